@@ -0,0 +1,212 @@
+# coding=utf-8
+"""
+频率词匹配基准（user-010）：单次扫描匹配器 vs 逐词匹配
+
+生成 300 个词组的合成配置（约 40% 为字面量交替正则 /a|b|c/，其余为普通词、必须词、过滤词和少量
+真正的正则）和 20 个平台 × 1000 条标题，测量：
+1. 当前代码的 count_word_frequency / count_rss_frequency（取 3 次中的最好成绩）
+2. WordGroupMatcher.first_group 与逐词匹配（_word_matches 逐组检查必须词 / 普通词 / 过滤词，
+   即编译匹配器之前的算法）的耗时，并确认每个标题匹配到的词组一致
+3. 指定 --baseline 时，在另一份代码（如引入匹配器之前的提交）上运行同样的统计，比较耗时和结果：
+       git worktree add /tmp/trendradar-base 04fd82d~1
+       python benchmarks/bench_frequency_matcher.py --baseline /tmp/trendradar-base
+
+统计在子进程中运行，两份代码互不影响。
+
+用法（项目根目录）：
+    python benchmarks/bench_frequency_matcher.py
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_CHARS = "的一是不了人我在有他这中大来上国个到说们为子和你地出会时要也就下得可天而经"
+
+
+def _build_inputs(groups: int, platforms: int, titles_per_platform: int):
+    """生成合成配置和标题（固定随机种子）"""
+    rnd = random.Random(7)
+
+    def word() -> str:
+        return "".join(rnd.choice(_CHARS) for _ in range(rnd.randint(2, 3)))
+
+    lines = ["[GLOBAL_FILTER]"] + [word() for _ in range(10)] + ["", "[WORD_GROUPS]"]
+    for g in range(groups):
+        r = rnd.random()
+        if r < 0.4:
+            group = [f"/{'|'.join(word() for _ in range(rnd.randint(2, 5)))}/ => G{g}"]
+        elif r < 0.7:
+            group = [word() for _ in range(rnd.randint(1, 4))]
+        elif r < 0.85:
+            group = ["+" + word(), word(), word()]
+        elif r < 0.95:
+            group = [word(), "!" + word()]
+        else:
+            group = [f"/(?<![a-z]){rnd.choice(['ai', 'gpu', 'ev', '5g'])}\\d*(?![a-z])/i"]
+        lines += group + [""]
+
+    results = {}
+    for p in range(platforms):
+        results[f"p{p}"] = {
+            "".join(rnd.choice(_CHARS + "AIgpu5G ") for _ in range(rnd.randint(10, 30))): {
+                "ranks": [i % 50 + 1], "url": f"https://example.com/{p}/{i}", "mobileUrl": "",
+            }
+            for i in range(titles_per_platform)
+        }
+    return "\n".join(lines), results
+
+
+def _measure(frequency_file: str, results: dict, repeat: int) -> dict:
+    """在当前进程加载的代码上计时（子进程入口）"""
+    import contextlib
+    import io
+
+    from trendradar.core.analyzer import count_rss_frequency, count_word_frequency
+    from trendradar.core.frequency import load_frequency_words
+
+    word_groups, filter_words, global_filters = load_frequency_words(frequency_file)
+    id_to_name = {platform_id: platform_id.upper() for platform_id in results}
+    weight_config = {"RANK_WEIGHT": 0.6, "FREQUENCY_WEIGHT": 0.3, "HOTNESS_WEIGHT": 0.1}
+    rss_items = [
+        {"title": title, "url": f"https://example.com/rss/{i}", "feed_id": "f", "feed_name": "F",
+         "published_at": "2025-01-01T00:00:00"}
+        for i, title in enumerate(title for titles in results.values() for title in titles)
+    ]
+
+    word_ms = rss_ms = float("inf")
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            started = time.perf_counter()
+            stats, _ = count_word_frequency(
+                results, word_groups, filter_words, id_to_name,
+                rank_threshold=5, mode="daily", global_filters=global_filters,
+                weight_config=weight_config, quiet=True,
+            )
+            word_ms = min(word_ms, (time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            rss_stats, _ = count_rss_frequency(
+                rss_items, word_groups, filter_words, global_filters, quiet=True
+            )
+            rss_ms = min(rss_ms, (time.perf_counter() - started) * 1000)
+
+    output = json.dumps([stats, rss_stats], sort_keys=True, ensure_ascii=False, default=str)
+    return {
+        "count_word_frequency": word_ms,
+        "count_rss_frequency": rss_ms,
+        "matched_groups": sum(1 for stat in stats if stat["count"]),
+        "digest": hashlib.sha1(output.encode("utf-8")).hexdigest(),
+    }
+
+
+def _run_tree(root: Path, frequency_file: str, inputs_file: str, repeat: int) -> dict:
+    """在子进程中加载 root 下的代码并计时"""
+    output = subprocess.run(
+        [sys.executable, __file__, "--measure", str(root), frequency_file, inputs_file, str(repeat)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _per_word_first_group(title: str, word_groups, filter_words, global_filters) -> int:
+    """逐词匹配（编译匹配器之前的算法），返回第一个匹配的词组序号，不匹配时返回 -1"""
+    from trendradar.core.frequency import _word_matches
+
+    title_lower = title.lower()
+    if global_filters and any(word.lower() in title_lower for word in global_filters):
+        return -1
+    if any(_word_matches(word, title_lower) for word in filter_words):
+        return -1
+    for index, group in enumerate(word_groups):
+        if group["required"] and not all(_word_matches(word, title_lower) for word in group["required"]):
+            continue
+        if group["normal"] and not any(_word_matches(word, title_lower) for word in group["normal"]):
+            continue
+        return index
+    return -1
+
+
+def bench_matcher(frequency_file: str, results: dict) -> None:
+    """匹配器与逐词匹配的耗时和结果比较"""
+    from trendradar.core.frequency import WordGroupMatcher, load_frequency_words
+
+    word_groups, filter_words, global_filters = load_frequency_words(frequency_file)
+    titles = [title for platform_titles in results.values() for title in platform_titles]
+
+    started = time.perf_counter()
+    matcher = WordGroupMatcher(word_groups, filter_words, global_filters)
+    compile_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    compiled = [matcher.first_group(title) for title in titles]
+    matcher_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    reference = [_per_word_first_group(title, word_groups, filter_words, global_filters) for title in titles]
+    per_word_ms = (time.perf_counter() - started) * 1000
+
+    mismatches = sum(1 for a, b in zip(compiled, reference) if a != b)
+    print(
+        f"首个匹配词组（{len(titles)} 条标题）: 逐词 {per_word_ms:.0f} ms，"
+        f"匹配器 {matcher_ms:.0f} ms（编译 {compile_ms:.0f} ms），"
+        f"{'结果一致' if not mismatches else f'{mismatches} 条不一致'}"
+    )
+
+
+def main() -> int:
+    if len(sys.argv) == 6 and sys.argv[1] == "--measure":
+        root, frequency_file, inputs_file, repeat = sys.argv[2:]
+        sys.path.insert(0, root)
+        with open(inputs_file, "r", encoding="utf-8") as f:
+            results = json.load(f)
+        print(json.dumps(_measure(frequency_file, results, int(repeat))))
+        return 0
+
+    parser = argparse.ArgumentParser(description="频率词匹配基准：单次扫描匹配器 vs 逐词匹配")
+    parser.add_argument("--groups", type=int, default=300, help="词组数")
+    parser.add_argument("--platforms", type=int, default=20, help="平台数")
+    parser.add_argument("--titles", type=int, default=1000, help="每个平台的标题数")
+    parser.add_argument("--repeat", type=int, default=3, help="计时次数（取最好成绩）")
+    parser.add_argument("--baseline", help="用于比较的另一份代码目录（如 git worktree）")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    config, results = _build_inputs(args.groups, args.platforms, args.titles)
+    total = sum(len(titles) for titles in results.values())
+    print(f"{total} 条标题 × {args.groups} 个词组")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        frequency_file = str(Path(work_dir) / "frequency_words.txt")
+        inputs_file = str(Path(work_dir) / "titles.json")
+        Path(frequency_file).write_text(config, encoding="utf-8")
+        Path(inputs_file).write_text(json.dumps(results, ensure_ascii=False), encoding="utf-8")
+
+        trees = [("当前", ROOT)]
+        if args.baseline:
+            trees.insert(0, ("基准", Path(args.baseline).resolve()))
+        measured = {}
+        for label, root in trees:
+            measured[label] = _run_tree(root, frequency_file, inputs_file, args.repeat)
+            print(
+                f"{label}: count_word_frequency {measured[label]['count_word_frequency']:.0f} ms，"
+                f"count_rss_frequency {measured[label]['count_rss_frequency']:.0f} ms，"
+                f"命中 {measured[label]['matched_groups']} 个词组"
+            )
+        if args.baseline:
+            same = measured["基准"]["digest"] == measured["当前"]["digest"]
+            print(f"统计结果{'一致' if same else '不一致'}")
+
+        bench_matcher(frequency_file, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
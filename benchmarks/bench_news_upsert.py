@@ -0,0 +1,188 @@
+# coding=utf-8
+"""
+新闻条目写入基准（user-006）
+
+每种规模先用 save_news_data 写入 3 次抓取得到"热"数据库（关闭连接，WAL 已合并），然后测量：
+1. 按 URL 查找已有条目：带 url != ''（命中部分唯一索引 idx_news_url_platform）与不带该条件
+   （逐平台扫描）两种查询，对同一批 URL 各执行一遍
+2. URL 标准化：无缓存与带缓存（_normalized_url）标准化一次抓取的全部 URL
+3. upsert_news_items 写入一次抓取并提交（数据库副本上，取多次中的最好成绩）
+
+--consecutive 额外测量连续多次 save_news_data 的耗时（查询未命中索引时随数据库增大变慢）。
+
+抓取数据：每个平台的条目从 2 倍规模的候选中随机抽取（有重复 URL、约 5% 空 URL、标题变体），
+与真实榜单的变化程度相近。
+
+用法（项目根目录）：
+    python benchmarks/bench_news_upsert.py
+    python benchmarks/bench_news_upsert.py --items 12000 20000 50000 --consecutive 5
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from trendradar.storage import sqlite_ops  # noqa: E402
+from trendradar.storage.base import NewsData, NewsItem  # noqa: E402
+from trendradar.storage.local import LocalStorageBackend  # noqa: E402
+from trendradar.utils.url import normalize_url  # noqa: E402
+
+
+DATE = "2025-01-01"
+NOW = "2025-01-01 14:00:00"
+
+# 按 URL 查找已有条目（与 upsert_news_items_per_item 相同；去掉 url != '' 时无法使用部分索引）
+_LOOKUP_INDEXED = "SELECT id, title FROM news_items WHERE url = ? AND url != '' AND platform_id = ?"
+_LOOKUP_SCAN = "SELECT id, title FROM news_items WHERE url = ? AND platform_id = ?"
+
+
+def _news_data(crawl_time: str, rnd: random.Random, platforms: int, per_platform: int) -> NewsData:
+    """构造一次抓取"""
+    items = {}
+    for p in range(platforms):
+        platform_id = f"p{p}"
+        news_list = []
+        for rank in range(1, per_platform + 1):
+            k = rnd.randrange(per_platform * 2)
+            url = "" if rnd.random() < 0.05 else f"https://example.com/{platform_id}/{k}?band_rank=3"
+            news_list.append(NewsItem(
+                title=f"{platform_id} 标题 {k}-{rnd.randrange(3)}",
+                source_id=platform_id,
+                source_name=platform_id,
+                rank=rank,
+                url=url,
+                mobile_url=f"https://m.example.com/{k}",
+                crawl_time=crawl_time,
+                ranks=[rank],
+            ))
+        items[platform_id] = news_list
+    return NewsData(
+        date=DATE, crawl_time=crawl_time, items=items,
+        id_to_name={platform_id: platform_id for platform_id in items},
+    )
+
+
+def _time_lookups(db_path: Path, keys, sql: str) -> float:
+    """对每个 (URL, 平台) 执行一次查找，返回耗时（秒）"""
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.cursor()
+        started = time.perf_counter()
+        for url, platform_id in keys:
+            cursor.execute(sql, (url, platform_id)).fetchone()
+        return time.perf_counter() - started
+    finally:
+        conn.close()
+
+
+def _time_normalize(data: NewsData) -> tuple:
+    """无缓存 / 带缓存标准化全部 URL 的耗时（秒）"""
+    urls = [(item.url, platform_id) for platform_id, items in data.items.items() for item in items if item.url]
+    started = time.perf_counter()
+    for url, platform_id in urls:
+        normalize_url(url, platform_id)
+    uncached = time.perf_counter() - started
+
+    sqlite_ops._normalized_url.cache_clear()
+    for url, platform_id in urls:
+        # 指纹计算先标准化一遍，写入时命中缓存
+        sqlite_ops._normalized_url(url, platform_id)
+    started = time.perf_counter()
+    for url, platform_id in urls:
+        sqlite_ops._normalized_url(url, platform_id)
+    return uncached, time.perf_counter() - started
+
+
+def _time_upsert(db_path: Path, data: NewsData) -> float:
+    """在数据库副本上写入一次抓取并提交，返回耗时（秒）"""
+    work_path = db_path.with_name("work.db")
+    shutil.copyfile(db_path, work_path)
+    conn = sqlite3.connect(work_path)
+    try:
+        started = time.perf_counter()
+        sqlite_ops.upsert_news_items(conn.cursor(), data.items, data.crawl_time, NOW)
+        conn.commit()
+        return time.perf_counter() - started
+    finally:
+        conn.close()
+        work_path.unlink()
+
+
+def bench_save(total: int, platforms: int, repeat: int) -> None:
+    """热数据库上的查找、标准化和写入耗时"""
+    per_platform = max(1, total // platforms)
+    rnd = random.Random(7)
+    with tempfile.TemporaryDirectory() as data_dir:
+        backend = LocalStorageBackend(data_dir=data_dir, enable_txt=False, enable_html=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for r in range(3):
+                backend.save_news_data(_news_data(f"1{r}-00", rnd, platforms, per_platform))
+            backend.cleanup()
+        db_path = Path(data_dir) / "news" / f"{DATE}.db"
+        data = _news_data("14-00", rnd, platforms, per_platform)
+        keys = [
+            (normalize_url(item.url, platform_id), platform_id)
+            for platform_id, items in data.items.items() for item in items if item.url
+        ]
+
+        indexed = min(_time_lookups(db_path, keys, _LOOKUP_INDEXED) for _ in range(repeat))
+        scan = _time_lookups(db_path, keys, _LOOKUP_SCAN)
+        uncached, cached = _time_normalize(data)
+        upsert = min(_time_upsert(db_path, data) for _ in range(repeat))
+
+    print(
+        f"{platforms * per_platform:>7} 条/次  查找 {len(keys)} 个 URL: 扫描 {scan * 1000:.0f} ms → "
+        f"部分索引 {indexed * 1000:.0f} ms；标准化: {uncached * 1000:.0f} ms → 缓存 {cached * 1000:.0f} ms；"
+        f"upsert_news_items {upsert * 1000:.0f} ms"
+    )
+
+
+def bench_consecutive(total: int, platforms: int, saves: int) -> None:
+    """连续多次 save_news_data 的耗时"""
+    per_platform = max(1, total // platforms)
+    rnd = random.Random(7)
+    timings = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        backend = LocalStorageBackend(data_dir=data_dir, enable_txt=False, enable_html=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for r in range(saves):
+                data = _news_data(f"1{r}-00", rnd, platforms, per_platform)
+                started = time.perf_counter()
+                backend.save_news_data(data)
+                timings.append(time.perf_counter() - started)
+            backend.cleanup()
+    print(
+        f"{platforms * per_platform:>7} 条/次  连续 {saves} 次 save_news_data: "
+        + " ".join(f"{t * 1000:.0f}ms" for t in timings)
+        + f"  合计 {sum(timings):.1f}s"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="新闻条目写入基准")
+    parser.add_argument("--items", type=int, nargs="+", default=[12000, 20000, 50000], help="每次抓取的条目数")
+    parser.add_argument("--platforms", type=int, default=20, help="平台数")
+    parser.add_argument("--repeat", type=int, default=3, help="计时次数（取最好成绩）")
+    parser.add_argument("--consecutive", type=int, default=0, help="连续 save_news_data 次数（0 表示不运行）")
+    args = parser.parse_args()
+
+    print(f"SQLite {sqlite3.sqlite_version}，{args.platforms} 个平台，热数据库（已有 3 次抓取）")
+    for total in args.items:
+        bench_save(total, args.platforms, args.repeat)
+    if args.consecutive:
+        for total in args.items:
+            bench_consecutive(total, args.platforms, args.consecutive)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+# coding=utf-8
+"""
+排名历史读取基准（user-014）：按天读取全部条目及其排名列表
+
+构造一天的合成数据库（20 个平台，每个条目 3 行 rank_history，抓取时间分布在 48 个半点），
+测量 get_today_all_data 和 MCP 逐日读取（ParserService._read_from_sqlite）的耗时（取 3 次中的
+最好成绩）和 Python 峰值内存（tracemalloc）。
+
+数据库由被测代码自己的存储后端建表（各版本的表结构迁移不同），每个规模、每份代码在独立的子进程中运行。
+指定 --baseline 时在另一份代码上运行同样的测量，例如改为相关子查询之前的提交：
+    git worktree add /tmp/trendradar-base ee4365d~1
+    python benchmarks/bench_rank_history_read.py --baseline /tmp/trendradar-base
+
+旧实现把当天所有条目 ID 绑定到一个 IN (...) 查询，条目数超过 SQLITE_MAX_VARIABLE_NUMBER 时报错，
+报错会显示在结果中。
+
+用法（项目根目录）：
+    python benchmarks/bench_rank_history_read.py
+    python benchmarks/bench_rank_history_read.py --items 5000 50000 200000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DATE = "2026-10-18"
+PLATFORMS = 20
+RANKS_PER_ITEM = 3
+READERS = ("get_today_all_data", "mcp_read")
+
+
+def _build(data_dir: Path, items: int) -> None:
+    """用当前加载的代码建表并批量写入合成数据"""
+    from trendradar.storage.local import LocalStorageBackend
+
+    backend = LocalStorageBackend(data_dir=str(data_dir / "output"), enable_txt=False, enable_html=False)
+    conn = backend._get_connection(DATE)
+    cursor = conn.cursor()
+    platforms = [f"p{i}" for i in range(PLATFORMS)]
+    times = [f"{h:02d}-{m:02d}" for h in range(24) for m in (0, 30)]
+    cursor.executemany(
+        "INSERT INTO platforms (id, name) VALUES (?, ?)", [(p, f"平台 {p}") for p in platforms]
+    )
+
+    news_rows, rank_rows = [], []
+    for i in range(items):
+        first = (i * 7) % 40
+        news_rows.append((
+            i + 1, f"标题 {i} 一些较长的新闻标题文本", platforms[i % PLATFORMS], i % 50 + 1,
+            f"https://example.com/{i}", "", times[first], times[first + RANKS_PER_ITEM - 1], RANKS_PER_ITEM,
+        ))
+        rank_rows.extend((i + 1, (i + j) % 50 + 1, times[first + j]) for j in range(RANKS_PER_ITEM))
+    cursor.executemany("""
+        INSERT INTO news_items
+        (id, title, platform_id, rank, url, mobile_url, first_crawl_time, last_crawl_time, crawl_count)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, news_rows)
+    cursor.executemany(
+        "INSERT INTO rank_history (news_item_id, rank, crawl_time) VALUES (?, ?, ?)", rank_rows
+    )
+    cursor.executemany(
+        "INSERT OR IGNORE INTO crawl_records (crawl_time, total_items) VALUES (?, 0)", [(t,) for t in times]
+    )
+    conn.commit()
+    backend.cleanup()
+
+
+def _read(data_dir: Path, reader: str):
+    """执行一次读取"""
+    if reader == "get_today_all_data":
+        from trendradar.storage.local import LocalStorageBackend
+
+        backend = LocalStorageBackend(data_dir=str(data_dir / "output"), enable_txt=False, enable_html=False)
+        try:
+            result = backend.get_today_all_data(DATE)
+        finally:
+            backend.cleanup()
+        if result is None:
+            raise RuntimeError("没有读取到数据")
+        return result
+
+    from mcp_server.services.parser_service import ParserService
+
+    result = ParserService(project_root=str(data_dir))._read_from_sqlite(datetime.strptime(DATE, "%Y-%m-%d"))
+    if result is None:
+        raise RuntimeError("没有读取到数据")
+    return result
+
+
+def _measure(items: int, repeat: int) -> dict:
+    """在当前加载的代码上建库并计时（子进程入口）"""
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        data_dir = Path(work_dir)
+        with contextlib.redirect_stdout(io.StringIO()):
+            _build(data_dir, items)
+        for reader in READERS:
+            best, error = None, None
+            with contextlib.redirect_stdout(io.StringIO()):
+                try:
+                    for _ in range(repeat):
+                        started = time.perf_counter()
+                        _read(data_dir, reader)
+                        elapsed = time.perf_counter() - started
+                        best = elapsed if best is None else min(best, elapsed)
+                    tracemalloc.start()
+                    _read(data_dir, reader)
+                    peak = tracemalloc.get_traced_memory()[1]
+                except Exception as e:
+                    error, peak = repr(e)[:120], None
+                finally:
+                    tracemalloc.stop()
+            results[reader] = {
+                "ms": best * 1000 if best is not None and not error else None,
+                "peak_mb": peak / 1024 / 1024 if peak else None,
+                "error": error,
+            }
+    return results
+
+
+def _run_tree(root: Path, items: int, repeat: int) -> dict:
+    """在子进程中加载 root 下的代码并计时"""
+    output = subprocess.run(
+        [sys.executable, __file__, "--measure", str(root), str(items), str(repeat)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _format(result: dict) -> str:
+    if result["error"]:
+        return f"失败 {result['error']}"
+    return f"{result['ms']:7.0f} ms  {result['peak_mb']:6.1f} MB"
+
+
+def main() -> int:
+    if len(sys.argv) == 5 and sys.argv[1] == "--measure":
+        root, items, repeat = sys.argv[2], int(sys.argv[3]), int(sys.argv[4])
+        sys.path.insert(0, root)
+        print(json.dumps(_measure(items, repeat)))
+        return 0
+
+    parser = argparse.ArgumentParser(description="排名历史读取基准")
+    parser.add_argument("--items", type=int, nargs="+", default=[5000, 50000, 200000], help="当天条目数")
+    parser.add_argument("--repeat", type=int, default=3, help="计时次数（取最好成绩）")
+    parser.add_argument("--baseline", help="用于比较的另一份代码目录（如 git worktree）")
+    args = parser.parse_args()
+
+    trees = [("当前", ROOT)]
+    if args.baseline:
+        trees.insert(0, ("基准", Path(args.baseline).resolve()))
+
+    print(f"{PLATFORMS} 个平台，每个条目 {RANKS_PER_ITEM} 行排名历史（耗时为最好成绩，内存为 Python 峰值）")
+    for items in args.items:
+        for label, root in trees:
+            result = _run_tree(root, items, args.repeat)
+            print(f"{items:>7} 条  {label}  " + "  ".join(
+                f"{reader} {_format(result[reader])}" for reader in READERS
+            ))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
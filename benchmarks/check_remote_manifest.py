@@ -0,0 +1,208 @@
+# coding=utf-8
+"""
+校验存储桶清单（user-024）与远程对象一致
+
+在 S3 兼容存储上依次检查：
+1. 增量上传：一次完整上传 + 多次增量上传后，清单记录的大小等于远程基础快照对象的大小
+   （而不是应用了增量段的本地数据库大小），拉取到本地后与写入方的数据库逐字节一致；
+   未压缩和 zlib 压缩各运行一次
+2. 清单过期：未维护清单的写入方直接上传较新日期的数据库后，读取方改为列举并看到该日期；
+   写入方下次更新清单时补入该日期，读取方重新直接使用清单
+3. 并发写入：两个写入方读取同一版本的清单后各自上传不同日期，条件写入冲突的一方重新读取后重试，
+   清单同时包含两个日期
+
+默认启动本地 moto 服务（需要 pip install "moto[server]"），也可以用环境变量指定一个空的测试存储桶：
+    S3_ENDPOINT_URL / S3_BUCKET_NAME / S3_ACCESS_KEY_ID / S3_SECRET_ACCESS_KEY / S3_REGION
+
+用法（项目根目录）：
+    python benchmarks/check_remote_manifest.py
+"""
+
+import contextlib
+import filecmp
+import io
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import boto3  # noqa: E402
+from botocore.config import Config as BotoConfig  # noqa: E402
+
+from trendradar.storage.base import NewsData, NewsItem  # noqa: E402
+from trendradar.storage.remote import RemoteStorageBackend  # noqa: E402
+from trendradar.storage.remote_manifest import load_manifest  # noqa: E402
+from trendradar.storage.remote_sync import pull_databases  # noqa: E402
+
+
+MOTO_PORT = 5390
+PLATFORMS = 30
+
+
+def _client(endpoint: str, access_key: str, secret_key: str, region: str):
+    """路径风格的 S3 客户端（本地 moto 不支持虚拟主机风格）"""
+    return boto3.client(
+        "s3",
+        endpoint_url=endpoint,
+        aws_access_key_id=access_key,
+        aws_secret_access_key=secret_key,
+        region_name=region or "us-east-1",
+        config=BotoConfig(s3={"addressing_style": "path"}),
+    )
+
+
+def _news_data(date: str, crawl_time: str, index: int) -> NewsData:
+    """构造一次抓取：第一个平台的榜单每次多一个新条目，其余平台榜单不变（只记录"未变化"标记）"""
+    items = {
+        f"p{p}": [
+            NewsItem(
+                title=f"条目 {p}-{n}", source_id=f"p{p}", source_name=f"平台 {p}",
+                rank=rank, url=f"https://example.com/{p}/{n}", crawl_time=crawl_time,
+            )
+            for rank, n in enumerate(([f"new-{index}"] if p == 0 else []) + list(range(50)), 1)
+        ]
+        for p in range(PLATFORMS)
+    }
+    return NewsData(date=date, crawl_time=crawl_time, items=items, id_to_name={k: k for k in items})
+
+
+class Checker:
+    def __init__(self, endpoint: str, bucket: str, access_key: str, secret_key: str, region: str):
+        self.endpoint = endpoint
+        self.bucket = bucket
+        self.credentials = (access_key, secret_key, region)
+        self.client = _client(endpoint, *self.credentials)
+        self.failures = 0
+
+    def backend(self, **kwargs) -> RemoteStorageBackend:
+        with contextlib.redirect_stdout(io.StringIO()):
+            backend = RemoteStorageBackend(
+                self.bucket, self.credentials[0], self.credentials[1], self.endpoint,
+                region=self.credentials[2], enable_html=False, **kwargs,
+            )
+        backend.s3_client = _client(self.endpoint, *self.credentials)
+        return backend
+
+    def expect(self, name: str, ok: bool, detail: str = "") -> None:
+        print(f"  {'通过' if ok else '失败'}: {name}{f'（{detail}）' if detail else ''}")
+        if not ok:
+            self.failures += 1
+
+    def crawl(self, date: str, crawls: int, copy_to: Path, **kwargs) -> None:
+        """同一天多次抓取（每次一个写入方进程），保存写入方最终的数据库"""
+        for index in range(crawls):
+            backend = self.backend(**kwargs)
+            with contextlib.redirect_stdout(io.StringIO()):
+                assert backend.save_news_data(_news_data(date, f"10-{index:02d}", index))
+                shutil.copyfile(backend._get_local_db_path(date), copy_to)
+                backend.cleanup()
+
+    def check_delta_sizes(self, work: Path) -> None:
+        print("增量上传后的清单大小")
+        for date, compression in (("2026-01-10", ""), ("2026-01-11", "zlib")):
+            reference = work / f"{date}.writer.db"
+            self.crawl(date, 5, reference, delta_upload=True, object_compression=compression)
+            key = f"news/{date}.db"
+            entry = load_manifest(self.client, self.bucket)["objects"][key]
+            head = self.client.head_object(Bucket=self.bucket, Key=key)
+            label = compression or "未压缩"
+            # 增量段累计过大时会重新上传完整数据库（压缩后基础快照更小，更早触发），至少保留一段
+            self.expect(f"{label} 清单记录了增量段", bool(entry["segments"]), f"{len(entry['segments'])} 段")
+            self.expect(
+                f"{label} 清单大小等于基础快照",
+                entry["size"] == head["ContentLength"],
+                f"清单 {entry['size']}，远程 {head['ContentLength']}，本地 {reference.stat().st_size}",
+            )
+
+            pull_dir = work / f"pull-{date}"
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = pull_databases(self.client, self.bucket, str(pull_dir), [date], ("news",))
+            pulled = pull_dir / "news" / f"{date}.db"
+            self.expect(
+                f"{label} 拉取结果与写入方一致",
+                result["failed"] == 0 and pulled.exists() and filecmp.cmp(pulled, reference, shallow=False),
+                f"下载 {result['downloaded']}，失败 {result['failed']}",
+            )
+
+    def check_stale_manifest(self, work: Path) -> None:
+        print("未维护清单的写入方上传较新的日期")
+        date = "2026-01-12"
+        self.client.put_object(
+            Bucket=self.bucket, Key=f"news/{date}.db", Body=(work / "2026-01-10.writer.db").read_bytes()
+        )
+        reader = self.backend()
+        with contextlib.redirect_stdout(io.StringIO()):
+            databases, source = reader.get_remote_index()
+            dates = reader.list_remote_dates()
+        self.expect("读取方改为列举", source == "listing", source)
+        self.expect("日期列表包含新日期", date in dates, ", ".join(dates))
+        self.expect("列举时保留清单中的行数", databases["news/2026-01-10.db"].get("rows") is not None)
+
+        # 写入方更新任意日期时补入新日期
+        self.crawl("2026-01-11", 1, work / "2026-01-11.writer.db", delta_upload=True, object_compression="zlib")
+        with contextlib.redirect_stdout(io.StringIO()):
+            databases, source = reader.get_remote_index()
+            reader.cleanup()
+        self.expect("写入方补入后读取方使用清单", source == "manifest" and f"news/{date}.db" in databases, source)
+
+    def check_concurrent_writers(self, work: Path) -> None:
+        print("两个写入方并发更新清单")
+        first, second = self.backend(), self.backend()
+        with contextlib.redirect_stdout(io.StringIO()):
+            first._get_manifest()
+            second._get_manifest()
+            assert first.save_news_data(_news_data("2026-01-13", "10-00", 0))
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            assert second.save_news_data(_news_data("2026-01-14", "10-00", 0))
+        objects = load_manifest(self.client, self.bucket)["objects"]
+        self.expect(
+            "清单同时包含两个写入方的日期",
+            "news/2026-01-13.db" in objects and "news/2026-01-14.db" in objects,
+        )
+        self.expect("后写入的一方重试", "重新读取后重试" in out.getvalue())
+        for backend in (first, second):
+            with contextlib.redirect_stdout(io.StringIO()):
+                backend.cleanup()
+
+
+def main() -> int:
+    server = None
+    endpoint = os.environ.get("S3_ENDPOINT_URL")
+    if endpoint:
+        bucket = os.environ["S3_BUCKET_NAME"]
+        access_key = os.environ["S3_ACCESS_KEY_ID"]
+        secret_key = os.environ["S3_SECRET_ACCESS_KEY"]
+        region = os.environ.get("S3_REGION", "")
+    else:
+        try:
+            from moto.server import ThreadedMotoServer
+        except ImportError:
+            print('需要 moto 启动本地 S3 服务: pip install "moto[server]"（或设置 S3_ENDPOINT_URL 等环境变量）')
+            return 2
+        server = ThreadedMotoServer(port=MOTO_PORT, verbose=False)
+        server.start()
+        endpoint = f"http://127.0.0.1:{MOTO_PORT}"
+        bucket, access_key, secret_key, region = "manifest-check", "test", "test", "us-east-1"
+        _client(endpoint, access_key, secret_key, region).create_bucket(Bucket=bucket)
+
+    checker = Checker(endpoint, bucket, access_key, secret_key, region)
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            work = Path(work_dir)
+            checker.check_delta_sizes(work)
+            checker.check_stale_manifest(work)
+            checker.check_concurrent_writers(work)
+    finally:
+        if server:
+            server.stop()
+
+    print("全部通过" if not checker.failures else f"{checker.failures} 项失败")
+    return 1 if checker.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
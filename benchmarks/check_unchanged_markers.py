@@ -0,0 +1,141 @@
+# coding=utf-8
+"""
+校验"未变化"标记（user-005）的读取结果与逐次完整写入一致
+
+同一组抓取分别用两种方式写入临时目录：
+- 参考：关闭榜单指纹短路，每次抓取都完整写入条目和排名历史（与引入标记前的行为相同）
+- 标记：榜单未变化的平台只记录"未变化"标记
+
+抓取序列覆盖：同一 URL 在榜单中以两个标题出现、URL 为空的条目、未变化 → 变化 → 未变化。
+每次抓取后比较 get_today_all_data / get_latest_crawl_data、MCP 逐日读取和月度汇总的逐日读取，
+逐行（rank_history）和紧凑（rank_trail）两种排名布局各运行一次。
+
+用法（项目根目录）：
+    python benchmarks/check_unchanged_markers.py
+"""
+
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcp_server.services.parser_service import ParserService  # noqa: E402
+from trendradar.storage import local as local_module  # noqa: E402
+from trendradar.storage.base import NewsData, NewsItem  # noqa: E402
+from trendradar.storage.local import LocalStorageBackend  # noqa: E402
+from trendradar.storage.rollup import _read_day  # noqa: E402
+
+
+DATE = "2026-01-15"
+
+# 平台 a 的榜单：(标题, URL)，排名为列表位置
+BOARD_1 = [
+    ("重复链接标题甲", "https://example.com/dup"),
+    ("空链接条目", ""),
+    ("普通条目一", "https://example.com/1"),
+    ("重复链接标题乙", "https://example.com/dup"),
+    ("普通条目二", "https://example.com/2"),
+    ("空链接条目二", ""),
+]
+BOARD_2 = BOARD_1[:4] + [("普通条目三", "https://example.com/3")] + BOARD_1[5:]
+
+# 每次抓取：(抓取时间, 平台 a 榜单)；平台 b 每次都变化
+CRAWLS = [
+    ("09-00", BOARD_1),
+    ("09-30", BOARD_1),
+    ("10-00", BOARD_1),
+    ("10-30", BOARD_2),
+    ("11-00", BOARD_2),
+    ("11-30", BOARD_2),
+]
+
+
+def _news_data(crawl_time: str, board, index: int) -> NewsData:
+    """构造一次抓取的数据"""
+    items = {
+        "a": [
+            NewsItem(title=title, source_id="a", source_name="A", rank=rank, url=url, crawl_time=crawl_time)
+            for rank, (title, url) in enumerate(board, 1)
+        ],
+        "b": [
+            NewsItem(title=f"变化条目 {index}", source_id="b", source_name="B", rank=1,
+                     url=f"https://example.com/b{index}", crawl_time=crawl_time),
+            NewsItem(title="常驻条目", source_id="b", source_name="B", rank=2,
+                     url="https://example.com/b", crawl_time=crawl_time),
+        ],
+    }
+    return NewsData(date=DATE, crawl_time=crawl_time, items=items, id_to_name={"a": "A", "b": "B"})
+
+
+def _snapshot_news(data):
+    """NewsData 转为可比较的结构"""
+    if data is None:
+        return None
+    return {
+        platform_id: [
+            (item.title, item.url, item.rank, item.ranks, item.count, item.first_time, item.last_time)
+            for item in items
+        ]
+        for platform_id, items in data.items.items()
+    }
+
+
+def _snapshot(root: Path, backend: LocalStorageBackend):
+    """读取各读取方的结果"""
+    parser = ParserService(project_root=str(root))
+    mcp = parser._read_from_sqlite(datetime.strptime(DATE, "%Y-%m-%d"))
+    day = _read_day(root / "output" / "news" / f"{DATE}.db")
+    return {
+        "get_today_all_data": _snapshot_news(backend.get_today_all_data(DATE)),
+        "get_latest_crawl_data": _snapshot_news(backend.get_latest_crawl_data(DATE)),
+        "mcp": mcp[0] if mcp else None,
+        "rollup": day[1] if day else None,
+    }
+
+
+def _run(root: Path, rank_format: str, use_markers: bool):
+    """写入抓取序列，返回每次抓取后的读取结果"""
+    backend = LocalStorageBackend(
+        data_dir=str(root / "output"),
+        enable_txt=False,
+        enable_html=False,
+        sqlite_config={"rank_history": rank_format},
+    )
+    original = local_module.find_unchanged_platforms
+    if not use_markers:
+        local_module.find_unchanged_platforms = lambda cursor, fingerprints, crawl_time: {}
+    snapshots = []
+    try:
+        for index, (crawl_time, board) in enumerate(CRAWLS):
+            assert backend.save_news_data(_news_data(crawl_time, board, index))
+            snapshots.append(_snapshot(root, backend))
+    finally:
+        local_module.find_unchanged_platforms = original
+        backend.cleanup()
+    return snapshots
+
+
+def main() -> int:
+    failures = 0
+    for rank_format in ("rows", "packed"):
+        with tempfile.TemporaryDirectory() as ref_dir, tempfile.TemporaryDirectory() as marker_dir:
+            reference = _run(Path(ref_dir), rank_format, use_markers=False)
+            actual = _run(Path(marker_dir), rank_format, use_markers=True)
+
+        for (crawl_time, _), expected, got in zip(CRAWLS, reference, actual):
+            for reader in expected:
+                if expected[reader] != got[reader]:
+                    failures += 1
+                    print(f"[{rank_format}] {crawl_time} {reader} 不一致")
+                    print(f"  参考: {expected[reader]}")
+                    print(f"  标记: {got[reader]}")
+        print(f"[{rank_format}] 已比较 {len(CRAWLS)} 次抓取")
+
+    print("一致" if not failures else f"{failures} 处不一致")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
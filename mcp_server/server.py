@@ -885,7 +885,8 @@ async def sync_from_remote(
     从远程存储拉取数据到本地
 
     用于 MCP Server 等场景：爬虫存到远程云存储（如 Cloudflare R2），
-    MCP Server 拉取到本地进行分析查询。
+    MCP Server 拉取到本地进行分析查询。只下载缺失或远程已变化的数据库，
+    多个文件并发下载，中断后再次调用会从已下载的位置继续。
 
     Args:
         days: 拉取最近 N 天的数据，默认 7 天
@@ -898,8 +899,10 @@ async def sync_from_remote(
         - success: 是否成功
         - synced_files: 成功同步的文件数量
         - synced_dates: 成功同步的日期列表
-        - skipped_dates: 跳过的日期（本地已存在）
-        - failed_dates: 失败的日期及错误信息
+        - skipped_dates: 跳过的日期（本地已是最新或为本地数据）
+        - failed_dates: 失败的文件及错误信息
+        - files: 每个文件（news / rss）的状态、下载字节数和耗时
+        - total_bytes / elapsed_seconds: 下载总字节数和总耗时
         - message: 操作结果描述
 
     Examples:
@@ -935,11 +938,16 @@ async def get_storage_status() -> str:
             - date_count: 日期数量
             - earliest_date: 最早日期
             - latest_date: 最新日期
+            - archive: 归档层状态（热数据 / 归档 / 解压缓存的数量和大小，
+              归档访问的缓存命中次数与解压耗时）
         - remote: 远程存储状态
             - configured: 是否已配置
             - endpoint_url: 服务端点
             - bucket_name: 存储桶名称
             - date_count: 远程日期数量
+            - database_count / total_size: 远程数据库数量和总大小
+            - index_source: 索引来源（manifest = 存储桶清单，一次请求；listing = 列举对象）
+            - row_counts: 各表行数合计（来自清单）
         - pull: 拉取配置
             - enabled: 是否启用自动拉取
             - days: 自动拉取天数
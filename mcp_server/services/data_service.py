@@ -11,6 +11,7 @@ from typing import Dict, List, Optional, Tuple
 
 from .cache_service import get_cache
 from .parser_service import ParserService
+from .range_query import RangeQueryService
 from ..utils.errors import DataNotFoundError
 
 
@@ -41,6 +42,7 @@ class DataService:
             project_root: 项目根目录
         """
         self.parser = ParserService(project_root)
+        self.range_query = RangeQueryService(self.parser.project_root)
         self.cache = get_cache()
 
     def get_latest_news(
@@ -226,48 +228,38 @@ class DataService:
             # 默认搜索今天
             start_date = end_date = datetime.now()
 
-        # 收集所有匹配的新闻
+        # 关键词和平台过滤在 SQL 中完成（跨日期 ATTACH 批量查询），逐条流式统计，
+        # 只保留前 limit 条结果
         results = []
         platform_distribution = Counter()
+        rank_sum = 0
+        rank_count = 0
+        total_found = 0
+
+        for item in self.range_query.iter_news(start_date, end_date, keyword=keyword, platforms=platforms):
+            ranks = item["ranks"]
+            total_found += 1
+            platform_distribution[item["platform"]] += 1
+            rank_sum += sum(ranks)
+            rank_count += len(ranks)
+
+            if limit is not None and limit > 0 and len(results) >= limit:
+                continue
 
-        # 遍历日期范围
-        current_date = start_date
-        while current_date <= end_date:
-            try:
-                all_titles, id_to_name, _ = self.parser.read_all_titles_for_date(
-                    date=current_date,
-                    platform_ids=platforms
-                )
-
-                # 搜索包含关键词的标题
-                for platform_id, titles in all_titles.items():
-                    platform_name = id_to_name.get(platform_id, platform_id)
-
-                    for title, info in titles.items():
-                        if keyword.lower() in title.lower():
-                            # 计算平均排名
-                            avg_rank = sum(info["ranks"]) / len(info["ranks"]) if info["ranks"] else 0
-
-                            results.append({
-                                "title": title,
-                                "platform": platform_id,
-                                "platform_name": platform_name,
-                                "ranks": info["ranks"],
-                                "count": len(info["ranks"]),
-                                "avg_rank": round(avg_rank, 2),
-                                "url": info.get("url", ""),
-                                "mobileUrl": info.get("mobileUrl", ""),
-                                "date": current_date.strftime("%Y-%m-%d")
-                            })
-
-                            platform_distribution[platform_id] += 1
-
-            except DataNotFoundError:
-                # 该日期没有数据,继续下一天
-                pass
+            # 计算平均排名
+            avg_rank = sum(ranks) / len(ranks) if ranks else 0
 
-            # 下一天
-            current_date += timedelta(days=1)
+            results.append({
+                "title": item["title"],
+                "platform": item["platform"],
+                "platform_name": item["platform_name"],
+                "ranks": ranks,
+                "count": len(ranks),
+                "avg_rank": round(avg_rank, 2),
+                "url": item["url"],
+                "mobileUrl": item["mobileUrl"],
+                "date": item["date"]
+            })
 
         if not results:
             raise DataNotFoundError(
@@ -276,16 +268,7 @@ class DataService:
             )
 
         # 计算统计信息
-        total_ranks = []
-        for item in results:
-            total_ranks.extend(item["ranks"])
-
-        avg_rank = sum(total_ranks) / len(total_ranks) if total_ranks else 0
-
-        # 限制返回数量(如果指定)
-        total_found = len(results)
-        if limit is not None and limit > 0:
-            results = results[:limit]
+        avg_rank = rank_sum / rank_count if rank_count else 0
 
         return {
             "results": results,
@@ -357,50 +340,65 @@ class DataService:
         if cached:
             return cached
 
-        # 读取今天的数据
-        all_titles, id_to_name, timestamps = self.parser.read_all_titles_for_date()
-
-        if not all_titles:
-            raise DataNotFoundError(
-                "未找到今天的新闻数据",
-                suggestion="请确保爬虫已经运行并生成了数据"
-            )
-
-        # 根据 mode 选择要处理的标题数据
-        if mode == "daily":
-            titles_to_process = all_titles
-        elif mode == "current":
-            titles_to_process = all_titles  # 简化实现
-        else:
+        if mode not in ("daily", "current"):
             raise ValueError(f"不支持的模式: {mode}。支持的模式: daily, current")
 
         # 统计词频
         word_frequency = Counter()
         keyword_to_news = {}
 
-        # 遍历要处理的标题
-        for platform_id, titles in titles_to_process.items():
-            for title in titles.keys():
-                if extract_mode == "keywords":
-                    # 基于预设关键词统计
-                    word_groups = self.parser.parse_frequency_words()
-                    for group in word_groups:
-                        all_words = group.get("required", []) + group.get("normal", [])
-                        for word in all_words:
-                            if word and word in title:
-                                word_frequency[word] += 1
-                                if word not in keyword_to_news:
-                                    keyword_to_news[word] = []
-                                keyword_to_news[word].append(title)
-
-                elif extract_mode == "auto_extract":
-                    # 自动提取关键词
-                    extracted_words = self._extract_words_from_title(title)
-                    for word in extracted_words:
-                        word_frequency[word] += 1
-                        if word not in keyword_to_news:
-                            keyword_to_news[word] = []
-                        keyword_to_news[word].append(title)
+        # 当日累计的预设关键词统计优先读取入库时预计算的结果（无需遍历全部标题）
+        keyword_stats = None
+        if extract_mode == "keywords" and mode == "daily":
+            keyword_stats = self.parser.read_keyword_stats_for_date()
+
+        if keyword_stats:
+            word_groups, group_titles = keyword_stats
+            for group_index, entries in group_titles.items():
+                keyword = self._get_group_keyword(word_groups[group_index])
+                unique_entries = set(entries)
+                word_frequency[keyword] += len(unique_entries)
+                keyword_to_news.setdefault(keyword, []).extend(
+                    title for _, title in unique_entries
+                )
+        else:
+            # 读取今天的数据
+            all_titles, id_to_name, timestamps = self.parser.read_all_titles_for_date()
+
+            if not all_titles:
+                raise DataNotFoundError(
+                    "未找到今天的新闻数据",
+                    suggestion="请确保爬虫已经运行并生成了数据"
+                )
+
+            # 根据 mode 选择要处理的标题数据（current 为简化实现）
+            titles_to_process = all_titles
+
+            # 预设关键词按词组统计：每条新闻计入第一个匹配的词组（与当日汇总报告一致）
+            rules = self.parser.load_keyword_rules() if extract_mode == "keywords" else None
+
+            # 遍历要处理的标题
+            for platform_id, titles in titles_to_process.items():
+                for title in titles.keys():
+                    if extract_mode == "keywords":
+                        if rules is None:
+                            continue
+                        matcher, word_groups, _ = rules
+                        group_index = matcher.first_group(title)
+                        if group_index < 0:
+                            continue
+                        keyword = self._get_group_keyword(word_groups[group_index])
+                        word_frequency[keyword] += 1
+                        keyword_to_news.setdefault(keyword, []).append(title)
+
+                    elif extract_mode == "auto_extract":
+                        # 自动提取关键词
+                        extracted_words = self._extract_words_from_title(title)
+                        for word in extracted_words:
+                            word_frequency[word] += 1
+                            if word not in keyword_to_news:
+                                keyword_to_news[word] = []
+                            keyword_to_news[word].append(title)
 
         # 获取TOP N关键词
         top_keywords = word_frequency.most_common(top_n)
@@ -433,6 +431,11 @@ class DataService:
 
         return result
 
+    @staticmethod
+    def _get_group_keyword(group: Dict) -> str:
+        """获取词组的显示名称（优先 display_name，与报告一致）"""
+        return group.get("display_name") or group["group_key"]
+
     def _get_mode_description(self, mode: str, extract_mode: str = "keywords") -> str:
         """获取模式描述"""
         mode_desc = {
@@ -6,7 +6,7 @@ v2.0.0: 仅支持 SQLite 数据库，移除 TXT 文件支持
 """
 
 import re
-import sqlite3
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
@@ -61,6 +61,7 @@ class ParserService:
         获取数据库文件路径
 
         新结构：output/{type}/{date}.db
+        已归档的日期（output/archive/{type}/）返回解压缓存中的数据库
 
         Args:
             date: 日期对象，默认为今天
@@ -69,11 +70,10 @@ class ParserService:
         Returns:
             数据库文件路径，如果不存在则返回 None
         """
+        from trendradar.storage.archive import resolve_db_path
+
         date_str = self.get_date_folder_name(date)
-        db_path = self.project_root / "output" / db_type / f"{date_str}.db"
-        if db_path.exists():
-            return db_path
-        return None
+        return resolve_db_path(str(self.project_root / "output"), date_str, db_type)
 
     def _read_from_sqlite(
         self,
@@ -92,6 +92,8 @@ class ParserService:
         Returns:
             (all_titles, id_to_name, all_timestamps) 元组，如果数据库不存在返回 None
         """
+        from trendradar.storage.sqlite_conn import connect_sqlite_readonly
+
         db_path = self._get_db_path(date, db_type)
         if db_path is None:
             return None
@@ -101,8 +103,8 @@ class ParserService:
         all_timestamps = {}
 
         try:
-            conn = sqlite3.connect(str(db_path))
-            conn.row_factory = sqlite3.Row
+            # 只读打开（WAL 快照读），爬虫写入期间查询不阻塞
+            conn = connect_sqlite_readonly(str(db_path))
             cursor = conn.cursor()
 
             if db_type == "news":
@@ -126,6 +128,12 @@ class ParserService:
         all_timestamps: Dict
     ) -> Optional[Tuple[Dict, Dict, Dict]]:
         """从热榜数据库读取数据"""
+        from trendradar.storage.sqlite_ops import (
+            load_pending_unchanged,
+            apply_pending_unchanged,
+            RankListReader,
+        )
+
         # 检查表是否存在
         cursor.execute("""
             SELECT name FROM sqlite_master
@@ -134,53 +142,35 @@ class ParserService:
         if not cursor.fetchone():
             return None
 
+        # 榜单未变化的平台：还原出现次数和最后出现时间
+        pending = load_pending_unchanged(cursor)
+
+        # 逐次排名（含"未变化"抓取补出的排名），兼容逐行 / 紧凑两种排名布局
+        rank_reader = RankListReader(cursor, include_unchanged=True)
+
         # 构建查询
+        query = f"""
+            SELECT n.id, n.platform_id, p.name as platform_name, n.title,
+                   n.rank, n.url, n.mobile_url,
+                   n.first_crawl_time, n.last_crawl_time, n.crawl_count,
+                   {rank_reader.column} as ranks
+            FROM news_items n
+            LEFT JOIN platforms p ON n.platform_id = p.id
+        """
+        params: List[str] = []
         if platform_ids:
             placeholders = ','.join(['?' for _ in platform_ids])
-            query = f"""
-                SELECT n.id, n.platform_id, p.name as platform_name, n.title,
-                       n.rank, n.url, n.mobile_url,
-                       n.first_crawl_time, n.last_crawl_time, n.crawl_count
-                FROM news_items n
-                LEFT JOIN platforms p ON n.platform_id = p.id
-                WHERE n.platform_id IN ({placeholders})
-            """
-            cursor.execute(query, platform_ids)
-        else:
-            cursor.execute("""
-                SELECT n.id, n.platform_id, p.name as platform_name, n.title,
-                       n.rank, n.url, n.mobile_url,
-                       n.first_crawl_time, n.last_crawl_time, n.crawl_count
-                FROM news_items n
-                LEFT JOIN platforms p ON n.platform_id = p.id
-            """)
-
-        rows = cursor.fetchall()
-
-        # 收集所有 news_item_id 用于查询历史排名
-        news_ids = [row['id'] for row in rows]
-        rank_history_map = {}
-
-        if news_ids:
-            placeholders = ",".join("?" * len(news_ids))
-            cursor.execute(f"""
-                SELECT news_item_id, rank FROM rank_history
-                WHERE news_item_id IN ({placeholders})
-                ORDER BY news_item_id, crawl_time
-            """, news_ids)
-
-            for rh_row in cursor.fetchall():
-                news_id = rh_row['news_item_id']
-                rank = rh_row['rank']
-                if news_id not in rank_history_map:
-                    rank_history_map[news_id] = []
-                rank_history_map[news_id].append(rank)
-
-        for row in rows:
-            news_id = row['id']
-            platform_id = row['platform_id']
-            platform_name = row['platform_name'] or platform_id
-            title = row['title']
+            query += f" WHERE n.platform_id IN ({placeholders})"
+            params = list(platform_ids)
+        query += " ORDER BY n.id"
+
+        # 逐行流式读取，直接写入结果结构。
+        # 字符串驻留（sys.intern）：抓取时间、平台在同一天内大量重复，标题和 URL 跨天重复，
+        # 缓存多天结果时相同内容只保留一份
+        for row in cursor.execute(query, params):
+            platform_id = sys.intern(row['platform_id'])
+            platform_name = sys.intern(row['platform_name'] or platform_id)
+            title = sys.intern(row['title'])
 
             if platform_id not in id_to_name:
                 id_to_name[platform_id] = platform_name
@@ -188,15 +178,20 @@ class ParserService:
             if platform_id not in all_titles:
                 all_titles[platform_id] = {}
 
-            ranks = rank_history_map.get(news_id, [row['rank']])
+            ranks = rank_reader.parse(
+                row['ranks'], row['rank'], platform_id, distinct=False, url=row['url'] or ""
+            )
+            last_time, count = apply_pending_unchanged(
+                pending, platform_id, row['id'], row['last_crawl_time'], row['crawl_count']
+            )
 
             all_titles[platform_id][title] = {
                 "ranks": ranks,
-                "url": row['url'] or "",
-                "mobileUrl": row['mobile_url'] or "",
-                "first_time": row['first_crawl_time'] or "",
-                "last_time": row['last_crawl_time'] or "",
-                "count": row['crawl_count'] or 1,
+                "url": sys.intern(row['url'] or ""),
+                "mobileUrl": sys.intern(row['mobile_url'] or ""),
+                "first_time": sys.intern(row['first_crawl_time'] or ""),
+                "last_time": sys.intern(last_time or ""),
+                "count": count or 1,
             }
 
         # 获取抓取时间作为 timestamps
@@ -260,10 +255,11 @@ class ParserService:
 
         rows = cursor.fetchall()
 
+        # 字符串驻留：RSS 条目通常连续多天留在源中，跨天缓存时相同内容只保留一份
         for row in rows:
-            feed_id = row['feed_id']
-            feed_name = row['feed_name'] or feed_id
-            title = row['title']
+            feed_id = sys.intern(row['feed_id'])
+            feed_name = sys.intern(row['feed_name'] or feed_id)
+            title = sys.intern(row['title'])
 
             if feed_id not in id_to_name:
                 id_to_name[feed_id] = feed_name
@@ -272,12 +268,12 @@ class ParserService:
                 all_items[feed_id] = {}
 
             all_items[feed_id][title] = {
-                "url": row['url'] or "",
-                "published_at": row['published_at'] or "",
-                "summary": row['summary'] or "",
-                "author": row['author'] or "",
-                "first_time": row['first_crawl_time'] or "",
-                "last_time": row['last_crawl_time'] or "",
+                "url": sys.intern(row['url'] or ""),
+                "published_at": sys.intern(row['published_at'] or ""),
+                "summary": sys.intern(row['summary'] or ""),
+                "author": sys.intern(row['author'] or ""),
+                "first_time": sys.intern(row['first_crawl_time'] or ""),
+                "last_time": sys.intern(row['last_crawl_time'] or ""),
                 "count": row['crawl_count'] or 1,
             }
 
@@ -341,6 +337,86 @@ class ParserService:
             suggestion="请先运行爬虫或检查日期是否正确"
         )
 
+    def load_keyword_rules(self, words_file: str = None):
+        """
+        加载关键词匹配规则（与入库时预计算统计使用相同的匹配语义）
+
+        Args:
+            words_file: 关键词文件路径，默认为 config/frequency_words.txt
+
+        Returns:
+            (匹配器, 词组列表, 指纹)，未配置词组时返回 None
+        """
+        from trendradar.storage.keyword_stats import load_keyword_rules
+
+        if words_file is None:
+            words_file = str(self.project_root / "config" / "frequency_words.txt")
+        return load_keyword_rules(str(words_file))
+
+    def read_keyword_stats_for_date(
+        self,
+        date: datetime = None,
+        words_file: str = None,
+    ) -> Optional[Tuple[List[Dict], Dict[int, List[Tuple[str, str]]]]]:
+        """
+        读取入库时预计算的关键词统计（带缓存）
+
+        统计与当前关键词配置内容一致时才返回，否则返回 None（调用方回退到逐条匹配）。
+
+        Args:
+            date: 日期对象，默认为今天
+            words_file: 关键词文件路径，默认为 config/frequency_words.txt
+
+        Returns:
+            (词组列表, {词组序号: [(platform_id, title), ...]})，不可用时返回 None
+        """
+        from trendradar.storage.keyword_stats import get_keyword_stats_fingerprint
+        from trendradar.storage.sqlite_conn import connect_sqlite_readonly
+
+        db_path = self._get_db_path(date, "news")
+        if db_path is None:
+            return None
+
+        rules = self.load_keyword_rules(words_file)
+        if rules is None:
+            return None
+        _, word_groups, fingerprint = rules
+
+        date_str = self.get_date_folder_name(date)
+        cache_key = f"keyword_stats:{date_str}:{fingerprint}"
+        cached = self.cache.get(cache_key, ttl=900)
+        if cached:
+            return cached
+
+        try:
+            conn = connect_sqlite_readonly(str(db_path))
+        except Exception as e:
+            print(f"Warning: 打开数据库失败: {e}")
+            return None
+
+        try:
+            cursor = conn.cursor()
+            if get_keyword_stats_fingerprint(cursor) != fingerprint:
+                return None
+
+            cursor.execute("""
+                SELECT k.group_index, n.platform_id, n.title
+                FROM keyword_stats k
+                JOIN news_items n ON n.id = k.news_item_id
+            """)
+            group_titles: Dict[int, List[Tuple[str, str]]] = {}
+            for group_index, platform_id, title in cursor.fetchall():
+                group_titles.setdefault(group_index, []).append((platform_id, title))
+        except Exception as e:
+            print(f"Warning: 读取关键词统计失败: {e}")
+            return None
+        finally:
+            conn.close()
+
+        result = (list(word_groups), group_titles)
+        self.cache.set(cache_key, result)
+        return result
+
     def parse_yaml_config(self, config_path: str = None) -> dict:
         """
         解析YAML配置文件
@@ -406,7 +482,7 @@ class ParserService:
 
     def get_available_dates(self, db_type: str = "news") -> List[str]:
         """
-        获取可用的日期列表
+        获取可用的日期列表（含已归档的日期）
 
         Args:
             db_type: 数据库类型 ("news" 或 "rss")
@@ -414,15 +490,16 @@ class ParserService:
         Returns:
             日期字符串列表（YYYY-MM-DD 格式，降序排列）
         """
-        db_dir = self.project_root / "output" / db_type
-        if not db_dir.exists():
-            return []
+        from trendradar.storage.archive import list_archived_dates
 
-        dates = []
-        for db_file in db_dir.glob("*.db"):
-            date_match = re.match(r'(\d{4}-\d{2}-\d{2})\.db$', db_file.name)
-            if date_match:
-                dates.append(date_match.group(1))
+        dates = set(list_archived_dates(str(self.project_root / "output"), db_type))
+
+        db_dir = self.project_root / "output" / db_type
+        if db_dir.exists():
+            for db_file in db_dir.glob("*.db"):
+                date_match = re.match(r'(\d{4}-\d{2}-\d{2})\.db$', db_file.name)
+                if date_match:
+                    dates.add(date_match.group(1))
 
         return sorted(dates, reverse=True)
 
@@ -0,0 +1,401 @@
+"""
+跨日期查询服务
+
+按日期范围查询热榜数据时，把 output/news/{date}.db 分批 ATTACH 到同一个只读内存连接，
+每批用一条 UNION ALL 语句完成关键词 / 平台过滤、去重、聚合和 LIMIT，逐行返回结果，
+不再逐日打开连接、把整天数据读入 Python 字典后再过滤。
+
+已结束月份存在月度汇总库（output/rollup/{YYYY-MM}.db，见 trendradar/storage/rollup.py）时，
+已汇总且源文件未变化的日期直接读取汇总库（一个月只占一个附加位置），其余日期读取每日数据库；
+已归档（output/archive/，见 trendradar/storage/archive.py）且未汇总的日期读取解压缓存。
+
+返回结果与逐日 ParserService.read_all_titles_for_date 的语义一致：
+- 同一天同一平台的相同标题只保留一条（位置取首次出现，内容取最后一条）
+- 平台按当天首次出现顺序、标题按平台内首次出现顺序排列
+- 排名列表含"未变化"抓取补出的排名，兼容逐行 / 紧凑两种排名布局
+"""
+
+import sqlite3
+import unicodedata
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# SQLite 默认最多附加 10 个数据库（SQLITE_MAX_ATTACHED）
+DEFAULT_ATTACH_LIMIT = 10
+
+
+def _contains_text(text: Optional[str], needle: str) -> bool:
+    """关键词匹配（与 keyword.lower() in title.lower() 相同，支持非 ASCII 大小写）"""
+    return text is not None and needle in text.lower()
+
+
+def _literal_run(needle: str) -> str:
+    """
+    取关键词中最长的一段"字面字符"，用作 SQL 预过滤（instr 由 SQLite 原生执行）
+
+    str.lower() 的结果中，不是小写字母、也不是组合附加符号（Mn）的字符只能来自原文中的同一字符，
+    因此这类字符组成的连续片段必然原样出现在标题中（如中文、数字、空格）。
+    预过滤只会多放行，最终仍由 contains_text 精确判断。
+
+    Args:
+        needle: 已转小写的关键词
+
+    Returns:
+        最长字面片段，没有时返回空字符串
+    """
+    best = current = ""
+    for char in needle:
+        if char.islower() or unicodedata.category(char) == "Mn":
+            current = ""
+            continue
+        current += char
+        if len(current) > len(best):
+            best = current
+    return best
+
+
+class RangeQueryService:
+    """跨日期查询服务类"""
+
+    def __init__(self, project_root: str = None, batch_size: Optional[int] = None):
+        """
+        初始化跨日期查询服务
+
+        Args:
+            project_root: 项目根目录，默认为当前目录的父目录
+            batch_size: 每批附加的数据库数，默认取 SQLite 的附加上限
+        """
+        if project_root is None:
+            current_file = Path(__file__)
+            self.project_root = current_file.parent.parent.parent
+        else:
+            self.project_root = Path(project_root)
+
+        self.batch_size = batch_size
+
+    def _sources(self, start_date: datetime, end_date: datetime) -> List[Tuple[str, Path, List[str]]]:
+        """
+        列出日期范围内的数据源
+
+        已汇总、且源文件未变化（或已被归档、清理）的日期读取月度汇总库，其余日期读取每日数据库，
+        已归档的日期读取解压缓存中的数据库。
+
+        Returns:
+            [(类型 "daily" / "rollup" / "archive", 路径, [日期字符串])]
+        """
+        from trendradar.storage.archive import find_archive
+        from trendradar.storage.rollup import get_rollup_path, load_rollup_days, source_stamp
+
+        data_dir = self.project_root / "output"
+        news_dir = data_dir / "news"
+        sources: List[Tuple[str, Path, List[str]]] = []
+        rolled_days: Dict[str, Optional[Dict[str, str]]] = {}
+        rollup_dates: Dict[str, List[str]] = {}
+
+        current_date = start_date
+        while current_date <= end_date:
+            date_str = current_date.strftime("%Y-%m-%d")
+            month = date_str[:7]
+            if month not in rolled_days:
+                rolled_days[month] = load_rollup_days(get_rollup_path(str(data_dir), month))
+            rolled = rolled_days[month]
+
+            db_path = news_dir / f"{date_str}.db"
+            stamp = source_stamp(db_path)
+            if rolled and date_str in rolled and stamp in (None, rolled[date_str]):
+                rollup_dates.setdefault(month, []).append(date_str)
+            elif stamp is not None:
+                sources.append(("daily", db_path, [date_str]))
+            else:
+                archive_path = find_archive(str(data_dir), date_str)
+                if archive_path is not None:
+                    sources.append(("archive", archive_path, [date_str]))
+            current_date += timedelta(days=1)
+
+        for month, dates in rollup_dates.items():
+            sources.append(("rollup", get_rollup_path(str(data_dir), month), dates))
+        return sources
+
+    def _batches(
+        self,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Iterator[Tuple[sqlite3.Connection, List[Tuple[str, str, List[str]]]]]:
+        """
+        按批附加数据源
+
+        Args:
+            start_date: 开始日期
+            end_date: 结束日期
+
+        Yields:
+            (连接, [(库名, 类型, [日期字符串])])，每日数据库只包含存在 news_items 表的；
+            下一批附加前分离上一批
+        """
+        from trendradar.storage.archive import resolve_db_path
+        from trendradar.storage.sqlite_conn import (
+            connect_sqlite_hub,
+            attach_sqlite_readonly,
+            detach_sqlite,
+        )
+
+        data_dir = str(self.project_root / "output")
+        sources = self._sources(start_date, end_date)
+        if not sources:
+            return
+
+        conn = connect_sqlite_hub()
+        try:
+            conn.create_function("contains_text", 2, _contains_text, deterministic=True)
+            batch_size = self.batch_size
+            if not batch_size:
+                getlimit = getattr(conn, "getlimit", None)
+                batch_size = getlimit(sqlite3.SQLITE_LIMIT_ATTACHED) if getlimit else DEFAULT_ATTACH_LIMIT
+
+            for offset in range(0, len(sources), batch_size):
+                attached: List[Tuple[str, str, List[str]]] = []
+                try:
+                    for index, (kind, db_path, dates) in enumerate(sources[offset:offset + batch_size]):
+                        schema = f"d{index}"
+                        if kind == "archive":
+                            # 附加时才解压：缓存淘汰只会删除已附加（已打开）的文件
+                            db_path = resolve_db_path(data_dir, dates[0])
+                            if db_path is None:
+                                continue
+                            kind = "daily"
+                        try:
+                            attach_sqlite_readonly(conn, str(db_path), schema)
+                        except sqlite3.Error as e:
+                            print(f"Warning: 附加 SQLite 数据库失败 ({db_path.name}): {e}")
+                            continue
+                        attached.append((schema, kind, dates))
+
+                    yield conn, [
+                        (schema, kind, dates) for schema, kind, dates in attached
+                        if kind == "rollup" or self._has_news_table(conn, schema)
+                    ]
+                finally:
+                    for schema, _, _ in attached:
+                        detach_sqlite(conn, schema)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _has_news_table(conn: sqlite3.Connection, schema: str) -> bool:
+        """检查附加库是否包含 news_items 表"""
+        row = conn.execute(f"""
+            SELECT name FROM {schema}.sqlite_master
+            WHERE type = 'table' AND name = 'news_items'
+        """).fetchone()
+        return row is not None
+
+    @staticmethod
+    def _filters(
+        keyword: Optional[str],
+        platforms: Optional[List[str]]
+    ) -> Tuple[List[str], str, list, list]:
+        """
+        构建过滤条件（条目表别名为 n）
+
+        Returns:
+            (条目过滤条件列表, 平台顺序子查询 WHERE, 条目过滤参数, 平台过滤参数)
+        """
+        conditions = []
+        params: list = []
+        platform_where = ""
+        platform_params: list = []
+        if keyword:
+            needle = keyword.lower()
+            literal = _literal_run(needle)
+            if literal:
+                conditions.append("instr(n.title, ?) > 0")
+                params.append(literal)
+            conditions.append("contains_text(n.title, ?)")
+            params.append(needle)
+        if platforms:
+            placeholders = ",".join("?" * len(platforms))
+            conditions.append(f"n.platform_id IN ({placeholders})")
+            params.extend(platforms)
+            platform_where = f"WHERE platform_id IN ({placeholders})"
+            platform_params = list(platforms)
+        return conditions, platform_where, params, platform_params
+
+    @staticmethod
+    def _where(conditions: List[str]) -> str:
+        """拼接 WHERE 子句"""
+        return f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    def iter_news(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        keyword: Optional[str] = None,
+        platforms: Optional[List[str]] = None
+    ) -> Iterator[Dict]:
+        """
+        逐条读取日期范围内的新闻（按日期、平台首次出现、标题首次出现顺序）
+
+        Args:
+            start_date: 开始日期
+            end_date: 结束日期
+            keyword: 标题关键词（不区分大小写的子串匹配），None 表示不过滤
+            platforms: 平台ID列表，None表示所有平台
+
+        Yields:
+            {"date", "platform", "platform_name", "title", "ranks", "url", "mobileUrl"}
+        """
+        from trendradar.storage.sqlite_ops import RankListReader
+
+        conditions, platform_where, params, platform_params = self._filters(keyword, platforms)
+        columns = (
+            "day, part, platform_id, platform_name, title, rank, url, mobile_url, "
+            "ranks, first_id, title_first_id"
+        )
+
+        for conn, schemas in self._batches(start_date, end_date):
+            if not schemas:
+                continue
+
+            cursor = conn.cursor()
+            # 每个数据源的排名读取器（汇总库的排名已展开为逗号分隔字符串，为 None）
+            readers: List[Optional[RankListReader]] = []
+            selects = []
+            query_params: list = []
+            for part, (schema, kind, dates) in enumerate(schemas):
+                if kind == "rollup":
+                    readers.append(None)
+                    date_placeholders = ",".join("?" * len(dates))
+                    where = self._where([f"n.date IN ({date_placeholders})", *conditions])
+                    selects.append(f"""
+                        SELECT n.date AS day, {part} AS part, n.platform_id, dp.name AS platform_name,
+                               n.title, n.best_rank AS rank, n.url, n.mobile_url, n.ranks,
+                               0 AS first_id, n.position AS title_first_id
+                        FROM {schema}.title_daily n
+                        JOIN {schema}.day_platforms dp
+                            ON dp.date = n.date AND dp.platform_id = n.platform_id
+                        {where}
+                    """)
+                    query_params.extend([*dates, *params])
+                    continue
+
+                reader = RankListReader(cursor, include_unchanged=True, schema=schema)
+                readers.append(reader)
+                # 窗口函数实现字典去重语义：同平台同标题取最后一条（dup = 1），位置取首次出现
+                selects.append(f"""
+                    SELECT {columns} FROM (
+                        SELECT ? AS day, {part} AS part, n.platform_id, p.name AS platform_name,
+                               n.title, n.rank, n.url, n.mobile_url, {reader.column} AS ranks,
+                               po.first_id,
+                               MIN(n.id) OVER w AS title_first_id,
+                               ROW_NUMBER() OVER (w ORDER BY n.id DESC) AS dup
+                        FROM {schema}.news_items n
+                        JOIN (
+                            SELECT platform_id, MIN(id) AS first_id
+                            FROM {schema}.news_items {platform_where}
+                            GROUP BY platform_id
+                        ) po ON po.platform_id = n.platform_id
+                        LEFT JOIN {schema}.platforms p ON n.platform_id = p.id
+                        {self._where(conditions)}
+                        WINDOW w AS (PARTITION BY n.platform_id, n.title)
+                    ) WHERE dup = 1
+                """)
+                query_params.extend([dates[0], *platform_params, *params])
+
+            query = " UNION ALL ".join(selects) + " ORDER BY day, first_id, title_first_id"
+            try:
+                for row in cursor.execute(query, query_params):
+                    platform_id = row["platform_id"]
+                    reader = readers[row["part"]]
+                    if reader is None:
+                        ranks = [int(rank) for rank in row["ranks"].split(",")]
+                    else:
+                        ranks = reader.parse(
+                            row["ranks"], row["rank"], platform_id, distinct=False, url=row["url"] or ""
+                        )
+                    yield {
+                        "date": row["day"],
+                        "platform": platform_id,
+                        "platform_name": row["platform_name"] or platform_id,
+                        "title": row["title"],
+                        "ranks": ranks,
+                        "url": row["url"] or "",
+                        "mobileUrl": row["mobile_url"] or "",
+                    }
+            finally:
+                cursor.close()
+
+    def count_by_day(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        keyword: str,
+        platforms: Optional[List[str]] = None,
+        sample_size: int = 0
+    ) -> Dict[str, Tuple[int, List[str]]]:
+        """
+        按天统计标题包含关键词的新闻数（计数和样本标题在 SQL 中完成，每批一条语句）
+
+        Args:
+            start_date: 开始日期
+            end_date: 结束日期
+            keyword: 标题关键词（不区分大小写的子串匹配）
+            platforms: 平台ID列表，None表示所有平台
+            sample_size: 每天返回的样本标题数（按平台、标题首次出现顺序）
+
+        Returns:
+            {日期字符串: (匹配条数, 样本标题列表)}，没有数据或没有匹配的日期不出现
+        """
+        conditions, platform_where, params, platform_params = self._filters(keyword, platforms)
+        # 计数随样本行返回（窗口函数在筛选序号之前计算），至少取一行
+        row_limit = max(sample_size, 1)
+
+        daily: Dict[str, Tuple[int, List[str]]] = {}
+        for conn, schemas in self._batches(start_date, end_date):
+            if not schemas:
+                continue
+
+            selects = []
+            query_params: list = []
+            for schema, kind, dates in schemas:
+                if kind == "rollup":
+                    date_placeholders = ",".join("?" * len(dates))
+                    where = self._where([f"n.date IN ({date_placeholders})", *conditions])
+                    selects.append(f"""
+                        SELECT day, title, total, seq FROM (
+                            SELECT n.date AS day, n.title,
+                                   COUNT(*) OVER (PARTITION BY n.date) AS total,
+                                   ROW_NUMBER() OVER (PARTITION BY n.date ORDER BY n.position) AS seq
+                            FROM {schema}.title_daily n
+                            {where}
+                        ) WHERE seq <= {row_limit}
+                    """)
+                    query_params.extend([*dates, *params])
+                    continue
+
+                selects.append(f"""
+                    SELECT day, title, total, seq FROM (
+                        SELECT ? AS day, t.title, COUNT(*) OVER () AS total,
+                               ROW_NUMBER() OVER (ORDER BY po.first_id, t.title_first_id) AS seq
+                        FROM (
+                            SELECT n.platform_id, n.title, MIN(n.id) AS title_first_id
+                            FROM {schema}.news_items n
+                            {self._where(conditions)}
+                            GROUP BY n.platform_id, n.title
+                        ) t
+                        JOIN (
+                            SELECT platform_id, MIN(id) AS first_id
+                            FROM {schema}.news_items {platform_where}
+                            GROUP BY platform_id
+                        ) po ON po.platform_id = t.platform_id
+                    ) WHERE seq <= {row_limit}
+                """)
+                query_params.extend([dates[0], *params, *platform_params])
+
+            query = " UNION ALL ".join(selects) + " ORDER BY day, seq"
+            for day, title, total, _ in conn.execute(query, query_params):
+                count, samples = daily.setdefault(day, (total, []))
+                if len(samples) < sample_size:
+                    samples.append(title)
+
+        return daily
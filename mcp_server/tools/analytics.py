@@ -306,38 +306,23 @@ class AnalyticsTools:
                 end_date = datetime.now()
                 start_date = end_date - timedelta(days=6)
 
-            # 收集趋势数据
+            # 按天统计话题出现次数（跨日期批量查询，计数和样本在 SQL 中完成）
+            daily_counts = self.data_service.range_query.count_by_day(
+                start_date, end_date, topic, sample_size=3  # 只保留前3个样本
+            )
+
+            # 收集趋势数据（没有数据的日期计为 0）
             trend_data = []
             current_date = start_date
 
             while current_date <= end_date:
-                try:
-                    all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
-                    )
-
-                    # 统计该时间点的话题出现次数
-                    count = 0
-                    matched_titles = []
-
-                    for _, titles in all_titles.items():
-                        for title in titles.keys():
-                            if topic.lower() in title.lower():
-                                count += 1
-                                matched_titles.append(title)
-
-                    trend_data.append({
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "count": count,
-                        "sample_titles": matched_titles[:3]  # 只保留前3个样本
-                    })
-
-                except DataNotFoundError:
-                    trend_data.append({
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "count": 0,
-                        "sample_titles": []
-                    })
+                date_str = current_date.strftime("%Y-%m-%d")
+                count, matched_titles = daily_counts.get(date_str, (0, []))
+                trend_data.append({
+                    "date": date_str,
+                    "count": count,
+                    "sample_titles": matched_titles
+                })
 
                 # 按天增加时间
                 current_date += timedelta(days=1)
@@ -713,7 +698,8 @@ class AnalyticsTools:
                             news_item = {
                                 "platform": platform_name,
                                 "title": title,
-                                "ranks": info.get("ranks", []),
+                                # 复制排名列表：跨天去重时会原地合并，不能修改解析缓存中的列表
+                                "ranks": list(info.get("ranks", [])),
                                 "count": len(info.get("ranks", [])),
                                 "date": current_date.strftime("%Y-%m-%d")
                             }
@@ -1501,32 +1487,18 @@ class AnalyticsTools:
                 end_date = datetime.now()
                 start_date = end_date - timedelta(days=6)
 
-            # 收集话题历史数据
+            # 按天统计话题出现次数（跨日期批量查询）
+            daily_counts = self.data_service.range_query.count_by_day(start_date, end_date, topic)
+
+            # 收集话题历史数据（没有数据的日期计为 0）
             lifecycle_data = []
             current_date = start_date
             while current_date <= end_date:
-                try:
-                    all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
-                    )
-
-                    # 统计该日的话题出现次数
-                    count = 0
-                    for _, titles in all_titles.items():
-                        for title in titles.keys():
-                            if topic.lower() in title.lower():
-                                count += 1
-
-                    lifecycle_data.append({
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "count": count
-                    })
-
-                except DataNotFoundError:
-                    lifecycle_data.append({
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "count": 0
-                    })
+                date_str = current_date.strftime("%Y-%m-%d")
+                lifecycle_data.append({
+                    "date": date_str,
+                    "count": daily_counts.get(date_str, (0, []))[0]
+                })
 
                 current_date += timedelta(days=1)
 
@@ -2030,43 +2002,27 @@ class AnalyticsTools:
             else:
                 start_date = end_date = datetime.now()
 
-            # 收集所有新闻
+            # 收集所有新闻（跨日期批量查询，平台过滤在 SQL 中完成）
             all_news = []
-            current_date = start_date
 
-            while current_date <= end_date:
-                try:
-                    all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date,
-                        platform_ids=platforms
-                    )
-
-                    for platform_id, titles in all_titles.items():
-                        platform_name = id_to_name.get(platform_id, platform_id)
-
-                        for title, info in titles.items():
-                            news_item = {
-                                "title": title,
-                                "platform": platform_id,
-                                "platform_name": platform_name,
-                                "date": current_date.strftime("%Y-%m-%d"),
-                                "ranks": info.get("ranks", []),
-                                "count": len(info.get("ranks", [])),
-                                "rank": info["ranks"][0] if info["ranks"] else 999
-                            }
-
-                            if include_url:
-                                news_item["url"] = info.get("url", "")
-                                news_item["mobileUrl"] = info.get("mobileUrl", "")
-
-                            # 计算权重
-                            news_item["weight"] = calculate_news_weight(news_item)
-                            all_news.append(news_item)
+            for info in self.data_service.range_query.iter_news(start_date, end_date, platforms=platforms):
+                news_item = {
+                    "title": info["title"],
+                    "platform": info["platform"],
+                    "platform_name": info["platform_name"],
+                    "date": info["date"],
+                    "ranks": info["ranks"],
+                    "count": len(info["ranks"]),
+                    "rank": info["ranks"][0] if info["ranks"] else 999
+                }
 
-                except DataNotFoundError:
-                    pass
+                if include_url:
+                    news_item["url"] = info["url"]
+                    news_item["mobileUrl"] = info["mobileUrl"]
 
-                current_date += timedelta(days=1)
+                # 计算权重
+                news_item["weight"] = calculate_news_weight(news_item)
+                all_news.append(news_item)
 
             if not all_news:
                 return {
@@ -2356,44 +2312,30 @@ class AnalyticsTools:
         all_keywords = Counter()
         platform_stats = Counter()
 
-        current_date = start_date
-        while current_date <= end_date:
-            try:
-                all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date(
-                    date=current_date,
-                    platform_ids=platforms
-                )
-
-                for platform_id, titles in all_titles.items():
-                    platform_name = id_to_name.get(platform_id, platform_id)
-
-                    for title, info in titles.items():
-                        # 如果指定了话题，过滤不相关的新闻
-                        if topic and topic.lower() not in title.lower():
-                            continue
-
-                        news_item = {
-                            "title": title,
-                            "platform": platform_id,
-                            "platform_name": platform_name,
-                            "date": current_date.strftime("%Y-%m-%d"),
-                            "ranks": info.get("ranks", []),
-                            "rank": info["ranks"][0] if info["ranks"] else 999
-                        }
-                        news_item["weight"] = calculate_news_weight(news_item)
-                        all_news.append(news_item)
-
-                        # 统计平台
-                        platform_stats[platform_name] += 1
-
-                        # 提取关键词
-                        keywords = self._extract_keywords(title)
-                        all_keywords.update(keywords)
+        # 跨日期批量查询；指定话题时在 SQL 中过滤不相关的新闻
+        for info in self.data_service.range_query.iter_news(
+            start_date, end_date, keyword=topic or None, platforms=platforms
+        ):
+            title = info["title"]
+            platform_name = info["platform_name"]
+
+            news_item = {
+                "title": title,
+                "platform": info["platform"],
+                "platform_name": platform_name,
+                "date": info["date"],
+                "ranks": info["ranks"],
+                "rank": info["ranks"][0] if info["ranks"] else 999
+            }
+            news_item["weight"] = calculate_news_weight(news_item)
+            all_news.append(news_item)
 
-            except DataNotFoundError:
-                pass
+            # 统计平台
+            platform_stats[platform_name] += 1
 
-            current_date += timedelta(days=1)
+            # 提取关键词
+            keywords = self._extract_keywords(title)
+            all_keywords.update(keywords)
 
         return {
             "news": all_news,
@@ -8,7 +8,7 @@
 import os
 import re
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Optional
 
 import yaml
@@ -98,6 +98,7 @@ class StorageSyncTools:
                 endpoint_url=remote_config["endpoint_url"],
                 region=remote_config.get("region", ""),
                 timezone=timezone,
+                sqlite_config=config.get("storage", {}).get("sqlite"),
             )
             return self._remote_backend
         except ImportError:
@@ -162,7 +163,15 @@ class StorageSyncTools:
                 if folder_date:
                     dates.append(folder_date.strftime("%Y-%m-%d"))
 
-        return sorted(dates, reverse=True)
+        # 扁平结构：output/news/{date}.db
+        news_dir = local_dir / "news"
+        if news_dir.is_dir():
+            for item in news_dir.glob("*.db"):
+                folder_date = self._parse_date_folder_name(item.stem)
+                if folder_date:
+                    dates.append(folder_date.strftime("%Y-%m-%d"))
+
+        return sorted(set(dates), reverse=True)
 
     def _calculate_dir_size(self, path: Path) -> int:
         """计算目录大小（字节）"""
@@ -211,64 +220,38 @@ class StorageSyncTools:
             local_dir = self._get_local_data_dir()
             local_dir.mkdir(parents=True, exist_ok=True)
 
-            # 获取远程可用日期
-            remote_dates = remote_backend.list_remote_dates()
-
-            # 获取本地已有日期
-            local_dates = set(self._get_local_dates())
+            # 一次列出远程对象，并行下载缺失或已变化的 news / rss 数据库（断点续传）
+            pull_config = self._get_storage_config().get("pull", {})
+            result = remote_backend.sync_recent_days(
+                days, str(local_dir), max_workers=int(pull_config.get("workers", 8))
+            )
 
-            # 计算需要拉取的日期（最近 N 天）
-            from trendradar.utils.time import get_configured_time
-            config = self._load_config()
-            timezone = config.get("app", {}).get("timezone", "Asia/Shanghai")
-            now = get_configured_time(timezone)
-
-            target_dates = []
-            for i in range(days):
-                date = now - timedelta(days=i)
-                date_str = date.strftime("%Y-%m-%d")
-                if date_str in remote_dates:
-                    target_dates.append(date_str)
-
-            # 执行拉取
-            synced_dates = []
-            skipped_dates = []
-            failed_dates = []
-
-            for date_str in target_dates:
-                # 检查本地是否已存在
-                if date_str in local_dates:
-                    skipped_dates.append(date_str)
-                    continue
-
-                # 拉取单个日期
-                try:
-                    local_date_dir = local_dir / date_str
-                    local_db_path = local_date_dir / "news.db"
-                    remote_key = f"news/{date_str}.db"
-
-                    local_date_dir.mkdir(parents=True, exist_ok=True)
-                    remote_backend.s3_client.download_file(
-                        remote_backend.bucket_name,
-                        remote_key,
-                        str(local_db_path)
-                    )
-                    synced_dates.append(date_str)
-                    print(f"[存储同步] 已拉取: {date_str}")
-                except Exception as e:
-                    failed_dates.append({"date": date_str, "error": str(e)})
-                    print(f"[存储同步] 拉取失败 ({date_str}): {e}")
+            synced_dates = sorted({
+                item["date"] for item in result["files"]
+                if item["status"] in ("downloaded", "resumed", "updated")
+            }, reverse=True)
+            failed_dates = [
+                {"date": item["date"], "file": item["key"], "error": item["error"]}
+                for item in result["files"] if item["status"] == "failed"
+            ]
+            handled = set(synced_dates) | {item["date"] for item in failed_dates}
+            skipped_dates = sorted({
+                item["date"] for item in result["files"] if item["date"] not in handled
+            }, reverse=True)
 
             return {
                 "success": True,
-                "synced_files": len(synced_dates),
+                "synced_files": result["downloaded"],
                 "synced_dates": synced_dates,
                 "skipped_dates": skipped_dates,
                 "failed_dates": failed_dates,
+                "files": result["files"],
+                "total_bytes": result["bytes"],
+                "elapsed_seconds": result["seconds"],
                 "message": f"成功同步 {len(synced_dates)} 天数据" + (
-                    f"，跳过 {len(skipped_dates)} 天（本地已存在）" if skipped_dates else ""
+                    f"，跳过 {len(skipped_dates)} 天（本地已是最新）" if skipped_dates else ""
                 ) + (
-                    f"，失败 {len(failed_dates)} 天" if failed_dates else ""
+                    f"，失败 {len(failed_dates)} 个文件" if failed_dates else ""
                 )
             }
 
@@ -313,6 +296,15 @@ class StorageSyncTools:
                 "latest_date": local_dates[0] if local_dates else None,
             }
 
+            # 归档层状态（热数据 / 归档 / 解压缓存的大小，本进程的归档访问延迟）
+            from trendradar.storage.archive import get_archive_status
+
+            local_status["archive"] = {
+                "archive_days": local_config.get("archive_days", 0),
+                "compression": local_config.get("archive_compression", "lzma"),
+                **get_archive_status(str(local_dir)),
+            }
+
             # 远程存储状态
             remote_config = storage_config.get("remote", {})
             has_remote = self._has_remote_config()
@@ -330,14 +322,29 @@ class StorageSyncTools:
                 remote_status["endpoint_url"] = endpoint
                 remote_status["bucket_name"] = bucket
 
-                # 尝试获取远程日期列表
+                # 远程数据库索引（读取存储桶清单并检查是否缺少较新的日期；清单不存在或过期时列举对象）
                 remote_backend = self._get_remote_backend()
                 if remote_backend:
                     try:
-                        remote_dates = remote_backend.list_remote_dates()
+                        databases, source = remote_backend.get_remote_index()
+                        remote_dates = sorted(
+                            {info["date"] for info in databases.values() if info["db_type"] == "news"},
+                            reverse=True,
+                        )
+                        remote_size = sum(info["size"] for info in databases.values())
                         remote_status["date_count"] = len(remote_dates)
                         remote_status["earliest_date"] = remote_dates[-1] if remote_dates else None
                         remote_status["latest_date"] = remote_dates[0] if remote_dates else None
+                        remote_status["database_count"] = len(databases)
+                        remote_status["total_size"] = f"{remote_size / 1024 / 1024:.2f} MB"
+                        remote_status["total_size_bytes"] = remote_size
+                        remote_status["index_source"] = source
+                        if source == "manifest":
+                            row_totals: Dict[str, int] = {}
+                            for info in databases.values():
+                                for table, count in (info.get("rows") or {}).items():
+                                    row_totals[table] = row_totals.get(table, 0) + count
+                            remote_status["row_counts"] = row_totals
                     except Exception as e:
                         remote_status["error"] = str(e)
 
@@ -4,6 +4,7 @@
 实现系统状态查询和爬虫触发功能。
 """
 
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -30,6 +31,49 @@ class SystemManagementTools:
             current_file = Path(__file__)
             self.project_root = current_file.parent.parent.parent
 
+        # 临时爬取共用的数据获取器（复用 keep-alive 连接池），爬虫配置变化时重建
+        self._fetcher = None
+        self._fetcher_key = None
+        self._fetcher_lock = threading.Lock()
+
+    def _get_fetcher(self, crawler_config: Dict):
+        """
+        获取与当前爬虫配置对应的数据获取器
+
+        MCP 服务为长驻进程，多次 trigger_crawl 共用同一个 DataFetcher 及其会话，
+        后续爬取直接复用已建立的连接；代理或并发配置变化时关闭旧会话并重建。
+
+        Args:
+            crawler_config: config.yaml 中的 advanced.crawler 配置
+
+        Returns:
+            DataFetcher 实例
+        """
+        from trendradar.crawler.fetcher import DataFetcher
+
+        proxy_url = None
+        if crawler_config.get("use_proxy"):
+            proxy_url = crawler_config.get("default_proxy")
+        key = (
+            proxy_url,
+            crawler_config.get("max_concurrency", 5),
+            crawler_config.get("per_host_concurrency", 3),
+            crawler_config.get("per_host_interval", 0),
+        )
+
+        with self._fetcher_lock:
+            if self._fetcher is None or self._fetcher_key != key:
+                if self._fetcher is not None:
+                    self._fetcher.close()
+                self._fetcher = DataFetcher(
+                    proxy_url=key[0],
+                    max_concurrency=key[1],
+                    per_host_concurrency=key[2],
+                    per_host_interval=key[3],
+                )
+                self._fetcher_key = key
+            return self._fetcher
+
     def get_system_status(self) -> Dict:
         """
         获取系统运行状态和健康检查信息
@@ -89,7 +133,6 @@ class SystemManagementTools:
         try:
             import time
             import yaml
-            from trendradar.crawler.fetcher import DataFetcher
             from trendradar.storage.local import LocalStorageBackend
             from trendradar.storage.base import convert_crawl_results_to_news_data
             from trendradar.utils.time import get_configured_time, format_date_folder, format_time_filename
@@ -139,14 +182,10 @@ class SystemManagementTools:
 
             print(f"开始临时爬取，平台: {[p.get('name', p['id']) for p in target_platforms]}")
 
-            # 初始化数据获取器
+            # 获取数据获取器（跨调用复用连接池）
             advanced = config_data.get("advanced", {})
             crawler_config = advanced.get("crawler", {})
-            proxy_url = None
-            if crawler_config.get("use_proxy"):
-                proxy_url = crawler_config.get("default_proxy")
-            
-            fetcher = DataFetcher(proxy_url=proxy_url)
+            fetcher = self._get_fetcher(crawler_config)
             request_interval = crawler_config.get("request_interval", 100)
 
             # 执行爬取
@@ -176,7 +215,8 @@ class SystemManagementTools:
                 data_dir=str(self.project_root / "output"),
                 enable_txt=True,
                 enable_html=True,
-                timezone=timezone
+                timezone=timezone,
+                sqlite_config=config_data.get("storage", {}).get("sqlite"),
             )
 
             # 尝试持久化数据
@@ -185,23 +225,25 @@ class SystemManagementTools:
             saved_files = {}
 
             try:
-                # 1. 保存到 SQLite (核心持久化)
-                if storage.save_news_data(news_data):
-                    save_success = True
-                
-                # 2. 如果请求保存到本地，生成 TXT/HTML 快照
-                if save_to_local:
-                    # 保存 TXT
-                    txt_path = storage.save_txt_snapshot(news_data)
-                    if txt_path:
-                        saved_files["txt"] = txt_path
-
-                    # 保存 HTML (使用简化版生成器)
-                    html_content = self._generate_simple_html(results, id_to_name, failed_ids, current_time)
-                    html_filename = f"{crawl_time_str}.html"
-                    html_path = storage.save_html_report(html_content, html_filename)
-                    if html_path:
-                        saved_files["html"] = html_path
+                # 持有跨进程写锁，避免与定时爬取交错写入
+                with storage.write_lock():
+                    # 1. 保存到 SQLite (核心持久化)
+                    if storage.save_news_data(news_data):
+                        save_success = True
+
+                    # 2. 如果请求保存到本地，生成 TXT/HTML 快照
+                    if save_to_local:
+                        # 保存 TXT
+                        txt_path = storage.save_txt_snapshot(news_data)
+                        if txt_path:
+                            saved_files["txt"] = txt_path
+
+                        # 保存 HTML (使用简化版生成器)
+                        html_content = self._generate_simple_html(results, id_to_name, failed_ids, current_time)
+                        html_filename = f"{crawl_time_str}.html"
+                        html_path = storage.save_html_report(html_content, html_filename)
+                        if html_path:
+                            saved_files["html"] = html_path
 
             except Exception as e:
                 # 捕获所有保存错误（特别是 Docker 只读卷导致的 PermissionError）
@@ -120,7 +120,12 @@ class NewsAnalyzer:
         self.update_info = None
         self.proxy_url = None
         self._setup_proxy()
-        self.data_fetcher = DataFetcher(self.proxy_url)
+        self.data_fetcher = DataFetcher(
+            self.proxy_url,
+            max_concurrency=self.ctx.config.get("MAX_CONCURRENCY", 5),
+            per_host_concurrency=self.ctx.config.get("PER_HOST_CONCURRENCY", 3),
+            per_host_interval=self.ctx.config.get("PER_HOST_INTERVAL", 0),
+        )
 
         # 初始化存储管理器（使用 AppContext）
         self._init_storage_manager()
@@ -238,28 +243,48 @@ class NewsAnalyzer:
     def _load_analysis_data(
         self,
         quiet: bool = False,
-    ) -> Optional[Tuple[Dict, Dict, Dict, Dict, List, List]]:
-        """统一的数据加载和预处理，使用当前监控平台列表过滤历史数据"""
+        mode: str = "current",
+    ) -> Optional[Tuple[Dict, Dict, Dict, Dict, List, List, List, Optional[int]]]:
+        """
+        统一的数据加载和预处理，使用当前监控平台列表过滤历史数据
+
+        当日汇总（mode="daily"）优先读取入库时预计算的关键词统计，只加载命中词组的标题；
+        统计不可用时回退到读取全部标题。最后一项为预计算时的当日总标题数（否则为 None）。
+        """
         try:
             # 获取当前配置的监控平台ID列表
             current_platform_ids = self.ctx.platform_ids
             if not quiet:
                 print(f"当前监控平台: {current_platform_ids}")
 
-            all_results, id_to_name, title_info = self.ctx.read_today_titles(
-                current_platform_ids, quiet=quiet
-            )
+            word_groups, filter_words, global_filters = self.ctx.load_frequency_words()
+
+            keyword_data = None
+            if mode == "daily" and word_groups:
+                keyword_data = self.ctx.read_keyword_titles(current_platform_ids)
 
-            if not all_results:
-                print("没有找到当天的数据")
-                return None
+            if keyword_data:
+                all_results, id_to_name, title_info, total_titles = keyword_data
+                known_total_titles = total_titles
+                if not quiet:
+                    matched_count = sum(len(titles) for titles in all_results.values())
+                    print(f"[存储] 已从关键词统计读取 {matched_count} 条命中标题（当天共 {total_titles} 条）")
+            else:
+                all_results, id_to_name, title_info = self.ctx.read_today_titles(
+                    current_platform_ids, quiet=quiet
+                )
+                known_total_titles = None
+
+                if not all_results:
+                    print("没有找到当天的数据")
+                    return None
+
+                total_titles = sum(len(titles) for titles in all_results.values())
 
-            total_titles = sum(len(titles) for titles in all_results.values())
             if not quiet:
                 print(f"读取到 {total_titles} 个标题（已按当前监控平台过滤）")
 
             new_titles = self.ctx.detect_new_titles(current_platform_ids, quiet=quiet)
-            word_groups, filter_words, global_filters = self.ctx.load_frequency_words()
 
             return (
                 all_results,
@@ -269,6 +294,7 @@ class NewsAnalyzer:
                 word_groups,
                 filter_words,
                 global_filters,
+                known_total_titles,
             )
         except Exception as e:
             print(f"数据加载失败: {e}")
@@ -309,6 +335,7 @@ class NewsAnalyzer:
         quiet: bool = False,
         rss_items: Optional[List[Dict]] = None,
         rss_new_items: Optional[List[Dict]] = None,
+        known_total_titles: Optional[int] = None,
     ) -> Tuple[List[Dict], Optional[str]]:
         """统一的分析流水线：数据处理 → 统计计算 → HTML生成"""
 
@@ -323,6 +350,7 @@ class NewsAnalyzer:
             mode=mode,
             global_filters=global_filters,
             quiet=quiet,
+            known_total_titles=known_total_titles,
         )
 
         # 如果是 platform 模式，转换数据结构
@@ -487,13 +515,20 @@ class NewsAnalyzer:
         print(f"生成{summary_type}报告...")
 
         # 加载分析数据
-        analysis_data = self._load_analysis_data()
+        analysis_data = self._load_analysis_data(mode=mode_strategy["summary_mode"])
         if not analysis_data:
             return None
 
-        all_results, id_to_name, title_info, new_titles, word_groups, filter_words, global_filters = (
-            analysis_data
-        )
+        (
+            all_results,
+            id_to_name,
+            title_info,
+            new_titles,
+            word_groups,
+            filter_words,
+            global_filters,
+            known_total_titles,
+        ) = analysis_data
 
         # 运行分析流水线
         stats, html_file = self._run_analysis_pipeline(
@@ -508,6 +543,7 @@ class NewsAnalyzer:
             global_filters=global_filters,
             rss_items=rss_items,
             rss_new_items=rss_new_items,
+            known_total_titles=known_total_titles,
         )
 
         if html_file:
@@ -539,13 +575,20 @@ class NewsAnalyzer:
         print(f"生成{summary_type}HTML...")
 
         # 加载分析数据（静默模式，避免重复输出日志）
-        analysis_data = self._load_analysis_data(quiet=True)
+        analysis_data = self._load_analysis_data(quiet=True, mode=mode)
         if not analysis_data:
             return None
 
-        all_results, id_to_name, title_info, new_titles, word_groups, filter_words, global_filters = (
-            analysis_data
-        )
+        (
+            all_results,
+            id_to_name,
+            title_info,
+            new_titles,
+            word_groups,
+            filter_words,
+            global_filters,
+            known_total_titles,
+        ) = analysis_data
 
         # 运行分析流水线（静默模式，避免重复输出日志）
         _, html_file = self._run_analysis_pipeline(
@@ -561,6 +604,7 @@ class NewsAnalyzer:
             quiet=True,
             rss_items=rss_items,
             rss_new_items=rss_new_items,
+            known_total_titles=known_total_titles,
         )
 
         if html_file:
@@ -704,12 +748,17 @@ class NewsAnalyzer:
                 timezone=timezone,
                 freshness_enabled=freshness_enabled,
                 default_max_age_days=default_max_age_days,
+                conditional_get=rss_config.get("CONDITIONAL_GET", True),
+                validators=self.storage_manager.get_rss_feed_validators(),
+                max_workers=rss_config.get("MAX_WORKERS", 1),
+                parse_workers=rss_config.get("PARSE_WORKERS", 0),
+                parse_timeout=rss_config.get("PARSE_TIMEOUT", 30),
             )
 
             # 抓取数据
             rss_data = fetcher.fetch_all()
 
-            # 保存到存储后端
+            # 保存到存储后端（所有源均未变化时也保存：记录抓取状态、顺延条目，并更新 200 响应带回的新校验信息）
             if self.storage_manager.save_rss_data(rss_data):
                 print(f"[RSS] 数据已保存到存储后端")
 
@@ -933,12 +982,11 @@ class NewsAnalyzer:
         try:
             word_groups, filter_words, global_filters = self.ctx.load_frequency_words()
             if word_groups or filter_words or global_filters:
-                from trendradar.core.frequency import matches_word_groups
-                filtered_items = []
-                for item in rss_items:
-                    title = item.get("title", "")
-                    if matches_word_groups(title, word_groups, filter_words, global_filters):
-                        filtered_items.append(item)
+                from trendradar.core.frequency import get_word_matcher
+                matcher = get_word_matcher(word_groups, filter_words, global_filters)
+                filtered_items = [
+                    item for item in rss_items if matcher.matches(item.get("title", ""))
+                ]
 
                 original_count = len(rss_items)
                 rss_items = filtered_items
@@ -1016,6 +1064,7 @@ class NewsAnalyzer:
                     _,
                     _,
                     _,
+                    _,
                 ) = analysis_data
 
                 print(
@@ -1150,6 +1199,7 @@ class NewsAnalyzer:
         finally:
             # 清理资源（包括过期数据清理和数据库连接关闭）
             self.ctx.cleanup()
+            self.data_fetcher.close()
 
 
 def main():
@@ -19,11 +19,14 @@ from trendradar.utils.time import (
 from trendradar.core import (
     load_frequency_words,
     matches_word_groups,
+    get_frequency_words_stats,
     save_titles_to_file,
     read_all_today_titles,
+    read_keyword_titles_from_storage,
     detect_latest_new_titles,
     is_first_crawl_today,
     count_word_frequency,
+    NewsSnapshot,
 )
 from trendradar.report import (
     clean_title,
@@ -72,6 +75,8 @@ class AppContext:
         """
         self.config = config
         self._storage_manager = None
+        self._news_snapshot: Optional[NewsSnapshot] = None
+        self._frequency_stats_start = get_frequency_words_stats()
 
     # === 配置访问 ===
 
@@ -152,6 +157,7 @@ class AppContext:
             remote_config = storage_config.get("REMOTE", {})
             local_config = storage_config.get("LOCAL", {})
             pull_config = storage_config.get("PULL", {})
+            sqlite_config = storage_config.get("SQLITE", {})
 
             self._storage_manager = get_storage_manager(
                 backend_type=storage_config.get("BACKEND", "auto"),
@@ -164,12 +170,23 @@ class AppContext:
                     "secret_access_key": remote_config.get("SECRET_ACCESS_KEY", ""),
                     "endpoint_url": remote_config.get("ENDPOINT_URL", ""),
                     "region": remote_config.get("REGION", ""),
+                    "cache_dir": remote_config.get("CACHE_DIR", ""),
+                    "cache_max_mb": remote_config.get("CACHE_MAX_MB", 256),
+                    "delta_upload": remote_config.get("DELTA_UPLOAD", False),
+                    "transfer_part_mb": remote_config.get("TRANSFER_PART_MB", 8),
+                    "transfer_workers": remote_config.get("TRANSFER_WORKERS", 4),
+                    "object_compression": remote_config.get("OBJECT_COMPRESSION", ""),
                 },
                 local_retention_days=local_config.get("RETENTION_DAYS", 0),
                 remote_retention_days=remote_config.get("RETENTION_DAYS", 0),
                 pull_enabled=pull_config.get("ENABLED", False),
                 pull_days=pull_config.get("DAYS", 7),
+                pull_workers=pull_config.get("WORKERS", 8),
                 timezone=self.timezone,
+                sqlite_config={key.lower(): value for key, value in sqlite_config.items()},
+                local_rollup=local_config.get("ROLLUP", True),
+                local_archive_days=local_config.get("ARCHIVE_DAYS", 0),
+                local_archive_compression=local_config.get("ARCHIVE_COMPRESSION", "lzma"),
             )
         return self._storage_manager
 
@@ -186,17 +203,29 @@ class AppContext:
         output_path = self.get_output_path("txt", f"{self.format_time()}.txt")
         return save_titles_to_file(results, id_to_name, failed_ids, output_path, clean_title)
 
+    def get_news_snapshot(self) -> NewsSnapshot:
+        """获取本次运行的当日数据快照（延迟初始化，热榜写入后自动失效）"""
+        if self._news_snapshot is None:
+            self._news_snapshot = NewsSnapshot(self.get_storage_manager())
+        return self._news_snapshot
+
     def read_today_titles(
         self, platform_ids: Optional[List[str]] = None, quiet: bool = False
     ) -> Tuple[Dict, Dict, Dict]:
-        """读取当天所有标题"""
-        return read_all_today_titles(self.get_storage_manager(), platform_ids, quiet=quiet)
+        """读取当天所有标题（使用运行内数据快照）"""
+        return read_all_today_titles(self.get_news_snapshot(), platform_ids, quiet=quiet)
+
+    def read_keyword_titles(
+        self, platform_ids: Optional[List[str]] = None
+    ) -> Optional[Tuple[Dict, Dict, Dict, int]]:
+        """读取预计算的当日关键词统计（不可用时返回 None，调用方回退到全量读取）"""
+        return read_keyword_titles_from_storage(self.get_news_snapshot(), platform_ids)
 
     def detect_new_titles(
         self, platform_ids: Optional[List[str]] = None, quiet: bool = False
     ) -> Dict:
-        """检测最新批次的新增标题"""
-        return detect_latest_new_titles(self.get_storage_manager(), platform_ids, quiet=quiet)
+        """检测最新批次的新增标题（使用运行内数据快照）"""
+        return detect_latest_new_titles(self.get_news_snapshot(), platform_ids, quiet=quiet)
 
     def is_first_crawl(self) -> bool:
         """检测是否是当天第一次爬取"""
@@ -233,6 +262,7 @@ class AppContext:
         mode: str = "daily",
         global_filters: Optional[List[str]] = None,
         quiet: bool = False,
+        known_total_titles: Optional[int] = None,
     ) -> Tuple[List[Dict], int]:
         """统计词频"""
         return count_word_frequency(
@@ -251,6 +281,7 @@ class AppContext:
             is_first_crawl_func=self.is_first_crawl,
             convert_time_func=self.convert_time_display,
             quiet=quiet,
+            known_total_titles=known_total_titles,
         )
 
     # === 报告生成 ===
@@ -430,7 +461,19 @@ class AppContext:
 
     def cleanup(self):
         """清理资源"""
+        frequency_stats = get_frequency_words_stats()
+        parses = frequency_stats["parses"] - self._frequency_stats_start["parses"]
+        cache_hits = frequency_stats["hits"] - self._frequency_stats_start["hits"]
+        if parses or cache_hits:
+            print(f"[频率词] 本次运行解析 {parses} 次，缓存命中 {cache_hits} 次")
         if self._storage_manager:
+            read_summary = self._storage_manager.get_read_summary()
+            if read_summary:
+                hits = self._news_snapshot.hits if self._news_snapshot else 0
+                print(f"[存储] 本次运行存储读取: {read_summary}（快照命中 {hits} 次）")
+            self._news_snapshot = None
+            self._storage_manager.build_rollups()
+            self._storage_manager.archive_old_data()
             self._storage_manager.cleanup_old_data()
             self._storage_manager.cleanup()
             self._storage_manager = None
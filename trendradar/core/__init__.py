@@ -10,14 +10,23 @@ from trendradar.core.config import (
     get_account_at_index,
 )
 from trendradar.core.loader import load_config
-from trendradar.core.frequency import load_frequency_words, matches_word_groups
+from trendradar.core.frequency import (
+    load_frequency_words,
+    matches_word_groups,
+    get_word_matcher,
+    WordGroupMatcher,
+    invalidate_frequency_words_cache,
+    get_frequency_words_stats,
+)
 from trendradar.core.data import (
     save_titles_to_file,
     read_all_today_titles_from_storage,
+    read_keyword_titles_from_storage,
     read_all_today_titles,
     detect_latest_new_titles_from_storage,
     detect_latest_new_titles,
     is_first_crawl_today,
+    NewsSnapshot,
 )
 from trendradar.core.analyzer import (
     calculate_news_weight,
@@ -34,13 +43,19 @@ __all__ = [
     "load_config",
     "load_frequency_words",
     "matches_word_groups",
+    "get_word_matcher",
+    "WordGroupMatcher",
+    "invalidate_frequency_words_cache",
+    "get_frequency_words_stats",
     # 数据处理
     "save_titles_to_file",
     "read_all_today_titles_from_storage",
+    "read_keyword_titles_from_storage",
     "read_all_today_titles",
     "detect_latest_new_titles_from_storage",
     "detect_latest_new_titles",
     "is_first_crawl_today",
+    "NewsSnapshot",
     # 统计分析
     "calculate_news_weight",
     "format_time_display",
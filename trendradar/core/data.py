@@ -6,12 +6,13 @@
 - save_titles_to_file: 保存标题到 TXT 文件
 - read_all_today_titles: 从存储后端读取当天所有标题
 - detect_latest_new_titles: 检测最新批次的新增标题
+- NewsSnapshot: 单次运行内共享的当日数据快照
 
 Author: TrendRadar Team
 """
 
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Callable
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
 def save_titles_to_file(
@@ -83,6 +84,75 @@ def save_titles_to_file(
     return output_path
 
 
+class NewsSnapshot:
+    """
+    单次运行内的当日热榜数据快照
+
+    提供与存储管理器相同的 get_today_all_data / get_latest_crawl_data 接口，
+    同一次运行中的各读取方（标题信息、新增检测、汇总报告、current 模式）共享同一份数据，
+    避免重复构建 NewsItem 和查询排名历史。存储管理器发生新的热榜写入后自动失效。
+
+    注意：返回的 NewsData 为共享对象，调用方不应修改。
+    """
+
+    def __init__(self, storage_manager):
+        """
+        初始化数据快照
+
+        Args:
+            storage_manager: 存储管理器实例
+        """
+        self.storage_manager = storage_manager
+        self._cache: Dict[str, Any] = {}
+        self._write_version: Optional[int] = None
+        self.hits = 0
+        self.loads = 0
+
+    def _get(self, key: str, loader: Callable[[], Any]) -> Any:
+        """读取快照数据，写入版本变化时先清空快照"""
+        write_version = getattr(self.storage_manager, "news_write_version", None)
+        if write_version != self._write_version:
+            self._cache.clear()
+            self._write_version = write_version
+
+        if key in self._cache:
+            self.hits += 1
+            return self._cache[key]
+
+        value = loader()
+        self._cache[key] = value
+        self.loads += 1
+        return value
+
+    def get_today_all_data(self, date: Optional[str] = None):
+        """获取当天所有数据（仅缓存当天，指定日期时直接读取存储）"""
+        if date is not None:
+            return self.storage_manager.get_today_all_data(date)
+        return self._get("today_all", self.storage_manager.get_today_all_data)
+
+    def get_latest_crawl_data(self, date: Optional[str] = None):
+        """获取最新抓取数据（仅缓存当天，指定日期时直接读取存储）"""
+        if date is not None:
+            return self.storage_manager.get_latest_crawl_data(date)
+        return self._get("latest", self.storage_manager.get_latest_crawl_data)
+
+    def get_keyword_stats_data(self, date: Optional[str] = None):
+        """获取预计算的当日关键词统计（仅缓存当天，指定日期时直接读取存储）"""
+        if date is not None:
+            return self.storage_manager.get_keyword_stats_data(date)
+        return self._get("keyword_stats", self.storage_manager.get_keyword_stats_data)
+
+    def detect_latest_new_titles(self, platform_ids: Optional[List[str]] = None):
+        """检测最新批次的新增标题（存储端比较，按平台过滤条件缓存）"""
+        key = "latest_new:" + (",".join(sorted(platform_ids)) if platform_ids is not None else "*")
+        return self._get(key, lambda: self.storage_manager.detect_latest_new_titles(platform_ids))
+
+    def invalidate(self) -> None:
+        """手动清空快照"""
+        self._cache.clear()
+        self._write_version = None
+
+
 def read_all_today_titles_from_storage(
     storage_manager,
     current_platform_ids: Optional[List[str]] = None,
@@ -91,7 +161,7 @@ def read_all_today_titles_from_storage(
     从存储后端读取当天所有标题（SQLite 数据）
 
     Args:
-        storage_manager: 存储管理器实例
+        storage_manager: 存储管理器实例（或 NewsSnapshot）
         current_platform_ids: 当前监控的平台 ID 列表（用于过滤）
 
     Returns:
@@ -103,50 +173,113 @@ def read_all_today_titles_from_storage(
         if not news_data or not news_data.items:
             return {}, {}, {}
 
-        all_results = {}
-        final_id_to_name = {}
-        title_info = {}
+        return _news_data_to_titles(news_data, current_platform_ids)
 
-        for source_id, news_list in news_data.items.items():
-            # 按平台过滤
-            if current_platform_ids is not None and source_id not in current_platform_ids:
-                continue
+    except Exception as e:
+        print(f"[存储] 从存储后端读取数据失败: {e}")
+        return {}, {}, {}
 
-            # 获取来源名称
-            source_name = news_data.id_to_name.get(source_id, source_id)
-            final_id_to_name[source_id] = source_name
 
-            if source_id not in all_results:
-                all_results[source_id] = {}
-                title_info[source_id] = {}
+def _news_data_to_titles(
+    news_data,
+    current_platform_ids: Optional[List[str]] = None,
+) -> Tuple[Dict, Dict, Dict]:
+    """
+    将 NewsData 转换为按平台分组的标题结构
 
-            for item in news_list:
-                title = item.title
-                ranks = getattr(item, 'ranks', [item.rank])
-                first_time = getattr(item, 'first_time', item.crawl_time)
-                last_time = getattr(item, 'last_time', item.crawl_time)
-                count = getattr(item, 'count', 1)
+    Args:
+        news_data: NewsData 对象
+        current_platform_ids: 当前监控的平台 ID 列表（用于过滤）
 
-                all_results[source_id][title] = {
-                    "ranks": ranks,
-                    "url": item.url or "",
-                    "mobileUrl": item.mobile_url or "",
-                }
+    Returns:
+        Tuple[Dict, Dict, Dict]: (all_results, id_to_name, title_info)
+    """
+    all_results = {}
+    final_id_to_name = {}
+    title_info = {}
+
+    for source_id, news_list in news_data.items.items():
+        # 按平台过滤
+        if current_platform_ids is not None and source_id not in current_platform_ids:
+            continue
+
+        # 获取来源名称
+        source_name = news_data.id_to_name.get(source_id, source_id)
+        final_id_to_name[source_id] = source_name
+
+        if source_id not in all_results:
+            all_results[source_id] = {}
+            title_info[source_id] = {}
+
+        for item in news_list:
+            title = item.title
+            ranks = getattr(item, 'ranks', [item.rank])
+            first_time = getattr(item, 'first_time', item.crawl_time)
+            last_time = getattr(item, 'last_time', item.crawl_time)
+            count = getattr(item, 'count', 1)
+
+            all_results[source_id][title] = {
+                "ranks": ranks,
+                "url": item.url or "",
+                "mobileUrl": item.mobile_url or "",
+            }
+
+            title_info[source_id][title] = {
+                "first_time": first_time,
+                "last_time": last_time,
+                "count": count,
+                "ranks": ranks,
+                "url": item.url or "",
+                "mobileUrl": item.mobile_url or "",
+            }
+
+    return all_results, final_id_to_name, title_info
 
-                title_info[source_id][title] = {
-                    "first_time": first_time,
-                    "last_time": last_time,
-                    "count": count,
-                    "ranks": ranks,
-                    "url": item.url or "",
-                    "mobileUrl": item.mobile_url or "",
-                }
 
-        return all_results, final_id_to_name, title_info
+def read_keyword_titles_from_storage(
+    storage_manager,
+    current_platform_ids: Optional[List[str]] = None,
+) -> Optional[Tuple[Dict, Dict, Dict, int]]:
+    """
+    从入库时预计算的关键词统计读取当天命中频率词的标题
 
+    只包含命中词组的标题，结构与 read_all_today_titles_from_storage 相同；
+    未命中的标题只计入总标题数。当日汇总报告据此生成，无需遍历全部标题和排名历史。
+
+    Args:
+        storage_manager: 存储管理器实例（或 NewsSnapshot）
+        current_platform_ids: 当前监控的平台 ID 列表（用于过滤）
+
+    Returns:
+        (all_results, id_to_name, title_info, 当天总标题数)；
+        统计不可用（频率词配置已变化、重建未完成等）时返回 None
+    """
+    try:
+        stats_data = storage_manager.get_keyword_stats_data()
     except Exception as e:
-        print(f"[存储] 从存储后端读取数据失败: {e}")
-        return {}, {}, {}
+        print(f"[存储] 读取关键词统计失败: {e}")
+        return None
+
+    if not stats_data:
+        return None
+
+    news_data, title_counts = stats_data
+    platform_ids = [
+        pid for pid, count in title_counts.items()
+        if count and (current_platform_ids is None or pid in current_platform_ids)
+    ]
+    if not platform_ids:
+        return None
+
+    matched_results, _, matched_title_info = _news_data_to_titles(news_data, current_platform_ids)
+
+    # 没有命中标题的平台也保留（平台集合和顺序与全量读取一致）
+    all_results = {pid: matched_results.get(pid, {}) for pid in platform_ids}
+    title_info = {pid: matched_title_info.get(pid, {}) for pid in platform_ids}
+    final_id_to_name = {pid: news_data.id_to_name.get(pid, pid) for pid in platform_ids}
+
+    total_titles = sum(title_counts[pid] for pid in platform_ids)
+    return all_results, final_id_to_name, title_info, total_titles
 
 
 def read_all_today_titles(
@@ -158,7 +291,7 @@ def read_all_today_titles(
     读取当天所有标题（从存储后端）
 
     Args:
-        storage_manager: 存储管理器实例
+        storage_manager: 存储管理器实例（或 NewsSnapshot）
         current_platform_ids: 当前监控的平台 ID 列表（用于过滤）
         quiet: 是否静默模式（不打印日志）
 
@@ -187,13 +320,21 @@ def detect_latest_new_titles_from_storage(
     从存储后端检测最新批次的新增标题
 
     Args:
-        storage_manager: 存储管理器实例
+        storage_manager: 存储管理器实例（或 NewsSnapshot）
         current_platform_ids: 当前监控的平台 ID 列表（用于过滤）
 
     Returns:
         Dict: 新增标题 {source_id: {title: title_data}}
     """
     try:
+        # 优先在存储端比较首次出现时间（只查询最新批次的标题）
+        detect = getattr(storage_manager, "detect_latest_new_titles", None)
+        if detect is not None:
+            new_titles = detect(current_platform_ids)
+            if new_titles is not None:
+                return new_titles
+
+        # 存储后端不支持时，加载当天数据在内存中比较
         # 获取最新抓取数据
         latest_data = storage_manager.get_latest_crawl_data()
         if not latest_data or not latest_data.items:
@@ -271,7 +412,7 @@ def detect_latest_new_titles(
     检测当日最新批次的新增标题（从存储后端）
 
     Args:
-        storage_manager: 存储管理器实例
+        storage_manager: 存储管理器实例（或 NewsSnapshot）
         current_platform_ids: 当前监控的平台 ID 列表（用于过滤）
         quiet: 是否静默模式（不打印日志）
 
@@ -10,12 +10,22 @@
 - 最大显示数量（@前缀）
 - 正则表达式（/pattern/ 语法）
 - 显示名称（=> 备注 语法）
+
+缓存：
+- 解析结果按 文件路径 + mtime + 大小 在进程内缓存，文件未变化时直接返回同一份只读规则集
+
+匹配：
+- WordGroupMatcher: 将词组编译为多模式自动机 + 合并正则，一次扫描得到所有命中词组
+- get_word_matcher: 按词组列表对象缓存编译结果
 """
 
+import hashlib
 import os
 import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Union
+from typing import Dict, List, Sequence, Tuple, Optional, Union
 
 
 def _parse_word(word: str) -> Dict:
@@ -88,9 +98,15 @@ def _word_matches(word_config: Union[str, Dict], title_lower: str) -> bool:
         return word_config["word"].lower() in title_lower
 
 
+# 解析结果缓存：{文件绝对路径: ((mtime_ns, 大小), (词组, 过滤词, 全局过滤词), 内容指纹)}
+_frequency_cache: Dict[str, Tuple[Tuple[int, int], Tuple, str]] = {}
+_frequency_cache_lock = threading.Lock()
+_frequency_stats = {"parses": 0, "hits": 0}
+
+
 def load_frequency_words(
     frequency_file: Optional[str] = None,
-) -> Tuple[List[Dict], List[str], List[str]]:
+) -> Tuple[Sequence[Dict], Sequence[Dict], Sequence[str]]:
     """
     加载频率词配置
 
@@ -105,6 +121,9 @@ def load_frequency_words(
     - !词：过滤词，匹配则排除
     - @数字：该词组最多显示的条数
 
+    文件未变化（mtime 与大小相同）时返回缓存的同一份规则集（元组，正则与匹配器均已编译），
+    调用方不应修改其中的内容。
+
     Args:
         frequency_file: 频率词配置文件路径，默认从环境变量 FREQUENCY_WORDS_PATH 获取或使用 config/frequency_words.txt
 
@@ -114,18 +133,69 @@ def load_frequency_words(
     Raises:
         FileNotFoundError: 频率词文件不存在
     """
+    return _load_cached_rules(frequency_file)[0]
+
+
+def get_frequency_words_fingerprint(frequency_file: Optional[str] = None) -> str:
+    """
+    获取频率词配置的内容指纹（配置内容变化时改变，用于判断预计算统计是否过期）
+
+    Args:
+        frequency_file: 频率词配置文件路径，默认同 load_frequency_words
+
+    Returns:
+        SHA-256 十六进制字符串
+
+    Raises:
+        FileNotFoundError: 频率词文件不存在
+    """
+    return _load_cached_rules(frequency_file)[1]
+
+
+def _load_cached_rules(frequency_file: Optional[str] = None) -> Tuple[Tuple, str]:
+    """读取（或从缓存获取）解析后的规则集及其内容指纹"""
     if frequency_file is None:
         frequency_file = os.environ.get(
             "FREQUENCY_WORDS_PATH", "config/frequency_words.txt"
         )
 
     frequency_path = Path(frequency_file)
-    if not frequency_path.exists():
+    try:
+        stat = frequency_path.stat()
+    except (FileNotFoundError, NotADirectoryError):
         raise FileNotFoundError(f"频率词文件 {frequency_file} 不存在")
 
+    cache_key = str(frequency_path.resolve())
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _frequency_cache_lock:
+        cached = _frequency_cache.get(cache_key)
+        if cached is not None and cached[0] == signature:
+            _frequency_stats["hits"] += 1
+            return cached[1], cached[2]
+
     with open(frequency_path, "r", encoding="utf-8") as f:
         content = f.read()
 
+    rules = _parse_frequency_content(content)
+    fingerprint = hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    with _frequency_cache_lock:
+        _frequency_cache[cache_key] = (signature, rules, fingerprint)
+        _frequency_stats["parses"] += 1
+
+    return rules, fingerprint
+
+
+def _parse_frequency_content(content: str) -> Tuple[Tuple[Dict, ...], Tuple[Dict, ...], Tuple[str, ...]]:
+    """
+    解析频率词配置内容并预编译匹配器
+
+    Args:
+        content: 配置文件内容
+
+    Returns:
+        (词组, 词组内过滤词, 全局过滤词)，均为元组
+    """
     word_groups = [group.strip() for group in content.split("\n\n") if group.strip()]
 
     processed_groups = []
@@ -213,7 +283,416 @@ def load_frequency_words(
                 }
             )
 
-    return processed_groups, filter_words, global_filters
+    rules = (tuple(processed_groups), tuple(filter_words), tuple(global_filters))
+
+    # 预编译匹配器（按对象缓存，后续 get_word_matcher 直接命中）
+    get_word_matcher(*rules)
+
+    return rules
+
+
+def invalidate_frequency_words_cache(frequency_file: Optional[str] = None) -> None:
+    """
+    使频率词解析缓存失效（如 Web UI 保存关键词后）
+
+    Args:
+        frequency_file: 频率词文件路径，为 None 时清空全部缓存
+    """
+    with _frequency_cache_lock:
+        if frequency_file is None:
+            _frequency_cache.clear()
+        else:
+            _frequency_cache.pop(str(Path(frequency_file).resolve()), None)
+
+
+def get_frequency_words_stats() -> Dict[str, int]:
+    """
+    获取频率词加载统计（进程内累计）
+
+    Returns:
+        {"parses": 实际解析次数, "hits": 缓存命中次数}
+    """
+    with _frequency_cache_lock:
+        return dict(_frequency_stats)
+
+
+# 正则中可作为字面量的转义字符（\\ 后跟非字母数字的 ASCII 字符）
+_REGEX_META = set(".^$*+?{}[]()|\\")
+
+# IGNORECASE 下与 ASCII 字母等价、但 lower() 后仍不同的字符（ı ≈ i，ſ ≈ s）
+_IGNORECASE_EXTRAS = ("\u0131", "\u017f")
+
+
+def _split_literal_alternation(pattern_str: str) -> Optional[List[str]]:
+    """
+    将纯字面量分支的正则（如 百度|文心一言|Face\\+\\+）拆分为小写字面量列表
+
+    只接受 ASCII 或无大小写区分的字符（中文、数字、标点），保证小写子串匹配与
+    IGNORECASE 正则结果一致；包含其他正则语法时返回 None。
+
+    Args:
+        pattern_str: 正则表达式源码
+
+    Returns:
+        小写字面量列表，无法拆分时返回 None
+    """
+    alternatives = []
+    current = []
+    i = 0
+    while i < len(pattern_str):
+        ch = pattern_str[i]
+        if ch == "\\":
+            if i + 1 >= len(pattern_str):
+                return None
+            escaped = pattern_str[i + 1]
+            if escaped.isalnum() or not escaped.isascii():
+                return None
+            current.append(escaped)
+            i += 2
+            continue
+        if ch == "|":
+            alternatives.append("".join(current))
+            current = []
+        elif ch in _REGEX_META:
+            return None
+        else:
+            current.append(ch)
+        i += 1
+    alternatives.append("".join(current))
+
+    literals = []
+    for alt in alternatives:
+        if not alt:
+            return None
+        for ch in alt:
+            if not ch.isascii() and ch.lower() != ch.upper():
+                return None
+        literals.append(alt.lower())
+    return literals
+
+
+class WordGroupMatcher:
+    """
+    编译后的词组匹配器
+
+    - 字面词（含可拆分为字面量分支的正则）构建 Aho-Corasick 自动机，对小写标题单次扫描
+    - 其余正则合并为一个分支正则做快速排除，命中后再逐个确认
+    - 每个不同的词分配一个位，词组的必须词/普通词、过滤词、全局过滤词均为位掩码
+
+    匹配语义与 matches_word_groups 的逐词检查完全一致。
+    """
+
+    # 合并正则时每批的模式数量（命中后只需逐个确认该批）
+    REGEX_BATCH_SIZE = 16
+
+    def __init__(
+        self,
+        word_groups: List[Dict],
+        filter_words: List,
+        global_filters: Optional[List[str]] = None,
+    ):
+        """
+        编译词组
+
+        Args:
+            word_groups: 词组列表
+            filter_words: 过滤词列表（字符串或字典）
+            global_filters: 全局过滤词列表
+        """
+        self._bits: Dict[Tuple[str, str], int] = {}
+        self._literal_masks: Dict[str, int] = {}
+        self._always_mask = 0
+        self._split_regex_mask = 0
+        self._split_regex: List[Tuple[int, "re.Pattern"]] = []
+        self._regex: List[Tuple[int, "re.Pattern"]] = []
+
+        self._global_mask = 0
+        for global_word in global_filters or []:
+            self._global_mask |= self._literal_bit(global_word.lower())
+
+        self._filter_mask = 0
+        for filter_item in filter_words or []:
+            self._filter_mask |= self._word_bit(filter_item)
+
+        # 词组掩码，以及按位索引的候选词组（无任何词的词组总是候选）
+        self._groups: List[Tuple[int, int]] = []
+        self._groups_by_bit: Dict[int, List[int]] = {}
+        self._unconditional: List[int] = []
+        for idx, group in enumerate(word_groups):
+            required_mask = 0
+            for req_item in group.get("required", []):
+                required_mask |= self._word_bit(req_item)
+            normal_mask = 0
+            for normal_item in group.get("normal", []):
+                normal_mask |= self._word_bit(normal_item)
+            self._groups.append((required_mask, normal_mask))
+
+            # 有必须词时只需按必须词索引（缺任何一个都不会匹配）
+            index_mask = required_mask or normal_mask
+            if not index_mask:
+                self._unconditional.append(idx)
+            while index_mask:
+                low = index_mask & -index_mask
+                self._groups_by_bit.setdefault(low, []).append(idx)
+                index_mask ^= low
+
+        self._build_automaton()
+        self._regex_batches = self._build_regex_batches()
+
+    def _new_bit(self, key: Tuple[str, str]) -> Tuple[int, bool]:
+        """获取词对应的位，返回 (位, 是否新分配)"""
+        bit = self._bits.get(key)
+        if bit is not None:
+            return bit, False
+        bit = 1 << len(self._bits)
+        self._bits[key] = bit
+        return bit, True
+
+    def _literal_bit(self, literal: str) -> int:
+        """字面词（已小写）对应的位"""
+        bit, created = self._new_bit(("literal", literal))
+        if created:
+            if literal:
+                self._literal_masks[literal] = self._literal_masks.get(literal, 0) | bit
+            else:
+                # 空字符串是任意标题的子串
+                self._always_mask |= bit
+        return bit
+
+    def _word_bit(self, word_config: Union[str, Dict]) -> int:
+        """词配置（字符串或字典）对应的位"""
+        if isinstance(word_config, str):
+            return self._literal_bit(word_config.lower())
+
+        if not (word_config.get("is_regex") and word_config.get("pattern")):
+            return self._literal_bit(word_config["word"].lower())
+
+        pattern = word_config["pattern"]
+        bit, created = self._new_bit(("regex", pattern.pattern))
+        if created:
+            literals = _split_literal_alternation(pattern.pattern)
+            if literals is None or pattern.flags & ~(re.IGNORECASE | re.UNICODE):
+                self._regex.append((bit, pattern))
+            else:
+                for literal in literals:
+                    self._literal_masks[literal] = self._literal_masks.get(literal, 0) | bit
+                self._split_regex_mask |= bit
+                self._split_regex.append((bit, pattern))
+        return bit
+
+    def _build_automaton(self) -> None:
+        """构建 Aho-Corasick 自动机（goto / fail / 输出位掩码）"""
+        goto: List[Dict[str, int]] = [{}]
+        output: List[int] = [0]
+        for literal, mask in self._literal_masks.items():
+            state = 0
+            for ch in literal:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][ch] = next_state
+                    goto.append({})
+                    output.append(0)
+                state = next_state
+            output[state] |= mask
+
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and ch not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(ch, 0)
+                output[next_state] |= output[fail[next_state]]
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+
+    def _build_regex_batches(self) -> List[Tuple[Optional["re.Pattern"], List[Tuple[int, "re.Pattern"]]]]:
+        """将无法拆分的正则分批合并为分支正则，用于快速排除"""
+        batches = []
+        for start in range(0, len(self._regex), self.REGEX_BATCH_SIZE):
+            members = self._regex[start:start + self.REGEX_BATCH_SIZE]
+            combined = None
+            if len(members) > 1:
+                sources = [p.pattern for _, p in members]
+                # 反向引用在合并后编号会变化，这类模式不参与合并
+                if not any(re.search(r"\\[1-9]|\(\?P=", src) for src in sources):
+                    try:
+                        combined = re.compile(
+                            "|".join(f"(?:{src})" for src in sources), re.IGNORECASE
+                        )
+                    except re.error:
+                        combined = None
+            batches.append((combined, members))
+        return batches
+
+    def _scan(self, title_lower: str) -> int:
+        """扫描小写标题，返回命中词的位掩码"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        mask = self._always_mask
+        state = 0
+        for ch in title_lower:
+            next_state = goto[state].get(ch)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = goto[state].get(ch)
+            state = next_state or 0
+            if output[state]:
+                mask |= output[state]
+
+        # 标题含 ı / ſ 时 IGNORECASE 正则与小写子串结果可能不同，改为逐个正则判断
+        if self._split_regex_mask and any(ch in title_lower for ch in _IGNORECASE_EXTRAS):
+            mask &= ~self._split_regex_mask
+            for bit, pattern in self._split_regex:
+                if pattern.search(title_lower):
+                    mask |= bit
+
+        for combined, members in self._regex_batches:
+            if combined is not None and not combined.search(title_lower):
+                continue
+            for bit, pattern in members:
+                if not mask & bit and pattern.search(title_lower):
+                    mask |= bit
+        return mask
+
+    def _candidate_groups(self, mask: int) -> List[int]:
+        """根据命中位收集可能匹配的词组序号（升序）"""
+        if not self._groups_by_bit:
+            return self._unconditional
+        candidates = set(self._unconditional)
+        remaining = mask
+        while remaining:
+            low = remaining & -remaining
+            groups = self._groups_by_bit.get(low)
+            if groups:
+                candidates.update(groups)
+            remaining ^= low
+        return sorted(candidates)
+
+    def _match(self, title, first_only: bool) -> Optional[List[int]]:
+        """
+        匹配标题
+
+        Returns:
+            None 表示标题无效或被过滤；否则为匹配的词组序号列表
+            （没有配置词组时返回空列表）
+        """
+        # 防御性类型检查：确保 title 是有效字符串
+        if not isinstance(title, str):
+            title = str(title) if title is not None else ""
+        if not title.strip():
+            return None
+
+        mask = self._scan(title.lower())
+
+        # 全局过滤检查（优先级最高）
+        if mask & self._global_mask:
+            return None
+        if not self._groups:
+            return []
+        if mask & self._filter_mask:
+            return None
+
+        matched = []
+        for idx in self._candidate_groups(mask):
+            required_mask, normal_mask = self._groups[idx]
+            if mask & required_mask != required_mask:
+                continue
+            if normal_mask and not mask & normal_mask:
+                continue
+            matched.append(idx)
+            if first_only:
+                break
+        return matched if matched else None
+
+    def match_groups(self, title: str) -> List[int]:
+        """
+        返回标题匹配的所有词组序号（升序）
+
+        Args:
+            title: 标题文本
+
+        Returns:
+            词组序号列表，被过滤或未匹配时为空列表
+        """
+        return self._match(title, first_only=False) or []
+
+    def first_group(self, title: str) -> int:
+        """
+        返回标题匹配的第一个词组序号
+
+        Args:
+            title: 标题文本
+
+        Returns:
+            词组序号，被过滤或未匹配时为 -1
+        """
+        matched = self._match(title, first_only=True)
+        return matched[0] if matched else -1
+
+    def matches(self, title: str) -> bool:
+        """
+        检查标题是否匹配（没有配置词组时，未被全局过滤的标题均匹配）
+
+        Args:
+            title: 标题文本
+
+        Returns:
+            是否匹配
+        """
+        return self._match(title, first_only=True) is not None
+
+
+# 编译结果缓存：{(id(word_groups), id(filter_words), id(global_filters)): (原列表, 匹配器)}
+_MATCHER_CACHE_SIZE = 8
+_matcher_cache: "OrderedDict[Tuple[int, int, int], Tuple[Tuple, WordGroupMatcher]]" = OrderedDict()
+
+
+def get_word_matcher(
+    word_groups: List[Dict],
+    filter_words: List,
+    global_filters: Optional[List[str]] = None,
+) -> WordGroupMatcher:
+    """
+    获取词组的编译匹配器（按列表对象缓存，同一份配置只编译一次）
+
+    缓存以列表对象身份为键，调用方不应原地修改 load_frequency_words 返回的列表。
+
+    Args:
+        word_groups: 词组列表
+        filter_words: 过滤词列表
+        global_filters: 全局过滤词列表
+
+    Returns:
+        WordGroupMatcher 实例
+    """
+    key = (id(word_groups), id(filter_words), id(global_filters))
+    cached = _matcher_cache.get(key)
+    if cached is not None:
+        sources, matcher = cached
+        if (
+            sources[0] is word_groups
+            and sources[1] is filter_words
+            and sources[2] is global_filters
+        ):
+            _matcher_cache.move_to_end(key)
+            return matcher
+
+    matcher = WordGroupMatcher(word_groups, filter_words, global_filters)
+    _matcher_cache[key] = ((word_groups, filter_words, global_filters), matcher)
+    _matcher_cache.move_to_end(key)
+    while len(_matcher_cache) > _MATCHER_CACHE_SIZE:
+        _matcher_cache.popitem(last=False)
+    return matcher
 
 
 def matches_word_groups(
@@ -234,49 +713,4 @@ def matches_word_groups(
     Returns:
         是否匹配
     """
-    # 防御性类型检查：确保 title 是有效字符串
-    if not isinstance(title, str):
-        title = str(title) if title is not None else ""
-    if not title.strip():
-        return False
-
-    title_lower = title.lower()
-
-    # 全局过滤检查（优先级最高）
-    if global_filters:
-        if any(global_word.lower() in title_lower for global_word in global_filters):
-            return False
-
-    # 如果没有配置词组，则匹配所有标题（支持显示全部新闻）
-    if not word_groups:
-        return True
-
-    # 过滤词检查（兼容新旧格式）
-    for filter_item in filter_words:
-        if _word_matches(filter_item, title_lower):
-            return False
-
-    # 词组匹配检查
-    for group in word_groups:
-        required_words = group["required"]
-        normal_words = group["normal"]
-
-        # 必须词检查
-        if required_words:
-            all_required_present = all(
-                _word_matches(req_item, title_lower) for req_item in required_words
-            )
-            if not all_required_present:
-                continue
-
-        # 普通词检查
-        if normal_words:
-            any_normal_present = any(
-                _word_matches(normal_item, title_lower) for normal_item in normal_words
-            )
-            if not any_normal_present:
-                continue
-
-        return True
-
-    return False
+    return get_word_matcher(word_groups, filter_words, global_filters).matches(title)
@@ -58,6 +58,9 @@ def _load_crawler_config(config_data: Dict) -> Dict:
         "REQUEST_INTERVAL": crawler_config.get("request_interval", 100),
         "USE_PROXY": crawler_config.get("use_proxy", False),
         "DEFAULT_PROXY": crawler_config.get("default_proxy", ""),
+        "MAX_CONCURRENCY": crawler_config.get("max_concurrency", 5),
+        "PER_HOST_CONCURRENCY": crawler_config.get("per_host_concurrency", 3),
+        "PER_HOST_INTERVAL": crawler_config.get("per_host_interval", 0),
         "ENABLE_CRAWLER": enable_crawler_env if enable_crawler_env is not None else crawler_config.get("enabled", True),
     }
 
@@ -164,6 +167,10 @@ def _load_rss_config(config_data: Dict) -> Dict:
         "TIMEOUT": advanced_rss.get("timeout", 15),
         "USE_PROXY": advanced_rss.get("use_proxy", False),
         "PROXY_URL": rss_proxy_url,
+        "CONDITIONAL_GET": advanced_rss.get("conditional_get", True),
+        "MAX_WORKERS": advanced_rss.get("max_workers", 1),
+        "PARSE_WORKERS": advanced_rss.get("parse_workers", 0),
+        "PARSE_TIMEOUT": advanced_rss.get("parse_timeout", 30),
         "FEEDS": rss.get("feeds", []),
         "FRESHNESS_FILTER": {
             "ENABLED": freshness_filter.get("enabled", True),  # 默认启用
@@ -182,6 +189,7 @@ def _load_storage_config(config_data: Dict) -> Dict:
     local = storage.get("local", {})
     remote = storage.get("remote", {})
     pull = storage.get("pull", {})
+    sqlite = storage.get("sqlite", {})
 
     txt_enabled_env = _get_env_bool("STORAGE_TXT_ENABLED")
     html_enabled_env = _get_env_bool("STORAGE_HTML_ENABLED")
@@ -197,6 +205,9 @@ def _load_storage_config(config_data: Dict) -> Dict:
         "LOCAL": {
             "DATA_DIR": local.get("data_dir", "output"),
             "RETENTION_DAYS": _get_env_int("LOCAL_RETENTION_DAYS") or local.get("retention_days", 0),
+            "ROLLUP": local.get("rollup", True),
+            "ARCHIVE_DAYS": local.get("archive_days", 0),
+            "ARCHIVE_COMPRESSION": local.get("archive_compression", "lzma"),
         },
         "REMOTE": {
             "ENDPOINT_URL": _get_env_str("S3_ENDPOINT_URL") or remote.get("endpoint_url", ""),
@@ -205,10 +216,26 @@ def _load_storage_config(config_data: Dict) -> Dict:
             "SECRET_ACCESS_KEY": _get_env_str("S3_SECRET_ACCESS_KEY") or remote.get("secret_access_key", ""),
             "REGION": _get_env_str("S3_REGION") or remote.get("region", ""),
             "RETENTION_DAYS": _get_env_int("REMOTE_RETENTION_DAYS") or remote.get("retention_days", 0),
+            "CACHE_DIR": remote.get("cache_dir", ""),
+            "CACHE_MAX_MB": remote.get("cache_max_mb", 256),
+            "DELTA_UPLOAD": remote.get("delta_upload", False),
+            "TRANSFER_PART_MB": remote.get("transfer_part_mb", 8),
+            "TRANSFER_WORKERS": remote.get("transfer_workers", 4),
+            "OBJECT_COMPRESSION": remote.get("object_compression", ""),
         },
         "PULL": {
             "ENABLED": pull_enabled_env if pull_enabled_env is not None else pull.get("enabled", False),
             "DAYS": _get_env_int("PULL_DAYS") or pull.get("days", 7),
+            "WORKERS": pull.get("workers", 8),
+        },
+        "SQLITE": {
+            "JOURNAL_MODE": sqlite.get("journal_mode", "wal"),
+            "SYNCHRONOUS": sqlite.get("synchronous", "normal"),
+            "CACHE_SIZE": sqlite.get("cache_size", -16000),
+            "MMAP_SIZE": sqlite.get("mmap_size", 268435456),
+            "TEMP_STORE": sqlite.get("temp_store", "memory"),
+            "BUSY_TIMEOUT": sqlite.get("busy_timeout", 5000),
+            "RANK_HISTORY": sqlite.get("rank_history", "rows"),
         },
     }
 
@@ -7,14 +7,106 @@
 - 批量平台数据爬取
 - 自动重试机制
 - 代理支持
+- 并发爬取（asyncio，全局并发为主；请求分布在多个主机时另有单主机并发；可选的单主机请求间隔）
+- 连接池复用（keep-alive）与单次请求耗时统计（连接 / TLS / 传输）
 """
 
+import asyncio
 import json
 import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack, asynccontextmanager
 from typing import Dict, List, Tuple, Optional, Union
+from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.poolmanager import ProxyManager
+
+# brotli 为可选依赖：安装后 urllib3 可自动解压 br 编码的响应
+try:
+    import brotli  # noqa: F401
+    HAS_BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        HAS_BROTLI = True
+    except ImportError:
+        HAS_BROTLI = False
+
+
+# 当前线程正在进行的请求的连接耗时记录（并发模式下每个请求独占一个工作线程）
+_timing_local = threading.local()
+
+
+def _record_timing(key: str, value: float) -> None:
+    """记录当前线程请求的耗时（毫秒）"""
+    timings = getattr(_timing_local, "timings", None)
+    if timings is not None:
+        timings[key] = timings.get(key, 0.0) + value
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    """记录 TCP 建连耗时的 HTTP 连接"""
+
+    def _new_conn(self):
+        start = time.perf_counter()
+        sock = super()._new_conn()
+        _record_timing("connect_ms", (time.perf_counter() - start) * 1000)
+        return sock
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    """记录 TCP 建连和 TLS 握手耗时的 HTTPS 连接"""
+
+    def _new_conn(self):
+        start = time.perf_counter()
+        sock = super()._new_conn()
+        self._tcp_connect_ms = (time.perf_counter() - start) * 1000
+        _record_timing("connect_ms", self._tcp_connect_ms)
+        return sock
+
+    def connect(self):
+        self._tcp_connect_ms = 0.0
+        start = time.perf_counter()
+        super().connect()
+        total_ms = (time.perf_counter() - start) * 1000
+        _record_timing("tls_ms", max(0.0, total_ms - self._tcp_connect_ms))
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+_TIMED_POOL_CLASSES = {
+    "http": _TimedHTTPConnectionPool,
+    "https": _TimedHTTPSConnectionPool,
+}
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    """使用带耗时统计连接的 HTTP 适配器"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = dict(_TIMED_POOL_CLASSES)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        # HTTP(S) 代理的请求经 ProxyManager 的连接池发出，同样使用带耗时统计的连接：
+        # connect_ms 为连接代理的耗时，HTTPS 目标的 tls_ms 包含 CONNECT 隧道建立。
+        # SOCKS 代理使用 urllib3 自带的连接类，无法统计（见 DataFetcher._timed_connections）
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        if isinstance(manager, ProxyManager):
+            manager.pool_classes_by_scheme = dict(_TIMED_POOL_CLASSES)
+        return manager
 
 
 class DataFetcher:
@@ -32,10 +124,16 @@ class DataFetcher:
         "Cache-Control": "no-cache",
     }
 
+    # 请求超时（秒）
+    REQUEST_TIMEOUT = 10
+
     def __init__(
         self,
         proxy_url: Optional[str] = None,
         api_url: Optional[str] = None,
+        max_concurrency: int = 1,
+        per_host_concurrency: int = 1,
+        per_host_interval: Optional[int] = 0,
     ):
         """
         初始化数据获取器
@@ -43,9 +141,107 @@ class DataFetcher:
         Args:
             proxy_url: 代理服务器 URL（可选）
             api_url: API 基础 URL（可选，默认使用 DEFAULT_API_URL）
+            max_concurrency: 全局最大并发请求数（<=1 时使用串行爬取）
+            per_host_concurrency: 单个主机最大并发请求数（仅在请求分布在多个主机时生效）
+            per_host_interval: 并发模式下同一主机相邻请求的最小发起间隔（毫秒，0 或 None 表示不限制）
         """
         self.proxy_url = proxy_url
         self.api_url = api_url or self.DEFAULT_API_URL
+        self.max_concurrency = max(1, int(max_concurrency or 1))
+        self.per_host_concurrency = max(1, int(per_host_concurrency or 1))
+        self.per_host_interval = max(0, int(per_host_interval or 0))
+
+        # 每个平台最近一次请求的耗时统计 {平台ID: {...}}
+        self.request_timings: Dict[str, Dict] = {}
+        self._timings_lock = threading.Lock()
+        # SOCKS 代理的连接不经过带耗时统计的连接类，握手耗时和连接复用未知
+        self._timed_connections = not (
+            proxy_url and urlparse(proxy_url).scheme.lower().startswith("socks")
+        )
+
+        self.session = self._create_session()
+
+    def _create_session(self) -> requests.Session:
+        """
+        创建带连接池的请求会话
+
+        同一 DataFetcher 实例的所有请求（含重试、多次 crawl_websites 调用）
+        共享该会话，复用 keep-alive 连接，避免每次请求重新进行 TCP + TLS 握手。
+        """
+        session = requests.Session()
+        session.headers.update(self.DEFAULT_HEADERS)
+        session.headers["Accept-Encoding"] = (
+            "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate"
+        )
+
+        # 连接池大小与并发数匹配，避免并发请求时连接被丢弃重建
+        pool_size = max(self.max_concurrency, self.per_host_concurrency, 4)
+        adapter = _TimedHTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=pool_size,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        if self.proxy_url:
+            session.proxies = {"http": self.proxy_url, "https": self.proxy_url}
+
+        return session
+
+    def close(self) -> None:
+        """关闭会话，释放连接池"""
+        if self.session is not None:
+            self.session.close()
+
+    def get_request_timings(self) -> Dict[str, Dict]:
+        """
+        获取各平台最近一次请求的耗时统计
+
+        Returns:
+            {平台ID: {"connect_ms", "tls_ms", "ttfb_ms", "transfer_ms",
+                      "total_ms", "reused", "bytes", "attempts"}}
+            其中 reused 表示是否复用了已有连接（无 TCP/TLS 握手）；
+            使用 SOCKS 代理时无法统计，connect_ms / tls_ms / reused 为 None
+        """
+        with self._timings_lock:
+            return {k: dict(v) for k, v in self.request_timings.items()}
+
+    def _timed_get(self, url: str) -> Tuple[requests.Response, Dict]:
+        """
+        通过共享会话发起 GET 请求并统计耗时
+
+        Args:
+            url: 请求地址
+
+        Returns:
+            (响应对象, 耗时统计字典)
+        """
+        _timing_local.timings = {}
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=self.REQUEST_TIMEOUT)
+            # 读取完整响应体（stream=False 时 get 已读取，这里用于计算传输耗时）
+            content = response.content
+            total_ms = (time.perf_counter() - start) * 1000
+            conn_timings = _timing_local.timings
+        finally:
+            _timing_local.timings = None
+
+        ttfb_ms = response.elapsed.total_seconds() * 1000
+        timing = {
+            "connect_ms": None,
+            "tls_ms": None,
+            "ttfb_ms": round(ttfb_ms, 1),
+            "transfer_ms": round(max(0.0, total_ms - ttfb_ms), 1),
+            "total_ms": round(total_ms, 1),
+            "reused": None,
+            "bytes": len(content) if content else 0,
+        }
+        if self._timed_connections:
+            timing["connect_ms"] = round(conn_timings.get("connect_ms", 0.0), 1)
+            timing["tls_ms"] = round(conn_timings.get("tls_ms", 0.0), 1)
+            timing["reused"] = "connect_ms" not in conn_timings
+        return response, timing
 
     def fetch_data(
         self,
@@ -72,40 +268,14 @@ class DataFetcher:
             id_value = id_info
             alias = id_value
 
-        url = f"{self.api_url}?id={id_value}&latest"
-
-        proxies = None
-        if self.proxy_url:
-            proxies = {"http": self.proxy_url, "https": self.proxy_url}
-
         retries = 0
         while retries <= max_retries:
             try:
-                response = requests.get(
-                    url,
-                    proxies=proxies,
-                    headers=self.DEFAULT_HEADERS,
-                    timeout=10,
-                )
-                response.raise_for_status()
-
-                data_text = response.text
-                data_json = json.loads(data_text)
-
-                status = data_json.get("status", "未知")
-                if status not in ["success", "cache"]:
-                    raise ValueError(f"响应状态异常: {status}")
-
-                status_info = "最新数据" if status == "success" else "缓存数据"
-                print(f"获取 {id_value} 成功（{status_info}）")
-                return data_text, id_value, alias
-
+                return self._fetch_once(id_value, retries + 1), id_value, alias
             except Exception as e:
                 retries += 1
                 if retries <= max_retries:
-                    base_wait = random.uniform(min_retry_wait, max_retry_wait)
-                    additional_wait = (retries - 1) * random.uniform(1, 2)
-                    wait_time = base_wait + additional_wait
+                    wait_time = self._retry_wait(retries, min_retry_wait, max_retry_wait)
                     print(f"请求 {id_value} 失败: {e}. {wait_time:.2f}秒后重试...")
                     time.sleep(wait_time)
                 else:
@@ -114,6 +284,93 @@ class DataFetcher:
 
         return None, id_value, alias
 
+    def _fetch_once(self, id_value: str, attempt: int) -> str:
+        """
+        发起一次请求并校验响应，失败时抛出异常（由调用方决定是否重试）
+
+        Args:
+            id_value: 平台ID
+            attempt: 第几次尝试（从 1 开始，记录在耗时统计中）
+
+        Returns:
+            响应文本
+        """
+        response, timing = self._timed_get(f"{self.api_url}?id={id_value}&latest")
+        timing["attempts"] = attempt
+        with self._timings_lock:
+            self.request_timings[id_value] = timing
+        response.raise_for_status()
+
+        data_text = response.text
+        data_json = json.loads(data_text)
+
+        status = data_json.get("status", "未知")
+        if status not in ["success", "cache"]:
+            raise ValueError(f"响应状态异常: {status}")
+
+        status_info = "最新数据" if status == "success" else "缓存数据"
+        print(f"获取 {id_value} 成功（{status_info}）")
+        return data_text
+
+    @staticmethod
+    def _retry_wait(retries: int, min_retry_wait: int, max_retry_wait: int) -> float:
+        """第 retries 次重试前的等待时间（秒），随重试次数递增并带随机抖动"""
+        base_wait = random.uniform(min_retry_wait, max_retry_wait)
+        additional_wait = (retries - 1) * random.uniform(1, 2)
+        return base_wait + additional_wait
+
+    def _get_host(self, id_value: str) -> str:
+        """获取平台请求对应的主机名（NewsNow 的所有平台都请求同一个 API 主机）"""
+        return urlparse(f"{self.api_url}?id={id_value}").netloc or self.api_url
+
+    def _parse_response(
+        self,
+        id_value: str,
+        response: Optional[str],
+        results: Dict,
+        failed_ids: List,
+    ) -> None:
+        """
+        解析单个平台的响应并写入结果字典
+
+        Args:
+            id_value: 平台ID
+            response: 响应文本（失败时为 None）
+            results: 结果字典（原地更新）
+            failed_ids: 失败ID列表（原地更新）
+        """
+        if not response:
+            failed_ids.append(id_value)
+            return
+
+        try:
+            data = json.loads(response)
+            results[id_value] = {}
+
+            for index, item in enumerate(data.get("items", []), 1):
+                title = item.get("title")
+                # 跳过无效标题（None、float、空字符串）
+                if title is None or isinstance(title, float) or not str(title).strip():
+                    continue
+                title = str(title).strip()
+                url = item.get("url", "")
+                mobile_url = item.get("mobileUrl", "")
+
+                if title in results[id_value]:
+                    results[id_value][title]["ranks"].append(index)
+                else:
+                    results[id_value][title] = {
+                        "ranks": [index],
+                        "url": url,
+                        "mobileUrl": mobile_url,
+                    }
+        except json.JSONDecodeError:
+            print(f"解析 {id_value} 响应失败")
+            failed_ids.append(id_value)
+        except Exception as e:
+            print(f"处理 {id_value} 数据出错: {e}")
+            failed_ids.append(id_value)
+
     def crawl_websites(
         self,
         ids_list: List[Union[str, Tuple[str, str]]],
@@ -122,13 +379,19 @@ class DataFetcher:
         """
         爬取多个网站数据
 
+        max_concurrency > 1 时使用 asyncio 并发爬取，总耗时取决于最慢的平台；
+        否则按顺序逐个爬取。两种模式返回值完全一致。
+
         Args:
             ids_list: 平台ID列表，每个元素可以是字符串或 (平台ID, 别名) 元组
-            request_interval: 请求间隔（毫秒）
+            request_interval: 串行模式的请求间隔（毫秒）
 
         Returns:
             (结果字典, ID到名称的映射, 失败ID列表) 元组
         """
+        if self.max_concurrency > 1 and len(ids_list) > 1:
+            return self._crawl_websites_concurrent(ids_list)
+
         results = {}
         id_to_name = {}
         failed_ids = []
@@ -142,37 +405,7 @@ class DataFetcher:
 
             id_to_name[id_value] = name
             response, _, _ = self.fetch_data(id_info)
-
-            if response:
-                try:
-                    data = json.loads(response)
-                    results[id_value] = {}
-
-                    for index, item in enumerate(data.get("items", []), 1):
-                        title = item.get("title")
-                        # 跳过无效标题（None、float、空字符串）
-                        if title is None or isinstance(title, float) or not str(title).strip():
-                            continue
-                        title = str(title).strip()
-                        url = item.get("url", "")
-                        mobile_url = item.get("mobileUrl", "")
-
-                        if title in results[id_value]:
-                            results[id_value][title]["ranks"].append(index)
-                        else:
-                            results[id_value][title] = {
-                                "ranks": [index],
-                                "url": url,
-                                "mobileUrl": mobile_url,
-                            }
-                except json.JSONDecodeError:
-                    print(f"解析 {id_value} 响应失败")
-                    failed_ids.append(id_value)
-                except Exception as e:
-                    print(f"处理 {id_value} 数据出错: {e}")
-                    failed_ids.append(id_value)
-            else:
-                failed_ids.append(id_value)
+            self._parse_response(id_value, response, results, failed_ids)
 
             # 请求间隔（除了最后一个）
             if i < len(ids_list) - 1:
@@ -181,4 +414,170 @@ class DataFetcher:
                 time.sleep(actual_interval / 1000)
 
         print(f"成功: {list(results.keys())}, 失败: {failed_ids}")
+        self._print_timing_summary(id_to_name)
         return results, id_to_name, failed_ids
+
+    def _crawl_websites_concurrent(
+        self,
+        ids_list: List[Union[str, Tuple[str, str]]],
+    ) -> Tuple[Dict, Dict, List]:
+        """
+        并发爬取多个网站数据
+
+        在已有事件循环的线程中（如 MCP 异步工具）调用时，
+        会在独立线程中运行事件循环，避免 asyncio.run 嵌套报错。
+
+        Args:
+            ids_list: 平台ID列表
+
+        Returns:
+            (结果字典, ID到名称的映射, 失败ID列表) 元组
+        """
+        try:
+            asyncio.get_running_loop()
+            in_loop = True
+        except RuntimeError:
+            in_loop = False
+
+        if not in_loop:
+            responses = asyncio.run(self._fetch_all_async(ids_list))
+        else:
+            holder: Dict[str, object] = {}
+
+            def _runner():
+                try:
+                    holder["value"] = asyncio.run(
+                        self._fetch_all_async(ids_list)
+                    )
+                except BaseException as e:
+                    holder["error"] = e
+
+            worker = threading.Thread(target=_runner, name="crawl-websites")
+            worker.start()
+            worker.join()
+            if "error" in holder:
+                raise holder["error"]
+            responses = holder["value"]
+
+        # 按配置顺序解析，保证结果字典顺序与串行模式一致
+        results = {}
+        id_to_name = {}
+        failed_ids = []
+        for id_info, response in zip(ids_list, responses):
+            if isinstance(id_info, tuple):
+                id_value, name = id_info
+            else:
+                id_value = id_info
+                name = id_value
+            id_to_name[id_value] = name
+            self._parse_response(id_value, response, results, failed_ids)
+
+        print(f"成功: {list(results.keys())}, 失败: {failed_ids}")
+        self._print_timing_summary(id_to_name)
+        return results, id_to_name, failed_ids
+
+    def _print_timing_summary(self, id_to_name: Dict) -> None:
+        """输出本次爬取的连接复用与耗时概况"""
+        with self._timings_lock:
+            timings = [self.request_timings[i] for i in id_to_name if i in self.request_timings]
+        if not timings:
+            return
+        count = len(timings)
+        transfer = sum(t["transfer_ms"] for t in timings)
+        total = sum(t["total_ms"] for t in timings)
+        if timings[0]["reused"] is None:
+            connection_info = "连接复用和握手耗时未知（SOCKS 代理）"
+        else:
+            reused = sum(1 for t in timings if t["reused"])
+            handshake = sum(t["connect_ms"] + t["tls_ms"] for t in timings)
+            connection_info = f"连接复用 {reused}/{count}, 握手合计 {handshake:.0f}ms"
+        print(
+            f"请求耗时: {count} 个平台, {connection_info}, "
+            f"传输合计 {transfer:.0f}ms, 请求合计 {total:.0f}ms"
+        )
+
+    async def _fetch_all_async(
+        self,
+        ids_list: List[Union[str, Tuple[str, str]]],
+        max_retries: int = 2,
+        min_retry_wait: int = 3,
+        max_retry_wait: int = 5,
+    ) -> List[Optional[str]]:
+        """
+        使用 asyncio 并发获取所有平台数据
+
+        NewsNow 的所有平台都请求同一个 API 主机，并发数由 max_concurrency 控制；
+        请求分布在多个主机时，每个主机另受 per_host_concurrency 限制。
+        per_host_interval > 0 时同一主机相邻请求的发起时间至少间隔该毫秒数（带随机抖动），默认不限制。
+
+        每次尝试（包括重试）都重新占用请求名额并遵守发起间隔，重试前的等待不占用名额。
+
+        Args:
+            ids_list: 平台ID列表
+            max_retries: 最大重试次数
+            min_retry_wait: 最小重试等待时间（秒）
+            max_retry_wait: 最大重试等待时间（秒）
+
+        Returns:
+            与 ids_list 顺序一致的响应文本列表（失败为 None）
+        """
+        loop = asyncio.get_running_loop()
+        global_sem = asyncio.Semaphore(self.max_concurrency)
+        hosts = {
+            self._get_host(id_info[0] if isinstance(id_info, tuple) else id_info)
+            for id_info in ids_list
+        }
+        host_sems: Dict[str, asyncio.Semaphore] = {}
+        if len(hosts) > 1:
+            host_sems = {host: asyncio.Semaphore(self.per_host_concurrency) for host in hosts}
+        host_locks: Dict[str, asyncio.Lock] = {}
+        host_last_start: Dict[str, float] = {}
+
+        async def _wait_host_interval(host: str) -> None:
+            """保证同一主机的请求发起间隔"""
+            if self.per_host_interval <= 0:
+                return
+            lock = host_locks.setdefault(host, asyncio.Lock())
+            async with lock:
+                last = host_last_start.get(host)
+                if last is not None:
+                    interval = max(50, self.per_host_interval + random.randint(-10, 20)) / 1000
+                    wait = last + interval - loop.time()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                host_last_start[host] = loop.time()
+
+        @asynccontextmanager
+        async def _request_slot(host: str):
+            """占用一个请求名额：全局并发、单主机并发（多主机时）、单主机发起间隔"""
+            async with AsyncExitStack() as stack:
+                await stack.enter_async_context(global_sem)
+                if host in host_sems:
+                    await stack.enter_async_context(host_sems[host])
+                await _wait_host_interval(host)
+                yield
+
+        async def _fetch_one(executor: ThreadPoolExecutor, id_info) -> Optional[str]:
+            id_value = id_info[0] if isinstance(id_info, tuple) else id_info
+            host = self._get_host(id_value)
+            for attempt in range(1, max_retries + 2):
+                try:
+                    async with _request_slot(host):
+                        return await loop.run_in_executor(
+                            executor, self._fetch_once, id_value, attempt
+                        )
+                except Exception as e:
+                    if attempt > max_retries:
+                        print(f"请求 {id_value} 失败: {e}")
+                        return None
+                    wait_time = self._retry_wait(attempt, min_retry_wait, max_retry_wait)
+                    print(f"请求 {id_value} 失败: {e}. {wait_time:.2f}秒后重试...")
+                    await asyncio.sleep(wait_time)
+            return None
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="crawler"
+        ) as executor:
+            return await asyncio.gather(
+                *(_fetch_one(executor, id_info) for id_info in ids_list)
+            )
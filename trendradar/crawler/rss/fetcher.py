@@ -5,11 +5,17 @@ RSS 抓取器
 负责从配置的 RSS 源抓取数据并转换为标准格式
 """
 
+import hashlib
+import multiprocessing
+import queue
+import threading
 import time
 import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple, Callable
+from typing import List, Dict, Optional, Tuple, Callable, Deque
 
 import requests
 
@@ -18,6 +24,27 @@ from trendradar.storage.base import RSSItem, RSSData
 from trendradar.utils.time import get_configured_time, is_within_days, DEFAULT_TIMEZONE
 
 
+def _parse_feed_content(
+    content: str,
+    feed_url: str,
+    max_summary_length: int,
+) -> Tuple[List[ParsedRSSItem], float]:
+    """
+    解析单个源的内容（在解析进程中执行，需为模块级函数以便序列化）
+
+    Args:
+        content: Feed 原始内容
+        feed_url: Feed URL
+        max_summary_length: 摘要最大长度
+
+    Returns:
+        (解析后的条目列表, 解析耗时毫秒)
+    """
+    start = time.perf_counter()
+    items = RSSParser(max_summary_length=max_summary_length).parse(content, feed_url)
+    return items, (time.perf_counter() - start) * 1000
+
+
 @dataclass
 class RSSFeedConfig:
     """RSS 源配置"""
@@ -42,6 +69,11 @@ class RSSFetcher:
         timezone: str = DEFAULT_TIMEZONE,
         freshness_enabled: bool = True,
         default_max_age_days: int = 3,
+        conditional_get: bool = True,
+        validators: Optional[Dict[str, Dict[str, str]]] = None,
+        max_workers: int = 1,
+        parse_workers: int = 0,
+        parse_timeout: int = 30,
     ):
         """
         初始化抓取器
@@ -55,6 +87,11 @@ class RSSFetcher:
             timezone: 时区配置（如 'Asia/Shanghai'）
             freshness_enabled: 是否启用新鲜度过滤
             default_max_age_days: 默认最大文章年龄（天）
+            conditional_get: 是否启用条件请求（ETag/Last-Modified/内容哈希）
+            validators: 上次保存的缓存校验信息 {feed_id: {feed_url, etag, last_modified, content_hash}}
+            max_workers: 并发下载线程数（<=1 时串行抓取）
+            parse_workers: 解析进程数（<=1 时在当前进程解析）
+            parse_timeout: 单个源解析超时（秒），仅进程池解析时生效（在当前进程解析时不限时）
         """
         self.feeds = [f for f in feeds if f.enabled]
         self.request_interval = request_interval
@@ -64,6 +101,22 @@ class RSSFetcher:
         self.timezone = timezone
         self.freshness_enabled = freshness_enabled
         self.default_max_age_days = default_max_age_days
+        self.conditional_get = conditional_get
+        self.validators = validators or {}
+        self.max_workers = max(1, int(max_workers or 1))
+        self.parse_workers = max(0, int(parse_workers or 0))
+        self.parse_timeout = parse_timeout
+
+        # 各源解析耗时（毫秒）
+        self.parse_timings: Dict[str, float] = {}
+        self._stats_lock = threading.Lock()
+
+        # 本次抓取得到的最新校验信息（随 RSSData 一起保存）
+        self.new_validators: Dict[str, Dict[str, str]] = {}
+        # 未变化统计：304 次数、内容哈希命中次数、节省的下载字节数
+        self.not_modified_count = 0
+        self.unchanged_body_count = 0
+        self.unchanged_bytes = 0
 
         self.parser = RSSParser()
         self.session = self._create_session()
@@ -127,61 +180,326 @@ class RSSFetcher:
         filtered_count = len(items) - len(filtered)
         return filtered, filtered_count
 
-    def fetch_feed(self, feed: RSSFeedConfig) -> Tuple[List[RSSItem], Optional[str]]:
+    def _get_cached_validator(self, feed: RSSFeedConfig) -> Optional[Dict[str, str]]:
+        """获取源的缓存校验信息（URL 变化时视为无缓存）"""
+        if not self.conditional_get:
+            return None
+        cached = self.validators.get(feed.id)
+        if not cached or cached.get("feed_url") != feed.url:
+            return None
+        return cached
+
+    def _download_feed(self, feed: RSSFeedConfig) -> Tuple[Optional[str], Optional[str]]:
         """
-        抓取单个 RSS 源
+        下载单个 RSS 源的原始内容（不解析）
+
+        启用条件请求时，会携带上次的 ETag / Last-Modified；
+        服务端返回 304 或响应体哈希与上次相同时，视为未变化。
 
         Args:
             feed: RSS 源配置
 
         Returns:
-            (条目列表, 错误信息) 元组
+            (响应文本, 错误信息) 元组，源未变化时两者均为 None
         """
         try:
-            response = self.session.get(feed.url, timeout=self.timeout)
+            cached = self._get_cached_validator(feed)
+            headers = {}
+            if cached:
+                if cached.get("etag"):
+                    headers["If-None-Match"] = cached["etag"]
+                if cached.get("last_modified"):
+                    headers["If-Modified-Since"] = cached["last_modified"]
+
+            response = self.session.get(feed.url, timeout=self.timeout, headers=headers)
+
+            if response.status_code == 304 and cached:
+                with self._stats_lock:
+                    self.new_validators[feed.id] = dict(cached)
+                    self.not_modified_count += 1
+                print(f"[RSS] {feed.name}: 未变化（304），跳过")
+                return None, None
+
             response.raise_for_status()
 
-            parsed_items = self.parser.parse(response.text, feed.url)
-
-            # 限制条目数量（0=不限制）
-            if feed.max_items > 0:
-                parsed_items = parsed_items[:feed.max_items]
-
-            # 转换为 RSSItem（使用配置的时区）
-            now = get_configured_time(self.timezone)
-            crawl_time = now.strftime("%H:%M")
-            items = []
-
-            for parsed in parsed_items:
-                item = RSSItem(
-                    title=parsed.title,
-                    feed_id=feed.id,
-                    feed_name=feed.name,
-                    url=parsed.url,
-                    published_at=parsed.published_at or "",
-                    summary=parsed.summary or "",
-                    author=parsed.author or "",
-                    crawl_time=crawl_time,
-                    first_time=crawl_time,
-                    last_time=crawl_time,
-                    count=1,
-                )
-                items.append(item)
-
-            # 注意：新鲜度过滤已移至推送阶段（_convert_rss_items_to_list）
-            # 这样所有文章都会存入数据库，但旧文章不会推送
-            print(f"[RSS] {feed.name}: 获取 {len(items)} 条")
-            return items, None
+            content_hash = hashlib.sha256(response.content).hexdigest()
+            with self._stats_lock:
+                if self.conditional_get:
+                    self.new_validators[feed.id] = {
+                        "feed_url": feed.url,
+                        "etag": response.headers.get("ETag", ""),
+                        "last_modified": response.headers.get("Last-Modified", ""),
+                        "content_hash": content_hash,
+                    }
+
+                if cached and cached.get("content_hash") == content_hash:
+                    self.unchanged_body_count += 1
+                    self.unchanged_bytes += len(response.content)
+                    print(f"[RSS] {feed.name}: 内容未变化，跳过解析")
+                    return None, None
+
+            return response.text, None
 
         except requests.Timeout:
             error = f"请求超时 ({self.timeout}s)"
             print(f"[RSS] {feed.name}: {error}")
-            return [], error
+            return None, error
 
         except requests.RequestException as e:
             error = f"请求失败: {e}"
             print(f"[RSS] {feed.name}: {error}")
+            return None, error
+
+        except Exception as e:
+            error = f"未知错误: {e}"
+            print(f"[RSS] {feed.name}: {error}")
+            return None, error
+
+    def _build_items(
+        self,
+        feed: RSSFeedConfig,
+        parsed_items: List[ParsedRSSItem],
+    ) -> List[RSSItem]:
+        """
+        将解析结果转换为 RSSItem 列表
+
+        Args:
+            feed: RSS 源配置
+            parsed_items: 解析后的条目列表
+
+        Returns:
+            RSSItem 列表
+        """
+        # 限制条目数量（0=不限制）
+        if feed.max_items > 0:
+            parsed_items = parsed_items[:feed.max_items]
+
+        # 转换为 RSSItem（使用配置的时区）
+        now = get_configured_time(self.timezone)
+        crawl_time = now.strftime("%H:%M")
+        items = []
+
+        for parsed in parsed_items:
+            item = RSSItem(
+                title=parsed.title,
+                feed_id=feed.id,
+                feed_name=feed.name,
+                url=parsed.url,
+                published_at=parsed.published_at or "",
+                summary=parsed.summary or "",
+                author=parsed.author or "",
+                crawl_time=crawl_time,
+                first_time=crawl_time,
+                last_time=crawl_time,
+                count=1,
+            )
+            items.append(item)
+
+        # 注意：新鲜度过滤已移至推送阶段（_convert_rss_items_to_list）
+        # 这样所有文章都会存入数据库，但旧文章不会推送
+        print(f"[RSS] {feed.name}: 获取 {len(items)} 条")
+        return items
+
+    def fetch_feed(self, feed: RSSFeedConfig) -> Tuple[Optional[List[RSSItem]], Optional[str]]:
+        """
+        抓取单个 RSS 源（下载 + 当前进程内解析）
+
+        Args:
+            feed: RSS 源配置
+
+        Returns:
+            (条目列表, 错误信息) 元组，源未变化时条目列表为 None
+        """
+        content, error = self._download_feed(feed)
+        if error:
             return [], error
+        if content is None:
+            return None, None
+
+        return self._collect_parse_result(
+            feed,
+            lambda: _parse_feed_content(content, feed.url, self.parser.max_summary_length),
+        )
+
+    def _fetch_and_parse_serial(self) -> List[Tuple[Optional[List[RSSItem]], Optional[str]]]:
+        """串行抓取并解析所有源（带请求间隔）"""
+        results = []
+        for i, feed in enumerate(self.feeds):
+            # 请求间隔（带随机波动）
+            if i > 0:
+                interval = self.request_interval / 1000
+                jitter = random.uniform(-0.2, 0.2) * interval
+                time.sleep(interval + jitter)
+
+            results.append(self.fetch_feed(feed))
+        return results
+
+    def _create_parse_pool(self):
+        """创建解析进程池，失败时返回 None（改为在当前进程解析）"""
+        try:
+            return multiprocessing.Pool(processes=self.parse_workers)
+        except (OSError, ValueError) as e:
+            print(f"[RSS] 创建解析进程池失败，改为在当前进程解析: {e}")
+            return None
+
+    def _fetch_and_parse_pipeline(self) -> List[Tuple[Optional[List[RSSItem]], Optional[str]]]:
+        """
+        流水线模式：线程池并发下载，进程池并行解析
+
+        下载完成的源立即交给进程池解析，结果按源配置顺序收集。同时提交的解析任务不超过
+        解析进程数（任务不在进程池内排队），每个任务从提交起计算 parse_timeout 截止时间，
+        主线程阻塞等待下载 / 解析完成通知或最近的截止时间。
+
+        超时的源记为失败，其解析进程仍被占用；空闲进程不足且下载已全部完成时终止并重建进程池，
+        重新提交尚未完成的源（下载期间不重建，避免 fork 时复制运行中的下载线程）。
+        进程池不可用时在当前进程解析，此时没有超时保护：解析的是已下载到内存的内容，
+        耗时与内容大小成正比，不会因网络阻塞。
+
+        Returns:
+            与 self.feeds 顺序一致的 (条目列表, 错误信息) 列表
+        """
+        # 进程池需在启动下载线程之前创建（避免 fork 时复制运行中的线程）
+        pool = self._create_parse_pool() if self.parse_workers > 1 else None
+
+        results: List[Tuple[Optional[List[RSSItem]], Optional[str]]] = [
+            (None, None) for _ in self.feeds
+        ]
+        # 完成通知：("downloaded", 序号, Future) 或 ("parsed", 序号, 进程池代次)
+        events: queue.Queue = queue.Queue()
+        backlog: Deque[Tuple[int, str]] = deque()  # 已下载、等待空闲解析进程的源
+        running: Dict[int, Tuple[object, float, str]] = {}  # 序号 -> (AsyncResult, 截止时间, 内容)
+        stuck: Dict[int, object] = {}  # 已超时但仍占用解析进程的源
+        generation = 0  # 进程池代次，重建后忽略旧进程池的通知
+        downloads_left = len(self.feeds)
+
+        def parse_inline(index: int, content: str) -> None:
+            feed = self.feeds[index]
+            results[index] = self._collect_parse_result(
+                feed,
+                lambda: _parse_feed_content(content, feed.url, self.parser.max_summary_length),
+            )
+
+        def submit(index: int, content: str) -> None:
+            def notify(_result, index=index, generation=generation):
+                events.put(("parsed", index, generation))
+
+            async_result = pool.apply_async(
+                _parse_feed_content,
+                (content, self.feeds[index].url, self.parser.max_summary_length),
+                callback=notify,
+                error_callback=notify,
+            )
+            running[index] = (async_result, time.monotonic() + self.parse_timeout, content)
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(self.feeds)),
+                thread_name_prefix="rss-fetch",
+            ) as executor:
+                for index, feed in enumerate(self.feeds):
+                    executor.submit(self._download_feed, feed).add_done_callback(
+                        lambda future, index=index: events.put(("downloaded", index, future))
+                    )
+
+                while downloads_left or backlog or running:
+                    if pool is None:
+                        while backlog:
+                            parse_inline(*backlog.popleft())
+                    else:
+                        while backlog and len(running) + len(stuck) < self.parse_workers:
+                            submit(*backlog.popleft())
+
+                    if backlog and stuck and not downloads_left:
+                        # 解析进程被超时任务占满：终止进程池，重建后重新提交尚未完成的源
+                        pool.terminate()
+                        pool.join()
+                        generation += 1
+                        unfinished = []
+                        for index, (async_result, _, content) in sorted(running.items()):
+                            if async_result.ready():
+                                results[index] = self._collect_parse_result(
+                                    self.feeds[index], async_result.get
+                                )
+                            else:
+                                unfinished.append((index, content))
+                        backlog.extendleft(reversed(unfinished))
+                        running.clear()
+                        stuck.clear()
+                        print(f"[RSS] 重建解析进程池，重新提交 {len(backlog)} 个源")
+                        pool = self._create_parse_pool()
+                        continue
+
+                    if not downloads_left and not running:
+                        continue
+
+                    timeout = None
+                    if running:
+                        deadline = min(deadline for _, deadline, _ in running.values())
+                        timeout = max(0.0, deadline - time.monotonic())
+                    try:
+                        kind, index, payload = events.get(timeout=timeout)
+                    except queue.Empty:
+                        now = time.monotonic()
+                        for index in sorted(running):
+                            async_result, deadline, _ = running[index]
+                            if deadline > now:
+                                continue
+                            del running[index]
+                            if async_result.ready():
+                                results[index] = self._collect_parse_result(
+                                    self.feeds[index], async_result.get
+                                )
+                            else:
+                                error = f"解析超时 ({self.parse_timeout}s)"
+                                print(f"[RSS] {self.feeds[index].name}: {error}")
+                                results[index] = ([], error)
+                                stuck[index] = async_result
+                        continue
+
+                    if kind == "downloaded":
+                        downloads_left -= 1
+                        content, error = payload.result()
+                        if error:
+                            results[index] = ([], error)
+                        elif content is None:
+                            results[index] = (None, None)
+                        else:
+                            backlog.append((index, content))
+                    elif payload == generation:
+                        if index in running:
+                            results[index] = self._collect_parse_result(
+                                self.feeds[index], running.pop(index)[0].get
+                            )
+                        else:
+                            # 超时后才完成：结果已丢弃，解析进程重新空闲
+                            stuck.pop(index, None)
+
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+        return results
+
+    def _collect_parse_result(
+        self,
+        feed: RSSFeedConfig,
+        get_result: Callable[[], Tuple[List[ParsedRSSItem], float]],
+    ) -> Tuple[List[RSSItem], Optional[str]]:
+        """
+        获取单个源的解析结果并转换为 RSSItem
+
+        Args:
+            feed: RSS 源配置
+            get_result: 返回 (解析条目列表, 解析耗时毫秒) 的可调用对象
+
+        Returns:
+            (条目列表, 错误信息) 元组
+        """
+        try:
+            parsed_items, elapsed_ms = get_result()
+            self.parse_timings[feed.id] = elapsed_ms
+            return self._build_items(feed, parsed_items), None
 
         except ValueError as e:
             error = f"解析失败: {e}"
@@ -197,12 +515,16 @@ class RSSFetcher:
         """
         抓取所有 RSS 源
 
+        max_workers > 1 时使用流水线模式（并发下载 + 进程池解析），
+        否则按顺序逐个抓取。两种模式下结果均按源配置顺序组织。
+
         Returns:
             RSSData 对象
         """
         all_items: Dict[str, List[RSSItem]] = {}
         id_to_name: Dict[str, str] = {}
         failed_ids: List[str] = []
+        skipped_ids: List[str] = []
 
         # 使用配置的时区
         now = get_configured_time(self.timezone)
@@ -211,24 +533,35 @@ class RSSFetcher:
 
         print(f"[RSS] 开始抓取 {len(self.feeds)} 个 RSS 源...")
 
-        for i, feed in enumerate(self.feeds):
-            # 请求间隔（带随机波动）
-            if i > 0:
-                interval = self.request_interval / 1000
-                jitter = random.uniform(-0.2, 0.2) * interval
-                time.sleep(interval + jitter)
-
-            items, error = self.fetch_feed(feed)
+        if self.max_workers > 1 and len(self.feeds) > 1:
+            results = self._fetch_and_parse_pipeline()
+        else:
+            results = self._fetch_and_parse_serial()
 
+        for feed, (items, error) in zip(self.feeds, results):
             id_to_name[feed.id] = feed.name
 
             if error:
                 failed_ids.append(feed.id)
+            elif items is None:
+                skipped_ids.append(feed.id)
             else:
                 all_items[feed.id] = items
 
         total_items = sum(len(items) for items in all_items.values())
         print(f"[RSS] 抓取完成: {len(all_items)} 个源成功, {len(failed_ids)} 个失败, 共 {total_items} 条")
+        if skipped_ids:
+            print(
+                f"[RSS] 未变化跳过: {len(skipped_ids)} 个源"
+                f"（304: {self.not_modified_count}, 内容相同: {self.unchanged_body_count}, "
+                f"免解析 {self.unchanged_bytes / 1024:.1f} KB）"
+            )
+        if self.parse_timings:
+            slowest_id = max(self.parse_timings, key=self.parse_timings.get)
+            print(
+                f"[RSS] 解析耗时: 合计 {sum(self.parse_timings.values()):.0f}ms, "
+                f"最慢 {id_to_name.get(slowest_id, slowest_id)} {self.parse_timings[slowest_id]:.0f}ms"
+            )
 
         return RSSData(
             date=crawl_date,
@@ -236,6 +569,8 @@ class RSSFetcher:
             items=all_items,
             id_to_name=id_to_name,
             failed_ids=failed_ids,
+            skipped_ids=skipped_ids,
+            validators=dict(self.new_validators),
         )
 
     @classmethod
@@ -302,4 +637,8 @@ class RSSFetcher:
             timezone=config.get("timezone", DEFAULT_TIMEZONE),
             freshness_enabled=freshness_enabled,
             default_max_age_days=default_max_age_days,
+            conditional_get=config.get("conditional_get", True),
+            max_workers=config.get("max_workers", 1),
+            parse_workers=config.get("parse_workers", 0),
+            parse_timeout=config.get("parse_timeout", 30),
         )
@@ -0,0 +1,376 @@
+# coding=utf-8
+"""
+冷数据归档（本地存储）
+
+超过归档天数的每日数据库依次经历：热数据 -> 归档 -> 删除（保留期清理）
+- 归档：VACUUM INTO 生成紧凑的只读快照（去掉空闲页和 WAL，日志模式改为 delete），
+  再用标准库压缩为 output/archive/{type}/{date}.db.xz（lzma）或 .db.gz（zlib）
+- 读取：按需解压到有容量上限的本地缓存 output/archive/.cache/{type}/，
+  缓存文件是普通 SQLite 数据库，只读打开时同样使用 mmap；超出上限时按最近访问时间淘汰
+- 查询：resolve_db_path 优先返回热数据库，不存在时返回解压后的缓存路径，
+  MCP 逐日读取与跨日期查询都经由它访问归档日期
+
+手动归档：
+    python -m trendradar.storage.archive [output] --days N [--compression lzma|zlib]
+"""
+
+import argparse
+import gzip
+import lzma
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# 压缩格式 -> 归档文件后缀
+ARCHIVE_COMPRESSIONS: Dict[str, str] = {
+    "lzma": ".db.xz",
+    "zlib": ".db.gz",
+}
+
+# 解压缓存默认容量上限
+DEFAULT_CACHE_BYTES = 512 * 1024 * 1024
+
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+_cache_lock = threading.Lock()
+
+# 本进程内的归档访问统计（供 get_storage_status 报告访问延迟）
+_access_stats: Dict[str, float] = {
+    "hits": 0,
+    "misses": 0,
+    "hit_seconds": 0.0,
+    "decompress_seconds": 0.0,
+    "max_decompress_seconds": 0.0,
+}
+
+
+def get_archive_dir(data_dir: str, db_type: str = "news") -> Path:
+    """获取归档目录 output/archive/{type}"""
+    return Path(data_dir) / "archive" / db_type
+
+
+def get_cache_dir(data_dir: str, db_type: str = "news") -> Path:
+    """获取解压缓存目录 output/archive/.cache/{type}"""
+    return Path(data_dir) / "archive" / ".cache" / db_type
+
+
+def _open_compressed(path: Path, mode: str):
+    """按后缀打开压缩文件（.xz 为 lzma，.gz 为 zlib）"""
+    if path.name.endswith(".xz"):
+        return lzma.open(path, mode)
+    return gzip.open(path, mode, compresslevel=6)
+
+
+def find_archive(data_dir: str, date_str: str, db_type: str = "news") -> Optional[Path]:
+    """
+    查找某天的归档文件
+
+    Args:
+        data_dir: 数据目录
+        date_str: 日期（YYYY-MM-DD）
+        db_type: 数据库类型 ("news" 或 "rss")
+
+    Returns:
+        归档文件路径，不存在时返回 None
+    """
+    archive_dir = get_archive_dir(data_dir, db_type)
+    for suffix in ARCHIVE_COMPRESSIONS.values():
+        archive_path = archive_dir / f"{date_str}{suffix}"
+        if archive_path.exists():
+            return archive_path
+    return None
+
+
+def list_archived_dates(data_dir: str, db_type: str = "news") -> Dict[str, Path]:
+    """
+    列出已归档的日期
+
+    Returns:
+        {日期字符串: 归档文件路径}
+    """
+    archive_dir = get_archive_dir(data_dir, db_type)
+    if not archive_dir.is_dir():
+        return {}
+
+    archived = {}
+    for suffix in ARCHIVE_COMPRESSIONS.values():
+        for archive_path in archive_dir.glob(f"????-??-??{suffix}"):
+            archived[archive_path.name[:10]] = archive_path
+    return archived
+
+
+def archive_database(db_path: Path, archive_path: Path) -> Tuple[int, int]:
+    """
+    把每日数据库归档为压缩快照（不删除源文件）
+
+    先 VACUUM INTO 临时文件，再流式压缩，完成后原子替换为归档文件。
+
+    Args:
+        db_path: 每日数据库路径
+        archive_path: 归档文件路径（后缀决定压缩格式）
+
+    Returns:
+        (快照大小, 归档文件大小)
+    """
+    archive_path.parent.mkdir(parents=True, exist_ok=True)
+    snapshot_path = archive_path.with_name(archive_path.name + ".vacuum")
+    # 临时文件保留归档后缀（压缩格式按后缀选择），以 . 开头不会被当作归档
+    tmp_path = archive_path.with_name("." + archive_path.name)
+    for path in (snapshot_path, tmp_path):
+        path.unlink(missing_ok=True)
+
+    try:
+        conn = sqlite3.connect(str(db_path))
+        try:
+            conn.execute("VACUUM INTO ?", (str(snapshot_path),))
+        finally:
+            conn.close()
+
+        # 快照以 delete 日志模式保存：解压后只读打开不需要 -shm 文件
+        conn = sqlite3.connect(str(snapshot_path))
+        try:
+            conn.execute("PRAGMA journal_mode = delete")
+        finally:
+            conn.close()
+
+        snapshot_size = snapshot_path.stat().st_size
+        with open(snapshot_path, "rb") as src, _open_compressed(tmp_path, "wb") as dst:
+            shutil.copyfileobj(src, dst, _COPY_CHUNK_SIZE)
+        os.replace(tmp_path, archive_path)
+    finally:
+        snapshot_path.unlink(missing_ok=True)
+        tmp_path.unlink(missing_ok=True)
+
+    return snapshot_size, archive_path.stat().st_size
+
+
+def _evict_cache(cache_root: Path, cache_bytes: int, keep: Path) -> None:
+    """按最近访问时间（mtime）淘汰缓存文件，直到总大小不超过上限（不淘汰 keep）"""
+    entries = []
+    for path in cache_root.glob("*/*.db"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= cache_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            path.unlink()
+            total -= size
+        except OSError:
+            # Windows 下正在被读取的文件无法删除，留待下次淘汰
+            pass
+
+
+def open_archive(
+    data_dir: str,
+    date_str: str,
+    db_type: str = "news",
+    cache_bytes: int = DEFAULT_CACHE_BYTES,
+) -> Optional[Path]:
+    """
+    获取归档日期的可读数据库（按需解压到缓存）
+
+    缓存文件名包含归档文件的修改时间，归档重新生成后旧缓存自动失效。
+
+    Args:
+        data_dir: 数据目录
+        date_str: 日期（YYYY-MM-DD）
+        db_type: 数据库类型 ("news" 或 "rss")
+        cache_bytes: 解压缓存容量上限（字节）
+
+    Returns:
+        解压后的数据库路径，没有归档时返回 None
+    """
+    archive_path = find_archive(data_dir, date_str, db_type)
+    if archive_path is None:
+        return None
+
+    start = time.perf_counter()
+    try:
+        archive_mtime = archive_path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    cache_dir = get_cache_dir(data_dir, db_type)
+    cache_path = cache_dir / f"{date_str}.{archive_mtime}.db"
+
+    with _cache_lock:
+        if cache_path.exists():
+            try:
+                os.utime(cache_path)
+            except OSError:
+                pass
+            _access_stats["hits"] += 1
+            _access_stats["hit_seconds"] += time.perf_counter() - start
+            return cache_path
+
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for stale_path in cache_dir.glob(f"{date_str}.*.db"):
+            try:
+                stale_path.unlink()
+            except OSError:
+                pass
+
+        # 解压到唯一的临时文件再原子替换：多个进程同时解压同一天时互不影响
+        fd, tmp_name = tempfile.mkstemp(dir=str(cache_dir), prefix=f".{date_str}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as dst, _open_compressed(archive_path, "rb") as src:
+                shutil.copyfileobj(src, dst, _COPY_CHUNK_SIZE)
+            os.chmod(tmp_name, 0o644)
+            os.replace(tmp_name, cache_path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        elapsed = time.perf_counter() - start
+        _access_stats["misses"] += 1
+        _access_stats["decompress_seconds"] += elapsed
+        _access_stats["max_decompress_seconds"] = max(_access_stats["max_decompress_seconds"], elapsed)
+
+        _evict_cache(cache_dir.parent, cache_bytes, cache_path)
+
+    return cache_path
+
+
+def resolve_db_path(
+    data_dir: str,
+    date_str: str,
+    db_type: str = "news",
+    cache_bytes: int = DEFAULT_CACHE_BYTES,
+) -> Optional[Path]:
+    """
+    获取某天可读取的数据库路径
+
+    热数据库存在时直接返回；否则查找归档并解压到缓存。
+
+    Args:
+        data_dir: 数据目录
+        date_str: 日期（YYYY-MM-DD）
+        db_type: 数据库类型 ("news" 或 "rss")
+        cache_bytes: 解压缓存容量上限（字节）
+
+    Returns:
+        数据库路径，热数据与归档都不存在时返回 None
+    """
+    db_path = Path(data_dir) / db_type / f"{date_str}.db"
+    if db_path.exists():
+        return db_path
+    try:
+        return open_archive(data_dir, date_str, db_type, cache_bytes)
+    except (OSError, EOFError, lzma.LZMAError) as e:
+        print(f"[归档] 解压失败 {db_type}/{date_str}: {e}")
+        return None
+
+
+def cleanup_archives(data_dir: str, cutoff_date: str) -> int:
+    """
+    删除早于截止日期的归档及其解压缓存（保留期清理）
+
+    Args:
+        data_dir: 数据目录
+        cutoff_date: 截止日期（YYYY-MM-DD），早于该日期的数据过期
+
+    Returns:
+        删除的归档文件数量
+    """
+    deleted = 0
+    for db_type in ("news", "rss"):
+        for date_str, archive_path in sorted(list_archived_dates(data_dir, db_type).items()):
+            if date_str >= cutoff_date:
+                continue
+            try:
+                archive_path.unlink()
+                deleted += 1
+                print(f"[归档] 清理过期归档: archive/{db_type}/{archive_path.name}")
+            except OSError as e:
+                print(f"[归档] 删除文件失败 {archive_path}: {e}")
+                continue
+            for cache_path in get_cache_dir(data_dir, db_type).glob(f"{date_str}.*.db"):
+                cache_path.unlink(missing_ok=True)
+    return deleted
+
+
+def get_archive_status(data_dir: str, cache_bytes: int = DEFAULT_CACHE_BYTES) -> Dict:
+    """
+    统计热数据、归档和解压缓存的大小，以及本进程的归档访问延迟
+
+    Args:
+        data_dir: 数据目录
+        cache_bytes: 解压缓存容量上限（字节）
+
+    Returns:
+        状态字典
+    """
+    def total_size(paths) -> int:
+        size = 0
+        for path in paths:
+            try:
+                size += path.stat().st_size
+            except OSError:
+                pass
+        return size
+
+    status: Dict = {}
+    for db_type in ("news", "rss"):
+        hot_paths = list((Path(data_dir) / db_type).glob("????-??-??.db"))
+        archived = list_archived_dates(data_dir, db_type)
+        cache_paths = list(get_cache_dir(data_dir, db_type).glob("*.db"))
+        status[db_type] = {
+            "hot_count": len(hot_paths),
+            "hot_size_bytes": total_size(hot_paths),
+            "archived_count": len(archived),
+            "archived_size_bytes": total_size(archived.values()),
+            "earliest_archived": min(archived) if archived else None,
+            "latest_archived": max(archived) if archived else None,
+            "cached_count": len(cache_paths),
+            "cached_size_bytes": total_size(cache_paths),
+        }
+
+    with _cache_lock:
+        stats = dict(_access_stats)
+    hits, misses = int(stats["hits"]), int(stats["misses"])
+    status["cache_limit_bytes"] = cache_bytes
+    status["access"] = {
+        "cache_hits": hits,
+        "decompressions": misses,
+        "avg_hit_ms": round(stats["hit_seconds"] / hits * 1000, 2) if hits else None,
+        "avg_decompress_ms": round(stats["decompress_seconds"] / misses * 1000, 1) if misses else None,
+        "max_decompress_ms": round(stats["max_decompress_seconds"] * 1000, 1) if misses else None,
+    }
+    return status
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    from trendradar.storage.local import LocalStorageBackend
+
+    parser = argparse.ArgumentParser(description="TrendRadar 冷数据归档")
+    parser.add_argument("data_dir", nargs="?", default="output", help="数据目录，默认 output")
+    parser.add_argument("--days", type=int, required=True, help="归档早于 N 天前的每日数据库")
+    parser.add_argument("--compression", choices=sorted(ARCHIVE_COMPRESSIONS), default="lzma",
+                        help="压缩格式，默认 lzma")
+    args = parser.parse_args(argv)
+
+    backend = LocalStorageBackend(data_dir=args.data_dir, enable_txt=False, enable_html=False)
+    try:
+        backend.archive_old_data(args.days, args.compression)
+    finally:
+        backend.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
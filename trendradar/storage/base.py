@@ -5,9 +5,15 @@
 定义统一的存储接口，所有存储后端都需要实现这些方法
 """
 
+import sys
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+
+
+# NewsItem 中驻留（sys.intern）的字符串字段：平台和抓取时间在同一天的条目间大量重复。
+# 标题和 URL 在单次运行内基本唯一，驻留只增加开销，不在此列
+_INTERNED_NEWS_FIELDS = ("source_id", "source_name", "crawl_time", "first_time", "last_time")
 
 
 @dataclass
@@ -28,6 +34,14 @@ class NewsItem:
     last_time: str = ""                 # 最后出现时间
     count: int = 1                      # 出现次数
 
+    def __post_init__(self):
+        """驻留重复度高的字符串字段，相同内容只保留一份"""
+        fields = self.__dict__
+        for name in _INTERNED_NEWS_FIELDS:
+            value = fields[name]
+            if type(value) is str:
+                fields[name] = sys.intern(value)
+
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
         return {
@@ -125,6 +139,8 @@ class RSSData:
     - items: 按 feed_id 分组的 RSS 条目
     - id_to_name: feed_id 到名称的映射
     - failed_ids: 失败的 feed_id 列表
+    - skipped_ids: 内容未变化（304 或内容哈希相同）而跳过解析的 feed_id 列表
+    - validators: 各源最新的缓存校验信息 {feed_id: {feed_url, etag, last_modified, content_hash}}
     """
 
     date: str                                   # 日期
@@ -132,6 +148,8 @@ class RSSData:
     items: Dict[str, List[RSSItem]]             # 按 feed_id 分组的条目
     id_to_name: Dict[str, str] = field(default_factory=dict)   # ID到名称映射
     failed_ids: List[str] = field(default_factory=list)        # 失败的ID
+    skipped_ids: List[str] = field(default_factory=list)       # 未变化跳过的ID
+    validators: Dict[str, Dict[str, str]] = field(default_factory=dict)  # 缓存校验信息
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -145,6 +163,7 @@ class RSSData:
             "items": items_dict,
             "id_to_name": self.id_to_name,
             "failed_ids": self.failed_ids,
+            "skipped_ids": self.skipped_ids,
         }
 
     @classmethod
@@ -161,6 +180,7 @@ class RSSData:
             items=items,
             id_to_name=data.get("id_to_name", {}),
             failed_ids=data.get("failed_ids", []),
+            skipped_ids=data.get("skipped_ids", []),
         )
 
     def get_total_count(self) -> int:
@@ -327,6 +347,21 @@ class StorageBackend(ABC):
         """
         pass
 
+    def get_keyword_stats_data(
+        self, date: Optional[str] = None
+    ) -> Optional[Tuple[NewsData, Dict[str, int]]]:
+        """
+        获取入库时预计算的当日关键词统计（只含命中频率词的条目）
+
+        Args:
+            date: 日期字符串（YYYY-MM-DD），默认为今天
+
+        Returns:
+            (命中条目的 NewsData, {platform_id: 当天去重标题数})；
+            不支持或统计与当前频率词配置不一致时返回 None
+        """
+        return None
+
     @abstractmethod
     def get_latest_crawl_data(self, date: Optional[str] = None) -> Optional[NewsData]:
         """
@@ -353,6 +388,24 @@ class StorageBackend(ABC):
         """
         pass
 
+    def detect_latest_new_titles(
+        self,
+        platform_ids: Optional[List[str]] = None,
+        date: Optional[str] = None,
+    ) -> Optional[Dict[str, Dict]]:
+        """
+        检测已入库的最新批次中的新增标题（在存储端比较首次出现时间）
+
+        Args:
+            platform_ids: 平台过滤，None 表示全部平台
+            date: 日期字符串（YYYY-MM-DD），默认为今天
+
+        Returns:
+            新增标题 {source_id: {title: {"ranks", "url", "mobileUrl"}}}；
+            不支持时返回 None（调用方回退到加载当天数据后比较）
+        """
+        return None
+
     @abstractmethod
     def save_txt_snapshot(self, data: NewsData) -> Optional[str]:
         """
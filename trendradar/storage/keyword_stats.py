@@ -0,0 +1,482 @@
+# coding=utf-8
+"""
+当日关键词统计（入库时预计算）
+
+每个日期数据库的 keyword_stats 表记录命中频率词词组的条目：
+- 词组序号 / 词组键（与 count_word_frequency 相同，取第一个匹配的词组）
+- 去重排名列表（与 get_today_all_data 的 ranks 一致）和最佳排名
+
+维护方式：
+- 入库时在同一事务内只处理本次新增/更新的条目（last_crawl_time = 本次抓取时间）
+- 频率词配置内容变化后统计失效，由后台线程整库重建；重建完成前读取方回退到全量统计
+- 当日汇总报告只读取命中条目，无需遍历全部标题和排名历史
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from trendradar.storage.base import NewsItem, NewsData
+from trendradar.storage.sqlite_ops import (
+    load_pending_unchanged,
+    apply_pending_unchanged,
+    RankListReader,
+    query_crawl_ranks,
+    sort_by_restored_time,
+)
+from trendradar.utils.time import DEFAULT_TIMEZONE, get_configured_time
+
+
+# 匹配语义版本（计入指纹，匹配逻辑变化时递增以触发重建）
+KEYWORD_STATS_VERSION = 1
+
+# IN 列表分批大小（低于旧版 SQLite 的 999 个参数上限）
+_CHUNK_SIZE = 500
+
+
+def load_keyword_rules(frequency_file: Optional[str] = None) -> Optional[Tuple[object, Sequence[Dict], str]]:
+    """
+    加载用于预计算的频率词规则
+
+    没有配置词组时（报告显示全部新闻）不维护统计，返回 None。
+
+    Args:
+        frequency_file: 频率词配置文件路径，默认同 load_frequency_words
+
+    Returns:
+        (匹配器, 词组, 指纹)，不可用时返回 None
+    """
+    from trendradar.core.frequency import (
+        load_frequency_words,
+        get_frequency_words_fingerprint,
+        get_word_matcher,
+    )
+
+    try:
+        word_groups, filter_words, global_filters = load_frequency_words(frequency_file)
+        fingerprint = get_frequency_words_fingerprint(frequency_file)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"[关键词统计] 加载频率词失败: {e}")
+        return None
+
+    if not word_groups:
+        return None
+
+    matcher = get_word_matcher(word_groups, filter_words, global_filters)
+    return matcher, word_groups, f"v{KEYWORD_STATS_VERSION}:{fingerprint}"
+
+
+def get_keyword_stats_fingerprint(cursor: sqlite3.Cursor) -> Optional[str]:
+    """
+    读取统计对应的频率词指纹
+
+    Args:
+        cursor: 数据库游标
+
+    Returns:
+        指纹字符串，未建立统计或旧版本数据库返回 None
+    """
+    try:
+        cursor.execute("SELECT rules_fingerprint FROM keyword_stats_state WHERE id = 1")
+    except sqlite3.OperationalError:
+        return None
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def _set_keyword_stats_fingerprint(cursor: sqlite3.Cursor, fingerprint: str, now_str: str) -> None:
+    """写入统计对应的频率词指纹"""
+    cursor.execute("""
+        INSERT INTO keyword_stats_state (id, rules_fingerprint, updated_at)
+        VALUES (1, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            rules_fingerprint = excluded.rules_fingerprint,
+            updated_at = excluded.updated_at
+    """, (fingerprint, now_str))
+
+
+def _chunks(values: List, size: int = _CHUNK_SIZE):
+    """按固定大小切分列表"""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _load_rank_lists(cursor: sqlite3.Cursor, news_ids: List[int]) -> Dict[int, List[int]]:
+    """读取指定条目的去重排名列表（顺序与 get_today_all_data 一致）"""
+    rank_map: Dict[int, List[int]] = {}
+    rank_reader = RankListReader(cursor)
+    for chunk in _chunks(news_ids):
+        placeholders = ",".join("?" * len(chunk))
+        cursor.execute(f"""
+            SELECT n.id, {rank_reader.column} FROM news_items n
+            WHERE n.id IN ({placeholders})
+        """, chunk)
+        for news_id, ranks in cursor:
+            if ranks:
+                rank_map[news_id] = rank_reader.parse(ranks, 0)
+    return rank_map
+
+
+def _format_ranks(ranks: List[int]) -> str:
+    """排名列表序列化为逗号分隔字符串"""
+    return ",".join(str(rank) for rank in ranks)
+
+
+def _parse_ranks(value: str) -> List[int]:
+    """逗号分隔字符串还原为排名列表"""
+    return [int(rank) for rank in value.split(",")] if value else []
+
+
+def update_keyword_stats(
+    cursor: sqlite3.Cursor,
+    crawl_time: str,
+    rules: Tuple[object, Sequence[Dict], str],
+    now_str: str,
+) -> str:
+    """
+    增量更新关键词统计（在入库事务内、写入条目和排名历史之后调用）
+
+    只处理本次抓取新增或更新的条目：重新匹配标题（标题可能变更），
+    已在统计中的条目追加本次排名，新进入统计的条目从排名历史补全排名。
+
+    Args:
+        cursor: 数据库游标
+        crawl_time: 本次抓取时间
+        rules: load_keyword_rules 的返回值
+        now_str: 当前时间字符串
+
+    Returns:
+        "updated"（增量更新）、"rebuilt"（当天首次抓取，直接建立）或 "stale"（配置已变化，需重建）
+    """
+    matcher, word_groups, fingerprint = rules
+
+    stored = get_keyword_stats_fingerprint(cursor)
+    if stored != fingerprint:
+        # 当天首次抓取时数据量与增量相同，直接建立统计
+        cursor.execute("SELECT COUNT(*) FROM crawl_records WHERE crawl_time != ?", (crawl_time,))
+        if stored is None and cursor.fetchone()[0] == 0:
+            rebuild_keyword_stats(cursor, rules, now_str)
+            return "rebuilt"
+        return "stale"
+
+    cursor.execute("""
+        SELECT id, title FROM news_items WHERE last_crawl_time = ?
+    """, (crawl_time,))
+    touched = cursor.fetchall()
+    if not touched:
+        return "updated"
+
+    touched_ids = [row[0] for row in touched]
+
+    # 已有统计
+    existing: Dict[int, Tuple[List[int], int]] = {}
+    for chunk in _chunks(touched_ids):
+        placeholders = ",".join("?" * len(chunk))
+        cursor.execute(f"""
+            SELECT news_item_id, ranks, best_rank FROM keyword_stats
+            WHERE news_item_id IN ({placeholders})
+        """, chunk)
+        for news_id, ranks, best_rank in cursor.fetchall():
+            existing[news_id] = (_parse_ranks(ranks), best_rank)
+
+    # 本次抓取写入的排名
+    current_ranks = query_crawl_ranks(cursor, touched_ids, crawl_time)
+
+    rows = []
+    removed = []
+    entering: Dict[int, int] = {}
+    for news_id, title in touched:
+        group_index = matcher.first_group(title)
+        if group_index < 0:
+            if news_id in existing:
+                removed.append(news_id)
+            continue
+
+        if news_id not in existing:
+            entering[news_id] = group_index
+            continue
+
+        ranks, _ = existing[news_id]
+        for rank in current_ranks.get(news_id, []):
+            if rank not in ranks:
+                ranks.append(rank)
+        rows.append((news_id, group_index, word_groups[group_index]["group_key"], ranks))
+
+    # 新进入统计的条目（新条目或标题变更后开始匹配）从排名历史补全
+    if entering:
+        rank_map = _load_rank_lists(cursor, list(entering))
+        for news_id, group_index in entering.items():
+            ranks = rank_map.get(news_id) or current_ranks.get(news_id, [])
+            rows.append((news_id, group_index, word_groups[group_index]["group_key"], ranks))
+
+    for chunk in _chunks(removed):
+        placeholders = ",".join("?" * len(chunk))
+        cursor.execute(f"DELETE FROM keyword_stats WHERE news_item_id IN ({placeholders})", chunk)
+
+    cursor.executemany("""
+        INSERT OR REPLACE INTO keyword_stats
+        (news_item_id, group_index, group_key, ranks, best_rank)
+        VALUES (?, ?, ?, ?, ?)
+    """, [
+        (news_id, group_index, group_key, _format_ranks(ranks), min(ranks) if ranks else 0)
+        for news_id, group_index, group_key, ranks in rows
+        if ranks
+    ])
+    return "updated"
+
+
+def maintain_keyword_stats(
+    cursor: sqlite3.Cursor,
+    crawl_time: str,
+    now_str: str,
+    rebuild_inline: bool = False,
+    log_prefix: str = "",
+) -> str:
+    """
+    入库事务内维护关键词统计（失败不影响新闻写入）
+
+    出错时回滚统计部分的改动并清除指纹，读取方回退到全量统计，之后由重建恢复。
+
+    Args:
+        cursor: 数据库游标
+        crawl_time: 本次抓取时间
+        now_str: 当前时间字符串
+        rebuild_inline: 配置变化时是否在当前事务内直接重建（远程存储每次运行下载临时库）
+        log_prefix: 日志前缀
+
+    Returns:
+        "disabled"（未配置词组）、"updated"、"rebuilt" 或 "stale"（需要后台重建）
+    """
+    rules = load_keyword_rules()
+    if rules is None:
+        return "disabled"
+
+    cursor.execute("SAVEPOINT keyword_stats")
+    try:
+        status = update_keyword_stats(cursor, crawl_time, rules, now_str)
+        if status == "stale" and rebuild_inline:
+            rebuild_keyword_stats(cursor, rules, now_str)
+            status = "rebuilt"
+        cursor.execute("RELEASE keyword_stats")
+        return status
+    except sqlite3.Error as e:
+        cursor.execute("ROLLBACK TO keyword_stats")
+        cursor.execute("RELEASE keyword_stats")
+        print(f"{log_prefix}关键词统计更新失败，将重建: {e}")
+        try:
+            cursor.execute("DELETE FROM keyword_stats_state")
+        except sqlite3.Error:
+            pass
+        return "stale"
+
+
+def rebuild_keyword_stats(
+    cursor: sqlite3.Cursor,
+    rules: Tuple[object, Sequence[Dict], str],
+    now_str: str,
+) -> int:
+    """
+    整库重建关键词统计（调用方负责提交事务）
+
+    Args:
+        cursor: 数据库游标
+        rules: load_keyword_rules 的返回值
+        now_str: 当前时间字符串
+
+    Returns:
+        命中条目数
+    """
+    matcher, word_groups, fingerprint = rules
+
+    cursor.execute("SELECT id, title FROM news_items")
+    matched: Dict[int, int] = {}
+    for news_id, title in cursor.fetchall():
+        group_index = matcher.first_group(title)
+        if group_index >= 0:
+            matched[news_id] = group_index
+
+    # 命中条目的去重排名列表
+    rank_map = _load_rank_lists(cursor, list(matched))
+
+    cursor.execute("DELETE FROM keyword_stats")
+    cursor.executemany("""
+        INSERT INTO keyword_stats
+        (news_item_id, group_index, group_key, ranks, best_rank)
+        VALUES (?, ?, ?, ?, ?)
+    """, [
+        (
+            news_id,
+            group_index,
+            word_groups[group_index]["group_key"],
+            _format_ranks(rank_map[news_id]),
+            min(rank_map[news_id]),
+        )
+        for news_id, group_index in matched.items()
+        if rank_map.get(news_id)
+    ])
+    _set_keyword_stats_fingerprint(cursor, fingerprint, now_str)
+    return len(matched)
+
+
+def read_keyword_stats(
+    cursor: sqlite3.Cursor,
+    fingerprint: str,
+    date: str,
+) -> Optional[Tuple[NewsData, Dict[str, int]]]:
+    """
+    读取关键词统计命中的条目
+
+    条目顺序、排名列表、出现次数和最后出现时间与 get_today_all_data 完全一致，
+    只是不包含未命中任何词组的条目。
+
+    Args:
+        cursor: 数据库游标
+        fingerprint: 当前频率词指纹（与统计不一致时返回 None）
+        date: 日期字符串（写入 NewsData.date）
+
+    Returns:
+        (只含命中条目的 NewsData, {platform_id: 当天去重标题数})；
+        统计不可用时返回 None
+    """
+    if get_keyword_stats_fingerprint(cursor) != fingerprint:
+        return None
+
+    # 全部平台的名称和去重标题数（用于占比和平台名称）
+    cursor.execute("""
+        SELECT n.platform_id, p.name, COUNT(DISTINCT n.title)
+        FROM news_items n
+        LEFT JOIN platforms p ON n.platform_id = p.id
+        GROUP BY n.platform_id
+    """)
+    id_to_name: Dict[str, str] = {}
+    title_counts: Dict[str, int] = {}
+    for platform_id, platform_name, title_count in cursor.fetchall():
+        id_to_name[platform_id] = platform_name or platform_id
+        title_counts[platform_id] = title_count
+
+    pending = load_pending_unchanged(cursor)
+
+    cursor.execute("""
+        SELECT n.title, n.platform_id, n.rank, n.url, n.mobile_url,
+               n.first_crawl_time, n.last_crawl_time, n.crawl_count, k.ranks, n.id
+        FROM keyword_stats k
+        JOIN news_items n ON n.id = k.news_item_id
+        ORDER BY n.platform_id, n.last_crawl_time, n.id
+    """)
+
+    items: Dict[str, List[NewsItem]] = {}
+    for row in cursor.fetchall():
+        platform_id = row[1]
+        last_time, count = apply_pending_unchanged(pending, platform_id, row[9], row[6], row[7])
+        items.setdefault(platform_id, []).append(NewsItem(
+            title=row[0],
+            source_id=platform_id,
+            source_name=id_to_name.get(platform_id, platform_id),
+            rank=row[2],
+            url=row[3] or "",
+            mobile_url=row[4] or "",
+            crawl_time=last_time,
+            ranks=_parse_ranks(row[8]) or [row[2]],
+            first_time=row[5],
+            last_time=last_time,
+            count=count,
+        ))
+
+    # 标记条目按还原后的最后出现时间排序（与 get_today_all_data 一致）
+    sort_by_restored_time(items, pending)
+
+    cursor.execute("SELECT crawl_time FROM crawl_records ORDER BY crawl_time DESC LIMIT 1")
+    time_row = cursor.fetchone()
+
+    news_data = NewsData(
+        date=date,
+        crawl_time=time_row[0] if time_row else "",
+        items=items,
+        id_to_name=id_to_name,
+        failed_ids=[],
+    )
+    return news_data, title_counts
+
+
+# 正在重建的数据库 {db_path: 重建线程}
+_rebuilding: Dict[str, threading.Thread] = {}
+_rebuilding_guard = threading.Lock()
+
+
+def schedule_keyword_stats_rebuild(
+    db_path: str,
+    write_lock,
+    sqlite_options: Optional[Dict] = None,
+    timezone: str = DEFAULT_TIMEZONE,
+) -> bool:
+    """
+    在后台线程中重建指定数据库的关键词统计（频率词配置变化后调用）
+
+    重建在写锁内进行，与入库互斥；同一数据库同时只有一个重建任务。
+    线程为守护线程，不阻止进程退出（可用 wait_keyword_stats_rebuilds 限时等待）；
+    重建中途退出时事务回滚，统计仍为失效状态，下次入库会重新调度。
+
+    Args:
+        db_path: 数据库文件路径
+        write_lock: 数据目录写锁（WriteLock）
+        sqlite_options: 连接参数
+        timezone: 时区名称（用于 updated_at）
+
+    Returns:
+        是否新启动了重建任务
+    """
+    def _run():
+        from trendradar.storage.sqlite_conn import connect_sqlite
+
+        try:
+            rules = load_keyword_rules()
+            if rules is None:
+                return
+            with write_lock:
+                conn = connect_sqlite(db_path, sqlite_options)
+                try:
+                    cursor = conn.cursor()
+                    if get_keyword_stats_fingerprint(cursor) == rules[2]:
+                        return
+                    start = time.perf_counter()
+                    now_str = get_configured_time(timezone).strftime("%Y-%m-%d %H:%M:%S")
+                    matched = rebuild_keyword_stats(cursor, rules, now_str)
+                    conn.commit()
+                    elapsed = (time.perf_counter() - start) * 1000
+                    print(f"[关键词统计] 频率词配置已变化，重建完成：{matched} 条命中，耗时 {elapsed:.0f}ms")
+                finally:
+                    conn.close()
+        except Exception as e:
+            print(f"[关键词统计] 后台重建失败: {e}")
+        finally:
+            with _rebuilding_guard:
+                _rebuilding.pop(db_path, None)
+
+    thread = threading.Thread(target=_run, name="keyword-stats-rebuild", daemon=True)
+    with _rebuilding_guard:
+        if db_path in _rebuilding:
+            return False
+        _rebuilding[db_path] = thread
+    thread.start()
+    return True
+
+
+def wait_keyword_stats_rebuilds(timeout: float) -> int:
+    """
+    等待正在进行的关键词统计重建完成
+
+    Args:
+        timeout: 最长等待时间（秒，所有重建共用）
+
+    Returns:
+        超时后仍未完成的重建数量
+    """
+    with _rebuilding_guard:
+        threads = list(_rebuilding.values())
+    deadline = time.monotonic() + timeout
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+    return sum(1 for thread in threads if thread.is_alive())
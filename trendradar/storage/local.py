@@ -11,7 +11,7 @@ import pytz
 import re
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from trendradar.storage.base import StorageBackend, NewsItem, NewsData, RSSItem, RSSData
 from trendradar.utils.time import (
@@ -19,7 +19,34 @@ from trendradar.utils.time import (
     format_date_folder,
     format_time_filename,
 )
-from trendradar.utils.url import normalize_url
+from trendradar.storage.sqlite_ops import (
+    compute_news_fingerprint,
+    find_unchanged_platforms,
+    materialize_unchanged_markers,
+    split_unchanged_items,
+    record_unchanged_markers,
+    save_platform_fingerprints,
+    load_pending_unchanged,
+    apply_pending_unchanged,
+    get_latest_unchanged_boards,
+    sort_by_restored_time,
+    upsert_news_items,
+    has_titles_before,
+    query_historical_titles,
+    query_latest_new_titles,
+    query_historical_rss_urls,
+    RankListReader,
+)
+from trendradar.storage.migrations import migrate
+from trendradar.storage.rank_trail import apply_rank_history_format
+from trendradar.storage.sqlite_conn import connect_sqlite, get_write_lock, with_write_lock, WriteLock
+from trendradar.storage.keyword_stats import (
+    load_keyword_rules,
+    maintain_keyword_stats,
+    read_keyword_stats,
+    schedule_keyword_stats_rebuild,
+    wait_keyword_stats_rebuilds,
+)
 
 
 class LocalStorageBackend(StorageBackend):
@@ -32,12 +59,16 @@ class LocalStorageBackend(StorageBackend):
     - HTML 报告生成
     """
 
+    # 清理资源时等待后台关键词统计重建的最长时间（秒）
+    KEYWORD_REBUILD_WAIT = 30
+
     def __init__(
         self,
         data_dir: str = "output",
         enable_txt: bool = True,
         enable_html: bool = True,
         timezone: str = "Asia/Shanghai",
+        sqlite_config: Optional[dict] = None,
     ):
         """
         初始化本地存储后端
@@ -47,11 +78,13 @@ class LocalStorageBackend(StorageBackend):
             enable_txt: 是否启用 TXT 快照
             enable_html: 是否启用 HTML 报告
             timezone: 时区配置（默认 Asia/Shanghai）
+            sqlite_config: SQLite 连接参数（journal_mode, synchronous, cache_size 等）
         """
         self.data_dir = Path(data_dir)
         self.enable_txt = enable_txt
         self.enable_html = enable_html
         self.timezone = timezone
+        self.sqlite_config = sqlite_config or {}
         self._db_connections: Dict[str, sqlite3.Connection] = {}
 
     @property
@@ -108,46 +141,42 @@ class LocalStorageBackend(StorageBackend):
         db_path = str(self._get_db_path(date, db_type))
 
         if db_path not in self._db_connections:
-            conn = sqlite3.connect(db_path)
-            conn.row_factory = sqlite3.Row
+            conn = connect_sqlite(db_path, self.sqlite_config)
             self._init_tables(conn, db_type)
             self._db_connections[db_path] = conn
 
         return self._db_connections[db_path]
 
-    def _get_schema_path(self, db_type: str = "news") -> Path:
+    def write_lock(self) -> WriteLock:
         """
-        获取 schema.sql 文件路径
+        获取数据目录的跨进程写锁
 
-        Args:
-            db_type: 数据库类型 ("news" 或 "rss")
+        定时爬取和 MCP 临时爬取（trigger_crawl）写入同一数据目录时互斥，
+        同一进程内可重入。
 
         Returns:
-            schema 文件路径
+            WriteLock 实例（可用作上下文管理器）
         """
-        if db_type == "rss":
-            return Path(__file__).parent / "rss_schema.sql"
-        return Path(__file__).parent / "schema.sql"
+        return get_write_lock(str(self.data_dir))
 
     def _init_tables(self, conn: sqlite3.Connection, db_type: str = "news") -> None:
         """
-        从 schema.sql 初始化数据库表结构
+        初始化数据库表结构，旧版本数据库按需升级
+
+        按 PRAGMA user_version 执行迁移（见 migrations.py），已是最新版本时跳过。
+        新建的热榜数据库按 sqlite_config["rank_history"] 选择排名历史布局。
 
         Args:
             conn: 数据库连接
             db_type: 数据库类型 ("news" 或 "rss")
         """
-        schema_path = self._get_schema_path(db_type)
-
-        if schema_path.exists():
-            with open(schema_path, "r", encoding="utf-8") as f:
-                schema_sql = f.read()
-            conn.executescript(schema_sql)
-        else:
-            raise FileNotFoundError(f"Schema file not found: {schema_path}")
-
-        conn.commit()
+        migrate(conn, db_type)
+        if db_type == "news":
+            apply_rank_history_format(
+                conn, self.sqlite_config.get("rank_history", "rows"), log_prefix="[本地存储] "
+            )
 
+    @with_write_lock
     def save_news_data(self, data: NewsData) -> bool:
         """
         保存新闻数据到 SQLite（以 URL 为唯一标识，支持标题更新检测）
@@ -175,103 +204,38 @@ class LocalStorageBackend(StorageBackend):
                         updated_at = excluded.updated_at
                 """, (source_id, source_name, now_str))
 
+            # 计算榜单指纹，内容与上次写入相同的平台只记录"未变化"标记
+            fingerprints = {
+                source_id: compute_news_fingerprint(source_id, news_list)
+                for source_id, news_list in data.items.items()
+            }
+            unchanged = find_unchanged_platforms(cursor, fingerprints, data.crawl_time)
+
             # 统计计数器
             new_count = 0
             updated_count = 0
             title_changed_count = 0
             success_sources = []
+            changed_items: Dict[str, List[NewsItem]] = {}
 
             for source_id, news_list in data.items.items():
                 success_sources.append(source_id)
 
-                for item in news_list:
-                    try:
-                        # 标准化 URL（去除动态参数，如微博的 band_rank）
-                        normalized_url = normalize_url(item.url, source_id) if item.url else ""
+                if source_id in unchanged:
+                    # URL 为空的条目不做去重，仍逐次写入新行
+                    empty_url_items = split_unchanged_items(news_list)
+                    if empty_url_items:
+                        changed_items[source_id] = empty_url_items
+                    continue
 
-                        # 检查是否已存在（通过标准化 URL + platform_id）
-                        if normalized_url:
-                            cursor.execute("""
-                                SELECT id, title FROM news_items
-                                WHERE url = ? AND platform_id = ?
-                            """, (normalized_url, source_id))
-                            existing = cursor.fetchone()
+                # 榜单已变化：先回填之前的未变化标记
+                materialize_unchanged_markers(cursor, source_id)
+                changed_items[source_id] = news_list
 
-                            if existing:
-                                # 已存在，更新记录
-                                existing_id, existing_title = existing
-
-                                # 检查标题是否变化
-                                if existing_title != item.title:
-                                    # 记录标题变更
-                                    cursor.execute("""
-                                        INSERT INTO title_changes
-                                        (news_item_id, old_title, new_title, changed_at)
-                                        VALUES (?, ?, ?, ?)
-                                    """, (existing_id, existing_title, item.title, now_str))
-                                    title_changed_count += 1
-
-                                # 记录排名历史
-                                cursor.execute("""
-                                    INSERT INTO rank_history
-                                    (news_item_id, rank, crawl_time, created_at)
-                                    VALUES (?, ?, ?, ?)
-                                """, (existing_id, item.rank, data.crawl_time, now_str))
-
-                                # 更新现有记录
-                                cursor.execute("""
-                                    UPDATE news_items SET
-                                        title = ?,
-                                        rank = ?,
-                                        mobile_url = ?,
-                                        last_crawl_time = ?,
-                                        crawl_count = crawl_count + 1,
-                                        updated_at = ?
-                                    WHERE id = ?
-                                """, (item.title, item.rank, item.mobile_url,
-                                      data.crawl_time, now_str, existing_id))
-                                updated_count += 1
-                            else:
-                                # 不存在，插入新记录（存储标准化后的 URL）
-                                cursor.execute("""
-                                    INSERT INTO news_items
-                                    (title, platform_id, rank, url, mobile_url,
-                                     first_crawl_time, last_crawl_time, crawl_count,
-                                     created_at, updated_at)
-                                    VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, ?)
-                                """, (item.title, source_id, item.rank, normalized_url,
-                                      item.mobile_url, data.crawl_time, data.crawl_time,
-                                      now_str, now_str))
-                                new_id = cursor.lastrowid
-                                # 记录初始排名
-                                cursor.execute("""
-                                    INSERT INTO rank_history
-                                    (news_item_id, rank, crawl_time, created_at)
-                                    VALUES (?, ?, ?, ?)
-                                """, (new_id, item.rank, data.crawl_time, now_str))
-                                new_count += 1
-                        else:
-                            # URL 为空的情况，直接插入（不做去重）
-                            cursor.execute("""
-                                INSERT INTO news_items
-                                (title, platform_id, rank, url, mobile_url,
-                                 first_crawl_time, last_crawl_time, crawl_count,
-                                 created_at, updated_at)
-                                VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, ?)
-                            """, (item.title, source_id, item.rank, "",
-                                  item.mobile_url, data.crawl_time, data.crawl_time,
-                                  now_str, now_str))
-                            new_id = cursor.lastrowid
-                            # 记录初始排名
-                            cursor.execute("""
-                                INSERT INTO rank_history
-                                (news_item_id, rank, crawl_time, created_at)
-                                VALUES (?, ?, ?, ?)
-                            """, (new_id, item.rank, data.crawl_time, now_str))
-                            new_count += 1
-
-                    except sqlite3.Error as e:
-                        print(f"保存新闻条目失败 [{item.title[:30]}...]: {e}")
+            # 写入新闻条目、标题变更和排名历史
+            new_count, updated_count, title_changed_count = upsert_news_items(
+                cursor, changed_items, data.crawl_time, now_str, log_prefix="[本地存储] "
+            )
 
             total_items = new_count + updated_count
 
@@ -312,14 +276,40 @@ class LocalStorageBackend(StorageBackend):
                         VALUES (?, ?, 'failed')
                     """, (crawl_record_id, failed_id))
 
+                # 记录未变化标记
+                record_unchanged_markers(cursor, crawl_record_id, unchanged)
+
+            # 保存实际写入平台的指纹
+            save_platform_fingerprints(
+                cursor,
+                {pid: fp for pid, fp in fingerprints.items() if pid not in unchanged},
+                data.crawl_time,
+                now_str,
+            )
+
+            # 增量维护当日关键词统计（只处理本次新增/更新的条目）
+            keyword_status = maintain_keyword_stats(
+                cursor, data.crawl_time, now_str, log_prefix="[本地存储] "
+            )
+
             conn.commit()
 
+            # 频率词配置已变化：后台重建当日关键词统计
+            if keyword_status == "stale":
+                db_path = str(self._get_db_path(data.date))
+                if schedule_keyword_stats_rebuild(
+                    db_path, self.write_lock(), self.sqlite_config, self.timezone
+                ):
+                    print("[本地存储] 频率词配置已变化，后台重建当日关键词统计")
+
             # 输出详细的存储统计日志
             log_parts = [f"[本地存储] 处理完成：新增 {new_count} 条"]
             if updated_count > 0:
                 log_parts.append(f"更新 {updated_count} 条")
             if title_changed_count > 0:
                 log_parts.append(f"标题变更 {title_changed_count} 条")
+            if unchanged:
+                log_parts.append(f"未变化 {len(unchanged)} 个平台")
             print("，".join(log_parts))
 
             return True
@@ -346,46 +336,26 @@ class LocalStorageBackend(StorageBackend):
             conn = self._get_connection(date)
             cursor = conn.cursor()
 
-            # 获取所有新闻数据（包含 id 用于查询排名历史）
-            cursor.execute("""
+            pending = load_pending_unchanged(cursor)
+            rank_reader = RankListReader(cursor)
+
+            # 获取所有新闻数据，排名历史随主查询逐行读取（兼容逐行 / 紧凑两种排名布局）
+            cursor.execute(f"""
                 SELECT n.id, n.title, n.platform_id, p.name as platform_name,
                        n.rank, n.url, n.mobile_url,
-                       n.first_crawl_time, n.last_crawl_time, n.crawl_count
+                       n.first_crawl_time, n.last_crawl_time, n.crawl_count,
+                       {rank_reader.column} as ranks
                 FROM news_items n
                 LEFT JOIN platforms p ON n.platform_id = p.id
-                ORDER BY n.platform_id, n.last_crawl_time
+                ORDER BY n.platform_id, n.last_crawl_time, n.id
             """)
 
-            rows = cursor.fetchall()
-            if not rows:
-                return None
-
-            # 收集所有 news_item_id
-            news_ids = [row[0] for row in rows]
-
-            # 批量查询排名历史
-            rank_history_map: Dict[int, List[int]] = {}
-            if news_ids:
-                placeholders = ",".join("?" * len(news_ids))
-                cursor.execute(f"""
-                    SELECT news_item_id, rank FROM rank_history
-                    WHERE news_item_id IN ({placeholders})
-                    ORDER BY news_item_id, crawl_time
-                """, news_ids)
-                for rh_row in cursor.fetchall():
-                    news_id, rank = rh_row[0], rh_row[1]
-                    if news_id not in rank_history_map:
-                        rank_history_map[news_id] = []
-                    if rank not in rank_history_map[news_id]:
-                        rank_history_map[news_id].append(rank)
-
             # 按 platform_id 分组
             items: Dict[str, List[NewsItem]] = {}
             id_to_name: Dict[str, str] = {}
             crawl_date = self._format_date_folder(date)
 
-            for row in rows:
-                news_id = row[0]
+            for row in cursor:
                 platform_id = row[2]
                 title = row[1]
                 platform_name = row[3] or platform_id
@@ -395,8 +365,11 @@ class LocalStorageBackend(StorageBackend):
                 if platform_id not in items:
                     items[platform_id] = []
 
-                # 获取排名历史，如果没有则使用当前排名
-                ranks = rank_history_map.get(news_id, [row[4]])
+                # 获取排名历史（按首次出现顺序去重），如果没有则使用当前排名
+                ranks = rank_reader.parse(row[10], row[4])
+
+                # 还原"未变化"标记对应的出现次数和最后出现时间
+                last_time, count = apply_pending_unchanged(pending, platform_id, row[0], row[8], row[9])
 
                 items[platform_id].append(NewsItem(
                     title=title,
@@ -405,13 +378,18 @@ class LocalStorageBackend(StorageBackend):
                     rank=row[4],
                     url=row[5] or "",
                     mobile_url=row[6] or "",
-                    crawl_time=row[8],  # last_crawl_time
+                    crawl_time=last_time,
                     ranks=ranks,
                     first_time=row[7],  # first_crawl_time
-                    last_time=row[8],   # last_crawl_time
-                    count=row[9],       # crawl_count
+                    last_time=last_time,
+                    count=count,
                 ))
 
+            if not items:
+                return None
+
+            # 标记条目按还原后的最后出现时间排序
+            sort_by_restored_time(items, pending)
             final_items = items
 
             # 获取失败的来源
@@ -445,6 +423,34 @@ class LocalStorageBackend(StorageBackend):
             print(f"[本地存储] 读取数据失败: {e}")
             return None
 
+    def get_keyword_stats_data(
+        self, date: Optional[str] = None
+    ) -> Optional[Tuple[NewsData, Dict[str, int]]]:
+        """
+        获取入库时预计算的当日关键词统计
+
+        Args:
+            date: 日期字符串，默认为今天
+
+        Returns:
+            (命中条目的 NewsData, {platform_id: 当天去重标题数})；
+            统计不可用时返回 None（调用方回退到全量统计）
+        """
+        rules = load_keyword_rules()
+        if rules is None:
+            return None
+
+        try:
+            db_path = self._get_db_path(date)
+            if not db_path.exists():
+                return None
+
+            conn = self._get_connection(date)
+            return read_keyword_stats(conn.cursor(), rules[2], self._format_date_folder(date))
+        except Exception as e:
+            print(f"[本地存储] 读取关键词统计失败: {e}")
+            return None
+
     def get_latest_crawl_data(self, date: Optional[str] = None) -> Optional[NewsData]:
         """
         获取最新一次抓取的数据
@@ -476,45 +482,32 @@ class LocalStorageBackend(StorageBackend):
 
             latest_time = time_row[0]
 
-            # 获取该时间的新闻数据（包含 id 用于查询排名历史）
-            cursor.execute("""
+            # 最新一次抓取中榜单未变化的平台，按上一次实际写入时间补充读取
+            pending = load_pending_unchanged(cursor)
+            conditions = ["n.last_crawl_time = ?"]
+            params = [latest_time]
+            for platform_id, base_time in get_latest_unchanged_boards(pending, latest_time):
+                conditions.append("(n.platform_id = ? AND n.last_crawl_time = ? AND n.url != '')")
+                params.extend([platform_id, base_time])
+
+            # 获取该时间的新闻数据，排名历史随主查询逐行读取（兼容逐行 / 紧凑两种排名布局）
+            rank_reader = RankListReader(cursor)
+            cursor.execute(f"""
                 SELECT n.id, n.title, n.platform_id, p.name as platform_name,
                        n.rank, n.url, n.mobile_url,
-                       n.first_crawl_time, n.last_crawl_time, n.crawl_count
+                       n.first_crawl_time, n.last_crawl_time, n.crawl_count,
+                       {rank_reader.column} as ranks
                 FROM news_items n
                 LEFT JOIN platforms p ON n.platform_id = p.id
-                WHERE n.last_crawl_time = ?
-            """, (latest_time,))
-
-            rows = cursor.fetchall()
-            if not rows:
-                return None
-
-            # 收集所有 news_item_id
-            news_ids = [row[0] for row in rows]
-
-            # 批量查询排名历史
-            rank_history_map: Dict[int, List[int]] = {}
-            if news_ids:
-                placeholders = ",".join("?" * len(news_ids))
-                cursor.execute(f"""
-                    SELECT news_item_id, rank FROM rank_history
-                    WHERE news_item_id IN ({placeholders})
-                    ORDER BY news_item_id, crawl_time
-                """, news_ids)
-                for rh_row in cursor.fetchall():
-                    news_id, rank = rh_row[0], rh_row[1]
-                    if news_id not in rank_history_map:
-                        rank_history_map[news_id] = []
-                    if rank not in rank_history_map[news_id]:
-                        rank_history_map[news_id].append(rank)
+                WHERE {" OR ".join(conditions)}
+                ORDER BY n.id
+            """, params)
 
             items: Dict[str, List[NewsItem]] = {}
             id_to_name: Dict[str, str] = {}
             crawl_date = self._format_date_folder(date)
 
-            for row in rows:
-                news_id = row[0]
+            for row in cursor:
                 platform_id = row[2]
                 platform_name = row[3] or platform_id
                 id_to_name[platform_id] = platform_name
@@ -522,8 +515,11 @@ class LocalStorageBackend(StorageBackend):
                 if platform_id not in items:
                     items[platform_id] = []
 
-                # 获取排名历史，如果没有则使用当前排名
-                ranks = rank_history_map.get(news_id, [row[4]])
+                # 获取排名历史（按首次出现顺序去重），如果没有则使用当前排名
+                ranks = rank_reader.parse(row[10], row[4])
+
+                # 还原"未变化"标记对应的出现次数和最后出现时间
+                last_time, count = apply_pending_unchanged(pending, platform_id, row[0], row[8], row[9])
 
                 items[platform_id].append(NewsItem(
                     title=row[1],
@@ -532,13 +528,16 @@ class LocalStorageBackend(StorageBackend):
                     rank=row[4],
                     url=row[5] or "",
                     mobile_url=row[6] or "",
-                    crawl_time=row[8],  # last_crawl_time
+                    crawl_time=last_time,
                     ranks=ranks,
                     first_time=row[7],  # first_crawl_time
-                    last_time=row[8],   # last_crawl_time
-                    count=row[9],       # crawl_count
+                    last_time=last_time,
+                    count=count,
                 ))
 
+            if not items:
+                return None
+
             # 获取失败的来源（针对最新一次抓取）
             cursor.execute("""
                 SELECT css.platform_id
@@ -561,6 +560,56 @@ class LocalStorageBackend(StorageBackend):
             print(f"[本地存储] 获取最新数据失败: {e}")
             return None
 
+    @staticmethod
+    def _all_titles_as_new(current_data: NewsData) -> Dict[str, Dict]:
+        """当天没有历史数据时，当前批次的所有标题都是新增"""
+        new_titles = {}
+        for source_id, news_list in current_data.items.items():
+            new_titles[source_id] = {item.title: item for item in news_list}
+        return new_titles
+
+    def detect_latest_new_titles(
+        self,
+        platform_ids: Optional[List[str]] = None,
+        date: Optional[str] = None,
+    ) -> Optional[Dict[str, Dict]]:
+        """
+        检测已入库的最新批次中的新增标题（SQL 端比较，不加载当天全部数据）
+
+        Args:
+            platform_ids: 平台过滤，None 表示全部平台
+            date: 日期字符串，默认为今天
+
+        Returns:
+            新增标题 {source_id: {title: title_data}}，查询失败时返回 None
+        """
+        try:
+            if not self._get_db_path(date).exists():
+                return {}
+
+            conn = self._get_connection(date)
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT crawl_time FROM crawl_records
+                ORDER BY crawl_time DESC
+                LIMIT 1
+            """)
+            time_row = cursor.fetchone()
+            if not time_row:
+                return {}
+            latest_time = time_row[0]
+
+            # 只有一个抓取批次时，不应该有"新增"标题
+            if not has_titles_before(cursor, latest_time, platform_ids):
+                return {}
+
+            return query_latest_new_titles(cursor, latest_time, platform_ids)
+
+        except Exception as e:
+            print(f"[本地存储] 检测最新批次新增标题失败: {e}")
+            return None
+
     def detect_new_titles(self, current_data: NewsData) -> Dict[str, Dict]:
         """
         检测新增的标题
@@ -575,35 +624,35 @@ class LocalStorageBackend(StorageBackend):
             新增的标题数据 {source_id: {title: NewsItem}}
         """
         try:
-            # 获取历史数据
-            historical_data = self.get_today_all_data(current_data.date)
+            if not self._get_db_path(current_data.date).exists():
+                return self._all_titles_as_new(current_data)
+
+            conn = self._get_connection(current_data.date)
+            cursor = conn.cursor()
 
-            if not historical_data:
-                # 没有历史数据，所有都是新的
-                new_titles = {}
-                for source_id, news_list in current_data.items.items():
-                    new_titles[source_id] = {item.title: item for item in news_list}
-                return new_titles
+            # 没有历史数据，所有都是新的
+            cursor.execute("SELECT 1 FROM news_items LIMIT 1")
+            if cursor.fetchone() is None:
+                return self._all_titles_as_new(current_data)
 
             # 获取当前批次时间
             current_time = current_data.crawl_time
 
-            # 收集历史标题（first_time < current_time 的标题）
-            # 这样可以正确处理同一标题因 URL 变化而产生多条记录的情况
-            historical_titles: Dict[str, set] = {}
-            for source_id, news_list in historical_data.items.items():
-                historical_titles[source_id] = set()
-                for item in news_list:
-                    first_time = getattr(item, 'first_time', item.crawl_time)
-                    if first_time < current_time:
-                        historical_titles[source_id].add(item.title)
-
-            # 检查是否有历史数据
-            has_historical_data = any(len(titles) > 0 for titles in historical_titles.values())
-            if not has_historical_data:
-                # 第一次抓取，没有"新增"概念
+            # 没有首次出现时间早于当前批次的标题：第一次抓取，没有"新增"概念
+            if not has_titles_before(cursor, current_time):
                 return {}
 
+            # 只查询当前批次的标题是否在更早批次出现过（索引定位，不加载当天全部数据）
+            # 同一标题因 URL 变化产生多条记录时，任意一条更早出现即为历史标题
+            historical_titles = query_historical_titles(
+                cursor,
+                {
+                    source_id: [item.title for item in news_list]
+                    for source_id, news_list in current_data.items.items()
+                },
+                current_time,
+            )
+
             # 检测新增
             new_titles = {}
             for source_id, news_list in current_data.items.items():
@@ -775,7 +824,11 @@ class LocalStorageBackend(StorageBackend):
             return []
 
     def cleanup(self) -> None:
-        """清理资源（关闭数据库连接）"""
+        """清理资源（限时等待后台关键词统计重建，关闭数据库连接）"""
+        still_running = wait_keyword_stats_rebuilds(self.KEYWORD_REBUILD_WAIT)
+        if still_running:
+            print(f"[本地存储] {still_running} 个关键词统计重建未完成，下次入库时重新调度")
+
         for db_path, conn in self._db_connections.items():
             try:
                 conn.close()
@@ -794,6 +847,8 @@ class LocalStorageBackend(StorageBackend):
         - output/rss/{date}.db   -> 删除过期的 .db 文件
         - output/txt/{date}/     -> 删除过期的日期目录
         - output/html/{date}/    -> 删除过期的日期目录
+        - output/archive/{type}/{date}.db.xz -> 删除过期的归档
+        - output/rollup/{month}.db -> 删除整月过期的月度汇总库
 
         Args:
             retention_days: 保留天数（0 表示不清理）
@@ -883,6 +938,12 @@ class LocalStorageBackend(StorageBackend):
                         except Exception as e:
                             print(f"[本地存储] 删除目录失败 {date_folder}: {e}")
 
+            # 清理过期的归档和整月过期的月度汇总库 (archive/, rollup/)
+            from trendradar.storage.archive import cleanup_archives
+            from trendradar.storage.rollup import cleanup_rollups
+            deleted_count += cleanup_archives(str(self.data_dir), cutoff_date.strftime("%Y-%m-%d"))
+            deleted_count += cleanup_rollups(str(self.data_dir), cutoff_date.strftime("%Y-%m-%d"))
+
             if deleted_count > 0:
                 print(f"[本地存储] 共清理 {deleted_count} 个过期文件/目录")
 
@@ -892,6 +953,81 @@ class LocalStorageBackend(StorageBackend):
             print(f"[本地存储] 清理过期数据失败: {e}")
             return deleted_count
 
+    @with_write_lock
+    def archive_old_data(self, archive_days: int, compression: str = "lzma") -> int:
+        """
+        归档超过归档天数的每日数据库（热数据 -> 归档，见 archive.py）
+
+        归档前按当前结构版本迁移，归档后删除热数据库及其 -wal/-shm 文件。
+        MCP 查询归档日期时按需解压到缓存。
+
+        Args:
+            archive_days: 归档天数（0 表示不归档），早于 N 天前的数据库被归档
+            compression: 压缩格式（lzma / zlib）
+
+        Returns:
+            归档的数据库数量
+        """
+        from trendradar.storage.archive import ARCHIVE_COMPRESSIONS, archive_database, get_archive_dir
+
+        if archive_days <= 0:
+            return 0
+        if compression not in ARCHIVE_COMPRESSIONS:
+            print(f"[本地存储] 无效的归档压缩格式: {compression}，使用 lzma")
+            compression = "lzma"
+
+        cutoff = (self._get_configured_time() - timedelta(days=archive_days)).strftime("%Y-%m-%d")
+        archived_count = 0
+        source_bytes = 0
+        archived_bytes = 0
+
+        for db_type in ["news", "rss"]:
+            db_dir = self.data_dir / db_type
+            if not db_dir.exists():
+                continue
+
+            for db_file in sorted(db_dir.glob("????-??-??.db")):
+                date_str = db_file.stem
+                if date_str >= cutoff:
+                    continue
+
+                db_path = str(db_file)
+                try:
+                    # 通过写连接完成结构迁移，归档快照与当前读取逻辑一致
+                    self._get_connection(date_str, db_type)
+                    self._db_connections.pop(db_path).close()
+
+                    size = sum(
+                        path.stat().st_size
+                        for path in (db_file, db_file.with_name(db_file.name + "-wal"))
+                        if path.exists()
+                    )
+                    archive_path = get_archive_dir(str(self.data_dir), db_type) / (
+                        date_str + ARCHIVE_COMPRESSIONS[compression]
+                    )
+                    _, archive_size = archive_database(db_file, archive_path)
+
+                    for suffix in ("", "-wal", "-shm"):
+                        db_file.with_name(db_file.name + suffix).unlink(missing_ok=True)
+                except Exception as e:
+                    print(f"[本地存储] 归档失败 {db_type}/{db_file.name}: {e}")
+                    continue
+
+                archived_count += 1
+                source_bytes += size
+                archived_bytes += archive_size
+                print(
+                    f"[本地存储] 归档: {db_type}/{db_file.name} -> archive/{db_type}/{archive_path.name} "
+                    f"({size / 1024:.0f} KB -> {archive_size / 1024:.0f} KB)"
+                )
+
+        if archived_count > 0:
+            print(
+                f"[本地存储] 共归档 {archived_count} 个数据库，"
+                f"{source_bytes / 1024 / 1024:.2f} MB -> {archived_bytes / 1024 / 1024:.2f} MB"
+            )
+        return archived_count
+
     def has_pushed_today(self, date: Optional[str] = None) -> bool:
         """
         检查指定日期是否已推送过
@@ -921,6 +1057,7 @@ class LocalStorageBackend(StorageBackend):
             print(f"[本地存储] 检查推送记录失败: {e}")
             return False
 
+    @with_write_lock
     def record_push(self, report_type: str, date: Optional[str] = None) -> bool:
         """
         记录推送
@@ -961,6 +1098,7 @@ class LocalStorageBackend(StorageBackend):
     # RSS 数据存储方法
     # ========================================
 
+    @with_write_lock
     def save_rss_data(self, data: RSSData) -> bool:
         """
         保存 RSS 数据到 SQLite（以 URL 为唯一标识）
@@ -1063,8 +1201,8 @@ class LocalStorageBackend(StorageBackend):
             if record_row:
                 crawl_record_id = record_row[0]
 
-                # 记录成功的源
-                for feed_id in data.items.keys():
+                # 记录成功的源（未变化跳过的源也视为成功）
+                for feed_id in list(data.items.keys()) + list(data.skipped_ids):
                     cursor.execute("""
                         INSERT OR REPLACE INTO rss_crawl_status
                         (crawl_record_id, feed_id, status)
@@ -1084,12 +1222,40 @@ class LocalStorageBackend(StorageBackend):
                         VALUES (?, ?, 'failed')
                     """, (crawl_record_id, failed_id))
 
+            # 未变化的源：不重新写入条目，只把上一次抓取到的条目顺延到本次抓取时间并计入抓取次数，
+            # 保证"当前榜单"模式（按 last_crawl_time 读取）仍能看到这些源
+            for feed_id in data.skipped_ids:
+                cursor.execute("""
+                    UPDATE rss_items SET last_crawl_time = ?, crawl_count = crawl_count + 1
+                    WHERE feed_id = ? AND last_crawl_time = (
+                        SELECT MAX(last_crawl_time) FROM rss_items WHERE feed_id = ?
+                    )
+                """, (data.crawl_time, feed_id, feed_id))
+
+            # 保存缓存校验信息
+            for feed_id, validator in data.validators.items():
+                cursor.execute("""
+                    INSERT INTO rss_feed_validators
+                    (feed_id, feed_url, etag, last_modified, content_hash, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(feed_id) DO UPDATE SET
+                        feed_url = excluded.feed_url,
+                        etag = excluded.etag,
+                        last_modified = excluded.last_modified,
+                        content_hash = excluded.content_hash,
+                        updated_at = excluded.updated_at
+                """, (feed_id, validator.get("feed_url", ""), validator.get("etag", ""),
+                      validator.get("last_modified", ""), validator.get("content_hash", ""),
+                      now_str))
+
             conn.commit()
 
             # 输出统计日志
             log_parts = [f"[本地存储] RSS 处理完成：新增 {new_count} 条"]
             if updated_count > 0:
                 log_parts.append(f"更新 {updated_count} 条")
+            if data.skipped_ids:
+                log_parts.append(f"未变化 {len(data.skipped_ids)} 个源")
             print("，".join(log_parts))
 
             return True
@@ -1197,32 +1363,36 @@ class LocalStorageBackend(StorageBackend):
             新增的 RSS 条目 {feed_id: [RSSItem, ...]}
         """
         try:
-            # 获取历史数据
-            historical_data = self.get_rss_data(current_data.date)
+            conn = self._get_connection(current_data.date, db_type="rss")
+            cursor = conn.cursor()
 
-            if not historical_data:
-                # 没有历史数据，所有都是新的
+            # 没有历史数据，所有都是新的
+            cursor.execute("SELECT 1 FROM rss_items LIMIT 1")
+            if cursor.fetchone() is None:
                 return current_data.items.copy()
 
             # 获取当前批次时间
             current_time = current_data.crawl_time
 
-            # 收集历史 URL（first_time < current_time 的条目）
-            historical_urls: Dict[str, set] = {}
-            for feed_id, rss_list in historical_data.items.items():
-                historical_urls[feed_id] = set()
-                for item in rss_list:
-                    first_time = getattr(item, 'first_time', item.crawl_time)
-                    if first_time < current_time:
-                        if item.url:
-                            historical_urls[feed_id].add(item.url)
-
-            # 检查是否有历史数据
-            has_historical_data = any(len(urls) > 0 for urls in historical_urls.values())
-            if not has_historical_data:
-                # 第一次抓取，没有"新增"概念
+            # 没有首次出现时间早于当前批次的条目：第一次抓取，没有"新增"概念
+            cursor.execute("""
+                SELECT 1 FROM rss_items
+                WHERE first_crawl_time < ? AND url != ''
+                LIMIT 1
+            """, (current_time,))
+            if cursor.fetchone() is None:
                 return {}
 
+            # 只查询当前批次的 URL 是否在更早批次出现过
+            historical_urls = query_historical_rss_urls(
+                cursor,
+                {
+                    feed_id: [item.url for item in rss_list]
+                    for feed_id, rss_list in current_data.items.items()
+                },
+                current_time,
+            )
+
             # 检测新增
             new_items: Dict[str, List[RSSItem]] = {}
             for feed_id, rss_list in current_data.items.items():
@@ -1240,6 +1410,42 @@ class LocalStorageBackend(StorageBackend):
             print(f"[本地存储] 检测新 RSS 条目失败: {e}")
             return {}
 
+    def get_rss_feed_validators(self, date: Optional[str] = None) -> Dict[str, Dict[str, str]]:
+        """
+        获取 RSS 源的缓存校验信息（用于条件请求）
+
+        校验信息保存在当日 RSS 数据库中，跨天后自动失效，
+        保证每天的数据库都会完整写入一次各源的条目。
+
+        Args:
+            date: 日期字符串（YYYY-MM-DD），默认为今天
+
+        Returns:
+            {feed_id: {feed_url, etag, last_modified, content_hash}}
+        """
+        try:
+            conn = self._get_connection(date, db_type="rss")
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT feed_id, feed_url, etag, last_modified, content_hash
+                FROM rss_feed_validators
+            """)
+
+            return {
+                row[0]: {
+                    "feed_url": row[1] or "",
+                    "etag": row[2] or "",
+                    "last_modified": row[3] or "",
+                    "content_hash": row[4] or "",
+                }
+                for row in cursor.fetchall()
+            }
+
+        except Exception as e:
+            print(f"[本地存储] 读取 RSS 缓存校验信息失败: {e}")
+            return {}
+
     def get_latest_rss_data(self, date: Optional[str] = None) -> Optional[RSSData]:
         """
         获取最新一次抓取的 RSS 数据（当前榜单模式）
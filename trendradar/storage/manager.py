@@ -6,7 +6,7 @@
 """
 
 import os
-from typing import Optional
+from typing import Dict, List, Optional
 
 from trendradar.storage.base import StorageBackend, NewsData, RSSData
 
@@ -37,7 +37,12 @@ class StorageManager:
         remote_retention_days: int = 0,
         pull_enabled: bool = False,
         pull_days: int = 0,
+        pull_workers: int = 8,
         timezone: str = "Asia/Shanghai",
+        sqlite_config: Optional[dict] = None,
+        local_rollup: bool = True,
+        local_archive_days: int = 0,
+        local_archive_compression: str = "lzma",
     ):
         """
         初始化存储管理器
@@ -47,12 +52,20 @@ class StorageManager:
             data_dir: 本地数据目录
             enable_txt: 是否启用 TXT 快照
             enable_html: 是否启用 HTML 报告
-            remote_config: 远程存储配置（endpoint_url, bucket_name, access_key_id 等）
+            remote_config: 远程存储配置（endpoint_url, bucket_name, access_key_id 等，
+                           cache_dir / cache_max_mb 为远程 SQLite 文件的本地缓存，
+                           delta_upload 为是否增量上传，transfer_part_mb / transfer_workers 为分段传输参数，
+                           object_compression 为上传数据库时的压缩编码）
             local_retention_days: 本地数据保留天数（0 = 无限制）
             remote_retention_days: 远程数据保留天数（0 = 无限制）
             pull_enabled: 是否启用启动时自动拉取
             pull_days: 拉取最近 N 天的数据
+            pull_workers: 拉取时并发下载的文件数
             timezone: 时区配置（默认 Asia/Shanghai）
+            sqlite_config: SQLite 连接参数（journal_mode, synchronous, cache_size 等；远程工作数据库固定使用 delete 日志模式）
+            local_rollup: 是否为已结束的月份生成月度汇总库（仅本地存储）
+            local_archive_days: 本地数据归档天数（0 = 不归档，仅本地存储）
+            local_archive_compression: 归档压缩格式（lzma / zlib）
         """
         self.backend_type = backend_type
         self.data_dir = data_dir
@@ -63,11 +76,20 @@ class StorageManager:
         self.remote_retention_days = remote_retention_days
         self.pull_enabled = pull_enabled
         self.pull_days = pull_days
+        self.pull_workers = pull_workers
         self.timezone = timezone
+        self.sqlite_config = sqlite_config or {}
+        self.local_rollup = local_rollup
+        self.local_archive_days = local_archive_days
+        self.local_archive_compression = local_archive_compression
 
         self._backend: Optional[StorageBackend] = None
         self._remote_backend: Optional[StorageBackend] = None
 
+        # 读取统计（每个读取方法的调用次数）与热榜写入版本（每次写入后递增，供快照失效判断）
+        self.read_counts: Dict[str, int] = {}
+        self.news_write_version = 0
+
     @staticmethod
     def is_github_actions() -> bool:
         """检测是否在 GitHub Actions 环境中运行"""
@@ -137,6 +159,14 @@ class StorageManager:
                 enable_txt=self.enable_txt,
                 enable_html=self.enable_html,
                 timezone=self.timezone,
+                rank_history=self.sqlite_config.get("rank_history", "rows"),
+                cache_dir=self.remote_config.get("cache_dir") or os.path.join(self.data_dir, ".remote_cache"),
+                cache_max_bytes=int(self.remote_config.get("cache_max_mb", 256)) * 1024 * 1024,
+                delta_upload=bool(self.remote_config.get("delta_upload", False)),
+                transfer_part_size=int(self.remote_config.get("transfer_part_mb", 8)) * 1024 * 1024,
+                transfer_workers=int(self.remote_config.get("transfer_workers", 4)),
+                object_compression=self.remote_config.get("object_compression") or "",
+                sqlite_config=self.sqlite_config,
             )
         except ImportError as e:
             print(f"[存储管理器] 远程后端导入失败: {e}")
@@ -167,6 +197,7 @@ class StorageManager:
                     enable_txt=self.enable_txt,
                     enable_html=self.enable_html,
                     timezone=self.timezone,
+                    sqlite_config=self.sqlite_config,
                 )
                 print(f"[存储管理器] 使用本地存储后端 (数据目录: {self.data_dir})")
 
@@ -195,11 +226,22 @@ class StorageManager:
             return 0
 
         # 调用拉取方法
-        return self._remote_backend.pull_recent_days(self.pull_days, self.data_dir)
+        return self._remote_backend.pull_recent_days(self.pull_days, self.data_dir, self.pull_workers)
+
+    def _record_read(self, method: str) -> None:
+        """记录一次存储读取"""
+        self.read_counts[method] = self.read_counts.get(method, 0) + 1
+
+    def get_read_summary(self) -> str:
+        """获取本次运行的存储读取统计（如 "get_today_all_data×1, get_latest_crawl_data×1"）"""
+        return ", ".join(f"{method}×{count}" for method, count in self.read_counts.items())
 
     def save_news_data(self, data: NewsData) -> bool:
-        """保存新闻数据"""
-        return self.get_backend().save_news_data(data)
+        """保存新闻数据（写入后递增写入版本，使已加载的数据快照失效）"""
+        try:
+            return self.get_backend().save_news_data(data)
+        finally:
+            self.news_write_version += 1
 
     def save_rss_data(self, data: RSSData) -> bool:
         """保存 RSS 数据"""
@@ -207,28 +249,48 @@ class StorageManager:
 
     def get_rss_data(self, date: Optional[str] = None) -> Optional[RSSData]:
         """获取指定日期的所有 RSS 数据（当日汇总模式）"""
+        self._record_read("get_rss_data")
         return self.get_backend().get_rss_data(date)
 
+    def get_rss_feed_validators(self, date: Optional[str] = None) -> dict:
+        """获取 RSS 源的缓存校验信息（条件请求）"""
+        return self.get_backend().get_rss_feed_validators(date)
+
     def get_latest_rss_data(self, date: Optional[str] = None) -> Optional[RSSData]:
         """获取最新一次抓取的 RSS 数据（当前榜单模式）"""
+        self._record_read("get_latest_rss_data")
         return self.get_backend().get_latest_rss_data(date)
 
     def detect_new_rss_items(self, current_data: RSSData) -> dict:
         """检测新增的 RSS 条目（增量模式）"""
+        self._record_read("detect_new_rss_items")
         return self.get_backend().detect_new_rss_items(current_data)
 
     def get_today_all_data(self, date: Optional[str] = None) -> Optional[NewsData]:
         """获取当天所有数据"""
+        self._record_read("get_today_all_data")
         return self.get_backend().get_today_all_data(date)
 
+    def get_keyword_stats_data(self, date: Optional[str] = None):
+        """获取入库时预计算的当日关键词统计（不可用时返回 None）"""
+        self._record_read("get_keyword_stats_data")
+        return self.get_backend().get_keyword_stats_data(date)
+
     def get_latest_crawl_data(self, date: Optional[str] = None) -> Optional[NewsData]:
         """获取最新抓取数据"""
+        self._record_read("get_latest_crawl_data")
         return self.get_backend().get_latest_crawl_data(date)
 
     def detect_new_titles(self, current_data: NewsData) -> dict:
         """检测新增标题"""
+        self._record_read("detect_new_titles")
         return self.get_backend().detect_new_titles(current_data)
 
+    def detect_latest_new_titles(self, platform_ids: Optional[List[str]] = None) -> Optional[dict]:
+        """检测已入库的最新批次中的新增标题（存储端比较，不支持时返回 None）"""
+        self._record_read("detect_latest_new_titles")
+        return self.get_backend().detect_latest_new_titles(platform_ids)
+
     def save_txt_snapshot(self, data: NewsData) -> Optional[str]:
         """保存 TXT 快照"""
         return self.get_backend().save_txt_snapshot(data)
@@ -243,11 +305,55 @@ class StorageManager:
 
     def cleanup(self) -> None:
         """清理资源"""
+        self.read_counts.clear()
         if self._backend:
             self._backend.cleanup()
         if self._remote_backend:
             self._remote_backend.cleanup()
 
+    def build_rollups(self) -> int:
+        """
+        补齐本地已结束月份的汇总库（output/rollup/{YYYY-MM}.db，供 MCP 长时间范围查询）
+
+        仅本地存储后端生成（远程后端的本地目录只是临时数据）；应在保留期清理之前调用，
+        使即将被清理的日期先进入汇总库。
+
+        Returns:
+            生成的汇总库数量
+        """
+        if not self.local_rollup or self._resolve_backend_type() != "local":
+            return 0
+
+        from trendradar.storage.rollup import build_rollups
+        from trendradar.utils.time import get_configured_time
+
+        try:
+            current_month = get_configured_time(self.timezone).strftime("%Y-%m")
+            return build_rollups(self.data_dir, current_month)["built"]
+        except Exception as e:
+            print(f"[存储管理器] 生成月度汇总库失败: {e}")
+            return 0
+
+    def archive_old_data(self) -> int:
+        """
+        归档超过归档天数的本地每日数据库（output/archive/，MCP 查询时按需解压）
+
+        仅本地存储后端归档；应在生成月度汇总库之后、保留期清理之前调用。
+
+        Returns:
+            归档的数据库数量
+        """
+        if self.local_archive_days <= 0 or self._resolve_backend_type() != "local":
+            return 0
+
+        try:
+            return self.get_backend().archive_old_data(
+                self.local_archive_days, self.local_archive_compression
+            )
+        except Exception as e:
+            print(f"[存储管理器] 归档本地数据失败: {e}")
+            return 0
+
     def cleanup_old_data(self) -> int:
         """
         清理过期数据
@@ -318,7 +424,12 @@ def get_storage_manager(
     remote_retention_days: int = 0,
     pull_enabled: bool = False,
     pull_days: int = 0,
+    pull_workers: int = 8,
     timezone: str = "Asia/Shanghai",
+    sqlite_config: Optional[dict] = None,
+    local_rollup: bool = True,
+    local_archive_days: int = 0,
+    local_archive_compression: str = "lzma",
     force_new: bool = False,
 ) -> StorageManager:
     """
@@ -334,7 +445,12 @@ def get_storage_manager(
         remote_retention_days: 远程数据保留天数（0 = 无限制）
         pull_enabled: 是否启用启动时自动拉取
         pull_days: 拉取最近 N 天的数据
+        pull_workers: 拉取时并发下载的文件数
         timezone: 时区配置（默认 Asia/Shanghai）
+        sqlite_config: 本地 SQLite 连接参数
+        local_rollup: 是否为已结束的月份生成月度汇总库
+        local_archive_days: 本地数据归档天数（0 = 不归档）
+        local_archive_compression: 归档压缩格式（lzma / zlib）
         force_new: 是否强制创建新实例
 
     Returns:
@@ -353,7 +469,12 @@ def get_storage_manager(
             remote_retention_days=remote_retention_days,
             pull_enabled=pull_enabled,
             pull_days=pull_days,
+            pull_workers=pull_workers,
             timezone=timezone,
+            sqlite_config=sqlite_config,
+            local_rollup=local_rollup,
+            local_archive_days=local_archive_days,
+            local_archive_compression=local_archive_compression,
         )
 
     return _storage_manager
@@ -0,0 +1,238 @@
+# coding=utf-8
+"""
+SQLite 结构版本迁移
+
+基于 PRAGMA user_version 记录每个日期数据库的结构版本：
+- 打开数据库时按需升级（旧库从当前版本依次执行后续迁移）
+- 版本已是最新时跳过 schema 脚本，不再每次打开都执行 executescript
+- 每个迁移在独立事务中执行，并在同一事务内写入新版本号
+
+新增迁移：在 MIGRATIONS 对应类型末尾追加 (版本号, 说明, SQL)，版本号递增。
+schema.sql / rss_schema.sql 为版本 1 的基础表结构，只能包含 IF NOT EXISTS 语句。
+
+命令行（批量迁移整个 output 目录）：
+    python -m trendradar.storage.migrations [output] [--workers N]
+"""
+
+import argparse
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# 迁移定义：{db_type: [(version, description, sql)]}
+# 版本 1 为基础表结构（schema 文件），此处只列出之后的迁移
+MIGRATIONS: Dict[str, List[Tuple[int, str, str]]] = {
+    "news": [
+        (2, "排名历史覆盖索引、抓取状态索引", """
+            -- 排名查询按 news_item_id 过滤、按 crawl_time 排序并读取 rank，覆盖索引免回表
+            CREATE INDEX IF NOT EXISTS idx_rank_history_news_time
+                ON rank_history(news_item_id, crawl_time, rank);
+            DROP INDEX IF EXISTS idx_rank_history_news;
+
+            -- 失败来源查询（status = 'failed'）
+            CREATE INDEX IF NOT EXISTS idx_crawl_status_status
+                ON crawl_source_status(status, crawl_record_id, platform_id);
+        """),
+        (3, "当日关键词统计（入库时增量维护）", """
+            -- 命中频率词词组的条目：词组序号 + 去重排名（按首次出现顺序）
+            CREATE TABLE IF NOT EXISTS keyword_stats (
+                news_item_id INTEGER PRIMARY KEY,
+                group_index INTEGER NOT NULL,
+                group_key TEXT NOT NULL,
+                ranks TEXT NOT NULL,
+                best_rank INTEGER NOT NULL,
+                FOREIGN KEY (news_item_id) REFERENCES news_items(id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_keyword_stats_group
+                ON keyword_stats(group_index);
+
+            -- 统计对应的频率词配置指纹（配置变化后统计失效并重建）
+            CREATE TABLE IF NOT EXISTS keyword_stats_state (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                rules_fingerprint TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            );
+        """),
+        (4, "新增标题检测索引", """
+            -- 按 (platform_id, title) 查找最早出现时间（MIN(first_crawl_time)），覆盖索引免回表
+            -- 前缀 platform_id 可替代单列平台索引
+            CREATE INDEX IF NOT EXISTS idx_news_platform_title_first
+                ON news_items(platform_id, title, first_crawl_time);
+            DROP INDEX IF EXISTS idx_news_platform;
+        """),
+    ],
+    "rss": [
+        (2, "RSS 条目 feed_id + url 唯一索引", """
+            -- 按源过滤并按 URL 定位条目，替代单列 feed_id 索引和 (url, feed_id) 唯一索引
+            -- （没有只按 URL 的查询，保留一个唯一索引即可去重）
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_rss_feed_url
+                ON rss_items(feed_id, url);
+            DROP INDEX IF EXISTS idx_rss_feed;
+            DROP INDEX IF EXISTS idx_rss_url_feed;
+        """),
+    ],
+}
+
+
+def get_schema_path(db_type: str = "news") -> Path:
+    """
+    获取基础表结构文件路径
+
+    Args:
+        db_type: 数据库类型 ("news" 或 "rss")
+
+    Returns:
+        schema 文件路径
+    """
+    if db_type == "rss":
+        return Path(__file__).parent / "rss_schema.sql"
+    return Path(__file__).parent / "schema.sql"
+
+
+def get_latest_version(db_type: str = "news") -> int:
+    """获取指定数据库类型的最新结构版本"""
+    migrations = MIGRATIONS.get(db_type, [])
+    return migrations[-1][0] if migrations else 1
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """读取数据库的结构版本（PRAGMA user_version，未设置时为 0）"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _run_versioned_script(conn: sqlite3.Connection, sql: str, version: int) -> None:
+    """在单个事务中执行迁移脚本并写入版本号"""
+    conn.executescript(f"BEGIN;\n{sql}\nPRAGMA user_version = {int(version)};\nCOMMIT;")
+
+
+def migrate(conn: sqlite3.Connection, db_type: str = "news") -> Tuple[int, int]:
+    """
+    将数据库升级到最新结构版本
+
+    - 版本为 0（新库或迁移框架之前的旧库）：执行 schema 文件，记为版本 1
+    - 之后依次执行版本号大于当前版本的迁移
+    - 已是最新版本时不执行任何脚本
+
+    Args:
+        conn: 数据库连接
+        db_type: 数据库类型 ("news" 或 "rss")
+
+    Returns:
+        (迁移前版本, 迁移后版本)
+    """
+    version = get_schema_version(conn)
+    latest = get_latest_version(db_type)
+    if version >= latest:
+        return version, version
+
+    original = version
+    try:
+        if version == 0:
+            schema_path = get_schema_path(db_type)
+            if not schema_path.exists():
+                raise FileNotFoundError(f"Schema file not found: {schema_path}")
+            with open(schema_path, "r", encoding="utf-8") as f:
+                schema_sql = f.read()
+            _run_versioned_script(conn, schema_sql, 1)
+            version = 1
+
+        for target, description, sql in MIGRATIONS.get(db_type, []):
+            if target <= version:
+                continue
+            _run_versioned_script(conn, sql, target)
+            version = target
+    except sqlite3.Error:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+
+    return original, version
+
+
+def migrate_file(db_path: Path, db_type: str) -> Tuple[int, int]:
+    """
+    迁移单个数据库文件
+
+    Args:
+        db_path: 数据库文件路径
+        db_type: 数据库类型 ("news" 或 "rss")
+
+    Returns:
+        (迁移前版本, 迁移后版本)
+    """
+    from trendradar.storage.sqlite_conn import connect_sqlite
+
+    conn = connect_sqlite(str(db_path))
+    try:
+        return migrate(conn, db_type)
+    finally:
+        conn.close()
+
+
+def migrate_tree(data_dir: str = "output", workers: int = 4) -> Dict[str, int]:
+    """
+    并行迁移数据目录下所有日期数据库（output/news/*.db、output/rss/*.db）
+
+    Args:
+        data_dir: 数据目录
+        workers: 并行线程数（SQLite 执行期间释放 GIL）
+
+    Returns:
+        统计信息 {"total", "migrated", "current", "failed"}
+    """
+    root = Path(data_dir)
+    targets: List[Tuple[Path, str]] = []
+    for db_type in ("news", "rss"):
+        type_dir = root / db_type
+        if type_dir.is_dir():
+            targets.extend((path, db_type) for path in sorted(type_dir.glob("*.db")))
+
+    stats = {"total": len(targets), "migrated": 0, "current": 0, "failed": 0}
+    if not targets:
+        print(f"[迁移] 未找到数据库文件: {root}")
+        return stats
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {
+            executor.submit(migrate_file, path, db_type): (path, db_type)
+            for path, db_type in targets
+        }
+        for future in as_completed(futures):
+            path, db_type = futures[future]
+            try:
+                before, after = future.result()
+            except Exception as e:
+                stats["failed"] += 1
+                print(f"[迁移] 失败 {db_type}/{path.name}: {e}")
+                continue
+            if before == after:
+                stats["current"] += 1
+            else:
+                stats["migrated"] += 1
+                print(f"[迁移] {db_type}/{path.name}: v{before} -> v{after}")
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"[迁移] 完成：共 {stats['total']} 个数据库，升级 {stats['migrated']} 个，"
+        f"已是最新 {stats['current']} 个，失败 {stats['failed']} 个，耗时 {elapsed:.2f}s"
+    )
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="TrendRadar SQLite 数据库结构迁移")
+    parser.add_argument("data_dir", nargs="?", default="output", help="数据目录，默认 output")
+    parser.add_argument("--workers", type=int, default=4, help="并行线程数，默认 4")
+    args = parser.parse_args(argv)
+
+    stats = migrate_tree(args.data_dir, args.workers)
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,304 @@
+# coding=utf-8
+"""
+紧凑排名轨迹（rank_history 的可选存储布局）
+
+逐行布局（rows，默认）：rank_history 每条新闻每次抓取写入一行
+(id, news_item_id, rank, crawl_time, created_at)，是当日数据库体积的主要部分。
+
+紧凑布局（packed）：
+- crawl_times 字典表：抓取时间 -> 小整数序号
+- news_items.rank_trail：(抓取序号, 排名) 对按小端 uint16 打包的 BLOB，
+  每次抓取在条目原行上追加 4 字节（与 crawl_count 的更新在同一次写入中完成）
+- 读取时用 memoryview 直接按 uint16 解释 BLOB，不逐字段解包
+
+布局属于数据库文件本身：存在 crawl_times 表即为紧凑布局，写入和读取都按文件实际布局处理，
+两种布局的数据库可以混用。新建数据库按配置 storage.sqlite.rank_history 选择布局，
+已有的逐行布局数据库用命令行转换：
+    python -m trendradar.storage.rank_trail [output] [--workers N]
+"""
+
+import argparse
+import sqlite3
+import struct
+import sys
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import groupby
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+RANK_HISTORY_FORMATS = ("rows", "packed")
+
+# (抓取序号, 排名) 对：小端 uint16 x 2
+_PAIR = struct.Struct("<HH")
+_MAX_VALUE = 0xFFFF
+_NATIVE_LITTLE_ENDIAN = sys.byteorder == "little"
+
+# 转换时每批写回的条目数
+_CONVERT_BATCH_SIZE = 5000
+
+
+def has_rank_trail(cursor: sqlite3.Cursor, schema: str = "main") -> bool:
+    """检查数据库是否为紧凑排名轨迹布局（存在 crawl_times 字典表；schema 为附加库名）"""
+    cursor.execute(f"""
+        SELECT name FROM {schema}.sqlite_master
+        WHERE type = 'table' AND name = 'crawl_times'
+    """)
+    return cursor.fetchone() is not None
+
+
+def enable_rank_trail(cursor: sqlite3.Cursor) -> None:
+    """
+    为数据库启用紧凑排名轨迹布局（创建字典表并为 news_items 增加 rank_trail 列）
+
+    调用方负责事务；已有的 rank_history 数据需另行转换（见 convert_database）。
+
+    Args:
+        cursor: 数据库游标
+    """
+    cursor.execute("PRAGMA table_info(news_items)")
+    if "rank_trail" not in {row[1] for row in cursor.fetchall()}:
+        cursor.execute("ALTER TABLE news_items ADD COLUMN rank_trail BLOB")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS crawl_times (
+            id INTEGER PRIMARY KEY,
+            crawl_time TEXT NOT NULL UNIQUE
+        )
+    """)
+
+
+def apply_rank_history_format(conn: sqlite3.Connection, rank_format: str, log_prefix: str = "") -> None:
+    """
+    按配置为新建的热榜数据库选择排名历史布局
+
+    只对尚无任何条目的数据库生效；已有数据的逐行布局数据库保持原样（用命令行转换）。
+
+    Args:
+        conn: 数据库连接（已完成结构迁移）
+        rank_format: "rows" 或 "packed"
+        log_prefix: 日志前缀
+    """
+    if rank_format not in RANK_HISTORY_FORMATS:
+        print(f"{log_prefix}无效的 rank_history 布局: {rank_format}，使用 rows")
+        return
+    if rank_format != "packed":
+        return
+
+    cursor = conn.cursor()
+    if has_rank_trail(cursor):
+        return
+    cursor.execute("SELECT 1 FROM news_items LIMIT 1")
+    if cursor.fetchone() is not None:
+        return
+
+    enable_rank_trail(cursor)
+    conn.commit()
+
+
+def get_crawl_index(cursor: sqlite3.Cursor, crawl_time: str) -> int:
+    """
+    获取抓取时间在字典表中的序号（不存在时分配）
+
+    Args:
+        cursor: 数据库游标
+        crawl_time: 抓取时间
+
+    Returns:
+        抓取序号
+    """
+    cursor.execute("INSERT OR IGNORE INTO crawl_times (crawl_time) VALUES (?)", (crawl_time,))
+    cursor.execute("SELECT id FROM crawl_times WHERE crawl_time = ?", (crawl_time,))
+    crawl_index = cursor.fetchone()[0]
+    if crawl_index > _MAX_VALUE:
+        raise ValueError(f"抓取序号超出范围: {crawl_index}")
+    return crawl_index
+
+
+def load_crawl_times(cursor: sqlite3.Cursor, schema: str = "main") -> Dict[int, str]:
+    """读取抓取时间字典 {抓取序号: 抓取时间}（schema 为附加库名）"""
+    cursor.execute(f"SELECT id, crawl_time FROM {schema}.crawl_times")
+    return dict(cursor.fetchall())
+
+
+def pack_rank(crawl_index: int, rank: int) -> bytes:
+    """
+    打包一次抓取的排名（追加到 rank_trail 末尾）
+
+    Args:
+        crawl_index: 抓取序号
+        rank: 排名（超出 uint16 范围时截断到边界）
+
+    Returns:
+        4 字节
+    """
+    return _PAIR.pack(crawl_index, min(max(int(rank), 0), _MAX_VALUE))
+
+
+def decode_rank_trail(value: bytes) -> Tuple[Sequence[int], Sequence[int]]:
+    """
+    解码排名轨迹
+
+    小端平台上直接把 BLOB 视为 uint16 序列（memoryview，不复制数据），
+    大端平台复制到 array 后翻转字节序。
+
+    Args:
+        value: rank_trail 列的值
+
+    Returns:
+        (抓取序号序列, 排名序列)，两者等长，顺序为写入顺序
+    """
+    if _NATIVE_LITTLE_ENDIAN:
+        values = memoryview(value).cast("H")
+    else:
+        values = array("H", bytes(value))
+        values.byteswap()
+    return values[0::2], values[1::2]
+
+
+def _file_size(db_path: Path) -> int:
+    """数据库文件大小（含 -wal 文件）"""
+    wal_path = db_path.with_name(db_path.name + "-wal")
+    return db_path.stat().st_size + (wal_path.stat().st_size if wal_path.exists() else 0)
+
+
+def convert_database(db_path: Path) -> Optional[Tuple[int, int]]:
+    """
+    将逐行布局的热榜数据库转换为紧凑排名轨迹布局
+
+    在单个事务内按 (news_item_id, crawl_time, rank) 覆盖索引顺序读取 rank_history，
+    逐条目打包写入 rank_trail 后清空 rank_history，最后 VACUUM 回收空间。
+
+    Args:
+        db_path: 数据库文件路径
+
+    Returns:
+        (转换前大小, 转换后大小)，已是紧凑布局时返回 None
+    """
+    from trendradar.storage.migrations import migrate
+    from trendradar.storage.sqlite_conn import connect_sqlite
+
+    conn = connect_sqlite(str(db_path))
+    try:
+        migrate(conn, "news")
+        cursor = conn.cursor()
+        if has_rank_trail(cursor):
+            return None
+
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        size_before = _file_size(db_path)
+
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            enable_rank_trail(cursor)
+            cursor.execute("""
+                INSERT OR IGNORE INTO crawl_times (crawl_time)
+                SELECT crawl_time FROM (
+                    SELECT crawl_time FROM crawl_records
+                    UNION
+                    SELECT DISTINCT crawl_time FROM rank_history
+                )
+                ORDER BY crawl_time
+            """)
+            crawl_indexes = {crawl_time: idx for idx, crawl_time in load_crawl_times(cursor).items()}
+            if crawl_indexes and max(crawl_indexes.values()) > _MAX_VALUE:
+                raise ValueError("抓取次数超出紧凑布局上限")
+
+            # 逐条目流式打包，另一个游标分批写回
+            rows = conn.execute("""
+                SELECT news_item_id, rank, crawl_time FROM rank_history
+                ORDER BY news_item_id, crawl_time, rank
+            """)
+            batch: List[Tuple[bytes, int]] = []
+            for news_id, group in groupby(rows, key=lambda row: row[0]):
+                trail = b"".join(pack_rank(crawl_indexes[crawl_time], rank) for _, rank, crawl_time in group)
+                batch.append((trail, news_id))
+                if len(batch) >= _CONVERT_BATCH_SIZE:
+                    cursor.executemany("UPDATE news_items SET rank_trail = ? WHERE id = ?", batch)
+                    batch = []
+            cursor.executemany("UPDATE news_items SET rank_trail = ? WHERE id = ?", batch)
+            cursor.execute("DELETE FROM rank_history")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return size_before, _file_size(db_path)
+    finally:
+        conn.close()
+
+
+def convert_tree(data_dir: str = "output", workers: int = 4) -> Dict[str, int]:
+    """
+    并行转换数据目录下所有热榜数据库（output/news/*.db）
+
+    转换期间持有数据目录写锁，避免与定时爬取交错写入。
+
+    Args:
+        data_dir: 数据目录
+        workers: 并行线程数
+
+    Returns:
+        统计信息 {"total", "converted", "skipped", "failed", "bytes_before", "bytes_after"}
+    """
+    from trendradar.storage.sqlite_conn import get_write_lock
+
+    root = Path(data_dir)
+    targets = sorted((root / "news").glob("*.db")) if (root / "news").is_dir() else []
+    stats = {
+        "total": len(targets), "converted": 0, "skipped": 0, "failed": 0,
+        "bytes_before": 0, "bytes_after": 0,
+    }
+    if not targets:
+        print(f"[排名轨迹] 未找到热榜数据库: {root / 'news'}")
+        return stats
+
+    start = time.perf_counter()
+    with get_write_lock(str(root)):
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {executor.submit(convert_database, path): path for path in targets}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    sizes = future.result()
+                except Exception as e:
+                    stats["failed"] += 1
+                    print(f"[排名轨迹] 转换失败 {path.name}: {e}")
+                    continue
+                if sizes is None:
+                    stats["skipped"] += 1
+                    continue
+                before, after = sizes
+                stats["converted"] += 1
+                stats["bytes_before"] += before
+                stats["bytes_after"] += after
+                print(f"[排名轨迹] {path.name}: {before / 1024:.1f} KB -> {after / 1024:.1f} KB")
+
+    elapsed = time.perf_counter() - start
+    before, after = stats["bytes_before"], stats["bytes_after"]
+    reduction = (1 - after / before) * 100 if before else 0.0
+    print(
+        f"[排名轨迹] 完成：共 {stats['total']} 个数据库，转换 {stats['converted']} 个，"
+        f"已是紧凑布局 {stats['skipped']} 个，失败 {stats['failed']} 个；"
+        f"{before / 1024 / 1024:.2f} MB -> {after / 1024 / 1024:.2f} MB（减少 {reduction:.1f}%），"
+        f"耗时 {elapsed:.2f}s"
+    )
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="TrendRadar 排名历史转换为紧凑排名轨迹布局")
+    parser.add_argument("data_dir", nargs="?", default="output", help="数据目录，默认 output")
+    parser.add_argument("--workers", type=int, default=4, help="并行线程数，默认 4")
+    args = parser.parse_args(argv)
+
+    stats = convert_tree(args.data_dir, args.workers)
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -15,7 +15,7 @@ import tempfile
 import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 try:
     import boto3
@@ -34,7 +34,74 @@ from trendradar.utils.time import (
     format_date_folder,
     format_time_filename,
 )
-from trendradar.utils.url import normalize_url
+from trendradar.storage.sqlite_ops import (
+    compute_news_fingerprint,
+    find_unchanged_platforms,
+    materialize_unchanged_markers,
+    split_unchanged_items,
+    record_unchanged_markers,
+    save_platform_fingerprints,
+    load_pending_unchanged,
+    apply_pending_unchanged,
+    get_latest_unchanged_boards,
+    sort_by_restored_time,
+    upsert_news_items,
+    has_titles_before,
+    query_historical_titles,
+    query_latest_new_titles,
+    query_historical_rss_urls,
+    RankListReader,
+)
+from trendradar.storage.migrations import migrate
+from trendradar.storage.rank_trail import apply_rank_history_format
+from trendradar.storage.sqlite_conn import connect_sqlite
+from trendradar.storage.remote_cache import RemoteFileCache, DEFAULT_CACHE_BYTES
+from trendradar.storage.remote_manifest import (
+    ROW_COUNT_TABLES,
+    is_conditional_unsupported,
+    is_write_conflict,
+    manifest_databases,
+    new_manifest,
+    parse_db_key,
+    read_manifest,
+    save_manifest,
+)
+from trendradar.storage.remote_sync import (
+    DEFAULT_PULL_WORKERS,
+    find_unindexed_database,
+    list_remote_databases,
+    load_remote_index,
+    pull_databases,
+)
+from trendradar.storage.remote_transfer import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_PART_SIZE,
+    ENCODING_CONTENT_TYPES,
+    RAW_CONTENT_TYPE,
+    download_file,
+    upload_file,
+)
+from trendradar.storage.sqlite_delta import (
+    apply_segment,
+    diff_pages,
+    encode_segment,
+    parse_segment_seq,
+    segment_key,
+    segment_prefix,
+)
+from trendradar.storage.keyword_stats import (
+    load_keyword_rules,
+    maintain_keyword_stats,
+    read_keyword_stats,
+)
+
+
+# 增量上传：增量段累计大小超过数据库大小的该比例，或段数达到上限时，重新上传完整数据库
+DELTA_COMPACT_RATIO = 0.5
+DELTA_MAX_SEGMENTS = 64
+
+# 清单条件写入冲突（其他写入方同时更新）时的重试次数
+MANIFEST_SAVE_RETRIES = 5
 
 
 class RemoteStorageBackend(StorageBackend):
@@ -44,8 +111,8 @@ class RemoteStorageBackend(StorageBackend):
     特点：
     - 使用 S3 兼容 API 访问远程存储
     - 支持 Cloudflare R2、阿里云 OSS、腾讯云 COS、AWS S3、MinIO 等
-    - 下载 SQLite 到临时目录进行操作
-    - 支持数据合并和上传
+    - 下载 SQLite 到临时目录进行操作（可选的本地缓存按 ETag 条件下载，远程未变化时不重复下载）
+    - 支持数据合并和上传（可选增量上传：只上传变化的页，见 sqlite_delta.py）
     - 支持从远程拉取历史数据到本地
     - 运行结束后自动清理临时文件
     """
@@ -61,6 +128,14 @@ class RemoteStorageBackend(StorageBackend):
         enable_html: bool = True,
         temp_dir: Optional[str] = None,
         timezone: str = "Asia/Shanghai",
+        rank_history: str = "rows",
+        cache_dir: Optional[str] = None,
+        cache_max_bytes: int = DEFAULT_CACHE_BYTES,
+        delta_upload: bool = False,
+        transfer_part_size: int = DEFAULT_PART_SIZE,
+        transfer_workers: int = DEFAULT_MAX_WORKERS,
+        object_compression: str = "",
+        sqlite_config: Optional[dict] = None,
     ):
         """
         初始化远程存储后端
@@ -75,6 +150,14 @@ class RemoteStorageBackend(StorageBackend):
             enable_html: 是否启用 HTML 报告
             temp_dir: 临时目录路径（默认使用系统临时目录）
             timezone: 时区配置（默认 Asia/Shanghai）
+            rank_history: 新建数据库的排名历史布局（rows / packed，见 rank_trail.py）
+            cache_dir: 远程 SQLite 文件的本地缓存目录（None 表示不缓存，见 remote_cache.py）
+            cache_max_bytes: 本地缓存容量上限（字节）
+            delta_upload: 是否增量上传（只上传与上次同步相比变化的页）
+            transfer_part_size: 分段传输的分段大小（字节，见 remote_transfer.py）
+            transfer_workers: 并发传输的分段数
+            object_compression: 上传数据库时的压缩编码（"" 不压缩 / "zlib" / "lzma"，读取时自动识别）
+            sqlite_config: 工作数据库的 SQLite 连接参数（synchronous, cache_size 等，日志模式固定为 delete）
         """
         if not HAS_BOTO3:
             raise ImportError("远程存储后端需要安装 boto3: pip install boto3")
@@ -85,6 +168,14 @@ class RemoteStorageBackend(StorageBackend):
         self.enable_txt = enable_txt
         self.enable_html = enable_html
         self.timezone = timezone
+        self.rank_history = rank_history
+        self.sqlite_config = sqlite_config or {}
+        self.transfer_part_size = transfer_part_size
+        self.transfer_workers = transfer_workers
+        if object_compression and object_compression not in ENCODING_CONTENT_TYPES:
+            print(f"[远程存储] 不支持的压缩编码 {object_compression}，将不压缩上传")
+            object_compression = ""
+        self.object_compression = object_compression
 
         # 创建临时目录
         self.temp_dir = Path(temp_dir) if temp_dir else Path(tempfile.mkdtemp(prefix="trendradar_"))
@@ -118,6 +209,22 @@ class RemoteStorageBackend(StorageBackend):
         self._downloaded_files: List[Path] = []
         self._db_connections: Dict[str, sqlite3.Connection] = {}
 
+        # 远程文件缓存（按存储桶分目录）与下载统计
+        self._file_cache: Optional[RemoteFileCache] = None
+        if cache_dir and cache_max_bytes > 0:
+            self._file_cache = RemoteFileCache(str(Path(cache_dir) / bucket_name), cache_max_bytes)
+        self.download_stats: Dict[str, int] = {"requests": 0, "cache_hits": 0, "bytes": 0}
+
+        # 增量上传：每个对象键的同步状态（基础快照 ETag、已应用的增量段序号、增量段累计大小）
+        self.delta_upload = delta_upload
+        self._sync_state: Dict[str, Dict] = {}
+        self.upload_stats: Dict[str, int] = {"uploads": 0, "delta_uploads": 0, "bytes": 0}
+
+        # 存储桶清单（写入方首次上传时读取，见 remote_manifest.py）及读取时的 ETag（条件写入）
+        self._manifest: Optional[Dict] = None
+        self._manifest_etag: Optional[str] = None
+        self._manifest_conditional = True
+
         print(f"[远程存储] 初始化完成，存储桶: {bucket_name}，签名版本: {signature_version}")
 
     @property
@@ -170,38 +277,155 @@ class RemoteStorageBackend(StorageBackend):
         db_dir.mkdir(parents=True, exist_ok=True)
         return db_dir / f"{date_folder}.db"
 
-    def _check_object_exists(self, r2_key: str) -> bool:
+    def _list_segments(self, r2_key: str, base_etag: str) -> List[Tuple[int, str, int]]:
         """
-        检查远程存储中对象是否存在
+        列出某个基础快照的增量段
+
+        Returns:
+            [(序号, 对象键, 大小)]，按序号升序
+        """
+        segments = []
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=segment_prefix(r2_key, base_etag)):
+            for obj in page.get('Contents', []):
+                seq = parse_segment_seq(obj['Key'])
+                if seq is not None:
+                    segments.append((seq, obj['Key'], obj.get('Size', 0)))
+        return sorted(segments)
+
+    def _fetch_database(self, r2_key: str, dest: Path) -> Optional[Dict]:
+        """
+        下载数据库到本地路径：基础快照 + 按序应用增量段
+
+        基础快照按分段并行下载（见 remote_transfer.py），内存占用与文件大小无关。
+        启用本地缓存时带 IfNoneMatch 条件下载：远程未变化（304）时复制缓存文件，只补齐新的增量段。
 
         Args:
-            r2_key: 远程对象键
+            r2_key: 基础快照对象键
+            dest: 本地目标路径
 
         Returns:
-            是否存在
+            同步状态 {"etag", "segment", "delta_bytes"}，远程不存在时返回 None
         """
+        cached = self._file_cache.lookup(r2_key) if self._file_cache else None
+        segment, changed = 0, True
+        # 清单记录的分段 MD5：远程 ETag 与清单一致时逐段校验下载内容
+        checksums = self._get_manifest()["objects"].get(r2_key)
+
         try:
-            self.s3_client.head_object(Bucket=self.bucket_name, Key=r2_key)
-            return True
+            self.download_stats["requests"] += 1
+            try:
+                base_etag, size = download_file(
+                    self.s3_client, self.bucket_name, r2_key, dest,
+                    if_none_match=cached[1] if cached else None,
+                    part_size=self.transfer_part_size,
+                    max_workers=self.transfer_workers,
+                    checksums=checksums,
+                )
+            except ClientError as e:
+                status_code = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+                error_code = e.response.get("Error", {}).get("Code", "")
+                if not cached or (status_code != 304 and error_code not in ("304", "NotModified")):
+                    raise
+                if self._file_cache.copy_to(r2_key, dest):
+                    self.download_stats["cache_hits"] += 1
+                    base_etag, segment, changed = cached[1], cached[2], False
+                    print(f"[远程存储] 远程未变化，使用本地缓存: {r2_key}")
+                else:
+                    # 缓存文件刚被淘汰：去掉条件重新下载
+                    self.download_stats["requests"] += 1
+                    base_etag, size = download_file(
+                        self.s3_client, self.bucket_name, r2_key, dest,
+                        part_size=self.transfer_part_size,
+                        max_workers=self.transfer_workers,
+                        checksums=checksums,
+                    )
+
+            if changed:
+                self.download_stats["bytes"] += size
+                print(f"[远程存储] 已下载: {r2_key} -> {dest} ({size} bytes)")
         except ClientError as e:
             error_code = e.response.get("Error", {}).get("Code", "")
-            # S3 兼容存储可能返回 404, NoSuchKey, 或其他变体
+            # S3 兼容存储可能返回不同的错误码
             if error_code in ("404", "NoSuchKey", "Not Found"):
-                return False
-            # 其他错误（如权限问题）也视为不存在，但打印警告
-            print(f"[远程存储] 检查对象存在性失败 ({r2_key}): {e}")
-            return False
+                if self._file_cache:
+                    self._file_cache.remove(r2_key)
+                return None
+            else:
+                print(f"[远程存储] 下载失败 (错误码: {error_code}): {e}")
+                raise
         except Exception as e:
-            print(f"[远程存储] 检查对象存在性异常 ({r2_key}): {e}")
-            return False
+            print(f"[远程存储] 下载异常: {e}")
+            raise
+
+        try:
+            segment, delta_bytes, applied = self._apply_remote_segments(r2_key, dest, base_etag, segment)
+        except ValueError as e:
+            # 增量段校验失败：删除应用到一半的文件（_get_connection 只检查文件是否存在）。
+            # 基础快照来自本地缓存时缓存可能已损坏，丢弃缓存后完整下载一次；否则向上抛出
+            dest.unlink(missing_ok=True)
+            if self._file_cache:
+                self._file_cache.remove(r2_key)
+            if changed:
+                print(f"[远程存储] 增量段应用失败: {r2_key}: {e}")
+                raise
+            print(f"[远程存储] 增量段应用失败，丢弃本地缓存重新下载: {r2_key}: {e}")
+            return self._fetch_database(r2_key, dest)
+
+        if self._file_cache and (changed or applied):
+            self._file_cache.store(r2_key, dest, base_etag, segment)
+        return {"etag": base_etag, "segment": segment, "delta_bytes": delta_bytes}
+
+    def _apply_remote_segments(self, r2_key: str, dest: Path, base_etag: str, segment: int) -> Tuple[int, int, bool]:
+        """
+        按序下载并应用基础快照之后的增量段
+
+        序号连续；段在读取期间被压缩删除时停在已应用的一致状态。
+        清单中的基础快照 ETag 与下载结果一致时直接使用清单记录的增量段，否则列举。
+
+        Args:
+            r2_key: 基础快照对象键
+            dest: 已应用到第 segment 段的本地文件
+            base_etag: 基础快照 ETag
+            segment: 已应用的增量段序号
+
+        Returns:
+            (应用后的段序号, 已应用增量段的累计大小, 是否应用了新的段)
+
+        Raises:
+            ValueError: 增量段格式错误或应用后校验失败（dest 此时只应用了一部分）
+        """
+        entry = self._get_manifest()["objects"].get(r2_key)
+        if entry and entry.get("etag") == base_etag:
+            segments = [tuple(item) for item in entry.get("segments", [])]
+        else:
+            segments = self._list_segments(r2_key, base_etag)
+        delta_bytes = 0
+        applied = False
+        for seq, seg_key, seg_size in segments:
+            if seq <= segment:
+                delta_bytes += seg_size
+                continue
+            if seq != segment + 1:
+                break
+            try:
+                self.download_stats["requests"] += 1
+                data = self.s3_client.get_object(Bucket=self.bucket_name, Key=seg_key)['Body'].read()
+            except ClientError as e:
+                print(f"[远程存储] 增量段已不存在，停止应用 ({seg_key}): {e}")
+                break
+            self.download_stats["bytes"] += len(data)
+            apply_segment(dest, data, base_etag, seq)
+            segment, applied = seq, True
+            delta_bytes += seg_size
+        if segment:
+            print(f"[远程存储] 已应用增量段: {r2_key} 至第 {segment} 段")
+        return segment, delta_bytes, applied
 
     def _download_sqlite(self, date: Optional[str] = None, db_type: str = "news") -> Optional[Path]:
         """
         从远程存储下载当天的 SQLite 文件到本地临时目录
 
-        使用 get_object + iter_chunks 替代 download_file，
-        以正确处理腾讯云 COS 的 chunked transfer encoding。
-
         Args:
             date: 日期字符串
             db_type: 数据库类型 ("news" 或 "rss")
@@ -215,38 +439,225 @@ class RemoteStorageBackend(StorageBackend):
         # 确保目录存在
         local_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # 先检查文件是否存在
-        if not self._check_object_exists(r2_key):
+        state = self._fetch_database(r2_key, local_path)
+        if state is None:
             print(f"[远程存储] 文件不存在，将创建新数据库: {r2_key}")
             return None
 
+        self._downloaded_files.append(local_path)
+        self._sync_state[r2_key] = state
+        if self.delta_upload:
+            # 保存与远程一致的副本，上传时与之比较找出变化的页
+            synced_path = self._get_synced_path(r2_key)
+            synced_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(local_path, synced_path)
+        return local_path
+
+    def _get_synced_path(self, r2_key: str) -> Path:
+        """与远程内容一致的本地副本路径（增量上传的比较基准）"""
+        return self.temp_dir / ".synced" / r2_key
+
+    def _get_manifest(self) -> Dict:
+        """
+        获取存储桶清单（写入方使用，本次运行内缓存）
+
+        清单不存在时根据对象列表重建；清单缺少较新的日期（未维护清单的写入方上传）时
+        补入列举到的数据库。下次更新时写入存储桶。
+        """
+        if self._manifest is None:
+            self._manifest, self._manifest_etag = read_manifest(self.s3_client, self.bucket_name)
+            if self._manifest is None:
+                self._manifest = new_manifest()
+                for key, info in list_remote_databases(self.s3_client, self.bucket_name).items():
+                    self._manifest["objects"][key] = {**info, "rows": None}
+                print(f"[远程存储] 清单不存在，已根据对象列表重建（{len(self._manifest['objects'])} 个数据库）")
+            elif find_unindexed_database(
+                self.s3_client, self.bucket_name, manifest_databases(self._manifest)
+            ):
+                added = 0
+                for key, info in list_remote_databases(self.s3_client, self.bucket_name).items():
+                    if key not in self._manifest["objects"]:
+                        self._manifest["objects"][key] = {**info, "rows": None}
+                        added += 1
+                print(f"[远程存储] 清单已过期，已补入 {added} 个未记录的数据库")
+        return self._manifest
+
+    def _commit_manifest(self, change: Callable[[Dict], None]) -> None:
+        """
+        修改清单并条件写回存储桶
+
+        change 就地修改清单。写入以读取时的 ETag 作条件，清单已被其他写入方更新（412）时
+        重新读取清单、重新应用 change 后重试；存储服务不支持条件写入时改为无条件写入。
+
+        Raises:
+            ClientError: 写入失败或重试次数用尽
+        """
+        for attempt in range(MANIFEST_SAVE_RETRIES):
+            manifest = self._get_manifest()
+            change(manifest)
+            try:
+                self._manifest_etag = save_manifest(
+                    self.s3_client, self.bucket_name, manifest,
+                    etag=self._manifest_etag, conditional=self._manifest_conditional,
+                )
+                return
+            except ClientError as e:
+                if self._manifest_conditional and is_conditional_unsupported(e):
+                    print("[远程存储] 存储服务不支持条件写入，清单改为无条件写入")
+                    self._manifest_conditional = False
+                elif not is_write_conflict(e) or attempt == MANIFEST_SAVE_RETRIES - 1:
+                    raise
+                else:
+                    print("[远程存储] 清单已被其他写入方更新，重新读取后重试")
+                    self._manifest = None
+
+    def _count_rows(self, local_path: Path, db_type: str) -> Dict[str, int]:
+        """统计数据库主要表的行数（写入清单）"""
+        rows = {}
+        conn = sqlite3.connect(f"file:{local_path}?mode=ro", uri=True)
         try:
-            # 使用 get_object + iter_chunks 替代 download_file
-            # iter_chunks 会自动处理 chunked transfer encoding
-            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=r2_key)
-            with open(local_path, 'wb') as f:
-                for chunk in response['Body'].iter_chunks(chunk_size=1024*1024):
-                    f.write(chunk)
-            self._downloaded_files.append(local_path)
-            print(f"[远程存储] 已下载: {r2_key} -> {local_path}")
-            return local_path
-        except ClientError as e:
-            error_code = e.response.get("Error", {}).get("Code", "")
-            # S3 兼容存储可能返回不同的错误码
-            if error_code in ("404", "NoSuchKey", "Not Found"):
-                print(f"[远程存储] 文件不存在，将创建新数据库: {r2_key}")
-                return None
-            else:
-                print(f"[远程存储] 下载失败 (错误码: {error_code}): {e}")
-                raise
+            for table in ROW_COUNT_TABLES.get(db_type, ()):
+                try:
+                    rows[table] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                except sqlite3.Error:
+                    continue
+        finally:
+            conn.close()
+        return rows
+
+    def _update_manifest(
+        self,
+        r2_key: str,
+        local_path: Path,
+        etag: str,
+        size: int,
+        segments: List[Tuple[int, str, int]],
+        raw_size: int,
+        encoding: str,
+        part_size: int = 0,
+        part_md5: Optional[List[str]] = None,
+    ) -> None:
+        """
+        上传成功后更新清单中的数据库条目并写回存储桶
+
+        size 为远程基础快照对象的大小（读取方据此校验下载），raw_size / encoding 为基础快照
+        未压缩时的大小和压缩编码，part_size / part_md5 为基础快照的上传分段大小和各分段 MD5
+        （读取方逐段校验，未知时为空），行数统计自本地数据库（含增量段）。
+
+        清单写入失败不影响上传结果：读取方会发现清单与远程对象不符并回退到列举。
+        """
+        parsed = parse_db_key(r2_key)
+        if not parsed:
+            return
+        try:
+            entry = {
+                "db_type": parsed[0],
+                "date": parsed[1],
+                "size": size,
+                "raw_size": raw_size,
+                "encoding": encoding,
+                "etag": etag,
+                "part_size": part_size,
+                "part_md5": list(part_md5 or []),
+                "segments": [list(segment) for segment in segments],
+                "rows": self._count_rows(local_path, parsed[0]),
+            }
+
+            def set_entry(manifest: Dict) -> None:
+                manifest["objects"][r2_key] = entry
+
+            self._commit_manifest(set_entry)
         except Exception as e:
-            print(f"[远程存储] 下载异常: {e}")
-            raise
+            print(f"[远程存储] 更新清单失败: {e}")
+
+    def _delete_stale_segments(self, r2_key: str, segments: List[Tuple[int, str, int]]) -> None:
+        """删除旧基础快照的增量段（重新上传完整数据库后调用）"""
+        stale = [{'Key': segment[1]} for segment in segments]
+        for i in range(0, len(stale), 1000):
+            self.s3_client.delete_objects(Bucket=self.bucket_name, Delete={'Objects': stale[i:i + 1000]})
+        if stale:
+            print(f"[远程存储] 已删除 {len(stale)} 个失效的增量段: {r2_key}")
+
+    def _upload_delta(self, r2_key: str, local_path: Path, state: Dict) -> bool:
+        """
+        增量上传：只上传与上次同步相比变化的页
+
+        Returns:
+            是否已完成同步；返回 False 时调用方改为上传完整数据库
+            （没有比较基准、页大小变化、增量段累计过大或段数达到上限）
+        """
+        synced_path = self._get_synced_path(r2_key)
+        if not synced_path.exists() or state["segment"] >= DELTA_MAX_SEGMENTS:
+            return False
+
+        diff = diff_pages(synced_path, local_path)
+        if diff is None:
+            return False
+        page_size, pages = diff
+        if not pages:
+            print(f"[远程存储] 数据库无变化，跳过上传: {r2_key}")
+            return True
+
+        seq = state["segment"] + 1
+        data = encode_segment(state["etag"], seq, page_size, local_path, pages)
+
+        # 重新上传完整数据库的代价：当前大小按基础快照的压缩比估算
+        entry = self._get_manifest()["objects"].get(r2_key)
+        if not (entry and entry.get("etag") == state["etag"] and len(entry.get("segments", [])) >= seq - 1):
+            entry = None
+        full_size = local_path.stat().st_size
+        if entry and entry.get("raw_size"):
+            full_size = full_size * entry["size"] // entry["raw_size"]
+        if state["delta_bytes"] + len(data) > full_size * DELTA_COMPACT_RATIO:
+            print(f"[远程存储] 增量段累计 {state['delta_bytes'] + len(data)} bytes，重新上传完整数据库")
+            return False
+
+        seg_key = segment_key(r2_key, state["etag"], seq)
+        self.s3_client.put_object(
+            Bucket=self.bucket_name,
+            Key=seg_key,
+            Body=data,
+            ContentLength=len(data),
+            ContentType='application/octet-stream',
+        )
+        state["segment"] = seq
+        state["delta_bytes"] += len(data)
+
+        # 清单条目：沿用同一基础快照已有的增量段，追加本段
+        if entry:
+            base_size, raw_size, encoding = entry["size"], entry.get("raw_size", 0), entry.get("encoding", "")
+            part_size, part_md5 = entry.get("part_size", 0), entry.get("part_md5", [])
+            segments = [tuple(segment) for segment in entry["segments"][:seq - 1]]
+        else:
+            # 清单过期（没有本基础快照的条目）：读取基础快照大小和编码，之前的增量段大小未知
+            head = self.s3_client.head_object(Bucket=self.bucket_name, Key=r2_key)
+            base_size, raw_size = head["ContentLength"], 0
+            part_size, part_md5 = 0, []
+            encoding = next(
+                (name for name, content_type in ENCODING_CONTENT_TYPES.items()
+                 if head.get("ContentType") == content_type),
+                "",
+            )
+            segments = [(i, segment_key(r2_key, state["etag"], i), 0) for i in range(1, seq)]
+        self._update_manifest(
+            r2_key, local_path, state["etag"], base_size,
+            segments + [(seq, seg_key, len(data))], raw_size, encoding, part_size, part_md5,
+        )
+        shutil.copyfile(local_path, synced_path)
+        if self._file_cache:
+            self._file_cache.store(r2_key, local_path, state["etag"], seq)
+
+        self.upload_stats["delta_uploads"] += 1
+        self.upload_stats["bytes"] += len(data)
+        print(f"[远程存储] 已上传增量: {seg_key} ({len(pages)} 页，{len(data)} bytes)")
+        return True
 
     def _upload_sqlite(self, date: Optional[str] = None, db_type: str = "news") -> bool:
         """
         上传本地 SQLite 文件到远程存储
 
+        启用增量上传且有比较基准时只上传变化的页，否则上传完整数据库（并清理旧的增量段）。
+
         Args:
             date: 日期字符串
             db_type: 数据库类型 ("news" 或 "rss")
@@ -261,34 +672,61 @@ class RemoteStorageBackend(StorageBackend):
             print(f"[远程存储] 本地文件不存在，无法上传: {local_path}")
             return False
 
+        state = self._sync_state.get(r2_key)
+        if self.delta_upload and state:
+            try:
+                if self._upload_delta(r2_key, local_path, state):
+                    return True
+            except Exception as e:
+                print(f"[远程存储] 增量上传失败，改为上传完整数据库: {e}")
+
         try:
+            # 清单中的旧条目（上传完整数据库后，旧基础快照的增量段随之失效）
+            old_entry = self._get_manifest()["objects"].get(r2_key)
+
             # 获取本地文件大小
             local_size = local_path.stat().st_size
             print(f"[远程存储] 准备上传: {local_path} ({local_size} bytes) -> {r2_key}")
 
-            # 读取文件内容为 bytes 后上传
-            # 避免传入文件对象时 requests 库使用 chunked transfer encoding
-            # 腾讯云 COS 等 S3 兼容服务可能无法正确处理 chunked encoding
-            with open(local_path, 'rb') as f:
-                file_content = f.read()
-
-            # 使用 put_object 并明确设置 ContentLength，确保不使用 chunked encoding
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=r2_key,
-                Body=file_content,
-                ContentLength=local_size,
-                ContentType='application/x-sqlite3',
+            # 分段读取后上传（大文件使用 multipart upload），每个请求明确设置 ContentLength
+            # 避免 requests 库使用 chunked transfer encoding（腾讯云 COS 等 S3 兼容服务可能无法正确处理）
+            # 启用对象压缩时边读边压缩，Content-Type 标记编码
+            response = upload_file(
+                self.s3_client, self.bucket_name, r2_key, local_path,
+                content_type=RAW_CONTENT_TYPE,
+                part_size=self.transfer_part_size,
+                max_workers=self.transfer_workers,
+                encoding=self.object_compression or None,
             )
-            print(f"[远程存储] 已上传: {local_path} -> {r2_key}")
-
-            # 验证上传成功
-            if self._check_object_exists(r2_key):
-                print(f"[远程存储] 上传验证成功: {r2_key}")
-                return True
+            object_size = response["Size"]
+            if self.object_compression:
+                print(f"[远程存储] 已上传: {local_path} -> {r2_key} ({self.object_compression} 压缩后 {object_size} bytes)")
             else:
-                print(f"[远程存储] 上传验证失败: 文件未在远程存储中找到")
-                return False
+                print(f"[远程存储] 已上传: {local_path} -> {r2_key}")
+            self.upload_stats["uploads"] += 1
+            self.upload_stats["bytes"] += object_size
+
+            # 上传内容即远程最新版本：更新本地缓存和同步状态，旧基础快照的增量段随之失效
+            etag = response.get("ETag", "")
+            if self._file_cache:
+                self._file_cache.store(r2_key, local_path, etag)
+            self._sync_state[r2_key] = {"etag": etag, "segment": 0, "delta_bytes": 0}
+            if self.delta_upload and etag:
+                synced_path = self._get_synced_path(r2_key)
+                synced_path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(local_path, synced_path)
+            self._update_manifest(
+                r2_key, local_path, etag, object_size, [], local_size, self.object_compression,
+                response.get("PartSize", 0), response.get("PartMD5s"),
+            )
+            if old_entry and old_entry.get("etag") != etag and old_entry.get("segments"):
+                try:
+                    self._delete_stale_segments(r2_key, old_entry["segments"])
+                except Exception as e:
+                    print(f"[远程存储] 删除失效的增量段失败: {e}")
+
+            # put_object / complete_multipart_upload 成功返回即已写入，清单记录了新的 ETag，不再 head_object 验证
+            return True
 
         except Exception as e:
             print(f"[远程存储] 上传失败: {e}")
@@ -316,45 +754,27 @@ class RemoteStorageBackend(StorageBackend):
             if not local_path.exists():
                 self._download_sqlite(date, db_type)
 
-            conn = sqlite3.connect(db_path)
-            conn.row_factory = sqlite3.Row
+            # 数据库文件会整体上传，使用回滚日志，避免数据停留在 -wal 文件中；其余 PRAGMA 沿用配置
+            conn = connect_sqlite(db_path, {**self.sqlite_config, "journal_mode": "delete"})
             self._init_tables(conn, db_type)
             self._db_connections[db_path] = conn
 
         return self._db_connections[db_path]
 
-    def _get_schema_path(self, db_type: str = "news") -> Path:
-        """
-        获取 schema.sql 文件路径
-
-        Args:
-            db_type: 数据库类型 ("news" 或 "rss")
-
-        Returns:
-            schema 文件路径
-        """
-        if db_type == "rss":
-            return Path(__file__).parent / "rss_schema.sql"
-        return Path(__file__).parent / "schema.sql"
-
     def _init_tables(self, conn: sqlite3.Connection, db_type: str = "news") -> None:
         """
-        从 schema.sql 初始化数据库表结构
+        初始化数据库表结构，旧版本数据库按需升级
+
+        按 PRAGMA user_version 执行迁移（见 migrations.py），已是最新版本时跳过。
+        新建的热榜数据库按 rank_history 配置选择排名历史布局。
 
         Args:
             conn: 数据库连接
             db_type: 数据库类型 ("news" 或 "rss")
         """
-        schema_path = self._get_schema_path(db_type)
-
-        if schema_path.exists():
-            with open(schema_path, "r", encoding="utf-8") as f:
-                schema_sql = f.read()
-            conn.executescript(schema_sql)
-        else:
-            raise FileNotFoundError(f"Schema file not found: {schema_path}")
-
-        conn.commit()
+        migrate(conn, db_type)
+        if db_type == "news":
+            apply_rank_history_format(conn, self.rank_history, log_prefix="[远程存储] ")
 
     def save_news_data(self, data: NewsData) -> bool:
         """
@@ -392,103 +812,38 @@ class RemoteStorageBackend(StorageBackend):
                         updated_at = excluded.updated_at
                 """, (source_id, source_name, now_str))
 
+            # 计算榜单指纹，内容与上次写入相同的平台只记录"未变化"标记
+            fingerprints = {
+                source_id: compute_news_fingerprint(source_id, news_list)
+                for source_id, news_list in data.items.items()
+            }
+            unchanged = find_unchanged_platforms(cursor, fingerprints, data.crawl_time)
+
             # 统计计数器
             new_count = 0
             updated_count = 0
             title_changed_count = 0
             success_sources = []
+            changed_items: Dict[str, List[NewsItem]] = {}
 
             for source_id, news_list in data.items.items():
                 success_sources.append(source_id)
 
-                for item in news_list:
-                    try:
-                        # 标准化 URL（去除动态参数，如微博的 band_rank）
-                        normalized_url = normalize_url(item.url, source_id) if item.url else ""
-
-                        # 检查是否已存在（通过标准化 URL + platform_id）
-                        if normalized_url:
-                            cursor.execute("""
-                                SELECT id, title FROM news_items
-                                WHERE url = ? AND platform_id = ?
-                            """, (normalized_url, source_id))
-                            existing = cursor.fetchone()
+                if source_id in unchanged:
+                    # URL 为空的条目不做去重，仍逐次写入新行
+                    empty_url_items = split_unchanged_items(news_list)
+                    if empty_url_items:
+                        changed_items[source_id] = empty_url_items
+                    continue
 
-                            if existing:
-                                # 已存在，更新记录
-                                existing_id, existing_title = existing
-
-                                # 检查标题是否变化
-                                if existing_title != item.title:
-                                    # 记录标题变更
-                                    cursor.execute("""
-                                        INSERT INTO title_changes
-                                        (news_item_id, old_title, new_title, changed_at)
-                                        VALUES (?, ?, ?, ?)
-                                    """, (existing_id, existing_title, item.title, now_str))
-                                    title_changed_count += 1
-
-                                # 记录排名历史
-                                cursor.execute("""
-                                    INSERT INTO rank_history
-                                    (news_item_id, rank, crawl_time, created_at)
-                                    VALUES (?, ?, ?, ?)
-                                """, (existing_id, item.rank, data.crawl_time, now_str))
+                # 榜单已变化：先回填之前的未变化标记
+                materialize_unchanged_markers(cursor, source_id)
+                changed_items[source_id] = news_list
 
-                                # 更新现有记录
-                                cursor.execute("""
-                                    UPDATE news_items SET
-                                        title = ?,
-                                        rank = ?,
-                                        mobile_url = ?,
-                                        last_crawl_time = ?,
-                                        crawl_count = crawl_count + 1,
-                                        updated_at = ?
-                                    WHERE id = ?
-                                """, (item.title, item.rank, item.mobile_url,
-                                      data.crawl_time, now_str, existing_id))
-                                updated_count += 1
-                            else:
-                                # 不存在，插入新记录（存储标准化后的 URL）
-                                cursor.execute("""
-                                    INSERT INTO news_items
-                                    (title, platform_id, rank, url, mobile_url,
-                                     first_crawl_time, last_crawl_time, crawl_count,
-                                     created_at, updated_at)
-                                    VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, ?)
-                                """, (item.title, source_id, item.rank, normalized_url,
-                                      item.mobile_url, data.crawl_time, data.crawl_time,
-                                      now_str, now_str))
-                                new_id = cursor.lastrowid
-                                # 记录初始排名
-                                cursor.execute("""
-                                    INSERT INTO rank_history
-                                    (news_item_id, rank, crawl_time, created_at)
-                                    VALUES (?, ?, ?, ?)
-                                """, (new_id, item.rank, data.crawl_time, now_str))
-                                new_count += 1
-                        else:
-                            # URL 为空的情况，直接插入（不做去重）
-                            cursor.execute("""
-                                INSERT INTO news_items
-                                (title, platform_id, rank, url, mobile_url,
-                                 first_crawl_time, last_crawl_time, crawl_count,
-                                 created_at, updated_at)
-                                VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, ?)
-                            """, (item.title, source_id, item.rank, "",
-                                  item.mobile_url, data.crawl_time, data.crawl_time,
-                                  now_str, now_str))
-                            new_id = cursor.lastrowid
-                            # 记录初始排名
-                            cursor.execute("""
-                                INSERT INTO rank_history
-                                (news_item_id, rank, crawl_time, created_at)
-                                VALUES (?, ?, ?, ?)
-                            """, (new_id, item.rank, data.crawl_time, now_str))
-                            new_count += 1
-
-                    except sqlite3.Error as e:
-                        print(f"[远程存储] 保存新闻条目失败 [{item.title[:30]}...]: {e}")
+            # 写入新闻条目、标题变更和排名历史
+            new_count, updated_count, title_changed_count = upsert_news_items(
+                cursor, changed_items, data.crawl_time, now_str, log_prefix="[远程存储] "
+            )
 
             total_items = new_count + updated_count
 
@@ -529,6 +884,22 @@ class RemoteStorageBackend(StorageBackend):
                         VALUES (?, ?, 'failed')
                     """, (crawl_record_id, failed_id))
 
+                # 记录未变化标记
+                record_unchanged_markers(cursor, crawl_record_id, unchanged)
+
+            # 保存实际写入平台的指纹
+            save_platform_fingerprints(
+                cursor,
+                {pid: fp for pid, fp in fingerprints.items() if pid not in unchanged},
+                data.crawl_time,
+                now_str,
+            )
+
+            # 增量维护当日关键词统计（临时库随本次运行上传，配置变化时直接重建）
+            maintain_keyword_stats(
+                cursor, data.crawl_time, now_str, rebuild_inline=True, log_prefix="[远程存储] "
+            )
+
             conn.commit()
 
             # 查询合并后的总记录数
@@ -542,6 +913,8 @@ class RemoteStorageBackend(StorageBackend):
                 log_parts.append(f"更新 {updated_count} 条")
             if title_changed_count > 0:
                 log_parts.append(f"标题变更 {title_changed_count} 条")
+            if unchanged:
+                log_parts.append(f"未变化 {len(unchanged)} 个平台")
             log_parts.append(f"(去重后总计: {final_count} 条)")
             print("，".join(log_parts))
 
@@ -563,46 +936,26 @@ class RemoteStorageBackend(StorageBackend):
             conn = self._get_connection(date)
             cursor = conn.cursor()
 
-            # 获取所有新闻数据（包含 id 用于查询排名历史）
-            cursor.execute("""
+            pending = load_pending_unchanged(cursor)
+            rank_reader = RankListReader(cursor)
+
+            # 获取所有新闻数据，排名历史随主查询逐行读取（兼容逐行 / 紧凑两种排名布局）
+            cursor.execute(f"""
                 SELECT n.id, n.title, n.platform_id, p.name as platform_name,
                        n.rank, n.url, n.mobile_url,
-                       n.first_crawl_time, n.last_crawl_time, n.crawl_count
+                       n.first_crawl_time, n.last_crawl_time, n.crawl_count,
+                       {rank_reader.column} as ranks
                 FROM news_items n
                 LEFT JOIN platforms p ON n.platform_id = p.id
-                ORDER BY n.platform_id, n.last_crawl_time
+                ORDER BY n.platform_id, n.last_crawl_time, n.id
             """)
 
-            rows = cursor.fetchall()
-            if not rows:
-                return None
-
-            # 收集所有 news_item_id
-            news_ids = [row[0] for row in rows]
-
-            # 批量查询排名历史
-            rank_history_map: Dict[int, List[int]] = {}
-            if news_ids:
-                placeholders = ",".join("?" * len(news_ids))
-                cursor.execute(f"""
-                    SELECT news_item_id, rank FROM rank_history
-                    WHERE news_item_id IN ({placeholders})
-                    ORDER BY news_item_id, crawl_time
-                """, news_ids)
-                for rh_row in cursor.fetchall():
-                    news_id, rank = rh_row[0], rh_row[1]
-                    if news_id not in rank_history_map:
-                        rank_history_map[news_id] = []
-                    if rank not in rank_history_map[news_id]:
-                        rank_history_map[news_id].append(rank)
-
             # 按 platform_id 分组
             items: Dict[str, List[NewsItem]] = {}
             id_to_name: Dict[str, str] = {}
             crawl_date = self._format_date_folder(date)
 
-            for row in rows:
-                news_id = row[0]
+            for row in cursor:
                 platform_id = row[2]
                 title = row[1]
                 platform_name = row[3] or platform_id
@@ -612,8 +965,11 @@ class RemoteStorageBackend(StorageBackend):
                 if platform_id not in items:
                     items[platform_id] = []
 
-                # 获取排名历史，如果没有则使用当前排名
-                ranks = rank_history_map.get(news_id, [row[4]])
+                # 获取排名历史（按首次出现顺序去重），如果没有则使用当前排名
+                ranks = rank_reader.parse(row[10], row[4])
+
+                # 还原"未变化"标记对应的出现次数和最后出现时间
+                last_time, count = apply_pending_unchanged(pending, platform_id, row[0], row[8], row[9])
 
                 items[platform_id].append(NewsItem(
                     title=title,
@@ -622,13 +978,18 @@ class RemoteStorageBackend(StorageBackend):
                     rank=row[4],
                     url=row[5] or "",
                     mobile_url=row[6] or "",
-                    crawl_time=row[8],  # last_crawl_time
+                    crawl_time=last_time,
                     ranks=ranks,
                     first_time=row[7],  # first_crawl_time
-                    last_time=row[8],   # last_crawl_time
-                    count=row[9],       # crawl_count
+                    last_time=last_time,
+                    count=count,
                 ))
 
+            if not items:
+                return None
+
+            # 标记条目按还原后的最后出现时间排序
+            sort_by_restored_time(items, pending)
             final_items = items
 
             # 获取失败的来源
@@ -662,6 +1023,30 @@ class RemoteStorageBackend(StorageBackend):
             print(f"[远程存储] 读取数据失败: {e}")
             return None
 
+    def get_keyword_stats_data(
+        self, date: Optional[str] = None
+    ) -> Optional[Tuple[NewsData, Dict[str, int]]]:
+        """
+        获取入库时预计算的当日关键词统计
+
+        Args:
+            date: 日期字符串，默认为今天
+
+        Returns:
+            (命中条目的 NewsData, {platform_id: 当天去重标题数})；
+            统计不可用时返回 None（调用方回退到全量统计）
+        """
+        rules = load_keyword_rules()
+        if rules is None:
+            return None
+
+        try:
+            conn = self._get_connection(date)
+            return read_keyword_stats(conn.cursor(), rules[2], self._format_date_folder(date))
+        except Exception as e:
+            print(f"[远程存储] 读取关键词统计失败: {e}")
+            return None
+
     def get_latest_crawl_data(self, date: Optional[str] = None) -> Optional[NewsData]:
         """获取最新一次抓取的数据"""
         try:
@@ -681,25 +1066,30 @@ class RemoteStorageBackend(StorageBackend):
 
             latest_time = time_row[0]
 
+            # 最新一次抓取中榜单未变化的平台，按上一次实际写入时间补充读取
+            pending = load_pending_unchanged(cursor)
+            conditions = ["n.last_crawl_time = ?"]
+            params = [latest_time]
+            for platform_id, base_time in get_latest_unchanged_boards(pending, latest_time):
+                conditions.append("(n.platform_id = ? AND n.last_crawl_time = ? AND n.url != '')")
+                params.extend([platform_id, base_time])
+
             # 获取该时间的新闻数据，通过 JOIN 获取平台名称
-            cursor.execute("""
+            cursor.execute(f"""
                 SELECT n.title, n.platform_id, p.name as platform_name,
                        n.rank, n.url, n.mobile_url,
-                       n.first_crawl_time, n.last_crawl_time, n.crawl_count
+                       n.first_crawl_time, n.last_crawl_time, n.crawl_count, n.id
                 FROM news_items n
                 LEFT JOIN platforms p ON n.platform_id = p.id
-                WHERE n.last_crawl_time = ?
-            """, (latest_time,))
-
-            rows = cursor.fetchall()
-            if not rows:
-                return None
+                WHERE {" OR ".join(conditions)}
+                ORDER BY n.id
+            """, params)
 
             items: Dict[str, List[NewsItem]] = {}
             id_to_name: Dict[str, str] = {}
             crawl_date = self._format_date_folder(date)
 
-            for row in rows:
+            for row in cursor:
                 platform_id = row[1]
                 platform_name = row[2] or platform_id
                 id_to_name[platform_id] = platform_name
@@ -707,6 +1097,9 @@ class RemoteStorageBackend(StorageBackend):
                 if platform_id not in items:
                     items[platform_id] = []
 
+                # 还原"未变化"标记对应的出现次数和最后出现时间
+                last_time, count = apply_pending_unchanged(pending, platform_id, row[9], row[7], row[8])
+
                 items[platform_id].append(NewsItem(
                     title=row[0],
                     source_id=platform_id,
@@ -714,13 +1107,16 @@ class RemoteStorageBackend(StorageBackend):
                     rank=row[3],
                     url=row[4] or "",
                     mobile_url=row[5] or "",
-                    crawl_time=row[7],  # last_crawl_time
+                    crawl_time=last_time,
                     ranks=[row[3]],
                     first_time=row[6],  # first_crawl_time
-                    last_time=row[7],   # last_crawl_time
-                    count=row[8],       # crawl_count
+                    last_time=last_time,
+                    count=count,
                 ))
 
+            if not items:
+                return None
+
             # 获取失败的来源（针对最新一次抓取）
             cursor.execute("""
                 SELECT css.platform_id
@@ -743,6 +1139,53 @@ class RemoteStorageBackend(StorageBackend):
             print(f"[远程存储] 获取最新数据失败: {e}")
             return None
 
+    @staticmethod
+    def _all_titles_as_new(current_data: NewsData) -> Dict[str, Dict]:
+        """当天没有历史数据时，当前批次的所有标题都是新增"""
+        new_titles = {}
+        for source_id, news_list in current_data.items.items():
+            new_titles[source_id] = {item.title: item for item in news_list}
+        return new_titles
+
+    def detect_latest_new_titles(
+        self,
+        platform_ids: Optional[List[str]] = None,
+        date: Optional[str] = None,
+    ) -> Optional[Dict[str, Dict]]:
+        """
+        检测已入库的最新批次中的新增标题（SQL 端比较，不加载当天全部数据）
+
+        Args:
+            platform_ids: 平台过滤，None 表示全部平台
+            date: 日期字符串，默认为今天
+
+        Returns:
+            新增标题 {source_id: {title: title_data}}，查询失败时返回 None
+        """
+        try:
+            conn = self._get_connection(date)
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT crawl_time FROM crawl_records
+                ORDER BY crawl_time DESC
+                LIMIT 1
+            """)
+            time_row = cursor.fetchone()
+            if not time_row:
+                return {}
+            latest_time = time_row[0]
+
+            # 只有一个抓取批次时，不应该有"新增"标题
+            if not has_titles_before(cursor, latest_time, platform_ids):
+                return {}
+
+            return query_latest_new_titles(cursor, latest_time, platform_ids)
+
+        except Exception as e:
+            print(f"[远程存储] 检测最新批次新增标题失败: {e}")
+            return None
+
     def detect_new_titles(self, current_data: NewsData) -> Dict[str, Dict]:
         """
         检测新增的标题
@@ -751,33 +1194,33 @@ class RemoteStorageBackend(StorageBackend):
         关键逻辑：只有在历史批次中从未出现过的标题才算新增。
         """
         try:
-            historical_data = self.get_today_all_data(current_data.date)
+            conn = self._get_connection(current_data.date)
+            cursor = conn.cursor()
 
-            if not historical_data:
-                new_titles = {}
-                for source_id, news_list in current_data.items.items():
-                    new_titles[source_id] = {item.title: item for item in news_list}
-                return new_titles
+            # 没有历史数据，所有都是新的
+            cursor.execute("SELECT 1 FROM news_items LIMIT 1")
+            if cursor.fetchone() is None:
+                return self._all_titles_as_new(current_data)
 
             # 获取当前批次时间
             current_time = current_data.crawl_time
 
-            # 收集历史标题（first_time < current_time 的标题）
-            # 这样可以正确处理同一标题因 URL 变化而产生多条记录的情况
-            historical_titles: Dict[str, set] = {}
-            for source_id, news_list in historical_data.items.items():
-                historical_titles[source_id] = set()
-                for item in news_list:
-                    first_time = getattr(item, 'first_time', item.crawl_time)
-                    if first_time < current_time:
-                        historical_titles[source_id].add(item.title)
-
-            # 检查是否有历史数据
-            has_historical_data = any(len(titles) > 0 for titles in historical_titles.values())
-            if not has_historical_data:
-                # 第一次抓取，没有"新增"概念
+            # 没有首次出现时间早于当前批次的标题：第一次抓取，没有"新增"概念
+            if not has_titles_before(cursor, current_time):
                 return {}
 
+            # 只查询当前批次的标题是否在更早批次出现过（索引定位，不加载当天全部数据）
+            # 同一标题因 URL 变化产生多条记录时，任意一条更早出现即为历史标题
+            historical_titles = query_historical_titles(
+                cursor,
+                {
+                    source_id: [item.title for item in news_list]
+                    for source_id, news_list in current_data.items.items()
+                },
+                current_time,
+            )
+
+            # 检测新增
             new_titles = {}
             for source_id, news_list in current_data.items.items():
                 hist_set = historical_titles.get(source_id, set())
@@ -914,6 +1357,24 @@ class RemoteStorageBackend(StorageBackend):
         if downloaded_files:
             downloaded_files.clear()
 
+        download_stats = getattr(self, "download_stats", None)
+        if download_stats and download_stats["requests"]:
+            print(
+                f"[远程存储] 下载统计: {download_stats['requests']} 次请求，"
+                f"缓存命中 {download_stats['cache_hits']} 次，"
+                f"下载 {download_stats['bytes'] / 1024 / 1024:.2f} MB"
+            )
+            download_stats.update(requests=0, cache_hits=0, bytes=0)
+
+        upload_stats = getattr(self, "upload_stats", None)
+        if upload_stats and (upload_stats["uploads"] or upload_stats["delta_uploads"]):
+            print(
+                f"[远程存储] 上传统计: 完整上传 {upload_stats['uploads']} 次，"
+                f"增量上传 {upload_stats['delta_uploads']} 次，"
+                f"上传 {upload_stats['bytes'] / 1024 / 1024:.2f} MB"
+            )
+            upload_stats.update(uploads=0, delta_uploads=0, bytes=0)
+
     def cleanup_old_data(self, retention_days: int) -> int:
         """
         清理远程存储上的过期数据
@@ -946,11 +1407,11 @@ class RemoteStorageBackend(StorageBackend):
                 for obj in page['Contents']:
                     key = obj['Key']
 
-                    # 解析日期（格式: news/YYYY-MM-DD.db 或 news/YYYY年MM月DD日.db）
+                    # 解析日期（格式: news/YYYY-MM-DD.db 或 news/YYYY年MM月DD日.db，含其增量段 .db.delta/...）
                     folder_date = None
                     try:
                         # ISO 格式: news/YYYY-MM-DD.db
-                        date_match = re.match(r'news/(\d{4})-(\d{2})-(\d{2})\.db$', key)
+                        date_match = re.match(r'news/(\d{4})-(\d{2})-(\d{2})\.db(?:\.delta/.*)?$', key)
                         if date_match:
                             folder_date = datetime(
                                 int(date_match.group(1)),
@@ -961,7 +1422,7 @@ class RemoteStorageBackend(StorageBackend):
                             date_str = f"{date_match.group(1)}-{date_match.group(2)}-{date_match.group(3)}"
                         else:
                             # 旧中文格式: news/YYYY年MM月DD日.db
-                            date_match = re.match(r'news/(\d{4})年(\d{2})月(\d{2})日\.db$', key)
+                            date_match = re.match(r'news/(\d{4})年(\d{2})月(\d{2})日\.db(?:\.delta/.*)?$', key)
                             if date_match:
                                 folder_date = datetime(
                                     int(date_match.group(1)),
@@ -991,6 +1452,18 @@ class RemoteStorageBackend(StorageBackend):
                     except Exception as e:
                         print(f"[远程存储] 批量删除失败: {e}")
 
+                # 从清单中移除已删除的数据库
+                deleted_keys = {obj['Key'] for obj in objects_to_delete}
+
+                def remove_deleted(manifest: Dict) -> None:
+                    for key in deleted_keys & set(manifest["objects"]):
+                        del manifest["objects"][key]
+
+                try:
+                    self._commit_manifest(remove_deleted)
+                except Exception as e:
+                    print(f"[远程存储] 更新清单失败: {e}")
+
                 deleted_count = len(deleted_dates)
                 for date_str in sorted(deleted_dates):
                     print(f"[远程存储] 清理过期数据: news/{date_str}.db")
@@ -1183,8 +1656,8 @@ class RemoteStorageBackend(StorageBackend):
             if record_row:
                 crawl_record_id = record_row[0]
 
-                # 记录成功的源
-                for feed_id in data.items.keys():
+                # 记录成功的源（未变化跳过的源也视为成功）
+                for feed_id in list(data.items.keys()) + list(data.skipped_ids):
                     cursor.execute("""
                         INSERT OR REPLACE INTO rss_crawl_status
                         (crawl_record_id, feed_id, status)
@@ -1204,12 +1677,40 @@ class RemoteStorageBackend(StorageBackend):
                         VALUES (?, ?, 'failed')
                     """, (crawl_record_id, failed_id))
 
+            # 未变化的源：不重新写入条目，只把上一次抓取到的条目顺延到本次抓取时间并计入抓取次数，
+            # 保证"当前榜单"模式（按 last_crawl_time 读取）仍能看到这些源
+            for feed_id in data.skipped_ids:
+                cursor.execute("""
+                    UPDATE rss_items SET last_crawl_time = ?, crawl_count = crawl_count + 1
+                    WHERE feed_id = ? AND last_crawl_time = (
+                        SELECT MAX(last_crawl_time) FROM rss_items WHERE feed_id = ?
+                    )
+                """, (data.crawl_time, feed_id, feed_id))
+
+            # 保存缓存校验信息
+            for feed_id, validator in data.validators.items():
+                cursor.execute("""
+                    INSERT INTO rss_feed_validators
+                    (feed_id, feed_url, etag, last_modified, content_hash, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(feed_id) DO UPDATE SET
+                        feed_url = excluded.feed_url,
+                        etag = excluded.etag,
+                        last_modified = excluded.last_modified,
+                        content_hash = excluded.content_hash,
+                        updated_at = excluded.updated_at
+                """, (feed_id, validator.get("feed_url", ""), validator.get("etag", ""),
+                      validator.get("last_modified", ""), validator.get("content_hash", ""),
+                      now_str))
+
             conn.commit()
 
             # 输出统计日志
             log_parts = [f"[远程存储] RSS 处理完成：新增 {new_count} 条"]
             if updated_count > 0:
                 log_parts.append(f"更新 {updated_count} 条")
+            if data.skipped_ids:
+                log_parts.append(f"未变化 {len(data.skipped_ids)} 个源")
             print("，".join(log_parts))
 
             # 上传到远程存储
@@ -1323,32 +1824,36 @@ class RemoteStorageBackend(StorageBackend):
             新增的 RSS 条目 {feed_id: [RSSItem, ...]}
         """
         try:
-            # 获取历史数据
-            historical_data = self.get_rss_data(current_data.date)
+            conn = self._get_connection(current_data.date, db_type="rss")
+            cursor = conn.cursor()
 
-            if not historical_data:
-                # 没有历史数据，所有都是新的
+            # 没有历史数据，所有都是新的
+            cursor.execute("SELECT 1 FROM rss_items LIMIT 1")
+            if cursor.fetchone() is None:
                 return current_data.items.copy()
 
             # 获取当前批次时间
             current_time = current_data.crawl_time
 
-            # 收集历史 URL（first_time < current_time 的条目）
-            historical_urls: Dict[str, set] = {}
-            for feed_id, rss_list in historical_data.items.items():
-                historical_urls[feed_id] = set()
-                for item in rss_list:
-                    first_time = getattr(item, 'first_time', item.crawl_time)
-                    if first_time < current_time:
-                        if item.url:
-                            historical_urls[feed_id].add(item.url)
-
-            # 检查是否有历史数据
-            has_historical_data = any(len(urls) > 0 for urls in historical_urls.values())
-            if not has_historical_data:
-                # 第一次抓取，没有"新增"概念
+            # 没有首次出现时间早于当前批次的条目：第一次抓取，没有"新增"概念
+            cursor.execute("""
+                SELECT 1 FROM rss_items
+                WHERE first_crawl_time < ? AND url != ''
+                LIMIT 1
+            """, (current_time,))
+            if cursor.fetchone() is None:
                 return {}
 
+            # 只查询当前批次的 URL 是否在更早批次出现过
+            historical_urls = query_historical_rss_urls(
+                cursor,
+                {
+                    feed_id: [item.url for item in rss_list]
+                    for feed_id, rss_list in current_data.items.items()
+                },
+                current_time,
+            )
+
             # 检测新增
             new_items: Dict[str, List[RSSItem]] = {}
             for feed_id, rss_list in current_data.items.items():
@@ -1366,6 +1871,42 @@ class RemoteStorageBackend(StorageBackend):
             print(f"[远程存储] 检测新 RSS 条目失败: {e}")
             return {}
 
+    def get_rss_feed_validators(self, date: Optional[str] = None) -> Dict[str, Dict[str, str]]:
+        """
+        获取 RSS 源的缓存校验信息（用于条件请求）
+
+        校验信息保存在当日 RSS 数据库中，跨天后自动失效，
+        保证每天的数据库都会完整写入一次各源的条目。
+
+        Args:
+            date: 日期字符串（YYYY-MM-DD），默认为今天
+
+        Returns:
+            {feed_id: {feed_url, etag, last_modified, content_hash}}
+        """
+        try:
+            conn = self._get_connection(date, db_type="rss")
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT feed_id, feed_url, etag, last_modified, content_hash
+                FROM rss_feed_validators
+            """)
+
+            return {
+                row[0]: {
+                    "feed_url": row[1] or "",
+                    "etag": row[2] or "",
+                    "last_modified": row[3] or "",
+                    "content_hash": row[4] or "",
+                }
+                for row in cursor.fetchall()
+            }
+
+        except Exception as e:
+            print(f"[远程存储] 读取 RSS 缓存校验信息失败: {e}")
+            return {}
+
     def get_latest_rss_data(self, date: Optional[str] = None) -> Optional[RSSData]:
         """
         获取最新一次抓取的 RSS 数据（当前榜单模式）
@@ -1468,63 +2009,72 @@ class RemoteStorageBackend(StorageBackend):
             # Python 关闭时可能会出错，忽略即可
             pass
 
-    def pull_recent_days(self, days: int, local_data_dir: str = "output") -> int:
+    def sync_recent_days(
+        self,
+        days: int,
+        local_data_dir: str = "output",
+        max_workers: int = DEFAULT_PULL_WORKERS,
+    ) -> Dict:
         """
-        从远程拉取最近 N 天的数据到本地
+        从远程并行拉取最近 N 天的 news / rss 数据库到本地（{local_data_dir}/{type}/{date}.db）
+
+        一次列出远程对象，只下载缺失或远程已变化的文件，支持断点续传（见 remote_sync.py）。
 
         Args:
             days: 拉取天数
             local_data_dir: 本地数据目录
+            max_workers: 并发下载的文件数
 
         Returns:
-            成功拉取的数据库文件数量
+            拉取结果（每个文件的状态、下载字节数和耗时）
         """
-        if days <= 0:
-            return 0
-
-        local_dir = Path(local_data_dir)
-        local_dir.mkdir(parents=True, exist_ok=True)
-
-        pulled_count = 0
         now = self._get_configured_time()
+        dates = [(now - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(max(days, 0))]
 
         print(f"[远程存储] 开始拉取最近 {days} 天的数据...")
+        result = pull_databases(
+            self.s3_client, self.bucket_name, local_data_dir, dates, max_workers=max_workers
+        )
+        print(
+            f"[远程存储] 拉取完成，下载 {result['downloaded']} 个数据库文件，"
+            f"跳过 {result['skipped']} 个，失败 {result['failed']} 个，"
+            f"共 {result['bytes'] / 1024 / 1024:.2f} MB，耗时 {result['seconds']:.2f}s"
+        )
+        return result
 
-        for i in range(days):
-            date = now - timedelta(days=i)
-            date_str = date.strftime("%Y-%m-%d")
-
-            # 本地目标路径
-            local_date_dir = local_dir / date_str
-            local_db_path = local_date_dir / "news.db"
+    def pull_recent_days(
+        self,
+        days: int,
+        local_data_dir: str = "output",
+        max_workers: int = DEFAULT_PULL_WORKERS,
+    ) -> int:
+        """
+        从远程拉取最近 N 天的数据到本地
 
-            # 如果本地已存在，跳过
-            if local_db_path.exists():
-                print(f"[远程存储] 跳过（本地已存在）: {date_str}")
-                continue
+        Args:
+            days: 拉取天数
+            local_data_dir: 本地数据目录
+            max_workers: 并发下载的文件数
 
-            # 远程对象键
-            remote_key = f"news/{date_str}.db"
+        Returns:
+            成功拉取的数据库文件数量
+        """
+        if days <= 0:
+            return 0
+        return self.sync_recent_days(days, local_data_dir, max_workers)["downloaded"]
 
-            # 检查远程是否存在
-            if not self._check_object_exists(remote_key):
-                print(f"[远程存储] 跳过（远程不存在）: {date_str}")
-                continue
+    def get_remote_index(self, db_types: Tuple[str, ...] = ("news", "rss")) -> Tuple[Dict[str, Dict], str]:
+        """
+        获取远程数据库索引（优先读取存储桶清单：一次 GET 加每种类型一次小列举检查较新的日期；
+        清单不存在或过期时列举对象）
 
-            # 下载（使用 get_object + iter_chunks 处理 chunked encoding）
-            try:
-                local_date_dir.mkdir(parents=True, exist_ok=True)
-                response = self.s3_client.get_object(Bucket=self.bucket_name, Key=remote_key)
-                with open(local_db_path, 'wb') as f:
-                    for chunk in response['Body'].iter_chunks(chunk_size=1024*1024):
-                        f.write(chunk)
-                print(f"[远程存储] 已拉取: {remote_key} -> {local_db_path}")
-                pulled_count += 1
-            except Exception as e:
-                print(f"[远程存储] 拉取失败 ({date_str}): {e}")
+        Args:
+            db_types: 数据库类型
 
-        print(f"[远程存储] 拉取完成，共下载 {pulled_count} 个数据库文件")
-        return pulled_count
+        Returns:
+            ({对象键: {"db_type", "date", "size", "etag", "segments", "rows"}}, 来源 "manifest" / "listing")
+        """
+        return load_remote_index(self.s3_client, self.bucket_name, db_types)
 
     def list_remote_dates(self) -> List[str]:
         """
@@ -1533,24 +2083,9 @@ class RemoteStorageBackend(StorageBackend):
         Returns:
             日期字符串列表（YYYY-MM-DD 格式）
         """
-        dates = []
-
         try:
-            paginator = self.s3_client.get_paginator('list_objects_v2')
-            pages = paginator.paginate(Bucket=self.bucket_name, Prefix="news/")
-
-            for page in pages:
-                if 'Contents' not in page:
-                    continue
-
-                for obj in page['Contents']:
-                    key = obj['Key']
-                    # 解析日期
-                    date_match = re.match(r'news/(\d{4}-\d{2}-\d{2})\.db$', key)
-                    if date_match:
-                        dates.append(date_match.group(1))
-
-            return sorted(dates, reverse=True)
+            databases, _ = self.get_remote_index(("news",))
+            return sorted({info["date"] for info in databases.values()}, reverse=True)
 
         except Exception as e:
             print(f"[远程存储] 列出远程日期失败: {e}")
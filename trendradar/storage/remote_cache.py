@@ -0,0 +1,160 @@
+# coding=utf-8
+"""
+远程 SQLite 文件的本地缓存（按 ETag 校验）
+
+远程存储后端每次运行都需要当天数据库的本地副本。缓存保存最近下载 / 上传的对象：
+- 按对象键存放：{cache_dir}/{key}，旁边的 {key}.meta.json 记录 ETag、大小和已应用的增量段序号
+- 下载时带 IfNoneMatch 发起条件请求，远程未变化（304）时直接复用缓存，下载字节为 0
+- 上传成功后用上传内容和返回的 ETag 更新缓存，下次运行同样命中
+- 总大小超过上限时按最近使用时间（文件 mtime）淘汰
+
+缓存文件只读使用：后端把它复制到工作目录后再写入，缓存内容始终与远程某个 ETag 对应。
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+# 缓存默认容量上限
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+
+_META_SUFFIX = ".meta.json"
+
+
+class RemoteFileCache:
+    """
+    远程对象的本地缓存
+
+    同一进程内的操作串行执行；多进程共享同一目录时，写入先落临时文件再原子替换。
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_CACHE_BYTES):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 缓存目录
+            max_bytes: 容量上限（字节）
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        """对象键对应的缓存文件和元数据文件路径"""
+        path = self.cache_dir / key
+        return path, path.with_name(path.name + _META_SUFFIX)
+
+    def lookup(self, key: str) -> Optional[Tuple[Path, str, int]]:
+        """
+        查找缓存条目（文件大小与记录不符时视为无效并删除）
+
+        Args:
+            key: 对象键
+
+        Returns:
+            (缓存文件路径, ETag, 已应用的增量段序号)，不存在时返回 None
+        """
+        path, meta_path = self._paths(key)
+        with self._lock:
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                if path.stat().st_size != meta["size"]:
+                    raise ValueError("size mismatch")
+            except FileNotFoundError:
+                return None
+            except (OSError, ValueError, KeyError, TypeError):
+                self._remove_locked(key)
+                return None
+            return path, meta["etag"], meta.get("segment", 0)
+
+    def copy_to(self, key: str, dest: Path) -> bool:
+        """
+        把缓存文件复制到工作路径，并更新最近使用时间
+
+        Args:
+            key: 对象键
+            dest: 目标路径
+
+        Returns:
+            是否复制成功（缓存已被淘汰时返回 False）
+        """
+        path, _ = self._paths(key)
+        with self._lock:
+            try:
+                shutil.copyfile(path, dest)
+                os.utime(path)
+                return True
+            except OSError:
+                return False
+
+    def store(self, key: str, src: Path, etag: str, segment: int = 0) -> None:
+        """
+        用本地文件更新缓存条目
+
+        Args:
+            key: 对象键
+            src: 与远程对象内容一致的本地文件
+            etag: 远程对象的 ETag
+            segment: 已应用的增量段序号（见 sqlite_delta.py，0 表示只有基础快照）
+        """
+        if not etag:
+            return
+        path, meta_path = self._paths(key)
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+            os.close(fd)
+            try:
+                shutil.copyfile(src, tmp_name)
+                size = os.path.getsize(tmp_name)
+                # 先删除旧元数据：替换中途中断时条目不会与错误的 ETag 对应
+                meta_path.unlink(missing_ok=True)
+                os.replace(tmp_name, path)
+                tmp_meta = meta_path.with_name(meta_path.name + ".tmp")
+                with open(tmp_meta, "w", encoding="utf-8") as f:
+                    json.dump({"key": key, "etag": etag, "size": size, "segment": segment}, f)
+                os.replace(tmp_meta, meta_path)
+            finally:
+                Path(tmp_name).unlink(missing_ok=True)
+            self._evict_locked(keep=path)
+
+    def remove(self, key: str) -> None:
+        """删除缓存条目（远程对象已不存在时调用）"""
+        with self._lock:
+            self._remove_locked(key)
+
+    def _remove_locked(self, key: str) -> None:
+        """删除缓存条目（调用方已持有锁）"""
+        path, meta_path = self._paths(key)
+        for p in (meta_path, path):
+            try:
+                p.unlink()
+            except OSError:
+                pass
+
+    def _evict_locked(self, keep: Path) -> None:
+        """按最近使用时间淘汰条目，直到总大小不超过上限（不淘汰 keep）"""
+        entries = []
+        for meta_path in self.cache_dir.rglob(f"*{_META_SUFFIX}"):
+            path = meta_path.with_name(meta_path.name[:-len(_META_SUFFIX)])
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            self._remove_locked(path.relative_to(self.cache_dir).as_posix())
+            total -= size
@@ -0,0 +1,189 @@
+# coding=utf-8
+"""
+存储桶清单（manifest.json）
+
+写入方（远程存储后端）在存储桶根目录维护一个小的 JSON 清单，记录每个数据库对象：
+- 日期、类型、大小、ETag、属于当前基础快照的增量段（见 sqlite_delta.py）
+- 对象压缩编码和未压缩大小、上传分段大小和各分段 MD5（下载时逐段校验，见 remote_transfer.py）
+- 主要表的行数（上传时统计）
+
+每次上传数据库 / 增量段、清理过期数据后重写清单（单次 put_object，对读取方原子可见）。
+写入带条件：IfMatch 读取时的清单 ETag（清单不存在时 IfNoneMatch="*"），多个写入方同时更新时
+后写入的一方收到 412，重新读取清单、重新应用本次修改后重试，不会覆盖其他写入方的条目。
+不支持条件写入的存储服务（返回 501）退回无条件写入。
+
+读取方（日期列表、存储状态、拉取到本地）先读取清单，一次 GET 代替分页列举和逐个 head_object，
+再对每种类型做一次 MaxKeys 很小的列举，检查清单中最新日期之后是否还有数据库（未维护清单的写入方
+上传的新日期）；清单不存在、格式不符或缺少较新的日期时回退到 list_objects_v2（见 remote_sync.py）。
+下载时以清单中的 ETag 作 IfMatch，已有日期的对象被未维护清单的写入方改写时请求失败，再回退到列举。
+"""
+
+import json
+import re
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    from botocore.exceptions import ClientError
+except ImportError:
+    ClientError = Exception
+
+
+MANIFEST_KEY = "manifest.json"
+MANIFEST_VERSION = 1
+
+# 清单中统计行数的表
+ROW_COUNT_TABLES = {
+    "news": ("news_items", "crawl_records"),
+    "rss": ("rss_items",),
+}
+
+_DB_KEY_PATTERN = re.compile(r'^(news|rss)/(\d{4}-\d{2}-\d{2})\.db$')
+
+
+def parse_db_key(key: str) -> Optional[Tuple[str, str]]:
+    """解析数据库对象键，返回 (类型, 日期)，不是数据库对象时返回 None"""
+    match = _DB_KEY_PATTERN.match(key)
+    if not match:
+        return None
+    return match.group(1), match.group(2)
+
+
+def new_manifest() -> Dict:
+    """创建空清单"""
+    return {"version": MANIFEST_VERSION, "updated_at": "", "objects": {}}
+
+
+def read_manifest(client, bucket: str) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    读取存储桶清单及其 ETag（写入方据此条件写入）
+
+    Args:
+        client: boto3 S3 客户端
+        bucket: 存储桶名称
+
+    Returns:
+        (清单字典, ETag)；清单不存在时为 (None, None)，格式不符时为 (None, ETag)
+    """
+    try:
+        response = client.get_object(Bucket=bucket, Key=MANIFEST_KEY)
+        etag = response.get("ETag")
+        manifest = json.loads(response['Body'].read().decode("utf-8"))
+    except ClientError as e:
+        error_code = e.response.get("Error", {}).get("Code", "")
+        if error_code not in ("404", "NoSuchKey", "Not Found"):
+            print(f"[远程存储] 读取清单失败: {e}")
+        return None, None
+    except ValueError as e:
+        print(f"[远程存储] 清单格式错误: {e}")
+        return None, etag
+
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return None, etag
+    if not isinstance(manifest.get("objects"), dict):
+        return None, etag
+    return manifest, etag
+
+
+def load_manifest(client, bucket: str) -> Optional[Dict]:
+    """
+    读取存储桶清单
+
+    Args:
+        client: boto3 S3 客户端
+        bucket: 存储桶名称
+
+    Returns:
+        清单字典，不存在或格式不符时返回 None
+    """
+    return read_manifest(client, bucket)[0]
+
+
+def save_manifest(
+    client,
+    bucket: str,
+    manifest: Dict,
+    etag: Optional[str] = None,
+    conditional: bool = True,
+) -> str:
+    """
+    写入存储桶清单（更新时间戳，明确设置 ContentLength）
+
+    Args:
+        client: boto3 S3 客户端
+        bucket: 存储桶名称
+        manifest: 清单字典
+        etag: 读取清单时的 ETag（None 表示读取时清单不存在）
+        conditional: 是否条件写入（IfMatch etag / IfNoneMatch "*"）
+
+    Returns:
+        写入后的清单 ETag
+
+    Raises:
+        ClientError: 条件不满足（清单已被其他写入方更新，见 is_write_conflict）等
+    """
+    manifest["updated_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    body = json.dumps(manifest, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    kwargs = {}
+    if conditional:
+        if etag:
+            kwargs["IfMatch"] = etag
+        else:
+            kwargs["IfNoneMatch"] = "*"
+    response = client.put_object(
+        Bucket=bucket,
+        Key=MANIFEST_KEY,
+        Body=body,
+        ContentLength=len(body),
+        ContentType="application/json",
+        **kwargs,
+    )
+    return response.get("ETag", "")
+
+
+def _error_code(error: Exception) -> Tuple[str, Optional[int]]:
+    """ClientError 的错误码和 HTTP 状态码"""
+    response = getattr(error, "response", None) or {}
+    return (
+        response.get("Error", {}).get("Code", ""),
+        response.get("ResponseMetadata", {}).get("HTTPStatusCode"),
+    )
+
+
+def is_write_conflict(error: Exception) -> bool:
+    """条件写入失败：清单在读取之后被其他写入方更新（412 / 409）"""
+    code, status = _error_code(error)
+    return code in ("PreconditionFailed", "ConditionalRequestConflict") or status in (409, 412)
+
+
+def is_conditional_unsupported(error: Exception) -> bool:
+    """存储服务不支持条件写入（501 / NotImplemented）"""
+    code, status = _error_code(error)
+    return code == "NotImplemented" or status == 501
+
+
+def manifest_databases(manifest: Dict, db_types: Iterable[str] = ("news", "rss")) -> Dict[str, Dict]:
+    """
+    把清单转换为 list_remote_databases 的返回格式
+
+    Returns:
+        {对象键: {"db_type", "date", "size", "etag", "segments": [(序号, 对象键, 大小)], "rows", "encoding",
+                  "part_size", "part_md5"}}
+    """
+    db_types = set(db_types)
+    databases = {}
+    for key, entry in manifest["objects"].items():
+        if entry.get("db_type") not in db_types:
+            continue
+        databases[key] = {
+            "db_type": entry["db_type"],
+            "date": entry["date"],
+            "size": entry.get("size", 0),
+            "etag": entry.get("etag", ""),
+            "segments": [tuple(segment) for segment in entry.get("segments", [])],
+            "rows": entry.get("rows"),
+            "encoding": entry.get("encoding", ""),
+            "part_size": entry.get("part_size", 0),
+            "part_md5": entry.get("part_md5", []),
+        }
+    return databases
@@ -0,0 +1,466 @@
+# coding=utf-8
+"""
+从远程存储并行拉取数据库到本地
+
+拉取最近 N 天的 news / rss 数据库到本地存储后端使用的扁平结构 {data_dir}/{type}/{date}.db：
+- 先读取存储桶清单（见 remote_manifest.py），清单不存在或缺少较新的日期时一次 list_objects_v2
+  列出所有数据库及其增量段（见 sqlite_delta.py），不再逐个 head_object；清单与远程对象不符时改为列举后重试
+- 与本地同步记录 {data_dir}/.remote_sync.json（远程 ETag、已应用的增量段、本地文件大小和 mtime）比较，
+  只下载缺失或远程已变化的文件；基础快照未变、只多了增量段时只下载新的增量段
+- 多个文件并发下载（数量上限 max_workers），先写入 {file}.part，完成后原子替换
+- 中断后再次拉取时，ETag 未变的 .part 文件从已下载的位置继续（Range 请求）
+- 清单记录了分段 MD5 时，下载完成后逐段校验，从第一个不符的分段起重新下载一次
+- 压缩编码的对象（见 remote_transfer.py）下载完成后流式解压
+- 本地已有、但不是由同步写入（或同步后被本地修改）的文件保留不动
+
+返回每个文件的状态、下载字节数和耗时。
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from botocore.exceptions import ClientError
+except ImportError:
+    ClientError = Exception
+
+from trendradar.storage.archive import find_archive
+from trendradar.storage.remote_manifest import load_manifest, manifest_databases, parse_db_key
+from trendradar.storage.remote_transfer import decompress_file, detect_encoding
+from trendradar.storage.sqlite_delta import apply_segment, parse_segment_seq, segment_prefix
+
+
+# 默认并发下载的文件数
+DEFAULT_PULL_WORKERS = 8
+
+SYNC_STATE_FILE = ".remote_sync.json"
+
+_STREAM_CHUNK = 1024 * 1024
+
+
+def list_remote_databases(client, bucket: str, db_types: Iterable[str] = ("news", "rss")) -> Dict[str, Dict]:
+    """
+    列出远程存储中的数据库及其有效的增量段
+
+    Args:
+        client: boto3 S3 客户端
+        bucket: 存储桶名称
+        db_types: 数据库类型
+
+    Returns:
+        {对象键: {"db_type", "date", "size", "etag", "segments": [(序号, 对象键, 大小)]}}，
+        segments 只包含属于当前基础快照、从 1 开始连续的增量段
+    """
+    databases: Dict[str, Dict] = {}
+    delta_objects: Dict[str, List[Tuple[str, int]]] = {}
+
+    paginator = client.get_paginator('list_objects_v2')
+    for db_type in db_types:
+        for page in paginator.paginate(Bucket=bucket, Prefix=f"{db_type}/"):
+            for obj in page.get('Contents', []):
+                key = obj['Key']
+                parsed = parse_db_key(key)
+                if parsed:
+                    databases[key] = {
+                        "db_type": parsed[0],
+                        "date": parsed[1],
+                        "size": obj.get('Size', 0),
+                        "etag": obj.get('ETag', ""),
+                        "segments": [],
+                    }
+                elif ".db.delta/" in key:
+                    base_key = key.split(".delta/", 1)[0]
+                    delta_objects.setdefault(base_key, []).append((key, obj.get('Size', 0)))
+
+    for key, info in databases.items():
+        prefix = segment_prefix(key, info["etag"])
+        segments = sorted(
+            (parse_segment_seq(seg_key), seg_key, size)
+            for seg_key, size in delta_objects.get(key, [])
+            if seg_key.startswith(prefix) and parse_segment_seq(seg_key) is not None
+        )
+        for expected, segment in enumerate(segments, start=1):
+            if segment[0] != expected:
+                break
+            info["segments"].append(segment)
+
+    return databases
+
+
+# 检查清单是否过期时每种类型列举的对象数（新日期的数据库对象键排在最前，其余为旧格式等无关对象）
+_STALE_CHECK_KEYS = 100
+
+
+def find_unindexed_database(
+    client, bucket: str, databases: Dict[str, Dict], db_types: Iterable[str] = ("news", "rss")
+) -> Optional[str]:
+    """
+    检查远程是否有比清单中最新日期更新的数据库（未维护清单的写入方上传）
+
+    每种类型一次 list_objects_v2：StartAfter 为清单中该类型最新日期的增量段之后，
+    对象键按字典序排列，新日期的数据库对象排在最前。
+
+    Args:
+        client: boto3 S3 客户端
+        bucket: 存储桶名称
+        databases: 清单中的数据库（manifest_databases 的返回值）
+        db_types: 数据库类型
+
+    Returns:
+        第一个不在清单中的数据库对象键，没有时返回 None
+    """
+    for db_type in db_types:
+        dates = [info["date"] for info in databases.values() if info["db_type"] == db_type]
+        # "0" 排在 "/" 之后：跳过最新日期的增量段 {date}.db.delta/...
+        start_after = f"{db_type}/{max(dates)}.db.delta0" if dates else ""
+        response = client.list_objects_v2(
+            Bucket=bucket, Prefix=f"{db_type}/", StartAfter=start_after, MaxKeys=_STALE_CHECK_KEYS
+        )
+        for obj in response.get('Contents', []):
+            if parse_db_key(obj['Key']) and obj['Key'] not in databases:
+                return obj['Key']
+    return None
+
+
+def load_remote_index(client, bucket: str, db_types: Iterable[str] = ("news", "rss")) -> Tuple[Dict[str, Dict], str]:
+    """
+    获取远程数据库索引：优先读取存储桶清单，不存在或缺少较新的日期时列举对象
+
+    列举时保留清单中与远程一致（ETag 和增量段数相同）的条目，行数统计等信息不丢失。
+
+    Returns:
+        (与 list_remote_databases 相同格式的索引, 来源 "manifest" / "listing")
+    """
+    db_types = tuple(db_types)
+    manifest = load_manifest(client, bucket)
+    if manifest is None:
+        return list_remote_databases(client, bucket, db_types), "listing"
+
+    databases = manifest_databases(manifest, db_types)
+    unindexed = find_unindexed_database(client, bucket, databases, db_types)
+    if unindexed is None:
+        return databases, "manifest"
+
+    print(f"[远程存储] 清单已过期（缺少 {unindexed} 等较新的数据库），改为列举对象")
+    listed = list_remote_databases(client, bucket, db_types)
+    for key, info in listed.items():
+        entry = databases.get(key)
+        if entry and entry["etag"] == info["etag"] and len(entry["segments"]) == len(info["segments"]):
+            listed[key] = entry
+    return listed, "listing"
+
+
+def _is_index_mismatch(error: Exception) -> bool:
+    """下载失败是否因为索引中的 ETag / 增量段与远程对象不符（IfMatch 失败或对象已不存在）"""
+    if not isinstance(error, ClientError) or not hasattr(error, "response"):
+        return False
+    error_code = error.response.get("Error", {}).get("Code", "")
+    return error_code in ("412", "PreconditionFailed", "404", "NoSuchKey", "Not Found")
+
+
+def _load_state(state_path: Path) -> Dict[str, Dict]:
+    """读取同步记录"""
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(state_path: Path, state: Dict[str, Dict]) -> None:
+    """原子写入同步记录"""
+    tmp_path = state_path.with_name(state_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_path, state_path)
+
+
+def _file_md5(path: Path) -> str:
+    """计算文件 MD5（与单次上传对象的 ETag 比较）"""
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_STREAM_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _plan(key: str, info: Dict, dest: Path, entry: Optional[Dict], data_dir: str) -> Tuple[str, str]:
+    """
+    决定单个文件的同步方式
+
+    Returns:
+        (动作, 说明)，动作为 download / segments / skip / adopt
+    """
+    if not dest.exists():
+        if find_archive(data_dir, info["date"], info["db_type"]):
+            return "skip", "本地已归档"
+        return "download", ""
+
+    stat = dest.stat()
+    if entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+        if entry.get("etag") != info["etag"]:
+            return "download", "远程已更新"
+        if entry.get("segment", 0) < len(info["segments"]):
+            return "segments", "远程有新的增量段"
+        return "skip", "已是最新"
+
+    # 没有同步记录：内容与远程一致（单次上传对象的 ETag 即 MD5）时补记录，否则视为本地数据
+    etag = info["etag"].strip('"')
+    if (
+        not entry and not info["segments"] and stat.st_size == info["size"]
+        and "-" not in etag and _file_md5(dest) == etag
+    ):
+        return "adopt", "本地文件与远程一致"
+    return "skip", "本地已存在"
+
+
+def _first_bad_part(path: Path, info: Dict) -> Optional[int]:
+    """
+    按清单记录的上传分段校验已下载的对象
+
+    Returns:
+        第一个 MD5 不符的分段的起始偏移，全部一致或清单没有分段 MD5 时返回 None
+    """
+    part_size, part_md5 = info.get("part_size"), info.get("part_md5")
+    if not part_size or not part_md5 or len(part_md5) != max(1, -(-info["size"] // part_size)):
+        return None
+    with open(path, "rb") as f:
+        for index, expected in enumerate(part_md5):
+            digest = hashlib.md5()
+            remaining = part_size
+            while remaining:
+                chunk = f.read(min(_STREAM_CHUNK, remaining))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                remaining -= len(chunk)
+            if digest.hexdigest() != expected:
+                return index * part_size
+    return None
+
+
+def _download(client, bucket: str, key: str, info: Dict, dest: Path) -> Dict:
+    """
+    下载基础快照（支持断点续传）并应用增量段，完成后原子替换目标文件
+
+    Returns:
+        {"status": downloaded / resumed, "bytes": 下载字节数}
+    """
+    part_path = dest.with_name(dest.name + ".part")
+    part_meta_path = dest.with_name(dest.name + ".part.json")
+    dest.parent.mkdir(parents=True, exist_ok=True)
+
+    # 断点续传：只有 ETag 相同的 .part 文件可以继续
+    start = 0
+    if part_path.exists():
+        try:
+            with open(part_meta_path, "r", encoding="utf-8") as f:
+                if json.load(f).get("etag") == info["etag"]:
+                    start = part_path.stat().st_size
+        except (OSError, ValueError):
+            pass
+        if start > info["size"]:
+            start = 0
+    if start == 0:
+        with open(part_meta_path, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "etag": info["etag"]}, f)
+
+    transferred = 0
+    offset = start
+    for attempt in range(2):
+        if offset < info["size"] or info["size"] == 0:
+            # IfMatch：远程在列出之后被覆盖时失败，下次拉取按新 ETag 重新下载
+            kwargs = {"Bucket": bucket, "Key": key, "IfMatch": info["etag"]}
+            if offset:
+                kwargs["Range"] = f"bytes={offset}-"
+            response = client.get_object(**kwargs)
+            with open(part_path, "ab" if offset else "wb") as f:
+                # iter_chunks 会自动处理 chunked transfer encoding
+                for chunk in response['Body'].iter_chunks(chunk_size=_STREAM_CHUNK):
+                    f.write(chunk)
+                    transferred += len(chunk)
+        if part_path.stat().st_size != info["size"]:
+            raise IOError(f"下载不完整: {part_path.stat().st_size}/{info['size']} bytes")
+
+        # 逐段校验：从第一个不符的分段起截断，重新下载一次；仍不符时保留已校验的部分供下次续传
+        offset = _first_bad_part(part_path, info)
+        if offset is None:
+            break
+        with open(part_path, "r+b") as f:
+            f.truncate(offset)
+        if attempt:
+            raise IOError(f"分段 MD5 不符: {key} 偏移 {offset}")
+        print(f"[远程存储] {key} 偏移 {offset} 起的分段校验失败，重新下载")
+
+    # 压缩编码的对象（清单记录或文件头魔数）解压后再应用增量段
+    encoding = info.get("encoding") or detect_encoding(part_path)
+    if encoding or info["segments"]:
+        tmp_path = dest.with_name(dest.name + ".tmp")
+        try:
+            if encoding:
+                decompress_file(part_path, tmp_path, encoding)
+            else:
+                shutil.copyfile(part_path, tmp_path)
+            transferred += _apply_segments(client, bucket, info, tmp_path, 0)
+            os.replace(tmp_path, dest)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        part_path.unlink()
+    else:
+        os.replace(part_path, dest)
+    part_meta_path.unlink(missing_ok=True)
+
+    return {"status": "resumed" if start else "downloaded", "bytes": transferred}
+
+
+def _apply_segments(client, bucket: str, info: Dict, path: Path, applied: int) -> int:
+    """下载并按序应用序号大于 applied 的增量段，返回下载字节数"""
+    transferred = 0
+    for seq, seg_key, _ in info["segments"]:
+        if seq <= applied:
+            continue
+        data = client.get_object(Bucket=bucket, Key=seg_key)['Body'].read()
+        transferred += len(data)
+        apply_segment(path, data, info["etag"], seq)
+    return transferred
+
+
+def _update_segments(client, bucket: str, info: Dict, dest: Path, applied: int) -> Dict:
+    """基础快照未变：只下载新的增量段，应用到副本后原子替换"""
+    tmp_path = dest.with_name(dest.name + ".tmp")
+    shutil.copyfile(dest, tmp_path)
+    try:
+        transferred = _apply_segments(client, bucket, info, tmp_path, applied)
+        os.replace(tmp_path, dest)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return {"status": "updated", "bytes": transferred}
+
+
+def pull_databases(
+    client,
+    bucket: str,
+    data_dir: str,
+    dates: Iterable[str],
+    db_types: Iterable[str] = ("news", "rss"),
+    max_workers: int = DEFAULT_PULL_WORKERS,
+) -> Dict:
+    """
+    拉取指定日期的数据库到本地
+
+    Args:
+        client: boto3 S3 客户端
+        bucket: 存储桶名称
+        data_dir: 本地数据目录
+        dates: 日期列表（YYYY-MM-DD）
+        db_types: 数据库类型
+        max_workers: 并发下载的文件数
+
+    Returns:
+        {
+            "files": [{"key", "db_type", "date", "status", "bytes", "seconds", "reason" / "error"}],
+            "downloaded": 下载（含续传、增量更新）的文件数,
+            "skipped": 跳过的文件数,
+            "failed": 失败的文件数,
+            "bytes": 下载字节数,
+            "seconds": 总耗时,
+        }
+        status 为 downloaded / resumed / updated / adopted / skipped / failed
+    """
+    started = time.time()
+    local_dir = Path(data_dir)
+    local_dir.mkdir(parents=True, exist_ok=True)
+    state_path = local_dir / SYNC_STATE_FILE
+    state = _load_state(state_path)
+
+    target_dates = set(dates)
+    databases, source = load_remote_index(client, bucket, db_types)
+    remote = {key: info for key, info in databases.items() if info["date"] in target_dates}
+
+    files: List[Dict] = []
+
+    def record(key: str, info: Dict, dest: Path) -> None:
+        stat = dest.stat()
+        state[key] = {
+            "etag": info["etag"],
+            "segment": len(info["segments"]),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    def run(key: str, info: Dict, dest: Path, action: str) -> Dict:
+        task_started = time.time()
+        if action == "segments":
+            result = _update_segments(client, bucket, info, dest, state[key].get("segment", 0))
+        else:
+            result = _download(client, bucket, key, info, dest)
+        result["seconds"] = round(time.time() - task_started, 3)
+        return result
+
+    def sync(targets: Dict[str, Dict]) -> List[str]:
+        """同步一组文件，返回因远程对象与索引不符而失败的对象键"""
+        mismatched = []
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {}
+            for key in sorted(targets, reverse=True):
+                info = targets[key]
+                dest = local_dir / info["db_type"] / f"{info['date']}.db"
+                base = {"key": key, "db_type": info["db_type"], "date": info["date"]}
+                action, reason = _plan(key, info, dest, state.get(key), data_dir)
+                if action in ("skip", "adopt"):
+                    if action == "adopt":
+                        record(key, info, dest)
+                    files.append({
+                        **base, "status": "adopted" if action == "adopt" else "skipped",
+                        "bytes": 0, "seconds": 0.0, "reason": reason,
+                    })
+                    continue
+                futures[executor.submit(run, key, info, dest, action)] = (key, info, dest, base)
+
+            for future in as_completed(futures):
+                key, info, dest, base = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if source == "manifest" and _is_index_mismatch(e):
+                        mismatched.append(key)
+                        continue
+                    files.append({**base, "status": "failed", "bytes": 0, "seconds": 0.0, "error": str(e)})
+                    print(f"[远程存储] 拉取失败 ({key}): {e}")
+                    continue
+                record(key, info, dest)
+                _save_state(state_path, state)
+                files.append({**base, **result})
+                print(f"[远程存储] 已拉取: {key} -> {dest} ({result['bytes']} bytes, {result['seconds']:.2f}s)")
+        return mismatched
+
+    mismatched = sync(remote)
+    if mismatched:
+        # 清单已过期（远程对象被未维护清单的写入方改写）：列举对象后重试这些文件
+        print(f"[远程存储] 清单与远程对象不符（{len(mismatched)} 个文件），改为列举对象")
+        listed = list_remote_databases(client, bucket, db_types)
+        failed = [key for key in mismatched if key not in listed]
+        for key in failed:
+            print(f"[远程存储] 拉取失败 ({key}): 远程对象已不存在")
+            files.append({
+                "key": key, "db_type": remote[key]["db_type"], "date": remote[key]["date"],
+                "status": "failed", "bytes": 0, "seconds": 0.0, "error": "远程对象已不存在",
+            })
+        sync({key: listed[key] for key in mismatched if key in listed})
+
+    _save_state(state_path, state)
+    files.sort(key=lambda item: item["key"], reverse=True)
+    return {
+        "files": files,
+        "downloaded": sum(1 for item in files if item["status"] in ("downloaded", "resumed", "updated")),
+        "skipped": sum(1 for item in files if item["status"] in ("skipped", "adopted")),
+        "failed": sum(1 for item in files if item["status"] == "failed"),
+        "bytes": sum(item["bytes"] for item in files),
+        "seconds": round(time.time() - started, 3),
+    }
@@ -0,0 +1,473 @@
+# coding=utf-8
+"""
+远程存储分段传输（S3 兼容协议）
+
+远程存储后端上传 / 下载数据库文件时使用，内存占用与文件大小无关：
+- 上传：不超过一个分段大小的文件单次 put_object，更大的文件使用 multipart upload，
+  每个分段单独读取、明确设置 ContentLength（避免 chunked transfer encoding，兼容腾讯云 COS），
+  并附带 Content-MD5 由服务端逐段校验；返回各分段的 MD5，由调用方记录（见 remote_manifest.py）
+- 下载：先请求第一个分段（同时拿到对象大小和 ETag，并支持 IfNoneMatch 条件下载），
+  其余分段按 Range 并行下载，IfMatch 保证所有分段来自同一版本，每段校验长度后直接写入文件对应位置；
+  调用方提供上传时记录的分段 MD5 且 ETag 一致时，按上传的分段边界下载并逐段校验 MD5，
+  校验失败的分段重新下载一次，仍失败则抛出 IOError
+
+同时进行的分段数不超过 max_workers，峰值内存约为 max_workers × 分段大小（上传）
+或 max_workers × 1MB（下载）。
+
+可选压缩编码（zlib / lzma）：上传时边读边压缩，压缩数据按分段上传，Content-Type 标记编码；
+下载时按 Content-Type（未标记时按文件头魔数）识别编码并流式解压，未压缩的对象照常读取。
+"""
+
+import base64
+import hashlib
+import lzma
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from botocore.exceptions import ClientError
+except ImportError:
+    ClientError = Exception
+
+
+# 默认分段大小与并发数
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_MAX_WORKERS = 4
+
+# S3 multipart upload 分段最小 5MB（最后一段除外）
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+_STREAM_CHUNK = 1024 * 1024
+
+# 对象编码与 Content-Type
+RAW_CONTENT_TYPE = "application/x-sqlite3"
+ENCODING_CONTENT_TYPES = {
+    "zlib": "application/x-sqlite3+zlib",
+    "lzma": "application/x-sqlite3+xz",
+}
+
+_XZ_MAGIC = b"\xfd7zXZ\x00"
+
+
+def _compressor(encoding: str):
+    """创建流式压缩器"""
+    if encoding == "zlib":
+        return zlib.compressobj(6)
+    if encoding == "lzma":
+        return lzma.LZMACompressor(preset=6)
+    raise ValueError(f"不支持的压缩编码: {encoding}")
+
+
+def _decompressor(encoding: str):
+    """创建流式解压器"""
+    if encoding == "zlib":
+        return zlib.decompressobj()
+    if encoding == "lzma":
+        return lzma.LZMADecompressor()
+    raise ValueError(f"不支持的压缩编码: {encoding}")
+
+
+def detect_encoding(path: Path, content_type: Optional[str] = None) -> Optional[str]:
+    """
+    识别已下载对象的编码
+
+    优先使用 Content-Type 标记，未标记（或存储服务未保留）时按文件头魔数判断。
+
+    Args:
+        path: 已下载的对象文件
+        content_type: 响应的 Content-Type
+
+    Returns:
+        "zlib" / "lzma"，未压缩时返回 None
+    """
+    for encoding, tagged_type in ENCODING_CONTENT_TYPES.items():
+        if content_type == tagged_type:
+            return encoding
+    with open(path, "rb") as f:
+        head = f.read(len(_XZ_MAGIC))
+    if head.startswith(_XZ_MAGIC):
+        return "lzma"
+    # zlib 头：CMF = 0x78，且 CMF * 256 + FLG 是 31 的倍数（SQLite 文件以 "SQLite format 3" 开头）
+    if len(head) >= 2 and head[0] == 0x78 and (head[0] * 256 + head[1]) % 31 == 0:
+        return "zlib"
+    return None
+
+
+def decompress_file(src: Path, dest: Path, encoding: str) -> int:
+    """
+    流式解压文件
+
+    Args:
+        src: 压缩文件
+        dest: 解压目标
+        encoding: 压缩编码
+
+    Returns:
+        解压后大小
+    """
+    decompressor = _decompressor(encoding)
+    written = 0
+    with open(src, "rb") as fin, open(dest, "wb") as fout:
+        for chunk in iter(lambda: fin.read(_STREAM_CHUNK), b""):
+            data = decompressor.decompress(chunk)
+            fout.write(data)
+            written += len(data)
+        if encoding == "zlib":
+            data = decompressor.flush()
+            fout.write(data)
+            written += len(data)
+    if not decompressor.eof:
+        raise IOError(f"压缩数据不完整: {src}")
+    return written
+
+
+def _compressed_chunks(path: Path, encoding: str):
+    """边读边压缩，逐块产出压缩数据"""
+    compressor = _compressor(encoding)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_STREAM_CHUNK), b""):
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+    yield compressor.flush()
+
+
+def _content_md5(data: bytes) -> Tuple[str, str]:
+    """计算 MD5，返回 (Content-MD5 请求头（base64 编码）, 十六进制 MD5)"""
+    digest = hashlib.md5(data)
+    return base64.b64encode(digest.digest()).decode("ascii"), digest.hexdigest()
+
+
+def _read_part(path: Path, offset: int, length: int) -> bytes:
+    """读取文件的一个分段"""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return f.read(length)
+
+
+def upload_file(
+    client,
+    bucket: str,
+    key: str,
+    path: Path,
+    content_type: str = "application/octet-stream",
+    part_size: int = DEFAULT_PART_SIZE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    encoding: Optional[str] = None,
+) -> Dict:
+    """
+    上传本地文件
+
+    Args:
+        client: boto3 S3 客户端
+        bucket: 存储桶名称
+        key: 对象键
+        path: 本地文件路径
+        content_type: 对象 Content-Type（压缩时使用编码对应的 Content-Type）
+        part_size: 分段大小（字节，multipart upload 时不小于 5MB）
+        max_workers: 并发上传的分段数
+        encoding: 压缩编码（"zlib" / "lzma"，None 表示不压缩）
+
+    Returns:
+        服务端响应（包含 ETag），Size 为对象大小（压缩后），
+        PartSize / PartMD5s 为分段大小和各分段的十六进制 MD5（单次上传时只有一段）
+    """
+    path = Path(path)
+    part_size = max(part_size, MIN_PART_SIZE)
+    if encoding:
+        return _upload_compressed(
+            client, bucket, key, path, encoding, part_size, max_workers
+        )
+
+    size = path.stat().st_size
+    if size <= part_size:
+        data = _read_part(path, 0, size)
+        content_md5, md5_hex = _content_md5(data)
+        response = client.put_object(
+            Bucket=bucket,
+            Key=key,
+            Body=data,
+            ContentLength=len(data),
+            ContentMD5=content_md5,
+            ContentType=content_type,
+        )
+        return {**response, "Size": size, "PartSize": part_size, "PartMD5s": [md5_hex]}
+
+    upload_id = client.create_multipart_upload(
+        Bucket=bucket, Key=key, ContentType=content_type
+    )["UploadId"]
+
+    def upload_part(part_number: int) -> Tuple[Dict, str]:
+        offset = (part_number - 1) * part_size
+        data = _read_part(path, offset, min(part_size, size - offset))
+        return _upload_part(client, bucket, key, upload_id, part_number, data)
+
+    part_count = (size + part_size - 1) // part_size
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            results = list(executor.map(upload_part, range(1, part_count + 1)))
+        response = client.complete_multipart_upload(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": [part for part, _ in results]},
+        )
+        return {
+            **response, "Size": size, "PartSize": part_size,
+            "PartMD5s": [md5_hex for _, md5_hex in results],
+        }
+    except Exception:
+        _abort_upload(client, bucket, key, upload_id)
+        raise
+
+
+def _upload_part(client, bucket: str, key: str, upload_id: str, part_number: int, data: bytes) -> Tuple[Dict, str]:
+    """上传一个分段，返回 (complete_multipart_upload 的分段信息, 十六进制 MD5)"""
+    content_md5, md5_hex = _content_md5(data)
+    response = client.upload_part(
+        Bucket=bucket,
+        Key=key,
+        UploadId=upload_id,
+        PartNumber=part_number,
+        Body=data,
+        ContentLength=len(data),
+        ContentMD5=content_md5,
+    )
+    return {"PartNumber": part_number, "ETag": response["ETag"]}, md5_hex
+
+
+def _abort_upload(client, bucket: str, key: str, upload_id: str) -> None:
+    """取消分段上传（清理已上传的分段）"""
+    try:
+        client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+    except Exception as e:
+        print(f"[远程存储] 取消分段上传失败: {e}")
+
+
+def _upload_compressed(
+    client,
+    bucket: str,
+    key: str,
+    path: Path,
+    encoding: str,
+    part_size: int,
+    max_workers: int,
+) -> Dict:
+    """
+    边压缩边上传：压缩数据攒满一个分段即上传，压缩后不超过一个分段时单次 put_object
+
+    同时进行的分段数不超过 max_workers，峰值内存约为 (max_workers + 1) × 分段大小。
+    """
+    content_type = ENCODING_CONTENT_TYPES[encoding]
+    buffer = bytearray()
+    upload_id = None
+    parts = []
+    pending = []
+    size = 0
+
+    def upload_part(part_number: int, data: bytes) -> Tuple[Dict, str]:
+        return _upload_part(client, bucket, key, upload_id, part_number, data)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    try:
+        for data in _compressed_chunks(path, encoding):
+            buffer += data
+            size += len(data)
+            # 保留最后一段：压缩结束时才知道是否需要分段上传
+            while len(buffer) > part_size:
+                if upload_id is None:
+                    upload_id = client.create_multipart_upload(
+                        Bucket=bucket, Key=key, ContentType=content_type
+                    )["UploadId"]
+                part = bytes(buffer[:part_size])
+                del buffer[:part_size]
+                pending.append(executor.submit(upload_part, len(parts) + len(pending) + 1, part))
+                if len(pending) >= max(1, max_workers):
+                    parts.append(pending.pop(0).result())
+
+        if upload_id is None:
+            data = bytes(buffer)
+            content_md5, md5_hex = _content_md5(data)
+            response = client.put_object(
+                Bucket=bucket,
+                Key=key,
+                Body=data,
+                ContentLength=len(data),
+                ContentMD5=content_md5,
+                ContentType=content_type,
+            )
+            return {**response, "Size": size, "PartSize": part_size, "PartMD5s": [md5_hex]}
+
+        if buffer:
+            pending.append(executor.submit(upload_part, len(parts) + len(pending) + 1, bytes(buffer)))
+            buffer = bytearray()
+        parts.extend(future.result() for future in pending)
+        response = client.complete_multipart_upload(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": [part for part, _ in parts]},
+        )
+        return {
+            **response, "Size": size, "PartSize": part_size,
+            "PartMD5s": [md5_hex for _, md5_hex in parts],
+        }
+    except Exception:
+        if upload_id is not None:
+            _abort_upload(client, bucket, key, upload_id)
+        raise
+    finally:
+        executor.shutdown(wait=True)
+
+
+class PartChecksumError(IOError):
+    """下载的分段与上传时记录的 MD5 不符"""
+
+
+def _write_stream(body, f, expected: Optional[int], md5: Optional[str] = None) -> int:
+    """把响应流写入文件，校验长度（和 MD5），返回写入字节数"""
+    written = 0
+    digest = hashlib.md5() if md5 else None
+    # iter_chunks 会自动处理 chunked transfer encoding
+    for chunk in body.iter_chunks(chunk_size=_STREAM_CHUNK):
+        f.write(chunk)
+        written += len(chunk)
+        if digest:
+            digest.update(chunk)
+    if expected is not None and written != expected:
+        raise IOError(f"分段长度不符: 期望 {expected} bytes，实际 {written} bytes")
+    if digest and digest.hexdigest() != md5:
+        raise PartChecksumError(f"分段 MD5 不符: 期望 {md5}，实际 {digest.hexdigest()}")
+    return written
+
+
+def download_file(
+    client,
+    bucket: str,
+    key: str,
+    dest: Path,
+    if_none_match: Optional[str] = None,
+    part_size: int = DEFAULT_PART_SIZE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    checksums: Optional[Dict] = None,
+) -> Tuple[str, int]:
+    """
+    下载对象到本地文件（压缩编码的对象下载后流式解压）
+
+    远程不存在或未变化（IfNoneMatch 命中）时与 get_object 一样抛出 ClientError（404 / 304）。
+
+    Args:
+        client: boto3 S3 客户端
+        bucket: 存储桶名称
+        key: 对象键
+        dest: 本地目标路径
+        if_none_match: 条件下载的 ETag（可选）
+        part_size: 分段大小（字节）
+        max_workers: 并发下载的分段数
+        checksums: 上传时记录的分段校验信息 {"etag", "part_size", "part_md5"}（可选，
+            远程 ETag 一致时按记录的分段大小下载并逐段校验 MD5）
+
+    Returns:
+        (ETag, 对象大小（即下载字节数）)
+
+    Raises:
+        PartChecksumError: 分段重新下载后 MD5 仍不符
+    """
+    dest = Path(dest)
+    object_path = dest.with_name(dest.name + ".object")
+    kwargs = {"Bucket": bucket, "Key": key}
+    if if_none_match:
+        kwargs["IfNoneMatch"] = if_none_match
+    if checksums and checksums.get("part_size") and checksums.get("part_md5"):
+        part_size = checksums["part_size"]
+    else:
+        checksums = None
+
+    try:
+        first = client.get_object(Range=f"bytes=0-{part_size - 1}", **kwargs)
+    except ClientError as e:
+        # 空对象不支持 Range 请求
+        if e.response.get("Error", {}).get("Code", "") != "InvalidRange":
+            raise
+        first = client.get_object(**kwargs)
+
+    etag = first.get("ETag", "")
+    # 远程对象与记录不是同一版本（记录过期）时只校验长度
+    part_md5 = checksums["part_md5"] if checksums and checksums.get("etag") == etag else None
+    try:
+        size = _download_object(client, bucket, key, object_path, first, part_size, max_workers, part_md5)
+        encoding = detect_encoding(object_path, first.get("ContentType"))
+        if encoding:
+            decompress_file(object_path, dest, encoding)
+        else:
+            os.replace(object_path, dest)
+    finally:
+        object_path.unlink(missing_ok=True)
+    return etag, size
+
+
+def _download_object(
+    client,
+    bucket: str,
+    key: str,
+    dest: Path,
+    first: Dict,
+    part_size: int,
+    max_workers: int,
+    part_md5: Optional[List[str]] = None,
+) -> int:
+    """
+    把对象原样写入文件：第一个分段已在 first 响应中，其余分段并行下载，返回对象大小
+
+    提供 part_md5 时逐段校验，不符的分段（以 IfMatch 保证同一版本）重新下载一次。
+    """
+    etag = first.get("ETag", "")
+    content_range = first.get("ContentRange")
+    if content_range:
+        size = int(content_range.rsplit("/", 1)[1])
+    else:
+        # 服务端忽略了 Range（或空对象）：响应即完整对象
+        size = first.get("ContentLength")
+    if part_md5 is not None and (size is None or len(part_md5) != max(1, -(-size // part_size))):
+        # 分段数与记录不符：无法按分段校验
+        part_md5 = None
+
+    def fetch_part(offset: int) -> None:
+        end = min(offset + part_size, size) - 1
+        response = client.get_object(
+            Bucket=bucket, Key=key, Range=f"bytes={offset}-{end}", IfMatch=etag
+        )
+        with open(dest, "r+b") as f:
+            f.seek(offset)
+            _write_stream(response["Body"], f, end - offset + 1, part_md5[offset // part_size] if part_md5 else None)
+
+    def download_part(offset: int) -> None:
+        try:
+            fetch_part(offset)
+        except PartChecksumError as e:
+            print(f"[远程存储] {key} 第 {offset // part_size + 1} 个分段校验失败，重新下载: {e}")
+            fetch_part(offset)
+
+    with open(dest, "wb") as f:
+        if not content_range:
+            if part_md5 is not None and len(part_md5) != 1:
+                part_md5 = None
+            return _write_stream(first["Body"], f, size, part_md5[0] if part_md5 else None)
+        try:
+            _write_stream(first["Body"], f, min(part_size, size), part_md5[0] if part_md5 else None)
+            first_ok = True
+        except PartChecksumError as e:
+            print(f"[远程存储] {key} 第 1 个分段校验失败，重新下载: {e}")
+            first_ok = False
+        f.truncate(size)
+    if not first_ok:
+        fetch_part(0)
+
+    offsets = range(part_size, size, part_size)
+    if offsets:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            list(executor.map(download_part, offsets))
+    return size
@@ -0,0 +1,455 @@
+# coding=utf-8
+"""
+月度汇总库（长时间范围分析）
+
+为已结束的月份生成 output/rollup/{YYYY-MM}.db，每个汇总库包含当月各天的：
+- title_daily：每条标题的日汇总（最佳排名、出现次数、逐次排名、首次/最后出现时间、链接），
+  同一天同一平台的相同标题只保留一条，position 为当天的读取顺序
+- day_platforms：当天出现的平台及名称
+- keyword_daily：频率词词组的日命中条数和最佳排名（来自入库时维护的 keyword_stats）
+- rollup_days：已汇总的日期及源文件标记（大小 + 修改时间），源文件变化后该日视为过期；
+  没有热榜数据的日期也会记录（item_count 为 0）
+
+日汇总的语义与 MCP 逐日读取（ParserService.read_all_titles_for_date）一致，跨日期查询对已汇总的
+日期读取汇总库，其余日期（当月、未汇总或源文件已变化）读取每日数据库。
+每日数据库被归档（见 archive.py）或被保留期清理删除后，汇总库中该日的数据继续保留，直到整月超出保留期；
+汇总前已归档的日期按需解压后汇总。
+
+生成：每次运行结束时由存储管理器补齐缺失或过期的月份，也可用命令行手动执行：
+    python -m trendradar.storage.rollup [output] [--workers N]
+"""
+
+import argparse
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# 汇总库结构版本（结构或汇总语义变化时递增，旧版本汇总库会被重建，读取方忽略版本不符的汇总库）
+ROLLUP_VERSION = 1
+
+_ROLLUP_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS rollup_days (
+        date TEXT PRIMARY KEY,
+        source_stamp TEXT NOT NULL,        -- 源文件标记：大小:修改时间:WAL 大小
+        item_count INTEGER NOT NULL,
+        keyword_fingerprint TEXT,          -- keyword_daily 对应的频率词指纹
+        built_at TEXT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS day_platforms (
+        date TEXT NOT NULL,
+        platform_id TEXT NOT NULL,
+        name TEXT,
+        PRIMARY KEY (date, platform_id)
+    ) WITHOUT ROWID;
+
+    CREATE TABLE IF NOT EXISTS title_daily (
+        date TEXT NOT NULL,
+        position INTEGER NOT NULL,         -- 当天读取顺序（平台首次出现、标题首次出现）
+        platform_id TEXT NOT NULL,
+        title TEXT NOT NULL,
+        best_rank INTEGER NOT NULL,
+        appearances INTEGER NOT NULL,      -- 出现次数（含"未变化"抓取）
+        ranks TEXT NOT NULL,               -- 逐次排名，逗号分隔
+        first_seen TEXT,
+        last_seen TEXT,
+        url TEXT,
+        mobile_url TEXT,
+        PRIMARY KEY (date, position)
+    ) WITHOUT ROWID;
+
+    CREATE TABLE IF NOT EXISTS keyword_daily (
+        date TEXT NOT NULL,
+        group_key TEXT NOT NULL,
+        news_count INTEGER NOT NULL,
+        best_rank INTEGER NOT NULL,
+        PRIMARY KEY (date, group_key)
+    ) WITHOUT ROWID;
+"""
+
+_INSERT_BATCH_SIZE = 5000
+
+
+def get_rollup_path(data_dir: str, month: str) -> Path:
+    """获取月度汇总库路径 output/rollup/{YYYY-MM}.db"""
+    return Path(data_dir) / "rollup" / f"{month}.db"
+
+
+def source_stamp(db_path: Path) -> Optional[str]:
+    """
+    每日数据库的源文件标记（文件不存在时返回 None）
+
+    包含 -wal 文件大小：WAL 模式下写入可能尚未检查点回主文件。
+    """
+    try:
+        stat = db_path.stat()
+    except OSError:
+        return None
+    wal_path = db_path.with_name(db_path.name + "-wal")
+    wal_size = wal_path.stat().st_size if wal_path.exists() else 0
+    return f"{stat.st_size}:{stat.st_mtime_ns}:{wal_size}"
+
+
+def load_rollup_days(rollup_path: Path) -> Optional[Dict[str, str]]:
+    """
+    读取汇总库已汇总的日期
+
+    Args:
+        rollup_path: 汇总库路径
+
+    Returns:
+        {日期: 源文件标记}，汇总库不存在、不可读或版本不符时返回 None
+    """
+    from trendradar.storage.sqlite_conn import connect_sqlite_readonly
+
+    if not rollup_path.exists():
+        return None
+    try:
+        conn = connect_sqlite_readonly(str(rollup_path))
+    except sqlite3.Error:
+        return None
+    try:
+        if conn.execute("PRAGMA user_version").fetchone()[0] != ROLLUP_VERSION:
+            return None
+        return dict(conn.execute("SELECT date, source_stamp FROM rollup_days").fetchall())
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+
+
+def _read_day(db_path: Path) -> Optional[Tuple[Dict[str, str], List[tuple], List[tuple], Optional[str]]]:
+    """
+    读取一天的数据并按 MCP 逐日读取的语义汇总
+
+    Returns:
+        (平台名称, 标题日汇总行, 词组日统计行, 频率词指纹)，没有热榜数据时返回 None
+    """
+    from trendradar.storage.keyword_stats import get_keyword_stats_fingerprint
+    from trendradar.storage.sqlite_conn import connect_sqlite_readonly
+    from trendradar.storage.sqlite_ops import (
+        load_pending_unchanged,
+        apply_pending_unchanged,
+        RankListReader,
+    )
+
+    conn = connect_sqlite_readonly(str(db_path))
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT name FROM sqlite_master
+            WHERE type = 'table' AND name = 'news_items'
+        """)
+        if cursor.fetchone() is None:
+            return None
+
+        pending = load_pending_unchanged(cursor)
+        rank_reader = RankListReader(cursor, include_unchanged=True)
+
+        # {platform_id: {title: 汇总}}：与逐日读取相同的字典去重（位置取首次出现，内容取最后一条）
+        platform_names: Dict[str, str] = {}
+        titles: Dict[str, Dict[str, tuple]] = {}
+        for row in cursor.execute(f"""
+            SELECT n.id, n.platform_id, p.name, n.title, n.rank, n.url, n.mobile_url,
+                   n.first_crawl_time, n.last_crawl_time, n.crawl_count,
+                   {rank_reader.column}
+            FROM news_items n
+            LEFT JOIN platforms p ON n.platform_id = p.id
+            ORDER BY n.id
+        """):
+            news_id, platform_id, name, title, rank, url, mobile_url, first_time, last_time, count, ranks = row
+            if platform_id not in platform_names:
+                platform_names[platform_id] = name
+                titles[platform_id] = {}
+
+            rank_list = rank_reader.parse(ranks, rank, platform_id, distinct=False, url=url or "")
+            last_time, count = apply_pending_unchanged(pending, platform_id, news_id, last_time, count)
+            titles[platform_id][title] = (
+                min(rank_list),
+                count or 1,
+                ",".join(str(r) for r in rank_list),
+                first_time,
+                last_time,
+                url or "",
+                mobile_url or "",
+            )
+
+        if not titles:
+            return None
+
+        title_rows = [
+            (platform_id, title, *summary)
+            for platform_id, platform_titles in titles.items()
+            for title, summary in platform_titles.items()
+        ]
+
+        keyword_rows: List[tuple] = []
+        fingerprint = get_keyword_stats_fingerprint(cursor)
+        if fingerprint is not None:
+            cursor.execute("""
+                SELECT group_key, COUNT(*), MIN(best_rank) FROM keyword_stats
+                GROUP BY group_key
+            """)
+            keyword_rows = cursor.fetchall()
+
+        return platform_names, title_rows, keyword_rows, fingerprint
+    finally:
+        conn.close()
+
+
+def build_month_rollup(data_dir: str, month: str) -> Optional[Tuple[int, int]]:
+    """
+    生成（或重建）一个月的汇总库
+
+    汇总当月所有存在的每日数据库和尚未汇总的归档日期；旧汇总库中源文件已被归档或清理的日期原样保留。
+    先写入临时文件，完成后原子替换。
+
+    Args:
+        data_dir: 数据目录
+        month: 月份（YYYY-MM）
+
+    Returns:
+        (汇总天数, 汇总库大小)，当月没有任何数据时返回 None
+    """
+    from trendradar.storage.archive import list_archived_dates, open_archive
+    from trendradar.storage.sqlite_conn import connect_sqlite
+
+    rollup_path = get_rollup_path(data_dir, month)
+    day_paths = sorted((Path(data_dir) / "news").glob(f"{month}-??.db"))
+    old_days = load_rollup_days(rollup_path) or {}
+    hot_days = {path.stem for path in day_paths}
+    # 源文件已不存在、只能从旧汇总库保留的日期
+    kept_days = sorted(set(old_days) - hot_days)
+    # 已归档、尚未汇总的日期：按需解压后读取，标记取归档文件
+    archived_days = {
+        date: archive_path
+        for date, archive_path in list_archived_dates(data_dir).items()
+        if date.startswith(month) and date not in hot_days and date not in old_days
+    }
+
+    rollup_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = rollup_path.with_name(rollup_path.name + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    conn = connect_sqlite(str(tmp_path), {"journal_mode": "off", "synchronous": "off"})
+    try:
+        conn.executescript(_ROLLUP_SCHEMA)
+        conn.execute(f"PRAGMA user_version = {ROLLUP_VERSION}")
+        cursor = conn.cursor()
+        built_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        day_count = 0
+
+        sources = [(path.stem, path, path) for path in day_paths]
+        sources += [(date, archive_path, None) for date, archive_path in sorted(archived_days.items())]
+
+        cursor.execute("BEGIN")
+        for date, stamp_path, db_path in sources:
+            stamp = source_stamp(stamp_path)
+            if stamp is None:
+                continue
+            try:
+                if db_path is None:
+                    db_path = open_archive(data_dir, date)
+                day = _read_day(db_path) if db_path is not None else None
+            except (sqlite3.Error, OSError, EOFError, ValueError) as e:
+                # 与逐日读取一致：读取失败的日期视为没有数据（源文件变化后重新汇总）
+                print(f"[汇总] 读取失败 {date}: {e}")
+                day = None
+
+            platform_names, title_rows, keyword_rows, fingerprint = day or ({}, [], [], None)
+            cursor.executemany(
+                "INSERT INTO day_platforms (date, platform_id, name) VALUES (?, ?, ?)",
+                [(date, platform_id, name) for platform_id, name in platform_names.items()],
+            )
+            for start in range(0, len(title_rows), _INSERT_BATCH_SIZE):
+                cursor.executemany("""
+                    INSERT INTO title_daily (date, position, platform_id, title, best_rank, appearances,
+                                             ranks, first_seen, last_seen, url, mobile_url)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, [
+                    (date, start + offset, *row)
+                    for offset, row in enumerate(title_rows[start:start + _INSERT_BATCH_SIZE])
+                ])
+            cursor.executemany(
+                "INSERT INTO keyword_daily (date, group_key, news_count, best_rank) VALUES (?, ?, ?, ?)",
+                [(date, *row) for row in keyword_rows],
+            )
+            cursor.execute("""
+                INSERT INTO rollup_days (date, source_stamp, item_count, keyword_fingerprint, built_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (date, stamp, len(title_rows), fingerprint, built_at))
+            day_count += 1
+        conn.commit()
+
+        if kept_days:
+            conn.execute("ATTACH DATABASE ? AS old", (str(rollup_path),))
+            placeholders = ",".join("?" * len(kept_days))
+            cursor.execute("BEGIN")
+            for table in ("rollup_days", "day_platforms", "title_daily", "keyword_daily"):
+                cursor.execute(
+                    f"INSERT INTO main.{table} SELECT * FROM old.{table} WHERE date IN ({placeholders})",
+                    kept_days,
+                )
+            conn.commit()
+            conn.execute("DETACH DATABASE old")
+            day_count += len(kept_days)
+    except BaseException:
+        conn.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    conn.close()
+
+    if day_count == 0:
+        tmp_path.unlink(missing_ok=True)
+        return None
+
+    os.replace(tmp_path, rollup_path)
+    return day_count, rollup_path.stat().st_size
+
+
+def find_stale_months(data_dir: str, current_month: str) -> List[str]:
+    """
+    列出需要生成或重建汇总库的已结束月份
+
+    每日数据库新增、变化，出现未汇总的归档日期，或汇总库版本不符时需要重建；
+    源文件被归档或清理不算变化（汇总库保留这些日期）。
+
+    Args:
+        data_dir: 数据目录
+        current_month: 当前月份（YYYY-MM），该月及之后的月份不汇总
+
+    Returns:
+        月份列表（升序）
+    """
+    from trendradar.storage.archive import list_archived_dates
+
+    news_dir = Path(data_dir) / "news"
+    month_paths: Dict[str, List[Path]] = {}
+    for db_path in news_dir.glob("????-??-??.db"):
+        month = db_path.stem[:7]
+        if month < current_month:
+            month_paths.setdefault(month, []).append(db_path)
+
+    month_archived: Dict[str, List[str]] = {}
+    for date in list_archived_dates(data_dir):
+        if date[:7] < current_month:
+            month_archived.setdefault(date[:7], []).append(date)
+
+    stale = []
+    for month in sorted(set(month_paths) | set(month_archived)):
+        paths = month_paths.get(month, [])
+        hot_days = {path.stem for path in paths}
+        rolled = load_rollup_days(get_rollup_path(data_dir, month))
+        if (
+            rolled is None
+            or any(rolled.get(path.stem) != source_stamp(path) for path in paths)
+            or any(date not in rolled for date in month_archived.get(month, []) if date not in hot_days)
+        ):
+            stale.append(month)
+    return stale
+
+
+def build_rollups(data_dir: str = "output", current_month: Optional[str] = None, workers: int = 2) -> Dict[str, int]:
+    """
+    补齐数据目录下已结束月份的汇总库
+
+    生成期间持有数据目录写锁，避免与定时爬取、远程拉取交错。
+
+    Args:
+        data_dir: 数据目录
+        current_month: 当前月份（YYYY-MM），默认取本地时间
+        workers: 并行线程数
+
+    Returns:
+        统计信息 {"stale", "built", "failed", "days", "bytes"}
+    """
+    from trendradar.storage.sqlite_conn import get_write_lock
+
+    current_month = current_month or datetime.now().strftime("%Y-%m")
+    stats = {"stale": 0, "built": 0, "failed": 0, "days": 0, "bytes": 0}
+
+    months = find_stale_months(data_dir, current_month)
+    stats["stale"] = len(months)
+    if not months:
+        return stats
+
+    start = time.perf_counter()
+    with get_write_lock(data_dir):
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {executor.submit(build_month_rollup, data_dir, month): month for month in months}
+            for future in as_completed(futures):
+                month = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    stats["failed"] += 1
+                    print(f"[汇总] 生成失败 {month}: {e}")
+                    continue
+                if result is None:
+                    continue
+                days, size = result
+                stats["built"] += 1
+                stats["days"] += days
+                stats["bytes"] += size
+                print(f"[汇总] {month}: {days} 天，{size / 1024:.1f} KB")
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"[汇总] 完成：生成 {stats['built']} 个月度汇总库（共 {stats['days']} 天，"
+        f"{stats['bytes'] / 1024 / 1024:.2f} MB），失败 {stats['failed']} 个，耗时 {elapsed:.2f}s"
+    )
+    return stats
+
+
+def cleanup_rollups(data_dir: str, cutoff_date: str) -> int:
+    """
+    删除整月都早于截止日期的汇总库（保留期清理）
+
+    Args:
+        data_dir: 数据目录
+        cutoff_date: 截止日期（YYYY-MM-DD），早于该日期的数据过期
+
+    Returns:
+        删除的汇总库数量
+    """
+    rollup_dir = Path(data_dir) / "rollup"
+    if not rollup_dir.is_dir():
+        return 0
+
+    deleted = 0
+    for rollup_path in rollup_dir.glob("????-??.db"):
+        # 月份的最后一天也早于截止日期：下个月 1 日 <= 截止日期
+        year, month = int(rollup_path.stem[:4]), int(rollup_path.stem[5:7])
+        next_month = f"{year + month // 12:04d}-{month % 12 + 1:02d}-01"
+        if next_month <= cutoff_date:
+            try:
+                rollup_path.unlink()
+                deleted += 1
+                print(f"[汇总] 清理过期汇总库: rollup/{rollup_path.name}")
+            except OSError as e:
+                print(f"[汇总] 删除文件失败 {rollup_path}: {e}")
+    return deleted
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="TrendRadar 月度汇总库生成")
+    parser.add_argument("data_dir", nargs="?", default="output", help="数据目录，默认 output")
+    parser.add_argument("--month", help="当前月份 YYYY-MM（之前的月份会被汇总），默认本地时间")
+    parser.add_argument("--workers", type=int, default=2, help="并行线程数，默认 2")
+    args = parser.parse_args(argv)
+
+    stats = build_rollups(args.data_dir, args.month, args.workers)
+    if not stats["stale"]:
+        print("[汇总] 所有已结束月份的汇总库都是最新的")
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
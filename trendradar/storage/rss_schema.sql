@@ -62,6 +62,20 @@ CREATE TABLE IF NOT EXISTS rss_crawl_status (
     FOREIGN KEY (feed_id) REFERENCES rss_feeds(id)
 );
 
+-- ============================================
+-- RSS 源缓存校验表
+-- 记录每个源最近一次响应的 ETag / Last-Modified / 内容哈希，
+-- 用于条件请求（If-None-Match / If-Modified-Since），源未变化时跳过解析和写入
+-- ============================================
+CREATE TABLE IF NOT EXISTS rss_feed_validators (
+    feed_id TEXT PRIMARY KEY,
+    feed_url TEXT NOT NULL,                   -- 请求的 URL（URL 变化时校验信息失效）
+    etag TEXT DEFAULT '',                     -- 响应头 ETag
+    last_modified TEXT DEFAULT '',            -- 响应头 Last-Modified
+    content_hash TEXT DEFAULT '',             -- 响应体 SHA-256
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- ============================================
 -- 推送记录表
 -- 用于 push_window once_per_day 功能
@@ -76,11 +90,9 @@ CREATE TABLE IF NOT EXISTS rss_push_records (
 
 -- ============================================
 -- 索引定义
+-- 版本 1 之后新增的索引见 migrations.py（如 feed_id + url 唯一索引）
 -- ============================================
 
--- RSS 源索引
-CREATE INDEX IF NOT EXISTS idx_rss_feed ON rss_items(feed_id);
-
 -- 发布时间索引（用于按时间排序）
 CREATE INDEX IF NOT EXISTS idx_rss_published ON rss_items(published_at DESC);
 
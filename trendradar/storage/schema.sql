@@ -80,6 +80,33 @@ CREATE TABLE IF NOT EXISTS crawl_source_status (
     FOREIGN KEY (platform_id) REFERENCES platforms(id)
 );
 
+-- ============================================
+-- 平台榜单指纹表
+-- 记录每个平台最近一次实际写入的榜单内容指纹
+-- ============================================
+CREATE TABLE IF NOT EXISTS platform_fingerprints (
+    platform_id TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,                -- 榜单内容 SHA-256
+    crawl_time TEXT NOT NULL,                 -- 该内容实际写入的抓取时间
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (platform_id) REFERENCES platforms(id)
+);
+
+-- ============================================
+-- 榜单未变化标记表
+-- 平台榜单与上次写入完全相同时，只记录一条标记，不重复写入条目和排名历史
+-- 平台榜单下次变化时回填到 news_items（materialized = 1）
+-- ============================================
+CREATE TABLE IF NOT EXISTS unchanged_crawls (
+    crawl_record_id INTEGER NOT NULL,
+    platform_id TEXT NOT NULL,
+    base_crawl_time TEXT NOT NULL,            -- 内容相同的上一次实际写入时间
+    materialized INTEGER DEFAULT 0,           -- 是否已回填到 news_items
+    PRIMARY KEY (crawl_record_id, platform_id),
+    FOREIGN KEY (crawl_record_id) REFERENCES crawl_records(id),
+    FOREIGN KEY (platform_id) REFERENCES platforms(id)
+);
+
 -- ============================================
 -- 推送记录表
 -- 用于 push_window once_per_day 功能
@@ -95,6 +122,7 @@ CREATE TABLE IF NOT EXISTS push_records (
 
 -- ============================================
 -- 索引定义
+-- 版本 1 之后新增的索引见 migrations.py（如排名历史覆盖索引）
 -- ============================================
 
 -- 平台索引
@@ -113,5 +141,5 @@ CREATE UNIQUE INDEX IF NOT EXISTS idx_news_url_platform
 -- 抓取状态索引
 CREATE INDEX IF NOT EXISTS idx_crawl_status_record ON crawl_source_status(crawl_record_id);
 
--- 排名历史索引
-CREATE INDEX IF NOT EXISTS idx_rank_history_news ON rank_history(news_item_id);
+-- 未变化标记索引（读取未回填标记）
+CREATE INDEX IF NOT EXISTS idx_unchanged_pending ON unchanged_crawls(materialized, platform_id);
@@ -0,0 +1,351 @@
+# coding=utf-8
+"""
+SQLite 连接管理
+
+- 写连接：WAL 日志模式 + 可配置的 PRAGMA（synchronous / cache_size / mmap_size / temp_store）
+- 读连接：mode=ro URI 只读打开，不阻塞写入，也不会被写入阻塞
+- 跨日期查询：内存主库 + ATTACH 只读附加多个日期数据库
+- 跨进程写锁：定时爬取与 MCP trigger_crawl(save_to_local=True) 不会交错写入同一数据目录
+"""
+
+import functools
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import quote
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    fcntl = None
+    HAS_FCNTL = False
+
+try:
+    import msvcrt
+    HAS_MSVCRT = True
+except ImportError:
+    msvcrt = None
+    HAS_MSVCRT = False
+
+
+# 默认连接参数（与 config.yaml 中 storage.sqlite 对应）
+SQLITE_DEFAULTS: Dict = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "cache_size": -16000,
+    "mmap_size": 268435456,
+    "temp_store": "memory",
+    "busy_timeout": 5000,
+}
+
+_JOURNAL_MODES = ("delete", "truncate", "persist", "memory", "wal", "off")
+_SYNCHRONOUS_LEVELS = ("off", "normal", "full", "extra")
+_TEMP_STORES = ("default", "file", "memory")
+
+
+def _resolve_options(options: Optional[Dict]) -> Dict:
+    """合并默认参数并校验枚举值（非法值回退为默认值）"""
+    resolved = dict(SQLITE_DEFAULTS)
+    for key, value in (options or {}).items():
+        if value is not None and key in resolved:
+            resolved[key] = value
+
+    for key, allowed in (
+        ("journal_mode", _JOURNAL_MODES),
+        ("synchronous", _SYNCHRONOUS_LEVELS),
+        ("temp_store", _TEMP_STORES),
+    ):
+        value = str(resolved[key]).lower()
+        if value not in allowed:
+            print(f"[SQLite] 无效的 {key}: {resolved[key]}，使用默认值 {SQLITE_DEFAULTS[key]}")
+            value = SQLITE_DEFAULTS[key]
+        resolved[key] = value
+
+    for key in ("cache_size", "mmap_size", "busy_timeout"):
+        try:
+            resolved[key] = int(resolved[key])
+        except (TypeError, ValueError):
+            print(f"[SQLite] 无效的 {key}: {resolved[key]}，使用默认值 {SQLITE_DEFAULTS[key]}")
+            resolved[key] = SQLITE_DEFAULTS[key]
+
+    return resolved
+
+
+def _apply_read_pragmas(conn: sqlite3.Connection, options: Dict) -> None:
+    """设置读写连接共用的 PRAGMA"""
+    conn.execute(f"PRAGMA busy_timeout = {options['busy_timeout']}")
+    conn.execute(f"PRAGMA cache_size = {options['cache_size']}")
+    conn.execute(f"PRAGMA mmap_size = {options['mmap_size']}")
+    conn.execute(f"PRAGMA temp_store = {options['temp_store']}")
+
+
+def connect_sqlite(db_path: str, options: Optional[Dict] = None) -> sqlite3.Connection:
+    """
+    打开可写的 SQLite 连接
+
+    Args:
+        db_path: 数据库文件路径
+        options: 连接参数（journal_mode / synchronous / cache_size / mmap_size /
+                 temp_store / busy_timeout），未提供的使用 SQLITE_DEFAULTS
+
+    Returns:
+        数据库连接（row_factory 为 sqlite3.Row）
+    """
+    options = _resolve_options(options)
+    conn = sqlite3.connect(db_path, timeout=options["busy_timeout"] / 1000)
+    conn.row_factory = sqlite3.Row
+    _apply_read_pragmas(conn, options)
+
+    # 日志模式写入文件头，切换需要短暂的写锁；失败时沿用当前模式
+    try:
+        conn.execute(f"PRAGMA journal_mode = {options['journal_mode']}")
+    except sqlite3.OperationalError as e:
+        print(f"[SQLite] 设置日志模式失败 ({db_path}): {e}")
+    conn.execute(f"PRAGMA synchronous = {options['synchronous']}")
+
+    return conn
+
+
+def connect_sqlite_readonly(db_path: str, options: Optional[Dict] = None) -> sqlite3.Connection:
+    """
+    以只读方式打开 SQLite 连接（mode=ro URI）
+
+    WAL 模式下读连接读取的是已提交的快照，不会阻塞写入。
+    数据目录只读（如 Docker 只读卷）且 -shm 文件不存在时，回退为 immutable=1 打开。
+
+    Args:
+        db_path: 数据库文件路径
+        options: 连接参数，仅使用 cache_size / mmap_size / temp_store / busy_timeout
+
+    Returns:
+        只读数据库连接（row_factory 为 sqlite3.Row）
+    """
+    options = _resolve_options(options)
+    uri_path = quote(Path(db_path).resolve().as_posix())
+
+    try:
+        conn = sqlite3.connect(
+            f"file:{uri_path}?mode=ro", uri=True, timeout=options["busy_timeout"] / 1000
+        )
+        # 只读打开不会立即访问文件，执行一次查询以暴露打开失败
+        conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+    except sqlite3.OperationalError:
+        if not os.path.exists(db_path):
+            raise
+        conn = sqlite3.connect(f"file:{uri_path}?mode=ro&immutable=1", uri=True)
+
+    conn.row_factory = sqlite3.Row
+    _apply_read_pragmas(conn, options)
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+def connect_sqlite_hub(options: Optional[Dict] = None) -> sqlite3.Connection:
+    """
+    打开用于 ATTACH 多个数据库的只读内存连接（跨日期查询）
+
+    主库为内存数据库，启用 URI 文件名以便 attach_sqlite_readonly 以 mode=ro 附加日期数据库。
+
+    Args:
+        options: 连接参数，仅使用 cache_size / mmap_size / temp_store / busy_timeout
+
+    Returns:
+        内存数据库连接（row_factory 为 sqlite3.Row）
+    """
+    options = _resolve_options(options)
+    conn = sqlite3.connect(":memory:", uri=True, timeout=options["busy_timeout"] / 1000)
+    conn.row_factory = sqlite3.Row
+    _apply_read_pragmas(conn, options)
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+def attach_sqlite_readonly(
+    conn: sqlite3.Connection,
+    db_path: str,
+    schema: str,
+    options: Optional[Dict] = None,
+) -> None:
+    """
+    以只读方式附加数据库（与 connect_sqlite_readonly 相同的打开策略）
+
+    数据目录只读且 -shm 文件不存在时，回退为 immutable=1 附加。
+
+    Args:
+        conn: connect_sqlite_hub 打开的连接
+        db_path: 数据库文件路径
+        schema: 附加后的库名（调用方生成的标识符，直接拼入 SQL）
+        options: 连接参数，仅使用 cache_size / mmap_size
+    """
+    options = _resolve_options(options)
+    uri_path = quote(Path(db_path).resolve().as_posix())
+
+    try:
+        conn.execute("ATTACH DATABASE ? AS " + schema, (f"file:{uri_path}?mode=ro",))
+        # 与只读打开相同：执行一次查询以暴露打开失败
+        conn.execute(f"SELECT 1 FROM {schema}.sqlite_master LIMIT 1").fetchall()
+    except sqlite3.OperationalError:
+        if not os.path.exists(db_path):
+            raise
+        detach_sqlite(conn, schema)
+        conn.execute("ATTACH DATABASE ? AS " + schema, (f"file:{uri_path}?mode=ro&immutable=1",))
+
+    conn.execute(f"PRAGMA {schema}.cache_size = {options['cache_size']}")
+    conn.execute(f"PRAGMA {schema}.mmap_size = {options['mmap_size']}")
+
+
+def detach_sqlite(conn: sqlite3.Connection, schema: str) -> None:
+    """分离数据库（未附加时忽略）"""
+    try:
+        conn.execute("DETACH DATABASE " + schema)
+    except sqlite3.OperationalError:
+        pass
+
+
+class WriteLockTimeout(TimeoutError):
+    """等待写锁超时"""
+
+
+class WriteLock:
+    """
+    跨进程写锁（基于锁文件）
+
+    - Linux/macOS 使用 fcntl.flock，Windows 使用 msvcrt.locking
+    - 同一进程内可重入：同一锁文件共享一个实例（见 get_write_lock），嵌套获取只计数
+    - 进程退出时操作系统自动释放，不会残留死锁
+    """
+
+    def __init__(self, lock_path: str, timeout: float = 300.0):
+        """
+        初始化写锁
+
+        Args:
+            lock_path: 锁文件路径
+            timeout: 获取锁的最长等待时间（秒）
+        """
+        self.lock_path = lock_path
+        self.timeout = timeout
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+
+    def _try_lock_file(self) -> bool:
+        """尝试对锁文件加排他锁（非阻塞）"""
+        try:
+            if HAS_FCNTL:
+                fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            elif HAS_MSVCRT:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def _unlock_file(self) -> None:
+        """释放锁文件上的排他锁"""
+        try:
+            if HAS_FCNTL:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            elif HAS_MSVCRT:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+
+    def acquire(self) -> None:
+        """
+        获取写锁
+
+        Raises:
+            WriteLockTimeout: 超时仍未获取到锁
+        """
+        if not self._thread_lock.acquire(timeout=self.timeout):
+            raise WriteLockTimeout(f"等待写锁超时: {self.lock_path}")
+
+        if self._depth > 0:
+            self._depth += 1
+            return
+
+        try:
+            Path(self.lock_path).parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            deadline = time.monotonic() + self.timeout
+            waited = False
+            while not self._try_lock_file():
+                if not waited:
+                    print(f"[存储锁] 其他进程正在写入，等待写锁: {self.lock_path}")
+                    waited = True
+                if time.monotonic() >= deadline:
+                    raise WriteLockTimeout(f"等待写锁超时: {self.lock_path}")
+                time.sleep(0.1)
+        except BaseException:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+            self._thread_lock.release()
+            raise
+
+        self._depth = 1
+
+    def release(self) -> None:
+        """释放写锁"""
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            self._unlock_file()
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+    def __enter__(self) -> "WriteLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+
+
+_write_locks: Dict[str, WriteLock] = {}
+_write_locks_guard = threading.Lock()
+
+
+def get_write_lock(data_dir: str) -> WriteLock:
+    """
+    获取数据目录的写锁（同一进程内同一目录共享实例）
+
+    Args:
+        data_dir: 数据目录（锁文件为 {data_dir}/.write.lock）
+
+    Returns:
+        WriteLock 实例
+    """
+    lock_path = str(Path(data_dir).resolve() / ".write.lock")
+    with _write_locks_guard:
+        if lock_path not in _write_locks:
+            _write_locks[lock_path] = WriteLock(lock_path)
+        return _write_locks[lock_path]
+
+
+def with_write_lock(method):
+    """
+    存储后端写方法装饰器：在跨进程写锁内执行
+
+    要求实例提供 write_lock() 方法；获取锁超时时打印日志并返回 False。
+    只处理获取锁的超时，方法内部抛出的异常（包括 socket.timeout 等 TimeoutError）原样向上抛出。
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        lock = self.write_lock()
+        try:
+            lock.acquire()
+        except WriteLockTimeout as e:
+            print(f"[存储锁] {e}")
+            return False
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            lock.release()
+    return wrapper
@@ -0,0 +1,183 @@
+# coding=utf-8
+"""
+SQLite 页级增量（远程存储增量上传）
+
+远程存储后端每次抓取后都要同步当天数据库。增量模式下只上传与上次同步相比变化的页：
+- 基础快照：完整的数据库文件（对象键 news/{date}.db）
+- 增量段：{基础快照键}.delta/{基础 ETag 标记}-{序号}.seg，按序号依次覆盖变化的页并截断到新的文件大小
+- 增量段累计过大或段数过多时重新上传完整的基础快照，旧的增量段随之失效并删除
+
+增量段只对生成它的基础快照有效（键中包含基础快照 ETag 的哈希），每段记录应用后整个文件的 CRC32，
+读取方按序应用并校验，得到与写入方完全一致的数据库文件。
+
+数据库需使用回滚日志模式（远程存储后端的工作连接即为 delete 模式），提交后主文件即完整内容。
+"""
+
+import hashlib
+import struct
+import zlib
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+
+_SEGMENT_MAGIC = b"TRDELTA1"
+# 段头：魔数、序号、页大小、应用后文件大小、应用后文件 CRC32、页数、基础 ETag 长度
+_HEADER = struct.Struct(">8sIIQIIH")
+_PAGE_NO = struct.Struct(">I")
+
+_READ_CHUNK_PAGES = 256
+
+
+def base_tag(etag: str) -> str:
+    """基础快照 ETag 的短哈希（增量段键前缀）"""
+    return hashlib.sha1(etag.encode("utf-8")).hexdigest()[:12]
+
+
+def segment_prefix(key: str, etag: str) -> str:
+    """某个基础快照的增量段键前缀"""
+    return f"{key}.delta/{base_tag(etag)}-"
+
+
+def segment_key(key: str, etag: str, seq: int) -> str:
+    """增量段对象键"""
+    return f"{segment_prefix(key, etag)}{seq:06d}.seg"
+
+
+def parse_segment_seq(segment_key: str) -> Optional[int]:
+    """从增量段键解析序号"""
+    name = segment_key.rsplit("/", 1)[-1]
+    if not name.endswith(".seg") or "-" not in name:
+        return None
+    try:
+        return int(name[:-4].rsplit("-", 1)[1])
+    except ValueError:
+        return None
+
+
+def read_page_size(path: Path) -> Optional[int]:
+    """读取数据库文件头中的页大小（不是有效数据库时返回 None）"""
+    with open(path, "rb") as f:
+        header = f.read(100)
+    if len(header) < 100 or not header.startswith(b"SQLite format 3\x00"):
+        return None
+    page_size = struct.unpack(">H", header[16:18])[0]
+    return 65536 if page_size == 1 else page_size
+
+
+def file_crc32(path: Path) -> int:
+    """计算文件 CRC32"""
+    crc = 0
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(1024 * 1024)
+            if not chunk:
+                return crc
+            crc = zlib.crc32(chunk, crc)
+
+
+def diff_pages(old_path: Path, new_path: Path) -> Optional[Tuple[int, List[Tuple[int, bytes]]]]:
+    """
+    比较两个数据库文件，找出变化的页
+
+    Args:
+        old_path: 上次同步时的文件
+        new_path: 当前文件
+
+    Returns:
+        (页大小, [(页号, 页内容)])，页号从 0 开始；页大小不同或不是有效数据库时返回 None
+    """
+    page_size = read_page_size(new_path)
+    if page_size is None or read_page_size(old_path) != page_size:
+        return None
+
+    changed: List[Tuple[int, bytes]] = []
+    chunk_size = page_size * _READ_CHUNK_PAGES
+    page_no = 0
+    with open(old_path, "rb") as old, open(new_path, "rb") as new:
+        while True:
+            new_chunk = new.read(chunk_size)
+            if not new_chunk:
+                break
+            old_chunk = old.read(chunk_size)
+            if new_chunk == old_chunk:
+                page_no += len(new_chunk) // page_size
+                continue
+            for offset in range(0, len(new_chunk), page_size):
+                page = new_chunk[offset:offset + page_size]
+                if page != old_chunk[offset:offset + page_size]:
+                    changed.append((page_no, page))
+                page_no += 1
+    return page_size, changed
+
+
+def encode_segment(
+    base_etag: str,
+    seq: int,
+    page_size: int,
+    new_path: Path,
+    pages: List[Tuple[int, bytes]],
+) -> bytes:
+    """
+    编码增量段（zlib 压缩）
+
+    Args:
+        base_etag: 基础快照 ETag
+        seq: 段序号（从 1 开始）
+        page_size: 页大小
+        new_path: 当前文件（记录应用后的文件大小和 CRC32）
+        pages: 变化的页
+
+    Returns:
+        增量段内容
+    """
+    etag_bytes = base_etag.encode("utf-8")
+    parts = [
+        _HEADER.pack(
+            _SEGMENT_MAGIC, seq, page_size, new_path.stat().st_size,
+            file_crc32(new_path), len(pages), len(etag_bytes),
+        ),
+        etag_bytes,
+    ]
+    for page_no, page in pages:
+        parts.append(_PAGE_NO.pack(page_no))
+        parts.append(page)
+    return zlib.compress(b"".join(parts), 6)
+
+
+def apply_segment(path: Path, data: bytes, base_etag: str, seq: int) -> None:
+    """
+    把增量段应用到数据库文件
+
+    Args:
+        path: 已应用到 seq - 1 段的数据库文件
+        data: 增量段内容
+        base_etag: 基础快照 ETag
+        seq: 期望的段序号
+
+    Raises:
+        ValueError: 段格式错误、与基础快照或序号不符，或应用后校验失败
+    """
+    try:
+        payload = zlib.decompress(data)
+        magic, seg_seq, page_size, new_size, crc, count, etag_len = _HEADER.unpack_from(payload)
+        offset = _HEADER.size
+        seg_etag = payload[offset:offset + etag_len].decode("utf-8")
+    except (zlib.error, struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"增量段格式错误 (序号 {seq}): {e}") from e
+    offset += etag_len
+    if magic != _SEGMENT_MAGIC or seg_seq != seq or seg_etag != base_etag:
+        raise ValueError(f"增量段与基础快照不匹配 (序号 {seg_seq}, 期望 {seq})")
+    if len(payload) < offset + count * (_PAGE_NO.size + page_size):
+        raise ValueError(f"增量段内容不完整 (序号 {seq})")
+
+    with open(path, "r+b") as f:
+        for _ in range(count):
+            (page_no,) = _PAGE_NO.unpack_from(payload, offset)
+            offset += _PAGE_NO.size
+            f.seek(page_no * page_size)
+            f.write(payload[offset:offset + page_size])
+            offset += page_size
+        f.truncate(new_size)
+
+    if file_crc32(path) != crc:
+        raise ValueError(f"增量段校验失败 (序号 {seq})")
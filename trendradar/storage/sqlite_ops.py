@@ -0,0 +1,813 @@
+# coding=utf-8
+"""
+SQLite 公共操作
+
+本地存储与远程存储共用的热榜数据库操作（基于 cursor，不关心数据库文件来源）：
+- 榜单内容指纹：内容未变化的平台只记录一条"未变化"标记，不重复写入条目和排名历史
+- 未变化标记的读取与回填：读取时还原出现次数、最后出现时间和逐次排名
+- 逐条排名列表：兼容逐行 rank_history 与紧凑排名轨迹（rank_trail.py）两种布局
+- 新闻条目写入：按标准化 URL 逐条 upsert（查询命中部分唯一索引），同时记录标题变更和排名历史
+- 新增检测：在 SQLite 中按 (platform_id, title) 比较首次出现时间，只查询最新批次涉及的标题
+"""
+
+import hashlib
+import json
+import sqlite3
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from trendradar.storage.base import NewsItem
+from trendradar.storage.rank_trail import (
+    decode_rank_trail,
+    get_crawl_index,
+    has_rank_trail,
+    load_crawl_times,
+    pack_rank,
+)
+from trendradar.utils.url import normalize_url
+
+
+@lru_cache(maxsize=65536)
+def _normalized_url(url: str, source_id: str) -> str:
+    """标准化 URL（带缓存，指纹计算和条目写入会对同一 URL 重复标准化）"""
+    return normalize_url(url, source_id) if url else ""
+
+
+def compute_news_fingerprint(source_id: str, news_list: List[NewsItem]) -> str:
+    """
+    计算单个平台榜单内容的指纹
+
+    指纹基于标题、排名列表和标准化 URL（去除动态参数），
+    API 返回的相同榜单会得到相同的指纹。
+
+    Args:
+        source_id: 平台 ID
+        news_list: 平台的新闻列表（保持 API 返回顺序）
+
+    Returns:
+        SHA-256 十六进制字符串
+    """
+    payload = [
+        (
+            item.title,
+            item.ranks or [item.rank],
+            _normalized_url(item.url, source_id),
+            item.mobile_url or "",
+        )
+        for item in news_list
+    ]
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def find_unchanged_platforms(
+    cursor: sqlite3.Cursor,
+    fingerprints: Dict[str, str],
+    crawl_time: str,
+) -> Dict[str, str]:
+    """
+    找出榜单内容与上一次写入相同的平台
+
+    Args:
+        cursor: 数据库游标
+        fingerprints: 本次抓取的平台指纹 {platform_id: fingerprint}
+        crawl_time: 本次抓取时间
+
+    Returns:
+        {platform_id: 上一次实际写入的抓取时间}
+    """
+    if not fingerprints:
+        return {}
+
+    cursor.execute("SELECT platform_id, fingerprint, crawl_time FROM platform_fingerprints")
+    unchanged = {}
+    for platform_id, fingerprint, base_time in cursor.fetchall():
+        # 同一抓取时间重复保存时按正常流程处理
+        if fingerprints.get(platform_id) == fingerprint and base_time != crawl_time:
+            unchanged[platform_id] = base_time
+    return unchanged
+
+
+def materialize_unchanged_markers(cursor: sqlite3.Cursor, platform_id: str) -> None:
+    """
+    将平台尚未回填的"未变化"标记回填到 news_items
+
+    平台榜单发生变化、即将正常写入前调用：把上次实际写入时在榜的条目
+    的出现次数和最后出现时间补齐，之后的正常更新即可在此基础上累加。
+    出现次数按条目在榜单中的出现次数累加（见 _base_board_weights）。
+
+    Args:
+        cursor: 数据库游标
+        platform_id: 平台 ID
+    """
+    cursor.execute("""
+        SELECT u.base_crawl_time, COUNT(*), MAX(cr.crawl_time)
+        FROM unchanged_crawls u
+        JOIN crawl_records cr ON u.crawl_record_id = cr.id
+        WHERE u.platform_id = ? AND u.materialized = 0
+        GROUP BY u.base_crawl_time
+    """, (platform_id,))
+
+    for base_time, marker_count, last_time in cursor.fetchall():
+        weights = _base_board_weights(cursor, platform_id, base_time)
+        cursor.execute("""
+            SELECT id FROM news_items
+            WHERE platform_id = ? AND last_crawl_time = ?
+        """, (platform_id, base_time))
+        updates = [
+            (marker_count * weights.get(news_id, 1), last_time, news_id)
+            for (news_id,) in cursor.fetchall()
+            if weights.get(news_id, 1)
+        ]
+        cursor.executemany("""
+            UPDATE news_items SET
+                crawl_count = crawl_count + ?,
+                last_crawl_time = ?
+            WHERE id = ?
+        """, updates)
+
+    cursor.execute("""
+        UPDATE unchanged_crawls SET materialized = 1
+        WHERE platform_id = ? AND materialized = 0
+    """, (platform_id,))
+
+
+def _base_board_weights(cursor: sqlite3.Cursor, platform_id: str, base_time: str) -> Dict[int, int]:
+    """
+    上一次实际写入时在榜条目的出现次数（只返回不为 1 的条目）
+
+    与逐次完整写入一致：同一 URL 在榜单中出现多次（如以不同标题出现）时，每次抓取累加多次；
+    URL 为空的条目每次抓取都写入新行（见 split_unchanged_items），不受标记影响，次数为 0。
+
+    Args:
+        cursor: 数据库游标
+        platform_id: 平台 ID
+        base_time: 上一次实际写入的抓取时间
+
+    Returns:
+        {news_item_id: 每次未变化抓取的出现次数}
+    """
+    cursor.execute("""
+        SELECT id, url FROM news_items
+        WHERE platform_id = ? AND last_crawl_time = ?
+    """, (platform_id, base_time))
+    rows = cursor.fetchall()
+
+    weights = {news_id: 0 for news_id, url in rows if not url}
+    base_ranks = query_crawl_ranks(cursor, [news_id for news_id, url in rows if url], base_time)
+    weights.update({news_id: len(ranks) for news_id, ranks in base_ranks.items() if len(ranks) != 1})
+    return weights
+
+
+def split_unchanged_items(news_list: List[NewsItem]) -> List[NewsItem]:
+    """
+    榜单未变化时仍需正常写入的条目
+
+    URL 为空的条目不做去重，逐次完整写入时每次抓取都插入新行，
+    这些条目照常写入，其余条目由"未变化"标记代替。
+
+    Args:
+        news_list: 平台的新闻列表
+
+    Returns:
+        URL 为空的条目
+    """
+    return [item for item in news_list if not item.url]
+
+
+def record_unchanged_markers(
+    cursor: sqlite3.Cursor,
+    crawl_record_id: int,
+    unchanged: Dict[str, str],
+) -> None:
+    """
+    为内容未变化的平台写入"未变化"标记
+
+    Args:
+        cursor: 数据库游标
+        crawl_record_id: 本次抓取记录 ID
+        unchanged: {platform_id: 上一次实际写入的抓取时间}
+    """
+    cursor.executemany("""
+        INSERT OR REPLACE INTO unchanged_crawls
+        (crawl_record_id, platform_id, base_crawl_time, materialized)
+        VALUES (?, ?, ?, 0)
+    """, [(crawl_record_id, pid, base) for pid, base in unchanged.items()])
+
+
+def save_platform_fingerprints(
+    cursor: sqlite3.Cursor,
+    fingerprints: Dict[str, str],
+    crawl_time: str,
+    now_str: str,
+) -> None:
+    """
+    保存实际写入的平台指纹
+
+    Args:
+        cursor: 数据库游标
+        fingerprints: {platform_id: fingerprint}
+        crawl_time: 本次抓取时间
+        now_str: 当前时间字符串
+    """
+    cursor.executemany("""
+        INSERT INTO platform_fingerprints (platform_id, fingerprint, crawl_time, updated_at)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(platform_id) DO UPDATE SET
+            fingerprint = excluded.fingerprint,
+            crawl_time = excluded.crawl_time,
+            updated_at = excluded.updated_at
+    """, [(pid, fp, crawl_time, now_str) for pid, fp in fingerprints.items()])
+
+
+def load_pending_unchanged(cursor: sqlite3.Cursor) -> Dict[str, Tuple[str, int, str, Dict[int, int]]]:
+    """
+    读取尚未回填的"未变化"标记
+
+    旧版本数据库（无 unchanged_crawls 表）返回空字典。
+
+    Args:
+        cursor: 数据库游标
+
+    Returns:
+        {platform_id: (上一次实际写入时间, 未变化次数, 最后一次未变化的抓取时间,
+                       {news_item_id: 出现次数（不为 1 的条目，见 _base_board_weights）})}
+    """
+    try:
+        cursor.execute("""
+            SELECT u.platform_id, u.base_crawl_time, COUNT(*), MAX(cr.crawl_time)
+            FROM unchanged_crawls u
+            JOIN crawl_records cr ON u.crawl_record_id = cr.id
+            WHERE u.materialized = 0
+            GROUP BY u.platform_id, u.base_crawl_time
+        """)
+    except sqlite3.OperationalError:
+        return {}
+
+    return {
+        platform_id: (base_time, marker_count, last_time, _base_board_weights(cursor, platform_id, base_time))
+        for platform_id, base_time, marker_count, last_time in cursor.fetchall()
+    }
+
+
+def apply_pending_unchanged(
+    pending: Dict[str, Tuple[str, int, str, Dict[int, int]]],
+    platform_id: str,
+    news_id: int,
+    last_crawl_time: str,
+    crawl_count: int,
+) -> Tuple[str, int]:
+    """
+    按未回填的"未变化"标记还原条目的最后出现时间和出现次数
+
+    Args:
+        pending: load_pending_unchanged 的返回值
+        platform_id: 平台 ID
+        news_id: 条目 ID
+        last_crawl_time: 数据库中的最后抓取时间
+        crawl_count: 数据库中的抓取次数
+
+    Returns:
+        (还原后的最后出现时间, 还原后的出现次数)
+    """
+    marker = pending.get(platform_id)
+    if marker and last_crawl_time == marker[0]:
+        weight = marker[3].get(news_id, 1)
+        if weight:
+            return marker[2], (crawl_count or 1) + marker[1] * weight
+    return last_crawl_time, crawl_count
+
+
+def get_latest_unchanged_boards(
+    pending: Dict[str, Tuple[str, int, str, Dict[int, int]]],
+    latest_time: str,
+) -> List[Tuple[str, str]]:
+    """
+    获取在最新一次抓取中标记为"未变化"的平台
+
+    Args:
+        pending: load_pending_unchanged 的返回值
+        latest_time: 最新抓取时间
+
+    Returns:
+        [(platform_id, 上一次实际写入时间)]，读取最新榜单时需按此补充这些平台 URL 不为空的条目
+        （URL 为空的条目在最新一次抓取中已照常写入）
+    """
+    return [
+        (platform_id, marker[0])
+        for platform_id, marker in pending.items()
+        if marker[2] == latest_time
+    ]
+
+
+def sort_by_restored_time(
+    items: Dict[str, List[NewsItem]],
+    pending: Dict[str, Tuple[str, int, str, Dict[int, int]]],
+) -> None:
+    """
+    按还原后的最后出现时间重排有"未变化"标记的平台条目
+
+    读取方按 (last_crawl_time, id) 排序，标记条目在数据库中仍是上一次实际写入的时间，
+    稳定排序后与逐次完整写入的顺序一致。
+
+    Args:
+        items: 按平台分组的条目（每个平台内已按数据库中的 (last_crawl_time, id) 排序）
+        pending: load_pending_unchanged 的返回值
+    """
+    for platform_id in pending:
+        if platform_id in items:
+            items[platform_id].sort(key=lambda item: item.last_time)
+
+
+def _has_unchanged_table(cursor: sqlite3.Cursor, schema: str = "main") -> bool:
+    """检查数据库是否包含 unchanged_crawls 表（旧版本数据库没有）"""
+    cursor.execute(f"""
+        SELECT name FROM {schema}.sqlite_master
+        WHERE type = 'table' AND name = 'unchanged_crawls'
+    """)
+    return cursor.fetchone() is not None
+
+
+class RankListReader:
+    """
+    逐条新闻排名列表读取（兼容逐行 rank_history 与紧凑排名轨迹两种布局，见 rank_trail.py）
+
+    先创建读取器（会在游标上执行少量查询），再把 column 拼入 news_items 别名为 n 的主查询，
+    逐行用 parse 还原按 (抓取时间, 排名) 排序的排名列表：
+
+        reader = RankListReader(cursor)
+        for row in cursor.execute(f"SELECT n.rank, {reader.column} FROM news_items n"):
+            ranks = reader.parse(row[1], row[0])
+
+    - 逐行布局：column 为相关子查询，经 (news_item_id, crawl_time, rank) 覆盖索引按时间顺序
+      拼接排名（外层为聚合的子查询保留 ORDER BY，不会被展开）
+    - 紧凑布局：column 为 rank_trail，按抓取时间字典解码后排序
+
+    ATTACH 的附加库（跨日期查询）通过 schema 指定，column 中的表名带库名前缀。
+    """
+
+    def __init__(self, cursor: sqlite3.Cursor, include_unchanged: bool = False, schema: str = "main"):
+        """
+        初始化读取器
+
+        Args:
+            cursor: 数据库游标
+            include_unchanged: 是否为"未变化"抓取补出排名（每个未变化标记按上一次实际写入时的排名补一次，
+                URL 为空的条目除外，见 split_unchanged_items）
+            schema: 库名（主库为 main，附加库为 ATTACH 时的名称）
+        """
+        self.packed = has_rank_trail(cursor, schema)
+        self._crawl_times: Dict[int, str] = {}
+        self._unchanged: Dict[str, List[Tuple[str, str]]] = {}
+        with_unchanged = include_unchanged and _has_unchanged_table(cursor, schema)
+
+        if self.packed:
+            self.column = "n.rank_trail"
+            self._crawl_times = load_crawl_times(cursor, schema)
+            if with_unchanged:
+                cursor.execute(f"""
+                    SELECT u.platform_id, u.base_crawl_time, cr.crawl_time
+                    FROM {schema}.unchanged_crawls u
+                    JOIN {schema}.crawl_records cr ON u.crawl_record_id = cr.id
+                """)
+                for platform_id, base_time, crawl_time in cursor.fetchall():
+                    self._unchanged.setdefault(platform_id, []).append((base_time, crawl_time))
+            return
+
+        ranks_sql = f"SELECT rank, crawl_time FROM {schema}.rank_history WHERE news_item_id = n.id"
+        if with_unchanged:
+            ranks_sql += f"""
+                UNION ALL
+                SELECT rh.rank, cr.crawl_time
+                FROM {schema}.unchanged_crawls u
+                JOIN {schema}.crawl_records cr ON u.crawl_record_id = cr.id
+                JOIN {schema}.rank_history rh ON rh.news_item_id = n.id AND rh.crawl_time = u.base_crawl_time
+                WHERE u.platform_id = n.platform_id AND n.url != ''"""
+        self.column = f"(SELECT group_concat(rank) FROM ({ranks_sql} ORDER BY crawl_time, rank))"
+
+    def parse(
+        self,
+        value,
+        fallback_rank: int,
+        platform_id: Optional[str] = None,
+        distinct: bool = True,
+        url: Optional[str] = None,
+    ) -> List[int]:
+        """
+        解析 column 的结果
+
+        Args:
+            value: column 的值（NULL 表示没有排名历史）
+            fallback_rank: 没有排名历史时使用的当前排名
+            platform_id: 平台 ID（紧凑布局补出"未变化"抓取的排名时使用）
+            distinct: 是否按首次出现顺序去重
+            url: 条目 URL（紧凑布局补出排名时使用，URL 为空的条目不补）
+
+        Returns:
+            排名列表
+        """
+        if not value:
+            return [fallback_rank]
+        if self.packed:
+            ranks = self._trail_ranks(value, platform_id if url != "" else None)
+        else:
+            ranks = [int(rank) for rank in value.split(",")]
+        return list(dict.fromkeys(ranks)) if distinct else ranks
+
+    def _trail_ranks(self, value: bytes, platform_id: Optional[str]) -> List[int]:
+        """解码排名轨迹，按 (抓取时间, 排名) 排序"""
+        crawl_times = self._crawl_times
+        crawl_indexes, ranks = decode_rank_trail(value)
+        points = [(crawl_times.get(idx, ""), rank) for idx, rank in zip(crawl_indexes, ranks)]
+
+        markers = self._unchanged.get(platform_id)
+        if markers:
+            points += [
+                (crawl_time, rank)
+                for base_time, crawl_time in markers
+                for point_time, rank in points
+                if point_time == base_time
+            ]
+
+        points.sort()
+        return [rank for _, rank in points]
+
+
+def query_crawl_ranks(
+    cursor: sqlite3.Cursor,
+    news_ids: List[int],
+    crawl_time: str,
+) -> Dict[int, List[int]]:
+    """
+    查询指定条目在某次抓取中写入的排名（同一次抓取可能因重复 URL 有多个排名）
+
+    Args:
+        cursor: 数据库游标
+        news_ids: 条目 ID 列表
+        crawl_time: 抓取时间
+
+    Returns:
+        {news_item_id: 升序排名列表}
+    """
+    crawl_ranks: Dict[int, List[int]] = {}
+    if not news_ids:
+        return crawl_ranks
+
+    if not has_rank_trail(cursor):
+        for chunk in _chunked(news_ids):
+            cursor.execute(f"""
+                SELECT news_item_id, rank FROM rank_history
+                WHERE news_item_id IN ({",".join("?" * len(chunk))}) AND crawl_time = ?
+                ORDER BY news_item_id, rank
+            """, chunk + [crawl_time])
+            for news_id, rank in cursor.fetchall():
+                crawl_ranks.setdefault(news_id, []).append(rank)
+        return crawl_ranks
+
+    cursor.execute("SELECT id FROM crawl_times WHERE crawl_time = ?", (crawl_time,))
+    row = cursor.fetchone()
+    if row is None:
+        return crawl_ranks
+    crawl_index = row[0]
+
+    for chunk in _chunked(news_ids):
+        cursor.execute(f"""
+            SELECT id, rank_trail FROM news_items
+            WHERE id IN ({",".join("?" * len(chunk))}) AND rank_trail IS NOT NULL
+        """, chunk)
+        for news_id, trail in cursor.fetchall():
+            crawl_indexes, ranks = decode_rank_trail(trail)
+            matched = sorted(rank for idx, rank in zip(crawl_indexes, ranks) if idx == crawl_index)
+            if matched:
+                crawl_ranks[news_id] = matched
+    return crawl_ranks
+
+
+# IN 列表分批大小（低于旧版 SQLite 的 999 个参数上限）
+_IN_CHUNK_SIZE = 500
+
+
+def _chunked(values: List, size: int = _IN_CHUNK_SIZE):
+    """按固定大小切分列表"""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _platform_filter(column: str, platform_ids: Optional[Iterable[str]]) -> Tuple[str, List[str]]:
+    """生成平台过滤条件（platform_ids 为 None 时不过滤）"""
+    if platform_ids is None:
+        return "", []
+    platform_ids = list(platform_ids)
+    if not platform_ids:
+        return " AND 0", []
+    return f" AND {column} IN ({','.join('?' * len(platform_ids))})", platform_ids
+
+
+def has_titles_before(
+    cursor: sqlite3.Cursor,
+    before_time: str,
+    platform_ids: Optional[Iterable[str]] = None,
+) -> bool:
+    """
+    检查是否存在首次出现时间早于指定批次的标题（即当天是否已有历史批次）
+
+    Args:
+        cursor: 数据库游标
+        before_time: 批次时间
+        platform_ids: 平台过滤，None 表示全部平台
+
+    Returns:
+        是否存在历史标题
+    """
+    condition, params = _platform_filter("platform_id", platform_ids)
+    cursor.execute(f"""
+        SELECT 1 FROM news_items
+        WHERE first_crawl_time < ?{condition}
+        LIMIT 1
+    """, [before_time] + params)
+    return cursor.fetchone() is not None
+
+
+def query_historical_titles(
+    cursor: sqlite3.Cursor,
+    titles_by_platform: Dict[str, Iterable[str]],
+    before_time: str,
+) -> Dict[str, Set[str]]:
+    """
+    查询给定标题中在更早批次出现过的标题
+
+    同一标题可能因 URL 变化存在多条记录，任意一条首次出现时间早于批次时间即为历史标题。
+    按 (platform_id, title, first_crawl_time) 索引逐个标题定位，开销与给定标题数成正比。
+
+    Args:
+        cursor: 数据库游标
+        titles_by_platform: {platform_id: 标题集合}
+        before_time: 批次时间
+
+    Returns:
+        {platform_id: 历史标题集合}
+    """
+    historical: Dict[str, Set[str]] = {}
+    for platform_id, titles in titles_by_platform.items():
+        found: Set[str] = set()
+        for chunk in _chunked(list(set(titles))):
+            cursor.execute(f"""
+                SELECT DISTINCT title FROM news_items
+                WHERE platform_id = ? AND title IN ({",".join("?" * len(chunk))})
+                  AND first_crawl_time < ?
+            """, [platform_id] + chunk + [before_time])
+            found.update(row[0] for row in cursor.fetchall())
+        historical[platform_id] = found
+    return historical
+
+
+def query_latest_new_titles(
+    cursor: sqlite3.Cursor,
+    latest_time: str,
+    platform_ids: Optional[Iterable[str]] = None,
+) -> Dict[str, Dict[str, Dict]]:
+    """
+    查询最新批次中的新增标题
+
+    新增标题：最新批次出现（last_crawl_time = 最新时间），且同平台同标题的所有记录中
+    MIN(first_crawl_time) 不早于最新时间。最新批次条目经 last_crawl_time 索引定位，
+    每个标题的最早出现时间由 (platform_id, title, first_crawl_time) 索引一次查找得到，
+    开销与最新批次大小成正比，与当天累计数据量无关。
+
+    榜单未变化的平台（见 get_latest_unchanged_boards）条目都来自更早批次，不会是新增。
+
+    Args:
+        cursor: 数据库游标
+        latest_time: 最新批次时间
+        platform_ids: 平台过滤，None 表示全部平台
+
+    Returns:
+        {platform_id: {title: {"ranks": [rank], "url": url, "mobileUrl": mobile_url}}}
+    """
+    condition, params = _platform_filter("n.platform_id", platform_ids)
+    cursor.execute(f"""
+        SELECT n.platform_id, n.title, n.rank, n.url, n.mobile_url,
+               (
+                   SELECT MIN(h.first_crawl_time) FROM news_items h
+                   WHERE h.platform_id = n.platform_id AND h.title = n.title
+               ) >= ? AS is_new
+        FROM news_items n
+        WHERE n.last_crawl_time = ?{condition}
+        ORDER BY n.id
+    """, [latest_time, latest_time] + params)
+
+    # 平台顺序与最新批次条目顺序一致（没有新增标题的平台最后移除）
+    new_titles: Dict[str, Dict[str, Dict]] = {}
+    for platform_id, title, rank, url, mobile_url, is_new in cursor:
+        platform_titles = new_titles.setdefault(platform_id, {})
+        if is_new:
+            platform_titles[title] = {
+                "ranks": [rank],
+                "url": url or "",
+                "mobileUrl": mobile_url or "",
+            }
+    return {platform_id: titles for platform_id, titles in new_titles.items() if titles}
+
+
+def query_historical_rss_urls(
+    cursor: sqlite3.Cursor,
+    urls_by_feed: Dict[str, Iterable[str]],
+    before_time: str,
+) -> Dict[str, Set[str]]:
+    """
+    查询给定 RSS 条目 URL 中在更早批次出现过的 URL（rss_items (feed_id, url) 唯一索引）
+
+    Args:
+        cursor: RSS 数据库游标
+        urls_by_feed: {feed_id: URL 集合}
+        before_time: 批次时间
+
+    Returns:
+        {feed_id: 历史 URL 集合}
+    """
+    historical: Dict[str, Set[str]] = {}
+    for feed_id, urls in urls_by_feed.items():
+        found: Set[str] = set()
+        for chunk in _chunked([url for url in set(urls) if url]):
+            cursor.execute(f"""
+                SELECT url FROM rss_items
+                WHERE feed_id = ? AND url IN ({",".join("?" * len(chunk))})
+                  AND first_crawl_time < ?
+            """, [feed_id] + chunk + [before_time])
+            found.update(row[0] for row in cursor.fetchall())
+        historical[feed_id] = found
+    return historical
+
+
+# 紧凑布局追加排名（|| 的结果为 TEXT，需转回 BLOB）
+_APPEND_RANK_TRAIL_SQL = "rank_trail = CAST(IFNULL(rank_trail, X'') || {entry} AS BLOB)"
+
+
+def _record_rank(
+    cursor: sqlite3.Cursor,
+    news_id: int,
+    rank: int,
+    crawl_time: str,
+    now_str: str,
+    crawl_index: Optional[int],
+) -> None:
+    """记录单个条目的一次排名（逐行布局写入 rank_history，紧凑布局追加到 rank_trail）"""
+    if crawl_index is None:
+        cursor.execute("""
+            INSERT INTO rank_history
+            (news_item_id, rank, crawl_time, created_at)
+            VALUES (?, ?, ?, ?)
+        """, (news_id, rank, crawl_time, now_str))
+    else:
+        cursor.execute(
+            f"UPDATE news_items SET {_APPEND_RANK_TRAIL_SQL.format(entry='?')} WHERE id = ?",
+            (pack_rank(crawl_index, rank), news_id),
+        )
+
+
+def upsert_news_items(
+    cursor: sqlite3.Cursor,
+    items: Dict[str, List[NewsItem]],
+    crawl_time: str,
+    now_str: str,
+    log_prefix: str = "",
+) -> Tuple[int, int, int]:
+    """
+    写入新闻条目（含标题变更和排名历史）
+
+    逐平台逐条写入。排名按数据库布局写入 rank_history 或追加到 rank_trail（见 rank_trail.py）。
+    调用方负责提交事务。
+
+    Args:
+        cursor: 数据库游标
+        items: 按平台分组的新闻条目 {platform_id: [NewsItem]}
+        crawl_time: 本次抓取时间
+        now_str: 当前时间字符串
+        log_prefix: 日志前缀（如 "[本地存储] "）
+
+    Returns:
+        (新增条数, 更新条数, 标题变更条数)
+    """
+    if not items:
+        return 0, 0, 0
+
+    crawl_index = get_crawl_index(cursor, crawl_time) if has_rank_trail(cursor) else None
+
+    new_count = updated_count = title_changed_count = 0
+    for source_id, news_list in items.items():
+        counts = upsert_news_items_per_item(
+            cursor, source_id, news_list, crawl_time, now_str, log_prefix, crawl_index
+        )
+        new_count += counts[0]
+        updated_count += counts[1]
+        title_changed_count += counts[2]
+    return new_count, updated_count, title_changed_count
+
+
+def upsert_news_items_per_item(
+    cursor: sqlite3.Cursor,
+    source_id: str,
+    news_list: List[NewsItem],
+    crawl_time: str,
+    now_str: str,
+    log_prefix: str = "",
+    crawl_index: Optional[int] = None,
+) -> Tuple[int, int, int]:
+    """
+    逐条写入单个平台的新闻条目
+
+    Args:
+        cursor: 数据库游标
+        source_id: 平台 ID
+        news_list: 新闻条目列表
+        crawl_time: 本次抓取时间
+        now_str: 当前时间字符串
+        log_prefix: 日志前缀
+        crawl_index: 紧凑布局的抓取序号（逐行布局为 None）
+
+    Returns:
+        (新增条数, 更新条数, 标题变更条数)
+    """
+    new_count = 0
+    updated_count = 0
+    title_changed_count = 0
+
+    for item in news_list:
+        try:
+            # 标准化 URL（去除动态参数，如微博的 band_rank）
+            normalized_url = _normalized_url(item.url, source_id)
+
+            # 检查是否已存在（通过标准化 URL + platform_id）
+            if normalized_url:
+                # url != '' 使查询能命中部分唯一索引 idx_news_url_platform
+                cursor.execute("""
+                    SELECT id, title FROM news_items
+                    WHERE url = ? AND url != '' AND platform_id = ?
+                """, (normalized_url, source_id))
+                existing = cursor.fetchone()
+
+                if existing:
+                    # 已存在，更新记录
+                    existing_id, existing_title = existing
+
+                    # 检查标题是否变化
+                    if existing_title != item.title:
+                        # 记录标题变更
+                        cursor.execute("""
+                            INSERT INTO title_changes
+                            (news_item_id, old_title, new_title, changed_at)
+                            VALUES (?, ?, ?, ?)
+                        """, (existing_id, existing_title, item.title, now_str))
+                        title_changed_count += 1
+
+                    # 记录排名历史
+                    _record_rank(cursor, existing_id, item.rank, crawl_time, now_str, crawl_index)
+
+                    # 更新现有记录
+                    cursor.execute("""
+                        UPDATE news_items SET
+                            title = ?,
+                            rank = ?,
+                            mobile_url = ?,
+                            last_crawl_time = ?,
+                            crawl_count = crawl_count + 1,
+                            updated_at = ?
+                        WHERE id = ?
+                    """, (item.title, item.rank, item.mobile_url,
+                          crawl_time, now_str, existing_id))
+                    updated_count += 1
+                else:
+                    # 不存在，插入新记录（存储标准化后的 URL）
+                    cursor.execute("""
+                        INSERT INTO news_items
+                        (title, platform_id, rank, url, mobile_url,
+                         first_crawl_time, last_crawl_time, crawl_count,
+                         created_at, updated_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, ?)
+                    """, (item.title, source_id, item.rank, normalized_url,
+                          item.mobile_url, crawl_time, crawl_time,
+                          now_str, now_str))
+                    new_id = cursor.lastrowid
+                    # 记录初始排名
+                    _record_rank(cursor, new_id, item.rank, crawl_time, now_str, crawl_index)
+                    new_count += 1
+            else:
+                # URL 为空的情况，直接插入（不做去重）
+                cursor.execute("""
+                    INSERT INTO news_items
+                    (title, platform_id, rank, url, mobile_url,
+                     first_crawl_time, last_crawl_time, crawl_count,
+                     created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, ?)
+                """, (item.title, source_id, item.rank, "",
+                      item.mobile_url, crawl_time, crawl_time,
+                      now_str, now_str))
+                new_id = cursor.lastrowid
+                # 记录初始排名
+                _record_rank(cursor, new_id, item.rank, crawl_time, now_str, crawl_index)
+                new_count += 1
+
+        except sqlite3.Error as e:
+            print(f"{log_prefix}保存新闻条目失败 [{item.title[:30]}...]: {e}")
+
+    return new_count, updated_count, title_changed_count
@@ -32,6 +32,12 @@ else:
 
 sys.path.insert(0, str(project_root))
 
+try:
+    from trendradar.core.frequency import invalidate_frequency_words_cache
+except ImportError:
+    # Web UI 可独立于 trendradar 依赖运行
+    invalidate_frequency_words_cache = None
+
 app = Flask(__name__)
 CORS(app)
 
@@ -258,6 +264,9 @@ def save_keywords(content: str) -> bool:
     try:
         with open(KEYWORDS_FILE, 'w', encoding='utf-8') as f:
             f.write(content)
+        # 使进程内的频率词解析缓存失效（其他进程通过 mtime/大小 变化自动重新解析）
+        if invalidate_frequency_words_cache is not None:
+            invalidate_frequency_words_cache(str(KEYWORDS_FILE))
         return True
     except Exception as e:
         print(f"保存关键词文件失败: {e}")